@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compare per-repository venv creation: `python -m venv` vs. cloning the
+template venv (pkgmgr.actions.install.venv_template).
+
+    PYTHONPATH=src python scripts/benchmark/venvs.py [--count 100]
+
+Venvs and the template are created in a temporary directory (the template
+build is timed separately, it is paid once per interpreter).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from pkgmgr.actions.install.venv_template import clone_template, ensure_template
+
+
+def _timed(label: str, count: int, create) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        create(i)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<16} {count:>4} venvs  {elapsed:8.2f}s  "
+        f"{elapsed / count * 1000:8.1f} ms/venv"
+    )
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--python", default=sys.executable)
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="pkgmgr-venv-bench-")
+    os.environ["PKGMGR_CACHE_DIR"] = os.path.join(work, "cache")
+    try:
+        start = time.perf_counter()
+        template = ensure_template(args.python)
+        if template is None:
+            print("Could not create a template venv.", file=sys.stderr)
+            return 1
+        print(f"template build         {time.perf_counter() - start:8.2f}s")
+
+        def plain(i: int) -> None:
+            subprocess.run(
+                [args.python, "-m", "venv", os.path.join(work, "venv", str(i))],
+                check=True,
+            )
+
+        def cloned(i: int) -> None:
+            if not clone_template(template, os.path.join(work, "clone", str(i))):
+                raise RuntimeError("clone failed")
+
+        baseline = _timed("python -m venv", args.count, plain)
+        fast = _timed("template clone", args.count, cloned)
+        print(f"speedup                {baseline / fast:8.1f}x")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,16 +11,30 @@ Responsibilities:
   - Verify the repository (GPG / commit checks).
   - Build a RepoContext object.
   - Delegate the actual installation decision logic to InstallationPipeline.
+  - Schedule repositories in dependency order, optionally in parallel.
 """
 
 from __future__ import annotations
 
 import os
+import shutil
+import threading
+import time
+from contextlib import nullcontext
 from typing import Any, Dict, List, Optional, Tuple
 
+from pkgmgr.core.command.index import (
+    executable_index,
+    invalidate_executable_index,
+)
+from pkgmgr.core.command.process import watch_timeouts
+from pkgmgr.core.command.run import output_prefix
 from pkgmgr.core.repository.identifier import get_repo_identifier
 from pkgmgr.core.repository.dir import get_repo_dir
 from pkgmgr.core.repository.verify import verify_repository
+from pkgmgr.core.resources.governor import NETWORK, PACKAGE_MANAGER, acquire
+from pkgmgr.core.state.history import RunHistory, open_run_history
+from pkgmgr.actions.repository._parallel import RepoOutcome, print_summary
 from pkgmgr.actions.repository.clone import clone_repos
 from pkgmgr.actions.install.context import RepoContext
 from pkgmgr.actions.install.installers.os_packages import (
@@ -28,6 +42,7 @@ from pkgmgr.actions.install.installers.os_packages import (
     DebianControlInstaller,
     RpmSpecInstaller,
 )
+from pkgmgr.actions.install.installers.os_packages.metadata import package_metadata
 from pkgmgr.actions.install.installers.nix import (
     NixFlakeInstaller,
 )
@@ -35,7 +50,16 @@ from pkgmgr.actions.install.installers.python import PythonInstaller
 from pkgmgr.actions.install.installers.makefile import (
     MakefileInstaller,
 )
+from pkgmgr.actions.install.layers import classify_command_layer
+from pkgmgr.actions.install.ledger import InstallLedger, repo_fingerprint
 from pkgmgr.actions.install.pipeline import InstallationPipeline
+from pkgmgr.actions.install.scheduler import (
+    SKIPPED,
+    UNCHANGED,
+    InstallJob,
+    build_install_jobs,
+    run_install_jobs,
+)
 
 Repository = Dict[str, Any]
 
@@ -48,6 +72,28 @@ INSTALLERS = [
     MakefileInstaller(),
 ]
 
+# OS package installers that batch build dependencies, with the tool whose
+# presence makes that worthwhile.
+_BUILD_TOOLS = {
+    ArchPkgbuildInstaller: "makepkg",
+    DebianControlInstaller: "dpkg-buildpackage",
+    RpmSpecInstaller: "rpmbuild",
+}
+# Installers that keep state of up-front batches until discard_batch().
+_BATCHING_INSTALLERS = (NixFlakeInstaller, DebianControlInstaller, RpmSpecInstaller)
+
+_PROMPT_LOCK = threading.Lock()
+
+
+def _open_store(factory, what: str, quiet: bool):
+    """Open a state-dir backed store; None (with a warning) if unavailable."""
+    try:
+        return factory()
+    except OSError as exc:
+        if not quiet:
+            print(f"[Warning] {what} unavailable ({exc}).")
+        return None
+
 
 def _ensure_repo_dir(
     repo: Repository,
@@ -67,14 +113,15 @@ def _ensure_repo_dir(
 
     if not os.path.exists(repo_dir):
         print(f"Repository directory '{repo_dir}' does not exist. Cloning it now...")
-        clone_repos(
-            [repo],
-            repositories_base_dir,
-            all_repos,
-            preview,
-            no_verification,
-            clone_mode,
-        )
+        with acquire(NETWORK):
+            clone_repos(
+                [repo],
+                repositories_base_dir,
+                all_repos,
+                preview,
+                no_verification,
+                clone_mode,
+            )
         if not os.path.exists(repo_dir):
             print(f"Cloning failed for repository {identifier}. Skipping installation.")
             return None
@@ -88,11 +135,14 @@ def _verify_repo(
     no_verification: bool,
     identifier: str,
     silent: bool,
+    interactive: bool = True,
 ) -> bool:
     """
     Verify a repository using the configured verification data.
 
     Returns True if verification is considered okay and installation may continue.
+    Without ``interactive`` a failed verification skips the repository
+    instead of prompting (unless ``silent``).
     """
     verified_info = repo.get("verified")
     verified_ok, errors, _commit_hash, _signing_key = verify_repository(
@@ -112,6 +162,9 @@ def _verify_repo(
             print(
                 f"[Warning] Continuing despite verification failure for {identifier} (--silent)."
             )
+        elif not interactive:
+            print(f"Skipping installation for {identifier} (verification failed).")
+            return False
         else:
             choice = input("Continue anyway? [y/N]: ").strip().lower()
             if choice != "y":
@@ -154,36 +207,172 @@ def _create_context(
     )
 
 
-def install_repos(
-    selected_repos: List[Repository],
+def _batch_contexts(
+    pipeline: InstallationPipeline,
+    install_jobs: List[InstallJob],
     repositories_base_dir: str,
     bin_dir: str,
     all_repos: List[Repository],
     no_verification: bool,
-    preview: bool,
     quiet: bool,
     clone_mode: str,
     update_dependencies: bool,
+    force_update: bool,
+    ledger: Optional[InstallLedger],
+) -> List[Tuple[RepoContext, Any]]:
+    """
+    Contexts of the repositories that may take part in up-front batches,
+    each with the installer its pipeline would start with.
+
+    Only repositories that are cloned, pass verification without a prompt
+    and are not unchanged per the ledger are included.
+    """
+    candidates: List[Tuple[RepoContext, Any]] = []
+    for job in install_jobs:
+        repo_dir = get_repo_dir(repositories_base_dir, job.repo)
+        if not os.path.isdir(repo_dir):
+            continue
+        verified_ok, _errors, _commit, _key = verify_repository(
+            job.repo, repo_dir, mode="local", no_verification=no_verification
+        )
+        if not no_verification and job.repo.get("verified") and not verified_ok:
+            continue
+        if ledger is not None and ledger.is_unchanged(
+            repo_dir, repo_fingerprint(repo_dir)
+        ):
+            continue
+        ctx = _create_context(
+            repo=job.repo,
+            identifier=job.identifier,
+            repo_dir=repo_dir,
+            repositories_base_dir=repositories_base_dir,
+            bin_dir=bin_dir,
+            all_repos=all_repos,
+            no_verification=no_verification,
+            preview=False,
+            quiet=quiet,
+            clone_mode=clone_mode,
+            update_dependencies=update_dependencies,
+            force_update=force_update,
+        )
+        candidates.append((ctx, pipeline.first_installer(ctx)))
+    return candidates
+
+
+def _nix_batch_installer(
+    pipeline: InstallationPipeline,
+) -> Optional[NixFlakeInstaller]:
+    if os.environ.get("PKGMGR_NIX_BATCH") == "0" or shutil.which("nix") is None:
+        return None
+    return next(
+        (i for i in pipeline.installers if isinstance(i, NixFlakeInstaller)), None
+    )
+
+
+def _build_dependency_batchers(pipeline: InstallationPipeline) -> List[Any]:
+    if os.environ.get("PKGMGR_BUILD_DEPS_BATCH") == "0":
+        return []
+    return [
+        installer
+        for installer in pipeline.installers
+        for cls, tool in _BUILD_TOOLS.items()
+        if isinstance(installer, cls) and shutil.which(tool) is not None
+    ]
+
+
+def _batch_nix_installs(
+    nix: NixFlakeInstaller,
+    candidates: List[Tuple[RepoContext, Any]],
     force_update: bool = False,
-    silent: bool = False,
-    emit_summary: bool = True,
 ) -> None:
     """
-    Install one or more repositories according to the configured installers
-    and the CLI layer precedence rules.
+    Install the flake outputs of all repositories whose pipeline starts with
+    the nix installer in one multi-installable `nix profile install`, after
+    building them concurrently (`nix build --no-link`).
+
+    The per-repository pipelines run afterwards as usual; the nix installer
+    skips the outputs installed here, and installs everything itself if the
+    batch failed.
+
+    With force_update (`pkgmgr update`) the outputs are only built: the
+    upgrades replace existing profile entries per repository, but no longer
+    build while holding the nix profile lock. This also applies to a single
+    repository, as the pipelined update installs one repository per call.
+    """
+    ctxs = [ctx for ctx, first in candidates if first is nix]
+    if len(ctxs) < (1 if force_update else 2):
+        return
+    # Builds run concurrently; only the profile transaction is serialized.
+    built = nix.prefetch(ctxs)
+    if force_update:
+        return
+    with acquire(*nix.resources):
+        nix.install_batch(ctxs, prefetched=built)
+    invalidate_executable_index()
+
+
+def _batch_build_dependencies(
+    installers: List[Any],
+    candidates: List[Tuple[RepoContext, Any]],
+) -> None:
+    """
+    Install the build dependencies of all repositories whose pipeline starts
+    with an OS package installer in one package manager transaction per
+    installer (e.g. a single `apt-get build-dep` for all debian/ trees).
 
-    If force_update=True, installers of the currently active layer are allowed
-    to run again (upgrade/refresh), even if that layer is already loaded.
+    The per-repository builds skip the dependencies installed here, and
+    install them themselves if the batch failed.
+    """
+    for installer in installers:
+        ctxs = [ctx for ctx, first in candidates if first is installer]
+        if len(ctxs) < 2:
+            continue
+        with acquire(PACKAGE_MANAGER):
+            installer.install_build_dependencies_batch(ctxs)
+        invalidate_executable_index()
 
-    If silent=True, repository failures are downgraded to warnings and the
-    overall command never exits non-zero because of per-repository failures.
+
+def _install_one(
+    pipeline: InstallationPipeline,
+    repo: Repository,
+    identifier: str,
+    repositories_base_dir: str,
+    bin_dir: str,
+    all_repos: List[Repository],
+    no_verification: bool,
+    preview: bool,
+    quiet: bool,
+    clone_mode: str,
+    update_dependencies: bool,
+    force_update: bool,
+    silent: bool,
+    serialize_prompts: bool,
+    ledger: Optional[InstallLedger] = None,
+    interactive: bool = True,
+    history: Optional[RunHistory] = None,
+) -> Tuple[bool, str]:
+    """
+    Clone (if needed), verify and install a single repository.
+
+    With a ledger, repositories whose fingerprint did not change since the
+    last successful installation are skipped, and successful installations
+    are recorded.
+
+    With a history, the outcome and duration of every attempted installation
+    are recorded.
+
+    Returns ``(ok, msg)``; a declined verification yields ``(False, SKIPPED)``.
     """
-    pipeline = InstallationPipeline(INSTALLERS)
-    failures: List[Tuple[str, str]] = []
+    start = time.monotonic()
+    repo_dir: Optional[str] = None
 
-    for repo in selected_repos:
-        identifier = get_repo_identifier(repo, all_repos)
+    def _record(ok: bool) -> None:
+        if history is not None and repo_dir and not preview:
+            history.record(
+                repo_dir, "install", time.monotonic() - start, ok, label=identifier
+            )
 
+    with watch_timeouts() as watch:
         try:
             repo_dir = _ensure_repo_dir(
                 repo=repo,
@@ -195,17 +384,29 @@ def install_repos(
                 identifier=identifier,
             )
             if not repo_dir:
-                failures.append((identifier, "clone/ensure repo directory failed"))
-                continue
-
-            if not _verify_repo(
-                repo=repo,
-                repo_dir=repo_dir,
-                no_verification=no_verification,
-                identifier=identifier,
-                silent=silent,
-            ):
-                continue
+                return False, "clone/ensure repo directory failed"
+
+            # Interactive verification prompts must not interleave.
+            with _PROMPT_LOCK if serialize_prompts else nullcontext():
+                verified = _verify_repo(
+                    repo=repo,
+                    repo_dir=repo_dir,
+                    no_verification=no_verification,
+                    identifier=identifier,
+                    silent=silent,
+                    interactive=interactive,
+                )
+            if not verified:
+                return False, SKIPPED
+
+            fingerprint = repo_fingerprint(repo_dir) if ledger is not None else None
+            if ledger is not None and ledger.is_unchanged(repo_dir, fingerprint):
+                if not quiet:
+                    print(
+                        f"[pkgmgr] Skipping {identifier} – unchanged since last install "
+                        f"(commit {fingerprint.commit[:12]}). Use --force to reinstall."
+                    )
+                return True, UNCHANGED
 
             ctx = _create_context(
                 repo=repo,
@@ -222,23 +423,132 @@ def install_repos(
                 force_update=force_update,
             )
 
-            pipeline.run(ctx)
+            try:
+                pipeline.run(ctx)
+            except BaseException:
+                if ledger is not None:
+                    ledger.forget(repo_dir)
+                raise
+
+            if ledger is not None and fingerprint is not None:
+                command = repo.get("command")
+                layer = classify_command_layer(command, repo_dir) if command else None
+                ledger.record(
+                    repo_dir,
+                    fingerprint,
+                    layer=layer.value if layer else None,
+                    command=command,
+                )
 
         except SystemExit as exc:
+            _record(False)
             code = exc.code if isinstance(exc.code, int) else str(exc.code)
-            failures.append((identifier, f"installer failed (exit={code})"))
             if not quiet:
                 print(
                     f"[Warning] install: repository {identifier} failed (exit={code}). Continuing..."
                 )
-            continue
+            if watch.timed_out:
+                return False, f"timed out: {watch.commands[-1]}"
+            return False, f"installer failed (exit={code})"
         except Exception as exc:
-            failures.append((identifier, f"unexpected error: {exc}"))
+            _record(False)
             if not quiet:
                 print(
                     f"[Warning] install: repository {identifier} hit an unexpected error: {exc}. Continuing..."
                 )
-            continue
+            if watch.timed_out:
+                return False, f"timed out: {watch.commands[-1]}"
+            return False, f"unexpected error: {exc}"
+
+    _record(True)
+    return True, ""
+
+
+def install_repos(
+    selected_repos: List[Repository],
+    repositories_base_dir: str,
+    bin_dir: str,
+    all_repos: List[Repository],
+    no_verification: bool,
+    preview: bool,
+    quiet: bool,
+    clone_mode: str,
+    update_dependencies: bool,
+    force_update: bool = False,
+    silent: bool = False,
+    emit_summary: bool = True,
+    jobs: int = 1,
+    force: bool = False,
+    interactive: bool = True,
+    history: Optional[RunHistory] = None,
+) -> None:
+    """
+    Install one or more repositories according to the configured installers
+    and the CLI layer precedence rules.
+
+    If force_update=True, installers of the currently active layer are allowed
+    to run again (upgrade/refresh), even if that layer is already loaded.
+
+    If silent=True, repository failures are downgraded to warnings and the
+    overall command never exits non-zero because of per-repository failures.
+
+    Repositories are installed in dependency order (config key
+    ``dependencies``; with update_dependencies=True missing dependencies are
+    added to the run). With jobs > 1 independent repositories are installed
+    concurrently: output lines are prefixed with ``[identifier]``, steps that
+    mutate shared state (system package manager, nix profile, shared Python
+    env) are serialized via installer locks, and a per-repository timing
+    summary is printed at the end.
+
+    Unless force=True (or in preview mode), repositories whose commit and
+    build files are unchanged since their last successful installation are
+    skipped (see pkgmgr.actions.install.ledger).
+
+    The nix flake outputs of several repositories are installed up front in
+    a single `nix profile install` transaction (disable with
+    ``PKGMGR_NIX_BATCH=0``; with force_update they are built up front and
+    upgraded per repository); see _batch_nix_installs(). Likewise the build
+    dependencies of OS packages are installed in one package manager
+    transaction per installer (disable with ``PKGMGR_BUILD_DEPS_BATCH=0``);
+    see _batch_build_dependencies().
+
+    With interactive=False a failed verification skips the repository
+    instead of prompting (used by the pipelined update, which asks all
+    questions up front).
+
+    A ``history`` passed in (the pipelined update's) is used as is and left
+    open; otherwise the run history is opened and closed here.
+    """
+    own_history = history is None and not preview
+    if preview:
+        history = None
+    elif own_history:
+        history = open_run_history(quiet)
+    try:
+        outcomes, start, parallel = _install_jobs(
+            selected_repos,
+            repositories_base_dir,
+            bin_dir,
+            all_repos,
+            no_verification,
+            preview,
+            quiet,
+            clone_mode,
+            update_dependencies,
+            force_update,
+            silent,
+            jobs,
+            force,
+            interactive,
+            history,
+        )
+    finally:
+        if own_history and history is not None:
+            history.close()
+    failures = [(o.ident, o.msg) for o in outcomes if not o.ok and o.msg != SKIPPED]
+
+    if parallel and not quiet:
+        print_summary(outcomes, "install", time.monotonic() - start)
 
     if failures and emit_summary and not quiet:
         print("\n[pkgmgr] Installation finished with warnings:")
@@ -247,3 +557,108 @@ def install_repos(
 
     if failures and not silent:
         raise SystemExit(1)
+
+
+def _install_jobs(
+    selected_repos: List[Repository],
+    repositories_base_dir: str,
+    bin_dir: str,
+    all_repos: List[Repository],
+    no_verification: bool,
+    preview: bool,
+    quiet: bool,
+    clone_mode: str,
+    update_dependencies: bool,
+    force_update: bool,
+    silent: bool,
+    jobs: int,
+    force: bool,
+    interactive: bool,
+    history: Optional[RunHistory],
+) -> Tuple[List[RepoOutcome], float, bool]:
+    """Run the install jobs of install_repos(); (outcomes, start, parallel)."""
+    pipeline = InstallationPipeline(INSTALLERS, history=history)
+    ledger = (
+        None
+        if (force or preview)
+        else _open_store(InstallLedger, "install ledger", quiet)
+    )
+    install_jobs = build_install_jobs(
+        selected_repos,
+        all_repos,
+        include_dependencies=update_dependencies,
+        identify=get_repo_identifier,
+    )
+    parallel = jobs > 1 and len(install_jobs) > 1
+
+    def _run_job(job: InstallJob) -> Tuple[bool, str]:
+        # A serial run keeps the caller's prefix (e.g. a pipelined update).
+        with output_prefix(f"[{job.identifier}] ") if parallel else nullcontext():
+            return _install_one(
+                pipeline,
+                job.repo,
+                job.identifier,
+                repositories_base_dir,
+                bin_dir,
+                all_repos,
+                no_verification,
+                preview,
+                quiet,
+                clone_mode,
+                update_dependencies,
+                force_update,
+                silent,
+                serialize_prompts=parallel,
+                ledger=ledger,
+                interactive=interactive,
+                history=history,
+            )
+
+    expected = None
+    if parallel and history is not None:
+        repo_dirs = {
+            job.identifier: get_repo_dir(repositories_base_dir, job.repo)
+            for job in install_jobs
+        }
+        by_dir = history.expected_durations("install", repo_dirs.values())
+        expected = {
+            ident: by_dir[rd] for ident, rd in repo_dirs.items() if rd in by_dir
+        }
+
+    start = time.monotonic()
+    # PATH / nix profile lookups of all repositories share one index, and
+    # package metadata is refreshed at most once.
+    with executable_index(), package_metadata():
+        nix = None if preview else _nix_batch_installer(pipeline)
+        batchers = [] if preview else _build_dependency_batchers(pipeline)
+        batch = len(install_jobs) > 1
+        if (nix is not None and (batch or force_update)) or (batchers and batch):
+            candidates = _batch_contexts(
+                pipeline,
+                install_jobs,
+                repositories_base_dir,
+                bin_dir,
+                all_repos,
+                no_verification,
+                quiet,
+                clone_mode,
+                update_dependencies,
+                force_update,
+                ledger,
+            )
+            if nix is not None:
+                _batch_nix_installs(nix, candidates, force_update)
+            _batch_build_dependencies(batchers, candidates)
+        try:
+            outcomes = run_install_jobs(
+                install_jobs,
+                _run_job,
+                max_workers=jobs if parallel else 1,
+                expected=expected,
+                progress=parallel and not quiet,
+            )
+        finally:
+            for installer in pipeline.installers:
+                if isinstance(installer, _BATCHING_INSTALLERS):
+                    installer.discard_batch()
+    return outcomes, start, parallel
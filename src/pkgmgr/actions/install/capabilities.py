@@ -28,18 +28,48 @@ On top of the raw detection, this module also exposes a bottom-up
 
 This yields, for each layer, only those capabilities that are not
 redundant with respect to higher layers in the stack.
+
+Files are read through the RepoContext's file snapshot (each file once per
+repository), and the raw matrix for all layers is computed once per
+repository via capability_matrix() and cached across runs.
 """
 
 from __future__ import annotations
 
 import glob
 import os
+import threading
 from abc import ABC, abstractmethod
 from typing import Iterable, TYPE_CHECKING, Optional
 
+from pkgmgr.actions.install.capability_cache import CapabilityCache
+
 if TYPE_CHECKING:
     from pkgmgr.actions.install.context import RepoContext
 
+#: Files the matchers below read (plus *.spec); their mtimes/sizes key the
+#: persistent capability cache.
+CAPABILITY_FILES: list[str] = [
+    "pyproject.toml",
+    "setup.py",
+    "flake.nix",
+    "Makefile",
+    "PKGBUILD",
+    "debian/rules",
+]
+
+# Created on first use, so importing this module touches no state files.
+_CACHE: Optional[CapabilityCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _capability_cache() -> CapabilityCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = CapabilityCache()
+        return _CACHE
+
 
 # ---------------------------------------------------------------------------
 # Helper functions
@@ -57,7 +87,32 @@ def _read_text_if_exists(path: str) -> Optional[str]:
         return None
 
 
-def _scan_files_for_patterns(files: Iterable[str], patterns: Iterable[str]) -> bool:
+def _files(ctx: "RepoContext"):
+    """Return the RepoFileSnapshot of ctx, if it has one."""
+    return getattr(ctx, "files", None)
+
+
+def _exists(ctx: "RepoContext", path: str) -> bool:
+    files = _files(ctx)
+    if files is not None:
+        return files.exists(path)
+    return os.path.exists(path)
+
+
+def _read_lower(ctx: "RepoContext", path: str) -> Optional[str]:
+    """Return the lower-cased file content (via the snapshot if available)."""
+    files = _files(ctx)
+    if files is not None:
+        return files.lower(path)
+    content = _read_text_if_exists(path)
+    return content.lower() if content else None
+
+
+def _scan_files_for_patterns(
+    files: Iterable[str],
+    patterns: Iterable[str],
+    ctx: Optional["RepoContext"] = None,
+) -> bool:
     """
     Return True if any of the given files exists and contains at least one of
     the given patterns (case-insensitive).
@@ -66,21 +121,41 @@ def _scan_files_for_patterns(files: Iterable[str], patterns: Iterable[str]) -> b
     for path in files:
         if not path:
             continue
-        content = _read_text_if_exists(path)
-        if not content:
+        if ctx is not None:
+            lower_content = _read_lower(ctx, path)
+        else:
+            content = _read_text_if_exists(path)
+            lower_content = content.lower() if content else None
+        if not lower_content:
             continue
-        lower_content = content.lower()
         if any(p in lower_content for p in lower_patterns):
             return True
     return False
 
 
-def _first_spec_file(repo_dir: str) -> Optional[str]:
+def _first_spec_file(repo_dir: str, ctx: Optional["RepoContext"] = None) -> Optional[str]:
     """Return the first *.spec file in repo_dir, if any."""
-    matches = glob.glob(os.path.join(repo_dir, "*.spec"))
+    files = _files(ctx) if ctx is not None else None
+    if files is not None:
+        matches = files.glob("*.spec")
+    else:
+        matches = sorted(glob.glob(os.path.join(repo_dir, "*.spec")))
     if not matches:
         return None
-    return sorted(matches)[0]
+    return matches[0]
+
+
+def _os_build_scripts(ctx: "RepoContext") -> list[str]:
+    """PKGBUILD, debian/rules and the first *.spec of the repository."""
+    repo_dir = ctx.repo_dir
+    scripts = [
+        os.path.join(repo_dir, "PKGBUILD"),
+        os.path.join(repo_dir, "debian", "rules"),
+    ]
+    spec = _first_spec_file(repo_dir, ctx)
+    if spec:
+        scripts.append(spec)
+    return scripts
 
 
 # ---------------------------------------------------------------------------
@@ -140,15 +215,14 @@ class PythonRuntimeCapability(CapabilityMatcher):
             # For pkgmgr, a pyproject.toml is enough to say:
             # "This layer provides the Python runtime for this project."
             pyproject = os.path.join(repo_dir, "pyproject.toml")
-            return os.path.exists(pyproject)
+            return _exists(ctx, pyproject)
 
         if layer == "nix":
             flake = os.path.join(repo_dir, "flake.nix")
-            content = _read_text_if_exists(flake)
+            content = _read_lower(ctx, flake)
             if not content:
                 return False
 
-            content = content.lower()
             patterns = [
                 "buildpythonapplication",
                 "python3packages.",
@@ -164,24 +238,16 @@ class PythonRuntimeCapability(CapabilityMatcher):
             #   - and OS build scripts call pip / python -m pip / setup.py install
             pyproject = os.path.join(repo_dir, "pyproject.toml")
             setup_py = os.path.join(repo_dir, "setup.py")
-            if not (os.path.exists(pyproject) or os.path.exists(setup_py)):
+            if not (_exists(ctx, pyproject) or _exists(ctx, setup_py)):
                 return False
 
-            pkgbuild = os.path.join(repo_dir, "PKGBUILD")
-            debian_rules = os.path.join(repo_dir, "debian", "rules")
-            spec = _first_spec_file(repo_dir)
-
-            scripts = [pkgbuild, debian_rules]
-            if spec:
-                scripts.append(spec)
-
             patterns = [
                 "pip install .",
                 "python -m pip install",
                 "python3 -m pip install",
                 "setup.py install",
             ]
-            return _scan_files_for_patterns(scripts, patterns)
+            return _scan_files_for_patterns(_os_build_scripts(ctx), patterns, ctx)
 
         return False
 
@@ -213,44 +279,38 @@ class MakeInstallCapability(CapabilityMatcher):
 
         if layer == "makefile":
             makefile = os.path.join(repo_dir, "Makefile")
-            if not os.path.exists(makefile):
-                return False
-            try:
-                with open(makefile, "r", encoding="utf-8") as f:
-                    for line in f:
-                        if line.strip().startswith("install:"):
-                            return True
-            except OSError:
+            files = _files(ctx)
+            if files is not None:
+                content = files.text(makefile)
+            else:
+                content = _read_text_if_exists(makefile)
+            if not content:
                 return False
-            return False
+            return any(
+                line.strip().startswith("install:") for line in content.splitlines()
+            )
 
         if layer == "python":
             pyproject = os.path.join(repo_dir, "pyproject.toml")
-            content = _read_text_if_exists(pyproject)
+            content = _read_lower(ctx, pyproject)
             if not content:
                 return False
-            return "make install" in content.lower()
+            return "make install" in content
 
         if layer == "nix":
             flake = os.path.join(repo_dir, "flake.nix")
-            content = _read_text_if_exists(flake)
+            content = _read_lower(ctx, flake)
             if not content:
                 return False
-            return "make install" in content.lower()
+            return "make install" in content
 
         if layer == "os-packages":
-            pkgbuild = os.path.join(repo_dir, "PKGBUILD")
-            debian_rules = os.path.join(repo_dir, "debian", "rules")
-            spec = _first_spec_file(repo_dir)
-
-            scripts = [pkgbuild, debian_rules]
-            if spec:
-                scripts.append(spec)
-
             # If any OS build script calls "make install", we assume it is
             # already consuming the Makefile installation and thus provides
             # the make-install capability.
-            return _scan_files_for_patterns(scripts, ["make install"])
+            return _scan_files_for_patterns(
+                _os_build_scripts(ctx), ["make install"], ctx
+            )
 
         return False
 
@@ -279,17 +339,9 @@ class NixFlakeCapability(CapabilityMatcher):
 
         if layer == "nix":
             flake = os.path.join(repo_dir, "flake.nix")
-            return os.path.exists(flake)
+            return _exists(ctx, flake)
 
         if layer == "os-packages":
-            pkgbuild = os.path.join(repo_dir, "PKGBUILD")
-            debian_rules = os.path.join(repo_dir, "debian", "rules")
-            spec = _first_spec_file(repo_dir)
-
-            scripts = [pkgbuild, debian_rules]
-            if spec:
-                scripts.append(spec)
-
             patterns = [
                 "nix build",
                 "nix run",
@@ -297,7 +349,7 @@ class NixFlakeCapability(CapabilityMatcher):
                 "nix develop",
                 "nix profile",
             ]
-            return _scan_files_for_patterns(scripts, patterns)
+            return _scan_files_for_patterns(_os_build_scripts(ctx), patterns, ctx)
 
         return False
 
@@ -358,6 +410,44 @@ def detect_capabilities(
     return caps_by_layer
 
 
+def _cache_signature(ctx: "RepoContext") -> list:
+    files = _files(ctx)
+    specs = [os.path.relpath(p, ctx.repo_dir) for p in files.glob("*.spec")]
+    stats = [list(entry) for entry in files.stat_signature(CAPABILITY_FILES + specs)]
+    matchers = sorted(m.name for m in CAPABILITY_MATCHERS)
+    return [matchers, stats]
+
+
+def capability_matrix(ctx: "RepoContext") -> dict[str, set[str]]:
+    """
+    Raw capabilities of all layers in LAYER_ORDER for this repository.
+
+    Computed once per RepoContext (memoized on its file snapshot) and cached
+    across runs (except in preview), keyed by the mtimes/sizes of the
+    scanned build files.
+    Contexts without a snapshot are detected directly.
+    """
+    files = _files(ctx)
+    if files is None:
+        return detect_capabilities(ctx, LAYER_ORDER)
+
+    matrix = files.memo.get("capabilities")
+    if matrix is not None:
+        return matrix  # type: ignore[return-value]
+
+    cache = _capability_cache()
+    signature = _cache_signature(ctx)
+    matrix = cache.get(ctx.repo_dir, signature)
+    if matrix is None:
+        matrix = detect_capabilities(ctx, LAYER_ORDER)
+        # Preview runs leave no state behind.
+        if not ctx.preview:
+            cache.put(ctx.repo_dir, signature, matrix)
+
+    files.memo["capabilities"] = matrix
+    return matrix
+
+
 def resolve_effective_capabilities(
     ctx: "RepoContext",
     layers: Optional[Iterable[str]] = None,
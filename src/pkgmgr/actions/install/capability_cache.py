@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Persistent cache of per-repository capability matrices.
+
+Entries are keyed by the absolute repository directory and validated by a
+signature of the scanned build files (path, mtime_ns, size) plus the set of
+active capability matchers. Any change to a build file, or to the matcher
+registry, invalidates the entry. Stored as JSON in the pkgmgr state
+directory (capabilities-cache.json).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from pkgmgr.core.state.paths import state_dir
+
+CACHE_FILE = "capabilities-cache.json"
+CACHE_VERSION = 1
+
+Matrix = Dict[str, set]
+
+
+class CapabilityCache:
+    """Thread-safe JSON-backed capability matrix cache."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Any]] = None
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            # Not created here: reading must not create the state directory.
+            self._path = os.path.join(state_dir(create=False), CACHE_FILE)
+        return self._path
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                if raw.get("version") != CACHE_VERSION:
+                    raw = {}
+            except (OSError, ValueError, AttributeError):
+                raw = {}
+            self._entries = dict(raw.get("repositories") or {})
+        return self._entries
+
+    def get(self, repo_dir: str, signature: List[Any]) -> Optional[Matrix]:
+        with self._lock:
+            entry = self._load().get(os.path.abspath(repo_dir))
+        if not entry or entry.get("signature") != signature:
+            return None
+        return {layer: set(caps) for layer, caps in entry["matrix"].items()}
+
+    def put(self, repo_dir: str, signature: List[Any], matrix: Matrix) -> None:
+        with self._lock:
+            entries = self._load()
+            entries[os.path.abspath(repo_dir)] = {
+                "signature": signature,
+                "matrix": {layer: sorted(caps) for layer, caps in matrix.items()},
+            }
+            # Drop entries of repositories that no longer exist.
+            for key in [k for k in entries if not os.path.isdir(k)]:
+                del entries[key]
+            self._save(entries)
+
+    def _save(self, entries: Dict[str, Any]) -> None:
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".capabilities.")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "repositories": entries}, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            # The cache is an optimization only.
+            pass
@@ -9,8 +9,10 @@ This data class bundles all information needed by installer components so
 they do not depend on global state or long parameter lists.
 """
 
-from dataclasses import dataclass
-from typing import Any, Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from pkgmgr.actions.install.snapshot import RepoFileSnapshot
 
 
 @dataclass
@@ -32,3 +34,12 @@ class RepoContext:
 
     # If True, allow re-running installers of the currently active layer.
     force_update: bool = False
+
+    # Lazily read build files of repo_dir, shared by all installers.
+    files: Optional[RepoFileSnapshot] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.files is None:
+            self.files = RepoFileSnapshot(self.repo_dir)
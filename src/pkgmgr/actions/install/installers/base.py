@@ -6,10 +6,14 @@ Base interface for all installer components in the pkgmgr installation pipeline.
 """
 
 from abc import ABC, abstractmethod
-from typing import Set, Optional
+from typing import Optional, Set, Tuple
 
 from pkgmgr.actions.install.context import RepoContext
-from pkgmgr.actions.install.capabilities import CAPABILITY_MATCHERS
+from pkgmgr.actions.install.capabilities import (
+    CAPABILITY_MATCHERS,
+    capability_matrix,
+)
+from pkgmgr.core.resources.governor import BUILD
 
 
 class BaseInstaller(ABC):
@@ -26,6 +30,12 @@ class BaseInstaller(ABC):
     #   search for in the repository.
     layer: Optional[str] = None
 
+    #: Resource pools (pkgmgr.core.resources.governor) the pipeline holds a
+    #   token of while this installer runs. Installers that mutate shared
+    #   state add the matching single-slot pool (package manager, nix
+    #   profile) and are thereby serialized across repositories.
+    resources: Tuple[str, ...] = (BUILD,)
+
     def discover_capabilities(self, ctx: RepoContext) -> Set[str]:
         """
         Determine which logical capabilities this installer will provide
@@ -40,6 +50,11 @@ class BaseInstaller(ABC):
         if not self.layer:
             return caps
 
+        # All layers are detected in one pass per repository (and cached).
+        matrix = capability_matrix(ctx)
+        if self.layer in matrix:
+            return set(matrix[self.layer])
+
         for matcher in CAPABILITY_MATCHERS:
             if matcher.applies_to_layer(self.layer) and matcher.is_provided(
                 ctx, self.layer
@@ -2,11 +2,22 @@ from __future__ import annotations
 
 import os
 import shutil
-from typing import TYPE_CHECKING, List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Sequence, Set, Tuple
 
 from pkgmgr.actions.install.installers.base import BaseInstaller
+from pkgmgr.core.nix.build import build_options, prefetch_jobs
+from pkgmgr.core.nix.cache import copy_to_cache_command
+from pkgmgr.core.resources.governor import (
+    BUILD,
+    NIX_PROFILE,
+    acquire,
+    get_governor,
+)
 
 from .conflicts import NixConflictResolver
+from .outpath import NixOutPathCache
 from .profile import NixProfileInspector
 from .retry import GitHubRateLimitRetry, RetryPolicy
 from .runner import CommandRunner
@@ -17,6 +28,8 @@ if TYPE_CHECKING:
 
 class NixFlakeInstaller(BaseInstaller):
     layer = "nix"
+    # `nix profile install` builds and mutates the profile in one step.
+    resources = (BUILD, NIX_PROFILE)
     FLAKE_FILE = "flake.nix"
 
     def __init__(self, policy: RetryPolicy | None = None) -> None:
@@ -24,10 +37,15 @@ class NixFlakeInstaller(BaseInstaller):
         self._retry = GitHubRateLimitRetry(policy=policy)
         self._profile = NixProfileInspector()
         self._conflicts = NixConflictResolver(self._runner, self._retry, self._profile)
+        self._outpaths = NixOutPathCache()
 
         # Newer nix rejects numeric indices; we learn this at runtime and cache the decision.
         self._indices_supported: bool | None = None
 
+        # Installables already installed by install_batch(), consumed by run().
+        self._batched: Set[str] = set()
+        self._batch_lock = threading.Lock()
+
     def supports(self, ctx: "RepoContext") -> bool:
         if os.environ.get("PKGMGR_DISABLE_NIX_FLAKE_INSTALLER") == "1":
             if not ctx.quiet:
@@ -71,6 +89,136 @@ class NixFlakeInstaller(BaseInstaller):
     def _installable(self, ctx: "RepoContext", output: str) -> str:
         return f"{ctx.repo_dir}#{output}"
 
+    # ---------------------------------------------------------------------
+    # Batched install path
+    # ---------------------------------------------------------------------
+
+    def _required_installables(
+        self, ctxs: Sequence["RepoContext"]
+    ) -> List[Tuple["RepoContext", str]]:
+        return [
+            (ctx, self._installable(ctx, output))
+            for ctx in ctxs
+            for output, allow_failure in self._profile_outputs(ctx)
+            if not allow_failure
+        ]
+
+    def prefetch(self, ctxs: Sequence["RepoContext"]) -> Set[str]:
+        """
+        Build the required outputs of several repositories concurrently with
+        `nix build --no-link`, without touching the profile.
+
+        Builds hold a BUILD token each; the number of concurrent nix
+        processes and their --max-jobs/--cores come from
+        pkgmgr.core.nix.build. Returns the installables that built. Must not
+        be called while holding a BUILD token.
+        """
+        items = self._required_installables(ctxs)
+        if not items:
+            return set()
+
+        workers = min(len(items), prefetch_jobs(get_governor().pool(BUILD).size))
+        options = " ".join(build_options(workers))
+        quiet = all(ctx.quiet for ctx in ctxs)
+        if not quiet:
+            print(
+                f"[nix] prefetch: building {len(items)} outputs "
+                f"({workers} concurrent, {options})"
+            )
+
+        def _build(item: Tuple["RepoContext", str]) -> Optional[str]:
+            ctx, installable = item
+            cmd = f"nix build --no-link {options} {installable}"
+            with acquire(BUILD):
+                res = self._retry.run_with_retry(ctx, self._runner, cmd)
+            if res.returncode != 0:
+                if not quiet:
+                    print(
+                        f"[nix] prefetch of {installable} failed "
+                        f"(exit {res.returncode}); it is installed separately."
+                    )
+                return None
+            self._publish(ctx, installable)
+            return installable
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            built = executor.map(_build, items)
+            return {installable for installable in built if installable}
+
+    def install_batch(
+        self,
+        ctxs: Sequence["RepoContext"],
+        prefetched: Optional[Set[str]] = None,
+    ) -> Set[str]:
+        """
+        Install the required outputs of several repositories with a single
+        multi-installable `nix profile install` (one evaluation pass, one new
+        profile generation).
+
+        With ``prefetched`` (see prefetch()) only outputs that already built
+        are batched, so the transaction only links store paths and a broken
+        flake cannot fail it for everyone.
+
+        Returns the installables that were installed; run() skips those. If
+        the batched install fails nothing is marked and every repository
+        falls back to the per-output path (incl. conflict resolution).
+        """
+        with self._batch_lock:
+            self._batched.clear()
+
+        installables = [
+            installable
+            for _ctx, installable in self._required_installables(ctxs)
+            if prefetched is None or installable in prefetched
+        ]
+        if len(installables) < 2:
+            return set()
+
+        quiet = all(ctx.quiet for ctx in ctxs)
+        install_cmd = "nix profile install " + " ".join(installables)
+        if not quiet:
+            print(
+                f"[nix] batched install of {len(installables)} outputs: "
+                f"{install_cmd}"
+            )
+
+        res = self._retry.run_with_retry(ctxs[0], self._runner, install_cmd)
+        if res.returncode != 0:
+            if not quiet:
+                print(
+                    f"[nix] batched install failed (exit {res.returncode}); "
+                    "installing outputs one by one."
+                )
+            return set()
+
+        with self._batch_lock:
+            self._batched.update(installables)
+        return set(installables)
+
+    def _publish(self, ctx: "RepoContext", installable: str) -> None:
+        """Copy a built output into the local binary cache (if enabled)."""
+        cmd = copy_to_cache_command(installable)
+        if cmd is None:
+            return
+        res = self._runner.run(ctx, cmd, allow_failure=True)
+        if res.returncode != 0 and not ctx.quiet:
+            print(
+                f"[nix] could not copy {installable} to the local binary cache "
+                f"(exit {res.returncode}); continuing."
+            )
+
+    def discard_batch(self) -> None:
+        """Forget batched installables that no repository consumed."""
+        with self._batch_lock:
+            self._batched.clear()
+
+    def _take_batched(self, installable: str) -> bool:
+        with self._batch_lock:
+            if installable in self._batched:
+                self._batched.discard(installable)
+                return True
+        return False
+
     # ---------------------------------------------------------------------
     # Core install path
     # ---------------------------------------------------------------------
@@ -78,7 +226,16 @@ class NixFlakeInstaller(BaseInstaller):
     def _install_only(
         self, ctx: "RepoContext", output: str, allow_failure: bool
     ) -> None:
-        install_cmd = f"nix profile install {self._installable(ctx, output)}"
+        installable = self._installable(ctx, output)
+        if self._take_batched(installable):
+            if not ctx.quiet:
+                print(
+                    f"[nix] output '{output}' already installed by the batched "
+                    "install."
+                )
+            return
+
+        install_cmd = f"nix profile install {installable}"
 
         if not ctx.quiet:
             print(f"[nix] install: {install_cmd}")
@@ -87,6 +244,7 @@ class NixFlakeInstaller(BaseInstaller):
         if res.returncode == 0:
             if not ctx.quiet:
                 print(f"[nix] output '{output}' successfully installed.")
+            self._publish(ctx, installable)
             return
 
         # Conflict resolver first (handles the common “existing package already provides file” case)
@@ -101,6 +259,7 @@ class NixFlakeInstaller(BaseInstaller):
                 print(
                     f"[nix] output '{output}' successfully installed after conflict cleanup."
                 )
+            self._publish(ctx, installable)
             return
 
         if not ctx.quiet:
@@ -125,6 +284,7 @@ class NixFlakeInstaller(BaseInstaller):
                         )
 
             if upgraded:
+                self._publish(ctx, installable)
                 return
 
             if indices and not ctx.quiet:
@@ -147,6 +307,7 @@ class NixFlakeInstaller(BaseInstaller):
         if final.returncode == 0:
             if not ctx.quiet:
                 print(f"[nix] output '{output}' successfully re-installed.")
+            self._publish(ctx, installable)
             return
 
         print(
@@ -164,6 +325,20 @@ class NixFlakeInstaller(BaseInstaller):
     def _force_upgrade_output(
         self, ctx: "RepoContext", output: str, allow_failure: bool
     ) -> None:
+        # Nothing to upgrade if the profile already holds what the flake builds.
+        out_path = self._outpaths.out_path(
+            ctx, self._runner, self._installable(ctx, output)
+        )
+        if out_path and self._profile.model(ctx, self._runner).has_store_path(
+            out_path
+        ):
+            if not ctx.quiet:
+                print(
+                    f"[nix] output '{output}' is up to date ({out_path}); "
+                    "skipping upgrade."
+                )
+            return
+
         # Prefer token path if indices unsupported (new nix)
         if self._indices_supported is False:
             self._remove_tokens_for_output(ctx, output)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from pkgmgr.core.git.errors import GitBaseError
+from pkgmgr.core.git.queries import get_head_commit, get_worktree_changes
+from pkgmgr.core.state.paths import state_file
+
+if TYPE_CHECKING:
+    from pkgmgr.actions.install.context import RepoContext
+    from .runner import CommandRunner
+
+CACHE_FILE = "nix-outpaths.json"
+CACHE_VERSION = 1
+
+
+def flake_signature(repo_dir: str) -> Optional[List[str]]:
+    """
+    ``[HEAD commit, sha256 of flake.lock]`` of a clean checkout; None for
+    dirty or non-git trees, whose evaluation result must not be reused.
+    Untracked files are invisible to a git flake and do not count.
+    """
+    if not os.path.isdir(repo_dir):
+        return None
+    try:
+        commit = get_head_commit(cwd=repo_dir)
+        if not commit or get_worktree_changes(cwd=repo_dir, untracked=False):
+            return None
+    except GitBaseError:
+        return None
+
+    digest = hashlib.sha256()
+    try:
+        with open(os.path.join(repo_dir, "flake.lock"), "rb") as f:
+            digest.update(f.read())
+    except OSError:
+        pass
+    return [commit, digest.hexdigest()]
+
+
+class NixOutPathCache:
+    """
+    Evaluated out paths of flake installables, persisted across runs.
+
+    `nix eval --raw <installable>.outPath` is cheap compared to a rebuild but
+    still evaluates the whole flake; its result only changes with the
+    repository's commit or its flake.lock, so it is stored per installable
+    together with that signature (nix-outpaths.json in the state directory).
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Any]] = None
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = state_file(CACHE_FILE)
+        return self._path
+
+    def out_path(
+        self,
+        ctx: "RepoContext",
+        runner: "CommandRunner",
+        installable: str,
+    ) -> Optional[str]:
+        """The store path ``installable`` evaluates to (None if unknown)."""
+        signature = flake_signature(ctx.repo_dir)
+        if signature is not None:
+            with self._lock:
+                entry = self._load().get(installable)
+            if entry and entry.get("signature") == signature:
+                return entry.get("out_path")
+
+        res = runner.run(
+            ctx, f"nix eval --raw {installable}.outPath", allow_failure=True
+        )
+        out = (res.stdout or "").strip() if res.returncode == 0 else ""
+        if not out.startswith("/nix/store/"):
+            return None
+
+        if signature is not None:
+            with self._lock:
+                entries = self._load()
+                entries[installable] = {"signature": signature, "out_path": out}
+                self._save(entries)
+        return out
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+                if raw.get("version") != CACHE_VERSION:
+                    raw = {}
+            except (OSError, ValueError, AttributeError):
+                raw = {}
+            self._entries = dict(raw.get("installables") or {})
+        return self._entries
+
+    def _save(self, entries: Dict[str, Any]) -> None:
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".nix-outpaths.")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "installables": entries}, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            # The cache is an optimization only.
+            pass
@@ -1,4 +1,5 @@
 from .inspector import NixProfileInspector
+from .model import NixProfileModel
 from .models import NixProfileEntry
 
-__all__ = ["NixProfileInspector", "NixProfileEntry"]
+__all__ = ["NixProfileInspector", "NixProfileEntry", "NixProfileModel"]
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, List, TYPE_CHECKING
-
-from .matcher import (
-    entry_matches_output,
-    entry_matches_store_path,
-    stable_unique_ints,
-)
-from .normalizer import normalize_elements
+from typing import Any, List, Optional, TYPE_CHECKING
+
+from pkgmgr.core.nix.profile import profile_generation
+
+from .matcher import stable_unique_ints
+from .model import NixProfileModel
 from .parser import parse_profile_list_json
 from .result import extract_stdout_text
 
@@ -23,17 +21,36 @@ class NixProfileInspector:
 
     Public API:
       - list_json()
+      - model()                               (cached per profile generation)
+      - invalidate()
       - find_installed_indices_for_output()   (legacy; may not work on newer nix)
       - find_indices_by_store_path()          (legacy; may not work on newer nix)
       - find_remove_tokens_for_output()
       - find_remove_tokens_for_store_prefixes()
+
+    The profile is listed once and reused until a `nix profile` mutation
+    bumps the generation (pkgmgr.core.nix.profile) or invalidate() is called.
     """
 
+    def __init__(self) -> None:
+        self._model: Optional[NixProfileModel] = None
+        self._generation = -1
+
     def list_json(self, ctx: "RepoContext", runner: "CommandRunner") -> dict[str, Any]:
         res = runner.run(ctx, "nix profile list --json", allow_failure=False)
         raw = extract_stdout_text(res)
         return parse_profile_list_json(raw)
 
+    def model(self, ctx: "RepoContext", runner: "CommandRunner") -> NixProfileModel:
+        generation = profile_generation()
+        if self._model is None or self._generation != generation:
+            self._model = NixProfileModel.from_json(self.list_json(ctx, runner))
+            self._generation = generation
+        return self._model
+
+    def invalidate(self) -> None:
+        self._model = None
+
     # ---------------------------------------------------------------------
     # Legacy index helpers (still useful on older nix; newer nix may reject indices)
     # ---------------------------------------------------------------------
@@ -44,17 +61,8 @@ class NixProfileInspector:
         runner: "CommandRunner",
         output: str,
     ) -> List[int]:
-        data = self.list_json(ctx, runner)
-        entries = normalize_elements(data)
-
-        hits: List[int] = []
-        for e in entries:
-            if e.index is None:
-                continue
-            if entry_matches_output(e, output):
-                hits.append(e.index)
-
-        return stable_unique_ints(hits)
+        entries = self.model(ctx, runner).for_output(output)
+        return stable_unique_ints([e.index for e in entries if e.index is not None])
 
     def find_indices_by_store_path(
         self,
@@ -66,17 +74,8 @@ class NixProfileInspector:
         if not needle:
             return []
 
-        data = self.list_json(ctx, runner)
-        entries = normalize_elements(data)
-
-        hits: List[int] = []
-        for e in entries:
-            if e.index is None:
-                continue
-            if entry_matches_store_path(e, needle):
-                hits.append(e.index)
-
-        return stable_unique_ints(hits)
+        entries = self.model(ctx, runner).by_store_path(needle)
+        return stable_unique_ints([e.index for e in entries if e.index is not None])
 
     # ---------------------------------------------------------------------
     # New token-based helpers (works with newer nix where indices are rejected)
@@ -98,24 +97,22 @@ class NixProfileInspector:
         if not out:
             return []
 
-        data = self.list_json(ctx, runner)
-        entries = normalize_elements(data)
+        entries = self.model(ctx, runner).for_output(out)
 
         tokens: List[str] = [
             out
         ]  # critical: matches nix's own suggestion for conflicts
 
         for e in entries:
-            if entry_matches_output(e, out):
-                # Prefer removing by key/name (non-index) when possible.
-                # New nix rejects numeric indices; these tokens are safer.
-                k = (e.key or "").strip()
-                n = (e.name or "").strip()
+            # Prefer removing by key/name (non-index) when possible.
+            # New nix rejects numeric indices; these tokens are safer.
+            k = (e.key or "").strip()
+            n = (e.name or "").strip()
 
-                if k and not k.isdigit():
-                    tokens.append(k)
-                elif n and not n.isdigit():
-                    tokens.append(n)
+            if k and not k.isdigit():
+                tokens.append(k)
+            elif n and not n.isdigit():
+                tokens.append(n)
 
         # stable unique preserving order
         seen: set[str] = set()
@@ -140,20 +137,19 @@ class NixProfileInspector:
         if not prefixes:
             return []
 
-        data = self.list_json(ctx, runner)
-        entries = normalize_elements(data)
+        model = self.model(ctx, runner)
+        hits = {id(e) for p in prefixes for e in model.by_store_path(p)}
 
         tokens: List[str] = []
-        for e in entries:
-            if not e.store_paths:
+        for e in model.entries:
+            if id(e) not in hits:
                 continue
-            if any(sp == p for sp in e.store_paths for p in prefixes):
-                k = (e.key or "").strip()
-                n = (e.name or "").strip()
-                if k and not k.isdigit():
-                    tokens.append(k)
-                elif n and not n.isdigit():
-                    tokens.append(n)
+            k = (e.key or "").strip()
+            n = (e.name or "").strip()
+            if k and not k.isdigit():
+                tokens.append(k)
+            elif n and not n.isdigit():
+                tokens.append(n)
 
         seen: set[str] = set()
         uniq: List[str] = []
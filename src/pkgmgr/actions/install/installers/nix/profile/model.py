@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from .matcher import entry_matches_output
+from .models import NixProfileEntry
+from .normalizer import normalize_elements
+
+
+class NixProfileModel:
+    """
+    Indexed snapshot of one `nix profile list --json` result.
+
+    Lookups by name, attrPath and store path are dictionary hits; output
+    lookups use the entry_matches_output() heuristic once per output name.
+    """
+
+    def __init__(self, entries: List[NixProfileEntry]) -> None:
+        self.entries = list(entries)
+        self._by_name: Dict[str, List[NixProfileEntry]] = {}
+        self._by_attr_path: Dict[str, List[NixProfileEntry]] = {}
+        self._by_store_path: Dict[str, List[NixProfileEntry]] = {}
+        self._by_output: Dict[str, List[NixProfileEntry]] = {}
+
+        for e in self.entries:
+            if e.name:
+                self._by_name.setdefault(e.name, []).append(e)
+            if e.attr_path:
+                self._by_attr_path.setdefault(e.attr_path, []).append(e)
+            for sp in dict.fromkeys(e.store_paths):
+                self._by_store_path.setdefault(sp, []).append(e)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "NixProfileModel":
+        return cls(normalize_elements(data))
+
+    def by_name(self, name: str) -> List[NixProfileEntry]:
+        return list(self._by_name.get((name or "").strip(), []))
+
+    def by_attr_path(self, attr_path: str) -> List[NixProfileEntry]:
+        return list(self._by_attr_path.get((attr_path or "").strip(), []))
+
+    def by_store_path(self, store_path: str) -> List[NixProfileEntry]:
+        return list(self._by_store_path.get((store_path or "").strip(), []))
+
+    def for_output(self, output: str) -> List[NixProfileEntry]:
+        out = (output or "").strip()
+        if not out:
+            return []
+        if out not in self._by_output:
+            self._by_output[out] = [
+                e for e in self.entries if entry_matches_output(e, out)
+            ]
+        return list(self._by_output[out])
+
+    def has_store_path(self, store_path: str) -> bool:
+        return (store_path or "").strip() in self._by_store_path
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import random
-import time
 from dataclasses import dataclass
 from typing import Iterable, TYPE_CHECKING
 
+from pkgmgr.core.resources.ratelimit import (
+    RateLimitCoordinator,
+    github_rate_limit,
+    is_rate_limit_error,
+)
+
 from .types import RunResult
 
 if TYPE_CHECKING:
@@ -24,10 +29,20 @@ class GitHubRateLimitRetry:
     """
     Retries nix install commands only when the error looks like a GitHub API rate limit (HTTP 403).
     Backoff: Fibonacci(base, base, ...) + random jitter.
+
+    The backoff is reported to the shared GitHub rate-limit coordinator
+    (pkgmgr.core.resources.ratelimit) rather than slept locally: every
+    attempt first waits for the coordinator, so parallel workers pause
+    together until the shared deadline instead of each hitting the limit.
     """
 
-    def __init__(self, policy: RetryPolicy | None = None) -> None:
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        coordinator: RateLimitCoordinator | None = None,
+    ) -> None:
         self._policy = policy or RetryPolicy()
+        self._limits = coordinator or github_rate_limit()
 
     def run_with_retry(
         self,
@@ -45,6 +60,8 @@ class GitHubRateLimitRetry:
         last: RunResult | None = None
 
         for attempt, base_delay in enumerate(delays, start=1):
+            self._limits.wait(quiet=quiet)
+
             if not quiet:
                 print(
                     f"[nix] attempt {attempt}/{self._policy.max_attempts}: {install_cmd}"
@@ -54,6 +71,7 @@ class GitHubRateLimitRetry:
             last = res
 
             if res.returncode == 0:
+                self._limits.note_success()
                 return res
 
             combined = f"{res.stdout}\n{res.stderr}"
@@ -74,7 +92,7 @@ class GitHubRateLimitRetry:
                     f"Retrying in {wait_time}s (base={base_delay}s, jitter={jitter}s)..."
                 )
 
-            time.sleep(wait_time)
+            self._limits.note_rate_limited(combined, backoff=wait_time)
 
         return (
             last
@@ -84,13 +102,7 @@ class GitHubRateLimitRetry:
 
     @staticmethod
     def _is_github_rate_limit_error(text: str) -> bool:
-        t = (text or "").lower()
-        return (
-            "http error 403" in t
-            or "rate limit exceeded" in t
-            or "github api rate limit" in t
-            or "api rate limit exceeded" in t
-        )
+        return is_rate_limit_error(text)
 
     @staticmethod
     def _fibonacci_backoff(base: int, attempts: int) -> Iterable[int]:
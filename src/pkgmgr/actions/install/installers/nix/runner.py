@@ -4,6 +4,14 @@ import subprocess
 
 from typing import TYPE_CHECKING
 
+from pkgmgr.core.command.process import (
+    TIMEOUT_EXIT_CODE,
+    operation_timeout,
+    run_process,
+)
+from pkgmgr.core.nix.cache import substituter_env
+from pkgmgr.core.nix.profile import note_nix_command
+
 from .types import RunResult
 
 if TYPE_CHECKING:
@@ -14,6 +22,13 @@ class CommandRunner:
     """
     Executes commands (shell=True) inside a repository directory (if provided).
     Supports preview mode and compact failure output logging.
+
+    Commands are bounded by the configured nix timeout (config
+    ``performance.timeouts.nix``); a command exceeding it is terminated with
+    its builders and fails with TIMEOUT_EXIT_CODE.
+
+    With a local binary cache configured (pkgmgr.core.nix.cache) it is added
+    to every command as an extra substituter.
     """
 
     def run(self, ctx: "RepoContext", cmd: str, allow_failure: bool) -> RunResult:
@@ -26,8 +41,9 @@ class CommandRunner:
                 print(f"[preview] {cmd}")
             return RunResult(returncode=0, stdout="", stderr="")
 
+        timeout = operation_timeout("nix")
         try:
-            p = subprocess.run(
+            p = run_process(
                 cmd,
                 shell=True,
                 cwd=repo_dir,
@@ -35,11 +51,23 @@ class CommandRunner:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
+                timeout=timeout,
+                env=substituter_env(),
+            )
+        except subprocess.TimeoutExpired as e:
+            p = subprocess.CompletedProcess(
+                cmd,
+                TIMEOUT_EXIT_CODE,
+                stdout=e.stdout or "",
+                stderr=(e.stderr or "") + f"\n[nix] timed out after {timeout}s: {cmd}",
             )
         except Exception as e:
             if not allow_failure:
                 raise
             return RunResult(returncode=1, stdout="", stderr=str(e))
+        finally:
+            # Profile mutations (even failed ones) invalidate cached listings.
+            note_nix_command(cmd)
 
         res = RunResult(
             returncode=p.returncode, stdout=p.stdout or "", stderr=p.stderr or ""
@@ -1,10 +1,20 @@
 # pkgmgr/installers/os_packages/arch_pkgbuild.py
 
 import os
+import re
+import shlex
 import shutil
+from contextlib import nullcontext
+from typing import List, Optional, Sequence, Set, Tuple
 
 from pkgmgr.actions.install.context import RepoContext
 from pkgmgr.actions.install.installers.base import BaseInstaller
+from pkgmgr.actions.install.installers.os_packages.artifacts import (
+    ArtifactKey,
+    cached_artifacts,
+    store_artifacts,
+)
+from pkgmgr.core.resources.governor import BUILD, PACKAGE_MANAGER, acquire
 from pkgmgr.core.command.run import run_command
 
 
@@ -13,15 +23,25 @@ class ArchPkgbuildInstaller(BaseInstaller):
     Build and install an Arch package from PKGBUILD via makepkg.
 
     This installer is responsible for the full build + install of the
-    application on Arch-based systems. System dependencies are resolved
-    by makepkg itself (--syncdeps).
+    application on Arch-based systems. Missing dependencies are installed
+    with `pacman -S --asdeps` before the build and the built packages with
+    `pacman -U` afterwards; only these pacman transactions hold the
+    PACKAGE_MANAGER resource, makepkg builds run concurrently. If the
+    dependencies could not be installed up front, makepkg resolves them
+    itself (--syncdeps) and then holds PACKAGE_MANAGER for the build.
 
     Note: makepkg must not be run as root, so this installer refuses
     to run when the current user is UID 0.
+
+    Package databases are never refreshed here (`pacman -Sy` without a full
+    upgrade would be a partial upgrade), so only the dependency batch
+    applies: install_build_dependencies_batch() installs the missing
+    dependencies of several PKGBUILDs in one pacman transaction.
     """
 
     # Logical layer name, used by capability matchers.
     layer = "os-packages"
+    resources = (BUILD,)
 
     PKGBUILD_NAME = "PKGBUILD"
 
@@ -46,14 +66,185 @@ class ArchPkgbuildInstaller(BaseInstaller):
         pkgbuild_path = os.path.join(ctx.repo_dir, self.PKGBUILD_NAME)
         return os.path.exists(pkgbuild_path)
 
+    def _srcinfo(self, ctx: RepoContext) -> Tuple[List[str], Set[str]]:
+        """
+        (dependencies, package names) of the PKGBUILD via .SRCINFO; no
+        package names if makepkg could not print it.
+        """
+        res = run_command(
+            "makepkg --printsrcinfo",
+            cwd=ctx.repo_dir,
+            allow_failure=True,
+            stream=False,
+        )
+        deps: List[str] = []
+        names: Set[str] = set()
+        if res.returncode != 0:
+            return deps, names
+        for line in (res.stdout or "").splitlines():
+            key, sep, value = line.strip().partition(" = ")
+            if not sep:
+                continue
+            if key == "pkgname":
+                names.add(value)
+            elif re.fullmatch(r"(make|check)?depends(_\w+)?", key):
+                deps.append(value)
+        return deps, names
+
+    def _missing_dependencies(
+        self, srcinfos: Sequence[Tuple[List[str], Set[str]]]
+    ) -> List[str]:
+        """
+        Dependencies of the PKGBUILDs (see _srcinfo()) that are not installed
+        yet, leaving out packages built by these PKGBUILDs themselves.
+        """
+        deps: List[str] = []
+        built: Set[str] = set()
+        for ctx_deps, names in srcinfos:
+            built |= names
+            deps.extend(d for d in ctx_deps if d not in deps)
+        deps = [d for d in deps if re.split(r"[<>=]", d, 1)[0] not in built]
+        if not deps:
+            return []
+
+        # `pacman -T` prints the dependencies that are not satisfied.
+        res = run_command(
+            "pacman -T " + " ".join(shlex.quote(d) for d in deps),
+            allow_failure=True,
+            stream=False,
+        )
+        return [d for d in (res.stdout or "").split() if d]
+
+    def _install_dependencies(
+        self, missing: List[str], cwd: Optional[str] = None
+    ) -> bool:
+        """Install ``missing`` in one `pacman -S --asdeps` transaction."""
+        with acquire(PACKAGE_MANAGER):
+            res = run_command(
+                "sudo pacman -S --asdeps --noconfirm "
+                + " ".join(shlex.quote(d) for d in missing),
+                cwd=cwd,
+                allow_failure=True,
+            )
+        return res.returncode == 0
+
+    def install_build_dependencies_batch(self, ctxs: Sequence[RepoContext]) -> bool:
+        """
+        Install the dependencies missing for several PKGBUILDs in a single
+        `pacman -S --asdeps` transaction. Packages built by the batch itself
+        are left out; a failure leaves the dependencies to makepkg.
+        """
+        if shutil.which("sudo") is None:
+            return False
+        # Repositories installed from the artifact cache need no build deps.
+        ctxs = [c for c in ctxs if self.supports(c) and not self._cached_packages(c)[1]]
+        if not ctxs:
+            return False
+        missing = self._missing_dependencies([self._srcinfo(c) for c in ctxs])
+        if not missing:
+            return True
+        if not self._install_dependencies(missing):
+            print(
+                "[Warning] Batched dependency installation failed; makepkg "
+                "resolves the dependencies per repository."
+            )
+            return False
+        return True
+
+    def _cached_packages(
+        self, ctx: RepoContext
+    ) -> Tuple[Optional[ArtifactKey], List[str]]:
+        key, cached = cached_artifacts(ctx)
+        return key, [p for p in cached if ".pkg.tar" in p and not p.endswith(".sig")]
+
+    def _built_packages(self, ctx: RepoContext, names: Set[str]) -> List[str]:
+        """
+        Package files of the PKGBUILD's packages ``names`` (honours PKGDEST;
+        debug packages are left out, as with `makepkg --install`).
+        """
+        res = run_command(
+            "makepkg --packagelist", cwd=ctx.repo_dir, allow_failure=True, stream=False
+        )
+        if res.returncode != 0:
+            return []
+        packages = []
+        for path in (res.stdout or "").split():
+            # <pkgname>-<pkgver>-<pkgrel>-<arch>.pkg.tar*
+            match = re.fullmatch(
+                r"(.+)-[^-]+-[^-]+-[^-]+\.pkg\.tar[^/]*", os.path.basename(path)
+            )
+            if match and match.group(1) in names and (
+                ctx.preview or os.path.isfile(path)
+            ):
+                packages.append(path)
+        return packages
+
+    def _install_packages(self, ctx: RepoContext, packages: List[str]) -> None:
+        with acquire(PACKAGE_MANAGER):
+            run_command(
+                "sudo pacman -U --noconfirm " + " ".join(packages),
+                cwd=ctx.repo_dir,
+                preview=ctx.preview,
+            )
+
     def run(self, ctx: RepoContext) -> None:
         """
         Build and install the package using makepkg.
 
-        This uses:
-          makepkg --syncdeps --cleanbuild --install --noconfirm
+        Steps:
+          1. sudo pacman -S --asdeps <missing dependencies>
+          2. makepkg --cleanbuild --noconfirm
+             (with --syncdeps, holding PACKAGE_MANAGER, if step 1 failed
+             or was not possible)
+          3. sudo pacman -U <built packages>
+
+        Packages cached for the current commit (see .artifacts) are
+        installed with `pacman -U` directly.
 
         Any failure is treated as fatal (SystemExit).
         """
-        cmd = "makepkg --syncdeps --cleanbuild --install --noconfirm"
-        run_command(cmd, cwd=ctx.repo_dir, preview=ctx.preview)
+        key, cached = self._cached_packages(ctx)
+        if cached:
+            print(
+                f"[INFO] Installing cached packages of {ctx.identifier} "
+                f"(commit {key.commit[:12]})."
+            )
+            self._install_packages(ctx, cached)
+            return
+
+        srcinfo = self._srcinfo(ctx)
+        names = srcinfo[1]
+
+        # 1) Dependencies; makepkg only resolves them itself (--syncdeps, a
+        #    pacman transaction) if this step was not possible.
+        syncdeps = True
+        if not ctx.preview and names:
+            missing = self._missing_dependencies([srcinfo])
+            if not missing:
+                syncdeps = False
+            elif shutil.which("sudo") is not None:
+                syncdeps = not self._install_dependencies(missing, ctx.repo_dir)
+                if syncdeps:
+                    print(
+                        "[Warning] Installing dependencies with pacman failed; "
+                        "leaving them to makepkg."
+                    )
+
+        # 2) Build
+        cmd = "makepkg --cleanbuild --noconfirm"
+        if syncdeps:
+            cmd = "makepkg --syncdeps --cleanbuild --noconfirm"
+        with acquire(PACKAGE_MANAGER) if syncdeps else nullcontext():
+            run_command(cmd, cwd=ctx.repo_dir, preview=ctx.preview)
+
+        # 3) Install the built packages
+        packages = self._built_packages(ctx, names)
+        if not packages:
+            print(
+                "[Warning] No packages found after makepkg. "
+                "Skipping Arch package installation."
+            )
+            return
+        self._install_packages(ctx, packages)
+        if key is not None and not ctx.preview:
+            store_artifacts(key, packages)
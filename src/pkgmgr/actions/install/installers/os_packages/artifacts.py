@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache of built OS packages (.deb, .rpm, .pkg.tar.*).
+
+The OS package installers rebuild a repository's packages on every install
+or update. Built packages are now kept in pkgmgr's cache directory::
+
+    <cache>/artifacts/<distro>/<repo>/<commit>-<build hash>/<packages>
+
+keyed by the repository, its HEAD commit, the hash over its build files
+(see pkgmgr.actions.install.ledger) and the distribution release and
+architecture. While the key matches, the installers install the cached
+packages directly (``dpkg -i`` / ``dnf install`` / ``pacman -U``) and skip
+build dependencies and the build. Dirty or non-git trees are never cached.
+
+``PKGMGR_ARTIFACT_CACHE`` points the cache elsewhere or disables it (``0``).
+Only the newest KEEP builds per repository and distribution are kept.
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from pkgmgr.actions.install.context import RepoContext
+from pkgmgr.actions.install.ledger import repo_fingerprint
+from pkgmgr.core.state.paths import cache_dir
+from pkgmgr.core.system.os_release import read_os_release
+
+ARTIFACT_CACHE_ENV = "PKGMGR_ARTIFACT_CACHE"
+KEEP = 3
+
+
+def artifact_cache_dir() -> Optional[str]:
+    """The artifact cache directory, or None if disabled."""
+    explicit = os.environ.get(ARTIFACT_CACHE_ENV, "").strip()
+    if explicit == "0":
+        return None
+    if explicit:
+        return os.path.abspath(os.path.expanduser(explicit))
+    return os.path.join(cache_dir(create=False), "artifacts")
+
+
+def _safe(text: str) -> str:
+    return re.sub(r"[^\w.+-]", "_", text) or "_"
+
+
+def distro_id() -> str:
+    """``<ID>-<VERSION_ID>-<machine>`` of the running system."""
+    data = read_os_release()
+    release = data.get("VERSION_ID") or data.get("BUILD_ID") or "rolling"
+    return _safe(
+        f"{data.get('ID') or 'unknown'}-{release}-{platform.machine() or 'any'}"
+    )
+
+
+@dataclass(frozen=True)
+class ArtifactKey:
+    repo: str
+    commit: str
+    build_hash: str
+    distro: str
+
+    def parts(self) -> tuple:
+        return (
+            self.distro,
+            _safe(self.repo),
+            f"{self.commit}-{self.build_hash[:16]}",
+        )
+
+
+def artifact_key(ctx: RepoContext) -> Optional[ArtifactKey]:
+    """The cache key of ``ctx``'s checkout; None if it must not be cached."""
+    fingerprint = repo_fingerprint(ctx.repo_dir)
+    if fingerprint is None:
+        return None
+    return ArtifactKey(
+        ctx.identifier, fingerprint.commit, fingerprint.build_hash, distro_id()
+    )
+
+
+class ArtifactCache:
+    """Directory of built packages per ArtifactKey."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def entry_dir(self, key: ArtifactKey) -> str:
+        return os.path.join(self.root, *key.parts())
+
+    def lookup(self, key: ArtifactKey) -> List[str]:
+        """The cached packages of ``key`` (empty on a miss)."""
+        directory = self.entry_dir(key)
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            return []
+        return [os.path.join(directory, n) for n in names if not n.startswith(".")]
+
+    def store(self, key: ArtifactKey, files: Sequence[str]) -> List[str]:
+        """
+        Copy ``files`` into the entry of ``key`` (replacing it atomically)
+        and prune old entries of the repository; return the cached paths.
+        """
+        if not files:
+            return []
+        target = self.entry_dir(key)
+        parent = os.path.dirname(target)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent, prefix=".store-")
+        try:
+            for path in files:
+                shutil.copy2(path, os.path.join(staging, os.path.basename(path)))
+            shutil.rmtree(target, ignore_errors=True)
+            os.rename(staging, target)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._prune(parent, keep=target)
+        return self.lookup(key)
+
+    def _prune(self, parent: str, keep: str) -> None:
+        entries = []
+        for name in os.listdir(parent):
+            path = os.path.join(parent, name)
+            if name.startswith(".") or path == keep or not os.path.isdir(path):
+                continue
+            entries.append((os.path.getmtime(path), path))
+        entries.sort(reverse=True)
+        for _mtime, path in entries[KEEP - 1 :]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def cached_artifacts(ctx: RepoContext) -> Tuple[Optional[ArtifactKey], List[str]]:
+    """
+    ``(key, cached packages)`` of ``ctx``; the key is None if the cache is
+    disabled or the checkout cannot be cached.
+    """
+    root = artifact_cache_dir()
+    key = artifact_key(ctx) if root else None
+    if root is None or key is None:
+        return None, []
+    return key, ArtifactCache(root).lookup(key)
+
+
+def store_artifacts(key: Optional[ArtifactKey], files: Sequence[str]) -> None:
+    """Cache the packages built for ``key`` (best effort)."""
+    root = artifact_cache_dir()
+    if key is None or root is None or not files:
+        return
+    try:
+        ArtifactCache(root).store(key, files)
+    except OSError as exc:
+        print(f"[Warning] Could not cache built packages ({exc}).")
+        return
+    print(f"[INFO] Cached {len(files)} built package(s) for {key.repo}.")
@@ -12,15 +12,28 @@ This installer:
 
 It is intended for Debian-based systems where dpkg-buildpackage and
 apt/dpkg tooling are available.
+
+`apt-get update` runs at most once per run (see .metadata), and the build
+dependencies of several repositories can be installed up front in one
+`apt-get build-dep` transaction (install_build_dependencies_batch).
 """
 
 import glob
 import os
+import re
 import shutil
-from typing import List, Optional
+import threading
+from typing import List, Optional, Sequence, Set, Tuple
 
 from pkgmgr.actions.install.context import RepoContext
 from pkgmgr.actions.install.installers.base import BaseInstaller
+from pkgmgr.actions.install.installers.os_packages.artifacts import (
+    ArtifactKey,
+    cached_artifacts,
+    store_artifacts,
+)
+from pkgmgr.actions.install.installers.os_packages.metadata import refresh_metadata
+from pkgmgr.core.resources.governor import BUILD, PACKAGE_MANAGER, acquire
 from pkgmgr.core.command.run import run_command
 
 
@@ -34,10 +47,18 @@ class DebianControlInstaller(BaseInstaller):
 
     # Logical layer name, used by capability matchers.
     layer = "os-packages"
+    # Only the apt/dpkg transactions take PACKAGE_MANAGER; builds run
+    # concurrently.
+    resources = (BUILD,)
 
     CONTROL_DIR = "debian"
     CONTROL_FILE = "control"
 
+    def __init__(self) -> None:
+        # Repositories whose build dependencies the batch already installed.
+        self._batched: Set[str] = set()
+        self._batch_lock = threading.Lock()
+
     def _is_debian_like(self) -> bool:
         """Return True if this looks like a Debian-based system."""
         return shutil.which("dpkg-buildpackage") is not None
@@ -56,16 +77,55 @@ class DebianControlInstaller(BaseInstaller):
 
         return os.path.exists(self._control_path(ctx))
 
+    def _changes_file(self, repo_dir: str) -> Optional[str]:
+        """
+        The .changes file dpkg-buildpackage wrote for this tree, named after
+        the source package and version of debian/changelog.
+        """
+        changelog = os.path.join(repo_dir, self.CONTROL_DIR, "changelog")
+        try:
+            with open(changelog, "r", encoding="utf-8") as f:
+                first = next((line for line in f if line.strip()), "")
+        except OSError:
+            return None
+        match = re.match(r"(\S+) \(([^)]+)\)", first)
+        if not match:
+            return None
+        source = match.group(1)
+        version = match.group(2).split(":", 1)[-1]  # no epoch in file names
+        pattern = os.path.join(
+            glob.escape(os.path.dirname(repo_dir)),
+            f"{glob.escape(source)}_{glob.escape(version)}_*.changes",
+        )
+        matches = glob.glob(pattern)
+        return max(matches, key=os.path.getmtime) if matches else None
+
     def _find_built_debs(self, repo_dir: str) -> List[str]:
         """
-        Find .deb files built by dpkg-buildpackage.
+        Find the .deb files built by dpkg-buildpackage for this tree.
 
-        By default, dpkg-buildpackage creates .deb files in the parent
-        directory of the source tree.
+        dpkg-buildpackage creates them in the parent directory of the source
+        tree, which other repositories share; the files of this build are
+        the ones listed in its .changes file.
         """
+        changes = self._changes_file(repo_dir)
+        if changes is None:
+            return []
+        try:
+            with open(changes, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+
         parent = os.path.dirname(repo_dir)
-        pattern = os.path.join(parent, "*.deb")
-        return sorted(glob.glob(pattern))
+        debs: List[str] = []
+        in_files = False
+        for line in lines:
+            if not line[:1].isspace():
+                in_files = line.startswith("Files:")
+            elif in_files and line.split() and line.split()[-1].endswith(".deb"):
+                debs.append(os.path.join(parent, line.split()[-1]))
+        return sorted(debs)
 
     def _privileged_prefix(self) -> Optional[str]:
         """
@@ -93,6 +153,96 @@ class DebianControlInstaller(BaseInstaller):
             return ""
         return None
 
+    def _apt_prefix(self) -> Optional[str]:
+        """Privileged prefix for apt-get, or None (with a warning) if unusable."""
+        if shutil.which("apt-get") is None:
+            print(
+                "[Warning] apt-get not found on PATH. "
+                "Skipping automatic build-dep installation for Debian."
+            )
+            return None
+
+        prefix = self._privileged_prefix()
+        if prefix is None:
+            print(
+                "[Warning] Neither 'sudo' is available nor running as root. "
+                "Skipping automatic build-dep installation for Debian. "
+                "Please install build dependencies from debian/control manually."
+            )
+        return prefix
+
+    def _build_dep(
+        self, prefix: str, sources: str, cwd: Optional[str], preview: bool
+    ) -> None:
+        """
+        Run `apt-get build-dep` for ``sources`` after refreshing the package
+        lists (at most once per run). If the refresh was skipped because the
+        lists are recent, a failure triggers a refresh and one retry.
+        """
+        update_cmd = f"{prefix}apt-get update"
+        builddep_cmd = f"{prefix}apt-get build-dep -y {sources}"
+        with acquire(PACKAGE_MANAGER):
+            if refresh_metadata(
+                "apt",
+                lambda: run_command(update_cmd, cwd=cwd, preview=preview),
+                preview=preview,
+            ):
+                run_command(builddep_cmd, cwd=cwd, preview=preview)
+                return
+
+            res = run_command(builddep_cmd, cwd=cwd, allow_failure=True)
+            if res.returncode != 0:
+                # The package lists may be stale.
+                refresh_metadata(
+                    "apt", lambda: run_command(update_cmd, cwd=cwd), force=True
+                )
+                run_command(builddep_cmd, cwd=cwd)
+
+    def install_build_dependencies_batch(self, ctxs: Sequence[RepoContext]) -> bool:
+        """
+        Install the build dependencies of several repositories in a single
+        `apt-get build-dep` transaction. Their run() then skips this step; if
+        the batch fails, every repository installs its own as usual.
+        """
+        with self._batch_lock:
+            self._batched.clear()
+        # Repositories installed from the artifact cache need no build deps.
+        ctxs = [
+            c
+            for c in ctxs
+            if os.path.exists(self._control_path(c)) and not self._cached_debs(c)[1]
+        ]
+        if not ctxs:
+            return False
+        prefix = self._apt_prefix()
+        if prefix is None:
+            return False
+
+        sources = " ".join(os.path.abspath(c.repo_dir) for c in ctxs)
+        try:
+            self._build_dep(prefix, sources, None, False)
+        except SystemExit:
+            print(
+                "[Warning] Batched apt-get build-dep failed; installing build "
+                "dependencies per repository."
+            )
+            return False
+        with self._batch_lock:
+            self._batched.update(c.repo_dir for c in ctxs)
+        return True
+
+    def discard_batch(self) -> None:
+        """Forget batched repositories whose run() did not consume them."""
+        with self._batch_lock:
+            self._batched.clear()
+
+    def _take_batched(self, ctx: RepoContext) -> bool:
+        with self._batch_lock:
+            if ctx.repo_dir in self._batched:
+                self._batched.discard(ctx.repo_dir)
+                return True
+        return False
+
     def _install_build_dependencies(self, ctx: RepoContext) -> None:
         """
         Install build dependencies using `apt-get build-dep ./`.
@@ -104,33 +254,38 @@ class DebianControlInstaller(BaseInstaller):
         Any failure is treated as fatal (SystemExit), just like other
         installer steps.
         """
-        if shutil.which("apt-get") is None:
-            print(
-                "[Warning] apt-get not found on PATH. "
-                "Skipping automatic build-dep installation for Debian."
-            )
+        if self._take_batched(ctx):
+            print("[INFO] Build dependencies already installed by the batch.")
+            return
+
+        prefix = self._apt_prefix()
+        if prefix is None:
             return
 
+        # Install build dependencies based on debian/control in the current tree.
+        # `apt-get build-dep ./` uses the source in the current directory.
+        self._build_dep(prefix, "./", ctx.repo_dir, ctx.preview)
+
+    def _cached_debs(self, ctx: RepoContext) -> Tuple[Optional[ArtifactKey], List[str]]:
+        key, cached = cached_artifacts(ctx)
+        return key, [p for p in cached if p.endswith(".deb")]
+
+    def _install_debs(self, ctx: RepoContext, debs: List[str], cwd: str) -> bool:
+        """`dpkg -i` the given files (relative to ``cwd``); False if skipped."""
         prefix = self._privileged_prefix()
         if prefix is None:
             print(
                 "[Warning] Neither 'sudo' is available nor running as root. "
-                "Skipping automatic build-dep installation for Debian. "
-                "Please install build dependencies from debian/control manually."
+                "Skipping automatic .deb installation. "
+                "You can manually install the following files with dpkg -i:\n  "
+                + "\n  ".join(debs)
             )
-            return
-
-        # Update package lists first for reliable build-dep resolution.
-        run_command(
-            f"{prefix}apt-get update",
-            cwd=ctx.repo_dir,
-            preview=ctx.preview,
-        )
+            return False
 
-        # Install build dependencies based on debian/control in the current tree.
-        # `apt-get build-dep ./` uses the source in the current directory.
-        builddep_cmd = f"{prefix}apt-get build-dep -y ./"
-        run_command(builddep_cmd, cwd=ctx.repo_dir, preview=ctx.preview)
+        install_cmd = prefix + "dpkg -i " + " ".join(debs)
+        with acquire(PACKAGE_MANAGER):
+            run_command(install_cmd, cwd=cwd, preview=ctx.preview)
+        return True
 
     def run(self, ctx: RepoContext) -> None:
         """
@@ -140,11 +295,23 @@ class DebianControlInstaller(BaseInstaller):
           1. apt-get build-dep ./ (automatic build dependency installation)
           2. dpkg-buildpackage -b -us -uc
           3. sudo dpkg -i ../*.deb   (or plain dpkg -i when running as root)
+
+        Packages cached for the current commit (see .artifacts) are
+        installed directly instead.
         """
         control_path = self._control_path(ctx)
         if not os.path.exists(control_path):
             return
 
+        key, cached = self._cached_debs(ctx)
+        if cached:
+            print(
+                f"[INFO] Installing cached packages of {ctx.identifier} "
+                f"(commit {key.commit[:12]})."
+            )
+            self._install_debs(ctx, cached, ctx.repo_dir)
+            return
+
         # 1) Install build dependencies
         self._install_build_dependencies(ctx)
 
@@ -161,17 +328,8 @@ class DebianControlInstaller(BaseInstaller):
             )
             return
 
-        prefix = self._privileged_prefix()
-        if prefix is None:
-            print(
-                "[Warning] Neither 'sudo' is available nor running as root. "
-                "Skipping automatic .deb installation. "
-                "You can manually install the following files with dpkg -i:\n  "
-                + "\n  ".join(debs)
-            )
-            return
-
         # 4) Install .deb files
-        install_cmd = prefix + "dpkg -i " + " ".join(os.path.basename(d) for d in debs)
         parent = os.path.dirname(ctx.repo_dir)
-        run_command(install_cmd, cwd=parent, preview=ctx.preview)
+        names = [os.path.basename(d) for d in debs]
+        if self._install_debs(ctx, names, parent) and not ctx.preview:
+            store_artifacts(key, debs)
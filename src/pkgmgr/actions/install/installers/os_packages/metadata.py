@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Refreshing system package metadata (``apt-get update``; for dnf, its first
+command of a run).
+
+The OS package installers used to refresh the package lists for every
+repository. Within a run (a package_metadata() scope, opened by
+install_repos and the update command) each refresh now happens at most
+once, shared by all repositories and workers. Outside a scope every call
+refreshes, as before.
+
+Optionally a successful refresh is also remembered across runs: with
+``performance.package_metadata_ttl`` (seconds) a stamp file in the state
+directory suppresses refreshes younger than the TTL::
+
+    performance:
+      package_metadata_ttl: 3600
+
+Callers whose refresh was skipped because of the stamp should force one
+and retry when a package transaction fails (stale lists).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+from pkgmgr.core.state.paths import state_dir
+
+_TTL = 0.0
+
+
+class _Scope:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.locks: Dict[str, threading.Lock] = {}
+        self.refreshed: Dict[str, bool] = {}
+
+    def key_lock(self, key: str) -> threading.Lock:
+        with self.lock:
+            return self.locks.setdefault(key, threading.Lock())
+
+
+_ACTIVE: Optional[_Scope] = None
+_USERS = 0
+_SCOPE_LOCK = threading.Lock()
+
+
+def configure_package_metadata(
+    performance: Optional[Mapping[str, Any]] = None,
+) -> None:
+    """Apply ``performance.package_metadata_ttl``."""
+    global _TTL
+    value = (
+        performance.get("package_metadata_ttl")
+        if isinstance(performance, Mapping)
+        else None
+    )
+    _TTL = 0.0
+    if value is None:
+        return
+    try:
+        _TTL = max(0.0, float(value))
+    except (TypeError, ValueError):
+        print(f"[Warning] Ignoring invalid performance.package_metadata_ttl: {value!r}")
+
+
+@contextmanager
+def package_metadata() -> Iterator[None]:
+    """
+    Refresh package metadata at most once per key for the duration of a run.
+    Nested and concurrent use (worker threads) shares the scope; it ends
+    when the last user leaves.
+    """
+    global _ACTIVE, _USERS
+    with _SCOPE_LOCK:
+        if _ACTIVE is None:
+            _ACTIVE = _Scope()
+        _USERS += 1
+    try:
+        yield
+    finally:
+        with _SCOPE_LOCK:
+            _USERS -= 1
+            if _USERS == 0:
+                _ACTIVE = None
+
+
+def _stamp_path(key: str) -> str:
+    return os.path.join(state_dir(create=False), f"package-metadata-{key}.stamp")
+
+
+def _stamp_fresh(key: str) -> bool:
+    if _TTL <= 0:
+        return False
+    try:
+        age = time.time() - os.path.getmtime(_stamp_path(key))
+    except OSError:
+        return False
+    return 0 <= age < _TTL
+
+
+def _touch_stamp(key: str) -> None:
+    if _TTL <= 0:
+        return
+    try:
+        path = _stamp_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8"):
+            pass
+        os.utime(path, None)
+    except OSError:
+        # The stamp is an optimization only.
+        pass
+
+
+def refresh_metadata(
+    key: str,
+    refresh: Callable[[], Any],
+    *,
+    preview: bool = False,
+    force: bool = False,
+) -> bool:
+    """
+    Call ``refresh`` (e.g. running ``sudo apt-get update``) unless ``key``
+    was already refreshed in this run or, without ``force``, within the TTL.
+
+    Returns True if the metadata was refreshed in this run, False if the
+    refresh was skipped because of a previous run's stamp.
+    """
+    if preview:
+        refresh()
+        return True
+
+    scope = _ACTIVE
+    if scope is None:
+        refresh()
+        _touch_stamp(key)
+        return True
+
+    # Concurrent callers wait for the first refresh instead of repeating it.
+    with scope.key_lock(key):
+        if key in scope.refreshed and (scope.refreshed[key] or not force):
+            return scope.refreshed[key]
+        if not force and _stamp_fresh(key):
+            print(f"[INFO] Package metadata ({key}) is recent; skipping refresh.")
+            scope.refreshed[key] = False
+            return False
+        refresh()
+        _touch_stamp(key)
+        scope.refreshed[key] = True
+        return True
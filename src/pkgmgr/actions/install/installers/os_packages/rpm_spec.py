@@ -13,16 +13,31 @@ This installer:
      or rpm as a fallback.
 
 It targets RPM-based systems (Fedora / RHEL / CentOS / Rocky / Alma, etc.).
+
+With dnf the first dnf command of a run refreshes expired repository
+metadata as usual (see .metadata); later dnf commands of the run skip dnf's
+expiry check and reuse it. The build dependencies of several repositories can be
+installed up front in one builddep transaction
+(install_build_dependencies_batch).
 """
 
 import glob
 import os
 import shutil
+import subprocess
 import tarfile
-from typing import List, Optional, Tuple
+import threading
+from typing import List, Optional, Sequence, Set, Tuple
 
 from pkgmgr.actions.install.context import RepoContext
 from pkgmgr.actions.install.installers.base import BaseInstaller
+from pkgmgr.actions.install.installers.os_packages.artifacts import (
+    ArtifactKey,
+    cached_artifacts,
+    store_artifacts,
+)
+from pkgmgr.actions.install.installers.os_packages.metadata import refresh_metadata
+from pkgmgr.core.resources.governor import BUILD, PACKAGE_MANAGER, acquire
 from pkgmgr.core.command.run import run_command
 
 
@@ -36,6 +51,17 @@ class RpmSpecInstaller(BaseInstaller):
 
     # Logical layer name, used by capability matchers.
     layer = "os-packages"
+    # Only the dnf/yum/rpm transactions take PACKAGE_MANAGER; builds run
+    # concurrently.
+    resources = (BUILD,)
+
+    # dnf option used once the metadata was checked in this run.
+    DNF_CACHED = "--setopt=metadata_expire=-1"
+
+    def __init__(self) -> None:
+        # Repositories whose build dependencies the batch already installed.
+        self._batched: Set[str] = set()
+        self._batch_lock = threading.Lock()
 
     def _is_rpm_like(self) -> bool:
         """
@@ -183,37 +209,149 @@ class RpmSpecInstaller(BaseInstaller):
 
         return self._spec_path(ctx) is not None
 
-    def _find_built_rpms(self) -> List[str]:
+    def _find_built_rpms(self, ctx: RepoContext, spec_path: str) -> List[str]:
         """
-        Find RPMs built by rpmbuild.
+        Find the RPMs rpmbuild built from ``spec_path``.
 
-        By default, rpmbuild outputs RPMs into:
-          ~/rpmbuild/RPMS/*/*.rpm
+        rpmbuild outputs RPMs into the shared ~/rpmbuild/RPMS/<arch>/; the
+        files of this build are the binary packages the spec defines
+        (`rpmspec -q --rpms`).
         """
-        topdir = self._rpmbuild_topdir()
-        pattern = os.path.join(topdir, "RPMS", "**", "*.rpm")
-        return sorted(glob.glob(pattern, recursive=True))
-
-    def _install_build_dependencies(self, ctx: RepoContext, spec_path: str) -> None:
+        res = run_command(
+            "rpmspec -q --rpms --queryformat "
+            "'%{ARCH}/%{NAME}-%{VERSION}-%{RELEASE}.%{ARCH}.rpm\\n' "
+            + os.path.basename(spec_path),
+            cwd=ctx.repo_dir,
+            allow_failure=True,
+            stream=False,
+        )
+        if res.returncode != 0:
+            return []
+        rpms_dir = os.path.join(self._rpmbuild_topdir(), "RPMS")
+        rpms = [os.path.join(rpms_dir, p) for p in (res.stdout or "").split()]
+        return sorted(p for p in rpms if os.path.isfile(p))
+
+    def _dnf(
+        self,
+        args: str,
+        cwd: Optional[str],
+        preview: bool,
+        allow_failure: bool = False,
+    ) -> subprocess.CompletedProcess:
         """
-        Install build dependencies for the given .spec file.
+        Run `sudo dnf <args>`. The first dnf command of a run refreshes
+        expired metadata itself; later ones reuse it (DNF_CACHED).
         """
-        spec_basename = os.path.basename(spec_path)
+        first: List[subprocess.CompletedProcess] = []
+        refreshed = refresh_metadata(
+            "dnf",
+            lambda: first.append(
+                run_command(
+                    f"sudo dnf {args}",
+                    cwd=cwd,
+                    preview=preview,
+                    allow_failure=allow_failure,
+                )
+            ),
+            preview=preview,
+        )
+        if first:
+            return first[0]
+        # Checked by an earlier run only: leave the expiry check to dnf.
+        option = f"{self.DNF_CACHED} " if refreshed else ""
+        return run_command(
+            f"sudo dnf {option}{args}",
+            cwd=cwd,
+            preview=preview,
+            allow_failure=allow_failure,
+        )
 
+    def _builddep(
+        self,
+        specs: str,
+        cwd: Optional[str],
+        preview: bool,
+        allow_failure: bool = False,
+    ) -> Optional[subprocess.CompletedProcess]:
+        """Install the build dependencies of ``specs``; None if no tool."""
         if shutil.which("dnf") is not None:
-            cmd = f"sudo dnf builddep -y {spec_basename}"
-        elif shutil.which("yum-builddep") is not None:
-            cmd = f"sudo yum-builddep -y {spec_basename}"
-        elif shutil.which("yum") is not None:
-            cmd = f"sudo yum-builddep -y {spec_basename}"
-        else:
+            return self._dnf(f"builddep -y {specs}", cwd, preview, allow_failure)
+        if shutil.which("yum-builddep") is not None or shutil.which("yum") is not None:
+            return run_command(
+                f"sudo yum-builddep -y {specs}",
+                cwd=cwd,
+                preview=preview,
+                allow_failure=allow_failure,
+            )
+        print(
+            "[Warning] No suitable RPM builddep tool (dnf/yum-builddep/yum) found. "
+            "Skipping automatic build dependency installation for RPM."
+        )
+        return None
+
+    def install_build_dependencies_batch(self, ctxs: Sequence[RepoContext]) -> bool:
+        """
+        Install the build dependencies of several repositories in a single
+        builddep transaction. Their run() then skips this step; if the batch
+        fails, every repository installs its own as usual.
+        """
+        with self._batch_lock:
+            self._batched.clear()
+        # Repositories installed from the artifact cache need no build deps.
+        specs = [(c, self._spec_path(c)) for c in ctxs if not self._cached_rpms(c)[1]]
+        specs = [(c, spec) for c, spec in specs if spec]
+        if not specs:
+            return False
+
+        try:
+            with acquire(PACKAGE_MANAGER):
+                res = self._builddep(
+                    " ".join(os.path.abspath(spec) for _c, spec in specs),
+                    None,
+                    False,
+                    allow_failure=True,
+                )
+            if res is None:
+                return False
+            ok = res.returncode == 0
+        except SystemExit:
+            ok = False
+        if not ok:
             print(
-                "[Warning] No suitable RPM builddep tool (dnf/yum-builddep/yum) found. "
-                "Skipping automatic build dependency installation for RPM."
+                "[Warning] Batched builddep failed; installing build "
+                "dependencies per repository."
             )
+            return False
+        with self._batch_lock:
+            self._batched.update(c.repo_dir for c, _spec in specs)
+        return True
+
+    def discard_batch(self) -> None:
+        """Forget batched repositories whose run() did not consume them."""
+        with self._batch_lock:
+            self._batched.clear()
+
+    def _take_batched(self, ctx: RepoContext) -> bool:
+        with self._batch_lock:
+            if ctx.repo_dir in self._batched:
+                self._batched.discard(ctx.repo_dir)
+                return True
+        return False
+
+    def _install_build_dependencies(self, ctx: RepoContext, spec_path: str) -> None:
+        """
+        Install build dependencies for the given .spec file.
+        """
+        if self._take_batched(ctx):
+            print("[INFO] Build dependencies already installed by the batch.")
             return
 
-        run_command(cmd, cwd=ctx.repo_dir, preview=ctx.preview)
+        with acquire(PACKAGE_MANAGER):
+            self._builddep(os.path.basename(spec_path), ctx.repo_dir, ctx.preview)
+
+    def _cached_rpms(self, ctx: RepoContext) -> Tuple[Optional[ArtifactKey], List[str]]:
+        key, cached = cached_artifacts(ctx)
+        return key, [p for p in cached if p.endswith(".rpm")]
 
     def _install_built_rpms(self, ctx: RepoContext, rpms: List[str]) -> None:
         """
@@ -235,22 +373,26 @@ class RpmSpecInstaller(BaseInstaller):
         yum = shutil.which("yum")
         rpm = shutil.which("rpm")
 
-        if dnf is not None:
-            install_cmd = "sudo dnf install -y " + " ".join(rpms)
-        elif yum is not None:
-            install_cmd = "sudo yum install -y " + " ".join(rpms)
-        elif rpm is not None:
-            # Fallback: use rpm in upgrade mode so an existing older
-            # version is replaced instead of causing file conflicts.
-            install_cmd = "sudo rpm -Uvh " + " ".join(rpms)
-        else:
-            print(
-                "[Warning] No suitable RPM installer (dnf/yum/rpm) found. "
-                "Cannot install built RPMs."
-            )
-            return
-
-        run_command(install_cmd, cwd=ctx.repo_dir, preview=ctx.preview)
+        with acquire(PACKAGE_MANAGER):
+            if dnf is not None:
+                self._dnf(
+                    "install -y " + " ".join(rpms), ctx.repo_dir, ctx.preview
+                )
+                return
+            if yum is not None:
+                install_cmd = "sudo yum install -y " + " ".join(rpms)
+            elif rpm is not None:
+                # Fallback: use rpm in upgrade mode so an existing older
+                # version is replaced instead of causing file conflicts.
+                install_cmd = "sudo rpm -Uvh " + " ".join(rpms)
+            else:
+                print(
+                    "[Warning] No suitable RPM installer (dnf/yum/rpm) found. "
+                    "Cannot install built RPMs."
+                )
+                return
+
+            run_command(install_cmd, cwd=ctx.repo_dir, preview=ctx.preview)
 
     def run(self, ctx: RepoContext) -> None:
         """
@@ -261,11 +403,23 @@ class RpmSpecInstaller(BaseInstaller):
           2. dnf/yum builddep <spec> (automatic build dependency installation)
           3. rpmbuild -ba path/to/spec
           4. Install built RPMs via dnf/yum (or rpm as fallback)
+
+        RPMs cached for the current commit (see .artifacts) are installed
+        directly instead.
         """
         spec_path = self._spec_path(ctx)
         if not spec_path:
             return
 
+        key, cached = self._cached_rpms(ctx)
+        if cached:
+            print(
+                f"[INFO] Installing cached packages of {ctx.identifier} "
+                f"(commit {key.commit[:12]})."
+            )
+            self._install_built_rpms(ctx, cached)
+            return
+
         # 1) Prepare source tarball so rpmbuild finds Source0 in SOURCES.
         self._prepare_source_tarball(ctx, spec_path)
 
@@ -278,5 +432,7 @@ class RpmSpecInstaller(BaseInstaller):
         run_command(build_cmd, cwd=ctx.repo_dir, preview=ctx.preview)
 
         # 4) Find and install built RPMs
-        rpms = self._find_built_rpms()
+        rpms = self._find_built_rpms(ctx, spec_path)
         self._install_built_rpms(ctx, rpms)
+        if not ctx.preview:
+            store_artifacts(key, rpms)
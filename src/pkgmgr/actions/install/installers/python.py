@@ -1,15 +1,38 @@
 # src/pkgmgr/actions/install/installers/python.py
 from __future__ import annotations
 
+import glob
 import os
+import shutil
 import sys
+from contextlib import nullcontext
+from typing import Optional
 
 from pkgmgr.actions.install.installers.base import BaseInstaller
 from pkgmgr.actions.install.context import RepoContext
+from pkgmgr.actions.install.venv_template import create_venv
+from pkgmgr.actions.install.wheelhouse import (
+    Wheelhouse,
+    project_key,
+    wheelhouse_dir,
+)
 from pkgmgr.core.command.run import run_command
+from pkgmgr.core.resources.governor import PYTHON_ENV, acquire
+
+# "auto" (default): use uv for installs when it is on PATH; "pip": never.
+BACKEND_ENV = "PKGMGR_PYTHON_BACKEND"
 
 
 class PythonInstaller(BaseInstaller):
+    """
+    Installs a pyproject.toml project with pip.
+
+    The project is built into a wheel once per (name, version, commit) in
+    the shared wheelhouse (pkgmgr.actions.install.wheelhouse) and installed
+    from there together with cached dependency wheels; ``pip install .`` is
+    the fallback whenever the wheelhouse cannot be used.
+    """
+
     layer = "python"
 
     def supports(self, ctx: RepoContext) -> bool:
@@ -32,7 +55,9 @@ class PythonInstaller(BaseInstaller):
         python = sys.executable
 
         if not os.path.exists(venv_dir):
-            run_command(f"{python} -m venv {venv_dir}", preview=ctx.preview)
+            # Cloning the interpreter's template venv skips ensurepip.
+            if ctx.preview or not create_venv(python, venv_dir):
+                run_command(f"{python} -m venv {venv_dir}", preview=ctx.preview)
 
         return venv_dir
 
@@ -47,6 +72,129 @@ class PythonInstaller(BaseInstaller):
         venv_dir = self._ensure_repo_venv(ctx)
         return os.path.join(venv_dir, "bin", "pip")
 
+    def _target_python(self, ctx: RepoContext) -> Optional[str]:
+        """Interpreter pip installs into (None for an explicit PKGMGR_PIP)."""
+        if os.environ.get("PKGMGR_PIP", "").strip():
+            return None
+        if self._in_virtualenv():
+            return sys.executable
+        venv_dir = os.path.expanduser(f"~/.venvs/{ctx.identifier}")
+        return os.path.join(venv_dir, "bin", "python")
+
+    def _uv(self) -> Optional[str]:
+        backend = os.environ.get(BACKEND_ENV, "auto").strip().lower()
+        if backend not in ("", "auto", "uv"):
+            return None
+        return shutil.which("uv")
+
+    # ------------------------------------------------------------------
+    # Wheelhouse
+    # ------------------------------------------------------------------
+
+    def _wheelhouse(self, ctx: RepoContext) -> Optional[Wheelhouse]:
+        if ctx.preview:
+            return None
+        root = wheelhouse_dir()
+        return Wheelhouse(root) if root else None
+
+    def _project_wheel(
+        self, ctx: RepoContext, pip_cmd: str, wheelhouse: Wheelhouse
+    ) -> Optional[str]:
+        """The project's wheel from the wheelhouse, built on a cache miss."""
+        key = project_key(ctx.repo_dir)
+        if key is None:
+            return None
+        cached = wheelhouse.project_wheel(key)
+        if cached:
+            print(
+                f"[python-installer] Reusing cached wheel for {ctx.identifier} "
+                f"({key.name} {key.version} @ {key.commit[:12]})."
+            )
+            return cached
+
+        try:
+            staging = wheelhouse.staging_dir()
+        except OSError as exc:
+            print(f"[python-installer] Wheelhouse unavailable ({exc}).")
+            return None
+        try:
+            res = run_command(
+                f"{pip_cmd} wheel --no-deps -w {staging} .",
+                cwd=ctx.repo_dir,
+                allow_failure=True,
+            )
+            built = sorted(glob.glob(os.path.join(staging, "*.whl")))
+            if res.returncode != 0 or len(built) != 1:
+                return None
+            return wheelhouse.store_project_wheel(key, built[0])
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _install_wheel(
+        self, ctx: RepoContext, pip_cmd: str, wheelhouse: Wheelhouse, wheel: str
+    ) -> bool:
+        """
+        Install ``wheel`` with dependencies from the wheelhouse: offline
+        first, else after adding the missing dependency wheels.
+        """
+        try:
+            return self._install_from_wheelhouse(ctx, pip_cmd, wheelhouse, wheel)
+        except OSError as exc:
+            print(f"[python-installer] Wheelhouse unavailable ({exc}).")
+            return False
+
+    def _install_from_wheelhouse(
+        self, ctx: RepoContext, pip_cmd: str, wheelhouse: Wheelhouse, wheel: str
+    ) -> bool:
+        # A new commit keeps the version: the project itself is always
+        # reinstalled, its dependencies only when needed.
+        python = self._target_python(ctx)
+        uv = self._uv() if python else None
+        if uv:
+            name = os.path.basename(wheel).split("-", 1)[0]
+            with wheelhouse.locked(shared=True):
+                res = run_command(
+                    f"{uv} pip install --python {python} "
+                    f"--find-links {wheelhouse.deps} --reinstall-package {name} "
+                    f"{wheel}",
+                    cwd=ctx.repo_dir,
+                    allow_failure=True,
+                )
+            return res.returncode == 0
+
+        offline = (
+            f"{pip_cmd} install --no-index --find-links {wheelhouse.deps} {wheel}"
+        )
+        with wheelhouse.locked(shared=True):
+            res = run_command(
+                offline, cwd=ctx.repo_dir, allow_failure=True, stream=False
+            )
+        if res.returncode != 0:
+            # Build/download only the dependency wheels that are missing.
+            with wheelhouse.locked(shared=False):
+                res = run_command(
+                    f"{pip_cmd} wheel --find-links {wheelhouse.deps} "
+                    f"-w {wheelhouse.deps} {wheel}",
+                    cwd=ctx.repo_dir,
+                    allow_failure=True,
+                )
+            if res.returncode != 0:
+                return False
+            with wheelhouse.locked(shared=True):
+                res = run_command(offline, cwd=ctx.repo_dir, allow_failure=True)
+            if res.returncode != 0:
+                return False
+
+        res = run_command(
+            f"{pip_cmd} install --no-index --force-reinstall --no-deps {wheel}",
+            cwd=ctx.repo_dir,
+            allow_failure=True,
+        )
+        if res.returncode != 0:
+            return False
+        print(f"[python-installer] Installed {ctx.identifier} from the wheelhouse.")
+        return True
+
     def run(self, ctx: RepoContext) -> None:
         if not self.supports(ctx):
             return
@@ -54,7 +202,21 @@ class PythonInstaller(BaseInstaller):
         print(f"[python-installer] Installing Python project for {ctx.identifier}...")
 
         pip_cmd = self._pip_cmd(ctx)
-        run_command(f"{pip_cmd} install .", cwd=ctx.repo_dir, preview=ctx.preview)
+        wheelhouse = self._wheelhouse(ctx)
+        # Building does not touch the target env and may run concurrently.
+        wheel = self._project_wheel(ctx, pip_cmd, wheelhouse) if wheelhouse else None
+
+        # Per-repo venvs can be filled concurrently; a shared env cannot.
+        shared_env = bool(os.environ.get("PKGMGR_PIP", "").strip()) or (
+            self._in_virtualenv()
+        )
+        with acquire(PYTHON_ENV) if shared_env else nullcontext():
+            if not (
+                wheel and self._install_wheel(ctx, pip_cmd, wheelhouse, wheel)
+            ):
+                run_command(
+                    f"{pip_cmd} install .", cwd=ctx.repo_dir, preview=ctx.preview
+                )
 
         if ctx.force_update:
             # test-visible marker
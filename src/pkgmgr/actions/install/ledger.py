@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Install ledger: remembers what was installed for each repository.
+
+For every successful installation the ledger stores
+
+  - the installed commit (HEAD),
+  - a hash over the build files the installers look at,
+  - the resolved CLI command and the layer that provides it.
+
+install/update use it to skip repositories whose fingerprint (commit +
+build-file hash) did not change since the last successful installation.
+Local changes to tracked files, a missing command or a changed build file
+always trigger a reinstall; ``--force`` bypasses the ledger.
+
+Stored as JSON in the pkgmgr state directory (install-ledger.json).
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+from pkgmgr.core.git.errors import GitBaseError
+from pkgmgr.core.git.queries import get_head_commit, get_worktree_changes
+from pkgmgr.core.state.paths import state_file
+
+LEDGER_FILE = "install-ledger.json"
+
+# Files whose content influences what the installers do.
+BUILD_FILES = [
+    "flake.nix",
+    "flake.lock",
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "requirements.txt",
+    "Makefile",
+    "PKGBUILD",
+    "packaging/arch/PKGBUILD",
+    "debian/control",
+    "debian/rules",
+    "packaging/debian/control",
+    "packaging/debian/rules",
+]
+BUILD_FILE_GLOBS = ["*.spec", "packaging/fedora/*.spec"]
+
+
+@dataclass
+class LedgerEntry:
+    commit: str
+    build_hash: str
+    layer: Optional[str] = None
+    command: Optional[str] = None
+    installed_at: float = 0.0
+
+
+def build_files_hash(repo_dir: str) -> str:
+    """Return a sha256 over the relative path and content of all build files."""
+    paths = [os.path.join(repo_dir, rel) for rel in BUILD_FILES]
+    for pattern in BUILD_FILE_GLOBS:
+        paths.extend(sorted(glob.glob(os.path.join(repo_dir, pattern))))
+
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+        digest.update(os.path.relpath(path, repo_dir).encode("utf-8") + b"\0")
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            continue
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def repo_fingerprint(repo_dir: str) -> Optional[LedgerEntry]:
+    """
+    Compute the current fingerprint of a repository checkout.
+
+    Returns None if the directory is not a git checkout with a HEAD commit or
+    if tracked files have local changes (never skip uncommitted work).
+    Untracked files (e.g. build outputs left in the tree) do not count; the
+    build files among them are covered by the build-file hash.
+    """
+    if not os.path.isdir(repo_dir):
+        return None
+    try:
+        commit = get_head_commit(cwd=repo_dir)
+        if not commit or get_worktree_changes(cwd=repo_dir, untracked=False):
+            return None
+    except GitBaseError:
+        return None
+    return LedgerEntry(commit=commit, build_hash=build_files_hash(repo_dir))
+
+
+# Shared by all ledger instances, so that concurrent installs (e.g. the
+# pipelined update) re-read the file before writing and lose no entries.
+_WRITE_LOCK = threading.Lock()
+
+
+class InstallLedger:
+    """Thread-safe JSON-backed store of LedgerEntry objects keyed by repo dir."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or state_file(LEDGER_FILE)
+        self._lock = _WRITE_LOCK
+        self._entries: Dict[str, LedgerEntry] = self._load()
+
+    def _load(self) -> Dict[str, LedgerEntry]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        entries: Dict[str, LedgerEntry] = {}
+        for key, data in (raw.get("repositories") or {}).items():
+            try:
+                entries[key] = LedgerEntry(**data)
+            except TypeError:
+                continue
+        return entries
+
+    def _save(self) -> None:
+        data = {
+            "version": 1,
+            "repositories": {k: asdict(v) for k, v in sorted(self._entries.items())},
+        }
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".install-ledger.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    @staticmethod
+    def key(repo_dir: str) -> str:
+        return os.path.abspath(repo_dir)
+
+    def get(self, repo_dir: str) -> Optional[LedgerEntry]:
+        with self._lock:
+            return self._entries.get(self.key(repo_dir))
+
+    def is_unchanged(self, repo_dir: str, current: Optional[LedgerEntry]) -> bool:
+        """
+        True if ``current`` matches the recorded fingerprint and the recorded
+        command (if any) still exists.
+        """
+        if current is None:
+            return False
+        entry = self.get(repo_dir)
+        if entry is None:
+            return False
+        if (entry.commit, entry.build_hash) != (current.commit, current.build_hash):
+            return False
+        if entry.command and not os.path.exists(entry.command):
+            return False
+        return True
+
+    def record(
+        self,
+        repo_dir: str,
+        fingerprint: LedgerEntry,
+        *,
+        layer: Optional[str],
+        command: Optional[str],
+    ) -> None:
+        entry = LedgerEntry(
+            commit=fingerprint.commit,
+            build_hash=fingerprint.build_hash,
+            layer=layer,
+            command=command,
+            installed_at=time.time(),
+        )
+        with self._lock:
+            self._entries = self._load()
+            self._entries[self.key(repo_dir)] = entry
+            self._save()
+
+    def forget(self, repo_dir: str) -> None:
+        with self._lock:
+            self._entries = self._load()
+            if self._entries.pop(self.key(repo_dir), None) is not None:
+                self._save()
@@ -8,8 +8,9 @@ Installation pipeline orchestration for repositories.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Sequence, Set
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Set
 
 from pkgmgr.actions.install.context import RepoContext
 from pkgmgr.actions.install.installers.base import BaseInstaller
@@ -18,8 +19,11 @@ from pkgmgr.actions.install.layers import (
     classify_command_layer,
     layer_priority,
 )
+from pkgmgr.core.command.index import invalidate_executable_index
 from pkgmgr.core.command.ink import create_ink
 from pkgmgr.core.command.resolve import resolve_command_for_repo
+from pkgmgr.core.resources.governor import acquire
+from pkgmgr.core.state.history import RunHistory
 
 
 @dataclass
@@ -53,9 +57,114 @@ class CommandResolver:
         return CommandState(command=cmd, layer=layer)
 
 
+@dataclass
+class InstallerDecision:
+    """Whether (and why) an installer runs for a repository."""
+
+    installer: BaseInstaller
+    layer: Optional[CliLayer]
+    run: bool
+    # "no-layer", "run", "upgrade", "layer-shadowed", "layer-loaded",
+    # "unsupported" or "capabilities"
+    kind: str
+    reason: str
+    capabilities: Set[str] = field(default_factory=set)
+
+
+def decide_installer(
+    installer: BaseInstaller,
+    ctx: RepoContext,
+    state: CommandState,
+    provided_capabilities: Set[str],
+) -> InstallerDecision:
+    """
+    Apply the layer precedence, supports() and capability rules for one
+    installer given the current CLI state, without running anything.
+    """
+    layer_name = getattr(installer, "layer", None)
+    if layer_name is None:
+        return InstallerDecision(
+            installer, None, True, "no-layer", "installer without layer"
+        )
+
+    try:
+        installer_layer: Optional[CliLayer] = CliLayer(layer_name)
+    except ValueError:
+        installer_layer = None
+
+    if state.layer is not None and installer_layer is not None:
+        current_prio = layer_priority(state.layer)
+        installer_prio = layer_priority(installer_layer)
+
+        if current_prio < installer_prio:
+            return InstallerDecision(
+                installer,
+                installer_layer,
+                False,
+                "layer-shadowed",
+                f"CLI already provided by layer {state.layer.value!r}",
+            )
+
+        if current_prio == installer_prio and not ctx.force_update:
+            return InstallerDecision(
+                installer,
+                installer_layer,
+                False,
+                "layer-loaded",
+                f"layer {installer_layer.value!r} is already loaded",
+            )
+
+    if not installer.supports(ctx):
+        return InstallerDecision(
+            installer, installer_layer, False, "unsupported", "not applicable"
+        )
+
+    caps = installer.discover_capabilities(ctx)
+    if caps and caps.issubset(provided_capabilities):
+        return InstallerDecision(
+            installer,
+            installer_layer,
+            False,
+            "capabilities",
+            f"capabilities {caps} already provided",
+            caps,
+        )
+
+    if ctx.force_update and state.layer is not None and installer_layer == state.layer:
+        return InstallerDecision(
+            installer, installer_layer, True, "upgrade", "upgrade requested", caps
+        )
+
+    return InstallerDecision(
+        installer,
+        installer_layer,
+        True,
+        "run",
+        f"new capabilities: {caps or set()}",
+        caps,
+    )
+
+
 class InstallationPipeline:
-    def __init__(self, installers: Sequence[BaseInstaller]) -> None:
+    def __init__(
+        self,
+        installers: Sequence[BaseInstaller],
+        history: Optional[RunHistory] = None,
+    ) -> None:
         self._installers = list(installers)
+        self._history = history
+
+    @property
+    def installers(self) -> List[BaseInstaller]:
+        return list(self._installers)
+
+    def first_installer(self, ctx: RepoContext) -> Optional[BaseInstaller]:
+        """The installer run() would start with (None if none would run)."""
+        state = CommandResolver(ctx).resolve()
+        for installer in self._installers:
+            if decide_installer(installer, ctx, state, set()).run:
+                return installer
+        return None
 
     def run(self, ctx: RepoContext) -> None:
         repo = ctx.repo
@@ -86,71 +195,44 @@ class InstallationPipeline:
         provided_capabilities: Set[str] = set()
 
         for installer in self._installers:
-            layer_name = getattr(installer, "layer", None)
+            decision = decide_installer(installer, ctx, state, provided_capabilities)
+            name = installer.__class__.__name__
 
-            if layer_name is None:
+            if decision.kind == "no-layer":
                 self._run_installer(installer, ctx, identifier, repo_dir, quiet)
                 continue
 
-            try:
-                installer_layer = CliLayer(layer_name)
-            except ValueError:
-                installer_layer = None
-
-            if state.layer is not None and installer_layer is not None:
-                current_prio = layer_priority(state.layer)
-                installer_prio = layer_priority(installer_layer)
-
-                if current_prio < installer_prio:
-                    if not quiet:
-                        print(
-                            "[pkgmgr] Skipping installer "
-                            f"{installer.__class__.__name__} for {identifier} – "
-                            f"CLI already provided by layer {state.layer.value!r}."
-                        )
+            if not decision.run:
+                if quiet or decision.kind == "unsupported":
                     continue
-
-                if current_prio == installer_prio and not ctx.force_update:
-                    if not quiet:
-                        print(
-                            "[pkgmgr] Skipping installer "
-                            f"{installer.__class__.__name__} for {identifier} – "
-                            f"layer {installer_layer.value!r} is already loaded."
-                        )
-                    continue
-
-            if not installer.supports(ctx):
-                continue
-
-            caps = installer.discover_capabilities(ctx)
-            if caps and caps.issubset(provided_capabilities):
-                if not quiet:
+                if decision.kind == "capabilities":
+                    print(
+                        f"Skipping installer {name} "
+                        f"for {identifier} – {decision.reason}."
+                    )
+                else:
                     print(
-                        f"Skipping installer {installer.__class__.__name__} "
-                        f"for {identifier} – capabilities {caps} already provided."
+                        "[pkgmgr] Skipping installer "
+                        f"{name} for {identifier} – {decision.reason}."
                     )
                 continue
 
             if not quiet:
-                if (
-                    ctx.force_update
-                    and state.layer is not None
-                    and installer_layer == state.layer
-                ):
+                if decision.kind == "upgrade":
                     print(
-                        f"[pkgmgr] Running installer {installer.__class__.__name__} "
+                        f"[pkgmgr] Running installer {name} "
                         f"for {identifier} in '{repo_dir}' (upgrade requested)..."
                     )
                 else:
                     print(
-                        f"[pkgmgr] Running installer {installer.__class__.__name__} "
+                        f"[pkgmgr] Running installer {name} "
                         f"for {identifier} in '{repo_dir}' "
-                        f"(new capabilities: {caps or set()})..."
+                        f"({decision.reason})..."
                     )
 
             self._run_installer(installer, ctx, identifier, repo_dir, quiet)
 
-            provided_capabilities.update(caps)
+            provided_capabilities.update(decision.capabilities)
 
             new_state = resolver.resolve()
             if new_state.command:
@@ -168,17 +250,21 @@ class InstallationPipeline:
 
             state = new_state
 
-    @staticmethod
     def _run_installer(
+        self,
         installer: BaseInstaller,
         ctx: RepoContext,
         identifier: str,
         repo_dir: str,
         quiet: bool,
     ) -> None:
+        start = time.monotonic()
         try:
-            installer.run(ctx)
+            with acquire(*getattr(installer, "resources", ())):
+                installer.run(ctx)
         except SystemExit as exc:
+            invalidate_executable_index()
+            self._record(installer, ctx, time.monotonic() - start, ok=False)
             exit_code = exc.code if isinstance(exc.code, int) else str(exc.code)
             print(
                 f"[ERROR] Installer {installer.__class__.__name__} failed "
@@ -196,3 +282,27 @@ class InstallationPipeline:
                 "--clone-mode shallow --no-verification"
             )
             raise
+
+        # The installer may have added or replaced binaries.
+        invalidate_executable_index()
+
+        self._record(installer, ctx, time.monotonic() - start, ok=True)
+
+    def _record(
+        self,
+        installer: BaseInstaller,
+        ctx: RepoContext,
+        seconds: float,
+        *,
+        ok: bool,
+    ) -> None:
+        if self._history is None or ctx.preview:
+            return
+        self._history.record(
+            ctx.repo_dir,
+            "install",
+            seconds,
+            ok,
+            label=ctx.identifier,
+            installer=installer.__class__.__name__,
+        )
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Dry-run install planning ("pkgmgr install --plan").
+
+For each selected repository the plan shows, in scheduling order, which
+installers would run and why the others would be skipped. It applies the
+same rules as InstallationPipeline (CommandResolver, layer precedence,
+supports(), capabilities) without running anything, and assumes every
+installer that runs provides the CLI of its layer afterwards. Durations are
+estimated from the run history of earlier installations.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pkgmgr.actions.install.context import RepoContext
+from pkgmgr.actions.install.ledger import LEDGER_FILE, InstallLedger, repo_fingerprint
+from pkgmgr.actions.install.pipeline import (
+    CommandResolver,
+    CommandState,
+    InstallationPipeline,
+    decide_installer,
+)
+from pkgmgr.actions.install.scheduler import (
+    InstallJob,
+    build_install_jobs,
+    critical_path_priorities,
+    run_install_jobs,
+)
+from pkgmgr.core.command.index import executable_index
+from pkgmgr.core.repository.dir import get_repo_dir
+from pkgmgr.core.repository.identifier import get_repo_identifier
+from pkgmgr.core.state.history import RunHistory, open_run_history
+from pkgmgr.core.state.paths import state_dir
+
+Repository = Dict[str, Any]
+
+PLAN_FORMATS = ("text", "json")
+
+
+@dataclass
+class PlanStep:
+    installer: str
+    layer: Optional[str]
+    action: str  # "run" or "skip"
+    reason: str
+    kind: str
+    capabilities: List[str] = field(default_factory=list)
+    estimate: Optional[float] = None
+
+
+@dataclass
+class RepoPlan:
+    repository: str
+    directory: str
+    # "install", "clone" (directory missing) or "unchanged" (ledger hit)
+    status: str
+    command: Optional[str] = None
+    layer: Optional[str] = None
+    depends_on: List[str] = field(default_factory=list)
+    steps: List[PlanStep] = field(default_factory=list)
+    estimate: Optional[float] = None
+
+
+def plan_repo(
+    pipeline: InstallationPipeline,
+    ctx: RepoContext,
+    history: Optional[RunHistory] = None,
+) -> RepoPlan:
+    """Simulate the pipeline for one repository context."""
+    state = CommandResolver(ctx).resolve()
+    plan = RepoPlan(
+        repository=ctx.identifier,
+        directory=ctx.repo_dir,
+        status="install",
+        command=state.command,
+        layer=state.layer.value if state.layer else None,
+    )
+
+    provided: Set[str] = set()
+    for installer in pipeline.installers:
+        decision = decide_installer(installer, ctx, state, provided)
+        name = installer.__class__.__name__
+        step = PlanStep(
+            installer=name,
+            layer=getattr(installer, "layer", None),
+            action="run" if decision.run else "skip",
+            reason=decision.reason,
+            kind=decision.kind,
+            capabilities=sorted(decision.capabilities),
+        )
+        if decision.run:
+            if history is not None:
+                step.estimate = history.estimate(ctx.repo_dir, "install", name)
+            provided.update(decision.capabilities)
+            if decision.layer is not None:
+                state = CommandState(command=state.command, layer=decision.layer)
+        plan.steps.append(step)
+
+    estimates = [s.estimate for s in plan.steps if s.action == "run"]
+    if estimates and all(e is not None for e in estimates):
+        plan.estimate = sum(estimates)  # type: ignore[arg-type]
+    return plan
+
+
+def _fmt_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+    if seconds < 60:
+        return f"~{seconds:.1f}s"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    return f"~{minutes}m {secs:02d}s"
+
+
+def _print_text(plans: List[RepoPlan]) -> None:
+    for plan in plans:
+        print(f"[PLAN] {plan.repository} ({plan.directory})")
+        if plan.depends_on:
+            print(f"  depends on: {', '.join(plan.depends_on)}")
+        if plan.command:
+            print(f"  current CLI: {plan.command} (layer {plan.layer})")
+        if plan.status == "clone":
+            print("  not cloned yet: clone first, installers are decided afterwards")
+            continue
+        if plan.status == "unchanged":
+            print("  unchanged since last install: skip (use --force to reinstall)")
+            continue
+        for step in plan.steps:
+            if step.kind == "unsupported":
+                continue
+            estimate = _fmt_seconds(step.estimate) if step.action == "run" else ""
+            print(
+                f"  {step.action:<4}  {step.installer:<24} "
+                f"{step.layer or '-':<12} {step.reason}  {estimate}".rstrip()
+            )
+        if not any(s.action == "run" for s in plan.steps):
+            print("  nothing to run")
+        print(f"  estimate: {_fmt_seconds(plan.estimate)}")
+
+    to_install = [p for p in plans if p.status != "unchanged"]
+    known = [p.estimate for p in to_install if p.estimate is not None]
+    # Freshly cloned repositories have no history to estimate from.
+    total = _fmt_seconds(sum(known)) if known else "?"
+    print(
+        f"\n[PLAN] {len(to_install)} of {len(plans)} repositories to install; "
+        f"estimated serial time {total}"
+        + (
+            f" ({len(to_install) - len(known)} without history)"
+            if len(known) < len(to_install)
+            else ""
+        )
+    )
+
+
+def plan_installs(
+    selected_repos: List[Repository],
+    repositories_base_dir: str,
+    bin_dir: str,
+    all_repos: List[Repository],
+    *,
+    clone_mode: str = "ssh",
+    update_dependencies: bool = False,
+    force_update: bool = False,
+    force: bool = False,
+    output_format: str = "text",
+    jobs: int = 1,
+) -> List[RepoPlan]:
+    """
+    Print (and return) the install plan for the selected repositories, in
+    the order the scheduler would start them with ``jobs`` workers.
+    """
+    from pkgmgr.actions.install import INSTALLERS, _open_store
+
+    pipeline = InstallationPipeline(INSTALLERS)
+    # Planning writes nothing: the state directory, history and ledger are
+    # only read, and treated as empty if they do not exist yet.
+    history = open_run_history(read_only=True)
+    ledger = None
+    if not force:
+        ledger_path = os.path.join(state_dir(create=False), LEDGER_FILE)
+        ledger = _open_store(
+            lambda: InstallLedger(ledger_path), "install ledger", True
+        )
+    install_jobs = build_install_jobs(
+        selected_repos,
+        all_repos,
+        include_dependencies=update_dependencies,
+        identify=get_repo_identifier,
+    )
+    repo_dirs = {
+        job.identifier: get_repo_dir(repositories_base_dir, job.repo)
+        for job in install_jobs
+    }
+    # The dependency edges as declared; the scheduler may rewrite cycles.
+    declared = {job.identifier: sorted(job.depends_on) for job in install_jobs}
+
+    if jobs > 1 and len(install_jobs) > 1 and history is not None:
+        # A parallel run starts ready jobs longest critical path first.
+        by_dir = history.expected_durations("install", repo_dirs.values())
+        priorities = critical_path_priorities(
+            install_jobs,
+            {i: by_dir[rd] for i, rd in repo_dirs.items() if rd in by_dir},
+        )
+        install_jobs.sort(key=lambda job: -priorities[job.identifier])
+
+    plans: List[RepoPlan] = []
+
+    def _plan_job(job: InstallJob) -> Tuple[bool, str]:
+        repo_dir = repo_dirs[job.identifier]
+        depends_on = declared[job.identifier]
+
+        if not os.path.isdir(repo_dir):
+            plans.append(
+                RepoPlan(job.identifier, repo_dir, "clone", depends_on=depends_on)
+            )
+            return True, ""
+
+        ctx = RepoContext(
+            repo=dict(job.repo),
+            identifier=job.identifier,
+            repo_dir=repo_dir,
+            repositories_base_dir=repositories_base_dir,
+            bin_dir=bin_dir,
+            all_repos=all_repos,
+            no_verification=True,
+            preview=True,
+            quiet=True,
+            clone_mode=clone_mode,
+            update_dependencies=update_dependencies,
+            force_update=force_update,
+        )
+        plan = plan_repo(pipeline, ctx, history)
+        plan.depends_on = depends_on
+        if ledger is not None and ledger.is_unchanged(
+            repo_dir, repo_fingerprint(repo_dir)
+        ):
+            plan.status = "unchanged"
+            plan.estimate = 0.0
+        plans.append(plan)
+        return True, ""
+
+    try:
+        # Planning each job from a serial scheduler run yields the plans in
+        # scheduling order (dependencies first, cycles chained). Scheduler
+        # warnings must not end up in the JSON output.
+        with executable_index(), redirect_stdout(
+            sys.stderr
+        ) if output_format == "json" else nullcontext():
+            run_install_jobs(install_jobs, _plan_job)
+    finally:
+        if history is not None:
+            history.close()
+
+    if output_format == "json":
+        print(json.dumps([asdict(p) for p in plans], indent=2))
+    else:
+        _print_text(plans)
+    return plans
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Dependency-aware scheduling of per-repository install jobs.
+
+Repositories may declare other repositories they depend on via the config
+key ``dependencies`` (list of identifiers: ``provider/account/repository``,
+alias or unique repository name). Jobs form a DAG:
+
+  - a job starts only after all of its dependencies finished successfully,
+  - jobs whose dependency failed (or was skipped) are skipped,
+  - independent jobs run concurrently on a bounded worker pool,
+  - among ready jobs the one with the longest expected remaining chain
+    (own expected duration plus its longest chain of dependents) starts
+    first, so slow installs do not end up at the tail of the run.
+
+Dependencies that are not part of the current run are ignored, unless
+``include_dependencies`` is set, in which case they are added to the run.
+Dependency cycles are reported and broken by installing the members of each
+cycle one after another in selection order.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pkgmgr.actions.repository._parallel import RepoOutcome
+from pkgmgr.core.command.process import watch_timeouts
+from pkgmgr.core.command.run import OUTPUT_LOCK
+from pkgmgr.core.progress.display import ProgressDisplay
+from pkgmgr.core.repository.identifier import get_repo_identifier
+from pkgmgr.core.repository.resolve import resolve_repos
+
+Repository = Dict[str, Any]
+# op(job) -> (ok, msg); msg == SKIPPED marks a deliberate skip (not a failure).
+JobOp = Callable[["InstallJob"], Tuple[bool, str]]
+
+SKIPPED = "skipped"
+# msg of a successful job that had nothing to do.
+UNCHANGED = "unchanged"
+
+
+@dataclass
+class InstallJob:
+    identifier: str
+    repo: Repository
+    depends_on: Set[str] = field(default_factory=set)
+
+
+def _declared_dependencies(repo: Repository) -> List[str]:
+    deps = repo.get("dependencies") or []
+    if isinstance(deps, str):
+        deps = [deps]
+    return [str(d) for d in deps if d]
+
+
+def build_install_jobs(
+    selected_repos: List[Repository],
+    all_repos: List[Repository],
+    include_dependencies: bool = False,
+    identify: Callable[[Repository, List[Repository]], str] = get_repo_identifier,
+) -> List[InstallJob]:
+    """
+    Build the job list (selection order, added dependencies first) with
+    dependency edges restricted to the repositories of this run.
+    """
+    repos: List[Repository] = list(selected_repos)
+
+    if include_dependencies:
+        queue = list(selected_repos)
+        while queue:
+            repo = queue.pop(0)
+            for dep in resolve_repos(_declared_dependencies(repo), all_repos):
+                if not any(dep is r for r in repos):
+                    repos.insert(0, dep)
+                    queue.append(dep)
+
+    idents = {id(r): identify(r, all_repos) for r in repos}
+    jobs: List[InstallJob] = []
+    for repo in repos:
+        deps = {
+            idents[id(dep)]
+            for dep in resolve_repos(_declared_dependencies(repo), all_repos)
+            if id(dep) in idents and dep is not repo
+        }
+        jobs.append(InstallJob(idents[id(repo)], repo, deps))
+    return jobs
+
+
+def critical_path_priorities(
+    jobs: List[InstallJob],
+    expected: Dict[str, float],
+) -> Dict[str, float]:
+    """
+    Expected duration of each job plus its longest chain of dependents.
+
+    Jobs without history count with the median of the known durations (0 if
+    nothing is known). Cycles are cut at the first revisited job.
+    """
+    known = sorted(expected.values())
+    default = known[len(known) // 2] if known else 0.0
+    dependents: Dict[str, List[str]] = {j.identifier: [] for j in jobs}
+    for job in jobs:
+        for dep in job.depends_on:
+            if dep in dependents:
+                dependents[dep].append(job.identifier)
+
+    priorities: Dict[str, float] = {}
+    visiting: Set[str] = set()
+
+    def _priority(ident: str) -> float:
+        if ident in priorities:
+            return priorities[ident]
+        if ident in visiting:
+            return 0.0
+        visiting.add(ident)
+        tail = max((_priority(d) for d in dependents[ident]), default=0.0)
+        visiting.discard(ident)
+        priorities[ident] = expected.get(ident, default) + tail
+        return priorities[ident]
+
+    for job in jobs:
+        _priority(job.identifier)
+    return priorities
+
+
+def _dependency_cycles(
+    pending: Dict[str, InstallJob], selection: List[str]
+) -> List[List[str]]:
+    """
+    The dependency cycles (strongly connected components) among ``pending``,
+    members in selection order.
+    """
+    reach: Dict[str, Set[str]] = {}
+    for ident in pending:
+        seen: Set[str] = set()
+        stack = [ident]
+        while stack:
+            for dep in pending[stack.pop()].depends_on:
+                if dep in pending and dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        reach[ident] = seen
+
+    cycles: List[List[str]] = []
+    assigned: Set[str] = set()
+    for ident in selection:
+        if ident not in pending or ident in assigned or ident not in reach[ident]:
+            continue
+        members = {o for o in reach[ident] if ident in reach[o]} | {ident}
+        assigned |= members
+        cycles.append([i for i in selection if i in members])
+    return cycles
+
+
+def _chain(pending: Dict[str, InstallJob], cycle: List[str]) -> None:
+    """Replace the edges within ``cycle`` by a chain in its order."""
+    members = set(cycle)
+    for previous, ident in zip([None] + cycle[:-1], cycle):
+        job = pending[ident]
+        job.depends_on = {d for d in job.depends_on if d not in members}
+        if previous is not None:
+            job.depends_on.add(previous)
+
+
+def run_install_jobs(
+    jobs: List[InstallJob],
+    op: JobOp,
+    *,
+    max_workers: int = 1,
+    expected: Optional[Dict[str, float]] = None,
+    progress: bool = False,
+) -> List[RepoOutcome]:
+    """
+    Run ``op`` for every job respecting dependency order; return outcomes in
+    completion order (skipped jobs included).
+
+    ``expected`` maps identifiers to expected durations (run history); with
+    more than one worker, ready jobs are started longest critical path first.
+    With ``progress`` the running jobs are shown in a live display on a
+    terminal (pkgmgr.core.progress.display).
+    """
+    pending: Dict[str, InstallJob] = {j.identifier: j for j in jobs}
+    selection = [j.identifier for j in jobs]
+    order = list(selection)
+    finished: Dict[str, bool] = {}
+    outcomes: List[RepoOutcome] = []
+    workers = max(1, min(max_workers, len(jobs) or 1))
+    if expected and workers > 1:
+        priorities = critical_path_priorities(jobs, expected)
+        order.sort(key=lambda ident: -priorities[ident])
+
+    display = (
+        ProgressDisplay("install", len(jobs), expected=expected, outcome_lines=False)
+        if progress
+        else None
+    )
+
+    def _timed(job: InstallJob) -> Tuple[bool, str, float, bool]:
+        if display is not None:
+            display.start(job.identifier)
+        start = time.monotonic()
+        with watch_timeouts() as watch:
+            try:
+                ok, msg = op(job)
+            except SystemExit as exc:
+                ok, msg = False, f"exited with code {exc.code}"
+        return ok, msg, time.monotonic() - start, watch.timed_out and not ok
+
+    def _skip_blocked() -> None:
+        changed = True
+        while changed:
+            changed = False
+            for ident in list(pending):
+                failed = [d for d in pending[ident].depends_on if finished.get(d) is False]
+                if failed:
+                    del pending[ident]
+                    finished[ident] = False
+                    if display is not None:
+                        display.skip(ident)
+                    outcomes.append(
+                        RepoOutcome(
+                            ident,
+                            ok=False,
+                            msg=f"dependency failed: {', '.join(sorted(failed))}",
+                            skipped=True,
+                        )
+                    )
+                    changed = True
+
+    def _ready() -> List[str]:
+        return [
+            ident
+            for ident in order
+            if ident in pending
+            and all(finished.get(d) for d in pending[ident].depends_on)
+        ]
+
+    running: Dict[Future, str] = {}
+    with display or nullcontext(), ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            _skip_blocked()
+            ready = _ready()
+
+            if not ready and not running and pending:
+                for cycle in _dependency_cycles(pending, selection):
+                    with OUTPUT_LOCK:
+                        print(
+                            "[Warning] install: dependency cycle among "
+                            f"{', '.join(cycle)}; installing in selection order."
+                        )
+                    _chain(pending, cycle)
+                continue
+
+            for ident in ready[: workers - len(running)]:
+                running[executor.submit(_timed, pending.pop(ident))] = ident
+
+            if not running:
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                ident = running.pop(future)
+                ok, msg, duration, timed_out = future.result()
+                skipped = not ok and msg == SKIPPED
+                finished[ident] = ok
+                if display is not None and skipped:
+                    display.skip(ident)
+                elif display is not None:
+                    display.finish(ident, ok, duration, msg=msg, timed_out=timed_out)
+                outcomes.append(
+                    RepoOutcome(
+                        ident, ok, msg, duration, skipped=skipped, timed_out=timed_out
+                    )
+                )
+
+    return outcomes
+
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Per-repository snapshot of build/config files.
+
+A RepoFileSnapshot belongs to one RepoContext. Files are read lazily on
+first access, at most once, and only up to a size cap; the decoded and the
+lower-cased content are cached, so all capability matchers and layers can
+scan the same text without touching the filesystem again.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Build files are small; anything beyond this is truncated for scanning.
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+
+FileStat = Tuple[str, Optional[int], Optional[int]]
+
+
+class RepoFileSnapshot:
+    """Lazy, cached, size-capped read access to files inside a repository."""
+
+    def __init__(self, repo_dir: str, max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> None:
+        self.repo_dir = repo_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._text: Dict[str, Optional[str]] = {}
+        self._lower: Dict[str, Optional[str]] = {}
+        self._globs: Dict[str, List[str]] = {}
+        # Free-form per-repo memo (e.g. the capability matrix).
+        self.memo: Dict[str, object] = {}
+
+    def path(self, rel_or_abs: str) -> str:
+        return os.path.join(self.repo_dir, rel_or_abs)
+
+    def exists(self, rel_or_abs: str) -> bool:
+        return self.text(rel_or_abs) is not None
+
+    def text(self, rel_or_abs: str) -> Optional[str]:
+        """Return the (possibly truncated) file content, or None if unreadable."""
+        path = self.path(rel_or_abs)
+        with self._lock:
+            if path in self._text:
+                return self._text[path]
+
+        content: Optional[str] = None
+        if os.path.isfile(path):
+            try:
+                with open(path, "rb") as f:
+                    content = f.read(self.max_bytes).decode("utf-8", errors="replace")
+            except OSError:
+                content = None
+
+        with self._lock:
+            self._text[path] = content
+        return content
+
+    def lower(self, rel_or_abs: str) -> Optional[str]:
+        """Return the lower-cased content (cached), or None if unreadable."""
+        path = self.path(rel_or_abs)
+        with self._lock:
+            if path in self._lower:
+                return self._lower[path]
+        content = self.text(path)
+        lowered = content.lower() if content is not None else None
+        with self._lock:
+            self._lower[path] = lowered
+        return lowered
+
+    def glob(self, pattern: str) -> List[str]:
+        """Return sorted matches of ``pattern`` relative to the repo (cached)."""
+        with self._lock:
+            if pattern in self._globs:
+                return self._globs[pattern]
+        matches = sorted(glob.glob(self.path(pattern)))
+        with self._lock:
+            self._globs[pattern] = matches
+        return matches
+
+    def stat_signature(self, rel_paths: Sequence[str]) -> List[FileStat]:
+        """
+        Return ``(relpath, mtime_ns, size)`` for each path (None values for
+        missing files); suitable as a cache key for derived data.
+        """
+        signature: List[FileStat] = []
+        for rel in rel_paths:
+            try:
+                st = os.stat(self.path(rel))
+                signature.append((rel, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append((rel, None, None))
+        return signature
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Template venvs for fast per-repository venv creation.
+
+``python -m venv`` bootstraps pip through ensurepip, which takes seconds per
+venv. Instead, pkgmgr creates one template venv per interpreter and
+TEMPLATE_VERSION in its cache directory::
+
+    <cache>/venv-templates/<interpreter key>-v<TEMPLATE_VERSION>/
+
+and clones it for every new per-repository venv:
+
+  - files are reflinked (``cp --reflink=always``) where the filesystem
+    supports it, else hardlinked, else copied; ``__pycache__`` is left out
+    of hardlinked clones so each venv compiles its own bytecode;
+  - files that embed the template's location (activation scripts,
+    pyvenv.cfg, console-script shebangs in bin/) are rewritten into fresh
+    files, so hardlinks to the template are never modified.
+
+pip replaces files instead of writing into them, so installing into a
+hardlinked clone leaves the template untouched. The interpreter key covers
+the interpreter's real path and version, i.e. a Python upgrade gets a new
+template. ``PKGMGR_VENV_TEMPLATE=0`` disables templates (plain
+``python -m venv``).
+"""
+
+from __future__ import annotations
+
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import Optional
+
+from pkgmgr.core.command.process import run_process
+from pkgmgr.core.state.paths import cache_dir
+
+TEMPLATE_ENV = "PKGMGR_VENV_TEMPLATE"
+TEMPLATE_VERSION = 1
+MARKER_FILE = ".pkgmgr-template.json"
+
+_LOCK = threading.Lock()
+
+
+def templates_enabled() -> bool:
+    return os.environ.get(TEMPLATE_ENV, "").strip() != "0"
+
+
+def _interpreter_key(python: str) -> Optional[str]:
+    real = os.path.realpath(python)
+    if real == os.path.realpath(sys.executable):
+        version = sys.version
+    else:
+        try:
+            p = run_process(
+                [python, "-c", "import sys; print(sys.version)"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError:
+            return None
+        if p.returncode != 0:
+            return None
+        version = p.stdout.strip()
+    digest = hashlib.sha256(f"{real}\n{version}".encode("utf-8")).hexdigest()
+    return f"py{version.split()[0]}-{digest[:12]}"
+
+
+def template_dir(python: str) -> Optional[str]:
+    """Location of the template venv for ``python`` (None if unknown)."""
+    key = _interpreter_key(python)
+    if key is None:
+        return None
+    return os.path.join(
+        cache_dir(create=False), "venv-templates", f"{key}-v{TEMPLATE_VERSION}"
+    )
+
+
+def _read_origin(template: str) -> Optional[str]:
+    try:
+        with open(os.path.join(template, MARKER_FILE), "r", encoding="utf-8") as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(marker, dict) or marker.get("version") != TEMPLATE_VERSION:
+        return None
+    origin = marker.get("origin")
+    return origin if isinstance(origin, str) and origin else None
+
+
+def ensure_template(python: str) -> Optional[str]:
+    """
+    Return the template venv for ``python``, creating it on first use
+    (None if it cannot be created).
+    """
+    target = template_dir(python)
+    if target is None:
+        return None
+    if _read_origin(target):
+        return target
+
+    parent = os.path.dirname(target)
+    with _LOCK:
+        try:
+            os.makedirs(parent, exist_ok=True)
+            with open(os.path.join(parent, ".lock"), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    if _read_origin(target):
+                        return target
+                    return _build_template(python, target)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        except OSError as exc:
+            print(f"[venv] Template venv unavailable ({exc}).")
+            return None
+
+
+def _build_template(python: str, target: str) -> Optional[str]:
+    shutil.rmtree(target, ignore_errors=True)
+    # Built at a unique path that is recorded as the "origin" to rewrite;
+    # a unique string is safe to replace in the cloned files.
+    origin = tempfile.mkdtemp(dir=os.path.dirname(target), prefix=".build-")
+    print(f"[venv] Creating template venv for {python}...")
+    p = run_process([python, "-m", "venv", origin])
+    if p.returncode != 0:
+        shutil.rmtree(origin, ignore_errors=True)
+        return None
+    with open(os.path.join(origin, MARKER_FILE), "w", encoding="utf-8") as f:
+        json.dump({"version": TEMPLATE_VERSION, "origin": origin}, f)
+    os.rename(origin, target)
+    return target
+
+
+def _reflink_tree(src: str, dst: str) -> bool:
+    try:
+        p = run_process(
+            ["cp", "-a", "--reflink=always", src, dst],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return False
+    if p.returncode != 0:
+        shutil.rmtree(dst, ignore_errors=True)
+        return False
+    return True
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError as exc:
+        if exc.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+        shutil.copy2(src, dst)
+
+
+def _rewrite(path: str, old: bytes, new: bytes) -> None:
+    """Replace ``old`` by ``new`` in ``path`` via a fresh file (breaks links)."""
+    if os.path.islink(path) or not os.path.isfile(path):
+        return
+    with open(path, "rb") as f:
+        data = f.read()
+    if old not in data:
+        return
+    mode = os.stat(path).st_mode
+    tmp = f"{path}.pkgmgr-tmp"
+    with open(tmp, "wb") as f:
+        f.write(data.replace(old, new))
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+
+
+def clone_template(template: str, venv_dir: str) -> bool:
+    """Create ``venv_dir`` as a clone of ``template``; False on failure."""
+    origin = _read_origin(template)
+    if origin is None or os.path.exists(venv_dir):
+        return False
+    parent = os.path.dirname(os.path.abspath(venv_dir))
+    staging = None
+    try:
+        os.makedirs(parent, exist_ok=True)
+        # Clone next to the target and rename, so a venv is never half made.
+        staging = tempfile.mkdtemp(dir=parent, prefix=".pkgmgr-venv-")
+        os.rmdir(staging)
+        if not _reflink_tree(template, staging):
+            shutil.copytree(
+                template,
+                staging,
+                symlinks=True,
+                copy_function=_link_or_copy,
+                ignore=shutil.ignore_patterns("__pycache__"),
+            )
+        os.remove(os.path.join(staging, MARKER_FILE))
+
+        old = origin.encode("utf-8")
+        new = os.path.abspath(venv_dir).encode("utf-8")
+        _rewrite(os.path.join(staging, "pyvenv.cfg"), old, new)
+        bin_dir = os.path.join(staging, "bin")
+        for name in os.listdir(bin_dir):
+            _rewrite(os.path.join(bin_dir, name), old, new)
+        os.rename(staging, venv_dir)
+    except OSError as exc:
+        print(f"[venv] Cloning template venv failed ({exc}).")
+        if staging:
+            shutil.rmtree(staging, ignore_errors=True)
+        return False
+    return True
+
+
+def create_venv(python: str, venv_dir: str) -> bool:
+    """
+    Create ``venv_dir`` from the template venv of ``python``; False if
+    templates are disabled or unusable (callers fall back to ``-m venv``).
+    """
+    if not templates_enabled():
+        return False
+    template = ensure_template(python)
+    return template is not None and clone_template(template, venv_dir)
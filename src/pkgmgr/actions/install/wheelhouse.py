@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared wheelhouse of the Python installer.
+
+Instead of letting ``pip install .`` build the project and every dependency
+from scratch in each per-repository venv, built wheels are kept in one
+directory shared by all repositories and runs::
+
+    <cache>/wheelhouse/
+      projects/<name>/<version>/<commit>/<wheel>   wheel of a repository
+      deps/                                        dependency wheels
+
+A project wheel is reused while the repository's name, version and HEAD
+commit are unchanged (dirty working trees are never cached). Dependency
+wheels are found by pip via ``--find-links``, so an install whose
+dependencies are all present needs neither the index nor a compiler.
+
+The wheelhouse lives in pkgmgr's cache directory; ``PKGMGR_WHEELHOUSE``
+points it elsewhere or disables it (``0``). Writers of ``deps/`` hold an
+exclusive file lock, readers a shared one.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import glob
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from pkgmgr.core.git.errors import GitBaseError
+from pkgmgr.core.git.queries import get_head_commit, get_worktree_changes
+from pkgmgr.core.state.paths import cache_dir
+from pkgmgr.core.version.source import (
+    read_pyproject_project_name,
+    read_pyproject_version,
+)
+
+WHEELHOUSE_ENV = "PKGMGR_WHEELHOUSE"
+
+
+def wheelhouse_dir() -> Optional[str]:
+    """The wheelhouse directory, or None if disabled."""
+    explicit = os.environ.get(WHEELHOUSE_ENV, "").strip()
+    if explicit == "0":
+        return None
+    if explicit:
+        return os.path.abspath(os.path.expanduser(explicit))
+    return os.path.join(cache_dir(create=False), "wheelhouse")
+
+
+def _normalize(name: str) -> str:
+    # PEP 503 normalization, also keeps the path component safe.
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@dataclass(frozen=True)
+class ProjectKey:
+    name: str
+    version: str
+    commit: str
+
+    def parts(self) -> tuple:
+        return (self.name, self.version, self.commit)
+
+
+def project_key(repo_dir: str) -> Optional[ProjectKey]:
+    """
+    (name, version, commit) of a clean checkout with a PEP 621 name; None
+    if the project wheel must not be cached. A dynamic version is keyed as
+    "dynamic" (the commit still pins the content).
+    """
+    name = read_pyproject_project_name(repo_dir)
+    if not name or not os.path.isdir(repo_dir):
+        return None
+    try:
+        commit = get_head_commit(cwd=repo_dir)
+        if not commit or get_worktree_changes(cwd=repo_dir):
+            return None
+    except GitBaseError:
+        return None
+    version = read_pyproject_version(repo_dir) or "dynamic"
+    return ProjectKey(_normalize(name), re.sub(r"[^\w.+!-]", "_", version), commit)
+
+
+class Wheelhouse:
+    """Directory of project and dependency wheels shared across repositories."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.deps = os.path.join(root, "deps")
+        self.projects = os.path.join(root, "projects")
+
+    def project_dir(self, key: ProjectKey) -> str:
+        return os.path.join(self.projects, *key.parts())
+
+    def project_wheel(self, key: ProjectKey) -> Optional[str]:
+        """The cached wheel of ``key``, if any."""
+        wheels = sorted(glob.glob(os.path.join(self.project_dir(key), "*.whl")))
+        return wheels[-1] if wheels else None
+
+    def staging_dir(self) -> str:
+        """A fresh directory to build into (same filesystem as the cache)."""
+        os.makedirs(self.projects, exist_ok=True)
+        return tempfile.mkdtemp(dir=self.projects, prefix=".build-")
+
+    def store_project_wheel(self, key: ProjectKey, built: str) -> str:
+        """Move a freshly built wheel into its project slot; return its path."""
+        target_dir = self.project_dir(key)
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, os.path.basename(built))
+        os.replace(built, target)
+        return target
+
+    @contextmanager
+    def locked(self, shared: bool) -> Iterator[None]:
+        """Hold the deps/ lock (shared for readers, exclusive for writers)."""
+        os.makedirs(self.deps, exist_ok=True)
+        with open(os.path.join(self.root, ".lock"), "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
@@ -5,6 +5,7 @@ from typing import List
 from pkgmgr.core.git.queries import probe_remote_reachable_detail
 from pkgmgr.core.remote_provisioning import ProviderHint, RepoSpec, set_repo_visibility
 from pkgmgr.core.remote_provisioning.visibility import VisibilityOptions
+from pkgmgr.core.resources.governor import NETWORK, acquire
 
 from .context import build_context
 from .git_remote import determine_primary_remote_url, ensure_origin_remote
@@ -71,7 +72,8 @@ def _print_probe_result(name: str | None, url: str, *, cwd: str) -> None:
     """
     Print probe result for a git remote URL, including a short failure reason.
     """
-    ok, reason = probe_remote_reachable_detail(url, cwd=cwd)
+    with acquire(NETWORK):
+        ok, reason = probe_remote_reachable_detail(url, cwd=cwd)
 
     prefix = f"{name}: " if name else ""
     if ok:
@@ -1,9 +1,77 @@
 import os
+from pkgmgr.actions.repository._parallel import execute_on_repos
 from pkgmgr.core.repository.identifier import get_repo_identifier
 from pkgmgr.core.repository.dir import get_repo_dir
-from pkgmgr.core.command.run import run_command
+from pkgmgr.core.command.run import OUTPUT_LOCK, run_command
+from pkgmgr.core.resources.governor import BUILD, NETWORK
 import sys
 
+OUTPUT_MODES = ("prefix", "group")
+# Proxied git subcommands that talk to a remote.
+GIT_NETWORK_COMMANDS = {"clone", "fetch", "pull", "push", "ls-remote"}
+
+
+def print_grouped_output(repo_identifier: str, full_cmd: str, result) -> None:
+    """Print the captured output of one repository as a single block."""
+    with OUTPUT_LOCK:
+        print(f"===== {repo_identifier}: {full_cmd} (exit {result.returncode}) =====")
+        log_path = getattr(result, "log_path", None)
+        if log_path:
+            print(f"(full output log: {log_path})")
+        if result.stdout:
+            print(result.stdout, end="" if result.stdout.endswith("\n") else "\n")
+        if result.stderr:
+            print(
+                result.stderr,
+                end="" if result.stderr.endswith("\n") else "\n",
+                file=sys.stderr,
+            )
+
+
+def _exec_parallel(
+    repos,
+    full_cmd: str,
+    preview: bool,
+    jobs: int,
+    output_mode: str,
+    fail_fast: bool,
+    op_name: str,
+    resource: str = BUILD,
+) -> None:
+    """Run full_cmd in all repos concurrently with prefixed or grouped output."""
+    idents = {rd: ident for ident, rd in repos}
+    exit_codes = {}
+
+    def _run_one(repo_dir: str):
+        ident = idents[repo_dir]
+        grouped = output_mode == "group"
+        result = run_command(
+            full_cmd,
+            cwd=repo_dir,
+            preview=preview,
+            allow_failure=True,
+            prefix="" if grouped else f"[{ident}] ",
+            stream=not grouped,
+        )
+        if grouped and not preview:
+            print_grouped_output(ident, full_cmd, result)
+        exit_codes[ident] = result.returncode
+        if result.returncode != 0:
+            return (False, f"exit code {result.returncode}")
+        return (True, "")
+
+    outcomes = execute_on_repos(
+        repos,
+        _run_one,
+        jobs=jobs,
+        op_name=op_name,
+        fail_fast=fail_fast,
+        resource=resource,
+    )
+    failed = [o.ident for o in outcomes if not o.ok and not o.skipped]
+    if failed:
+        sys.exit(max(exit_codes.get(ident) or 1 for ident in failed))
+
 
 def exec_proxy_command(
     proxy_prefix: str,
@@ -13,11 +81,23 @@ def exec_proxy_command(
     proxy_command: str,
     extra_args,
     preview: bool,
+    jobs: int = 1,
+    output_mode: str = "prefix",
+    fail_fast: bool = False,
 ):
-    """Execute a given proxy command with extra arguments for each repository."""
-    error_repos = []
-    max_exit_code = 0
+    """
+    Execute a given proxy command with extra arguments for each repository.
 
+    With jobs > 1 the repositories are processed concurrently; output is
+    either multiplexed line by line with a ``[repo]`` prefix
+    (output_mode="prefix") or collected and printed per repository once it
+    finished (output_mode="group"), followed by a summary with durations.
+    With fail_fast=True no further repositories are started after the first
+    failure.
+    """
+    full_cmd = f"{proxy_prefix} {proxy_command} {' '.join(extra_args)}"
+
+    repos = []
     for repo in selected_repos:
         repo_identifier = get_repo_identifier(repo, all_repos)
         repo_dir = get_repo_dir(repositories_base_dir, repo)
@@ -25,8 +105,32 @@ def exec_proxy_command(
         if not os.path.exists(repo_dir):
             print(f"Repository directory '{repo_dir}' not found for {repo_identifier}.")
             continue
+        repos.append((repo_identifier, repo_dir))
+
+    if jobs > 1 and len(repos) > 1:
+        _exec_parallel(
+            repos,
+            full_cmd,
+            preview,
+            jobs,
+            output_mode,
+            fail_fast,
+            op_name=f"{proxy_prefix} {proxy_command}",
+            resource=(
+                NETWORK
+                if proxy_prefix == "git" and proxy_command in GIT_NETWORK_COMMANDS
+                else BUILD
+            ),
+        )
+        return
 
-        full_cmd = f"{proxy_prefix} {proxy_command} {' '.join(extra_args)}"
+    error_repos = []
+    max_exit_code = 0
+
+    for repo_identifier, repo_dir in repos:
+        if fail_fast and error_repos:
+            print(f"[SKIP] {repo_identifier} (--fail-fast)")
+            continue
 
         try:
             run_command(full_cmd, cwd=repo_dir, preview=preview)
@@ -2,11 +2,19 @@ from __future__ import annotations
 
 import os
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Callable, Dict, List, Tuple
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from pkgmgr.core.command.process import watch_timeouts
+from pkgmgr.core.progress.display import ProgressDisplay
 from pkgmgr.core.repository.dir import get_repo_dir
 from pkgmgr.core.repository.identifier import get_repo_identifier
+from pkgmgr.core.resources.governor import acquire
+from pkgmgr.core.state.history import RunHistory, open_run_history
 
 Repository = Dict[str, Any]
 RepoRef = Tuple[str, str]
@@ -14,6 +22,19 @@ OpResult = Tuple[bool, str]
 RepoOp = Callable[[str], OpResult]
 
 
+@dataclass
+class RepoOutcome:
+    """Result of one repository operation inside a (parallel) batch."""
+
+    ident: str
+    ok: bool
+    msg: str = ""
+    duration: float = 0.0
+    skipped: bool = False
+    # A command of this operation exceeded its timeout and was terminated.
+    timed_out: bool = False
+
+
 def resolve_repos(
     selected_repos: List[Repository],
     repositories_base_dir: str,
@@ -36,56 +57,217 @@ def resolve_repos(
     return resolved
 
 
-def run_on_repos(
+def _timed(
+    op: RepoOp,
+    repo_dir: str,
+    resource: Optional[str] = None,
+    on_start: Optional[Callable[[], None]] = None,
+) -> Tuple[bool, str, float, bool]:
+    # The duration excludes the wait for a governor token.
+    with acquire(resource), watch_timeouts() as watch:
+        if on_start is not None:
+            on_start()
+        start = time.monotonic()
+        try:
+            ok, msg = op(repo_dir)
+        except SystemExit as exc:
+            ok, msg = False, f"exited with code {exc.code}"
+        except Exception as exc:
+            # One repository's error must not lose the others' results.
+            ok, msg = False, f"failed: {exc}"
+        return ok, msg, time.monotonic() - start, watch.timed_out and not ok
+
+
+def longest_first(repos: List[RepoRef], expected: Dict[str, float]) -> List[RepoRef]:
+    """
+    Order repos by expected duration (keyed by repo_dir), longest first.
+
+    Repos without history count with the median of the known durations;
+    ties keep the input order.
+    """
+    if not expected:
+        return list(repos)
+    known = sorted(expected.values())
+    default = known[len(known) // 2]
+    return sorted(repos, key=lambda ref: -expected.get(ref[1], default))
+
+
+def print_summary(outcomes: List[RepoOutcome], op_name: str, elapsed: float) -> None:
+    ok = sum(1 for o in outcomes if o.ok)
+    failed = sum(1 for o in outcomes if not o.ok and not o.skipped)
+    skipped = sum(1 for o in outcomes if o.skipped)
+    timed_out = sum(1 for o in outcomes if o.timed_out)
+
+    failed_text = f"{failed} failed"
+    if timed_out:
+        failed_text += f" ({timed_out} timed out)"
+    print(
+        f"\n[SUMMARY] {op_name}: {ok} ok, {failed_text}, {skipped} skipped "
+        f"in {elapsed:.1f}s"
+    )
+    for o in sorted(outcomes, key=lambda o: o.duration, reverse=True):
+        if o.skipped:
+            print(f"  SKIP          {o.ident}")
+        else:
+            status = "OK  " if o.ok else "TIME" if o.timed_out else "FAIL"
+            print(f"  {status} {o.duration:7.1f}s  {o.ident}")
+
+
+def execute_on_repos(
     repos: List[RepoRef],
     op: RepoOp,
     *,
     jobs: int,
     op_name: str,
-) -> None:
+    fail_fast: bool = False,
+    quiet: bool = False,
+    history: Optional[RunHistory] = None,
+    resource: Optional[str] = None,
+) -> List[RepoOutcome]:
     """
-    Run ``op(repo_dir) -> (ok, msg)`` for each repo, optionally in parallel.
+    Run ``op(repo_dir) -> (ok, msg)`` for each repo and return all outcomes.
 
     - ``jobs == 1``: serial, quiet on success, prints ``msg`` on failure.
     - ``jobs  > 1``: parallel via ThreadPoolExecutor, prints a banner plus
-      ``[OK]``/``[FAIL]`` per repo and a final summary.
-    - Exits with status 1 if any operation failed.
+      ``[OK]``/``[FAIL]`` per repo (with duration) and a final summary with
+      the per-repo durations, slowest first.
+    - ``fail_fast``: after the first failure no further operations are
+      started; repos that did not run are reported as skipped.
+    - ``quiet``: no banner, per-repo lines or summary (for callers that
+      produce machine-readable output themselves).
+    - ``history``: parallel batches start the repos with the longest
+      expected duration first; every outcome is recorded as ``op_name``.
+    - ``resource``: governor pool (pkgmgr.core.resources.governor) each
+      operation holds a token of, e.g. NETWORK for pulls.
     """
     if not repos:
-        return
+        return []
 
     effective_jobs = max(1, min(jobs, len(repos)))
-    failed: List[Tuple[str, str]] = []
+    outcomes = _execute(
+        repos, op, effective_jobs, op_name, fail_fast, quiet, history, resource
+    )
+    if history is not None:
+        dirs = dict(repos)
+        for o in outcomes:
+            if not o.skipped:
+                history.record(dirs[o.ident], op_name, o.duration, o.ok, label=o.ident)
+    return outcomes
+
+
+def _execute(
+    repos: List[RepoRef],
+    op: RepoOp,
+    effective_jobs: int,
+    op_name: str,
+    fail_fast: bool,
+    quiet: bool,
+    history: Optional[RunHistory],
+    resource: Optional[str],
+) -> List[RepoOutcome]:
+    outcomes: List[RepoOutcome] = []
 
     if effective_jobs == 1:
         for ident, rd in repos:
-            ok, msg = op(rd)
-            if not ok:
+            if fail_fast and any(not o.ok for o in outcomes):
+                outcomes.append(RepoOutcome(ident, ok=False, skipped=True))
+                continue
+            ok, msg, duration, timed_out = _timed(op, rd, resource)
+            if not ok and not quiet:
                 print(msg)
-                failed.append((ident, msg))
-    else:
+            outcomes.append(
+                RepoOutcome(ident, ok, msg, duration, timed_out=timed_out)
+            )
+        return outcomes
+
+    if not quiet:
         print(
             f"[{op_name.upper()}] Running {len(repos)} {op_name}(s) with up to "
             f"{effective_jobs} parallel jobs..."
         )
-        with ThreadPoolExecutor(max_workers=effective_jobs) as executor:
-            futures = {executor.submit(op, rd): ident for ident, rd in repos}
+    expected: Dict[str, float] = {}
+    if history is not None:
+        by_dir = history.expected_durations(op_name, [rd for _i, rd in repos])
+        repos = longest_first(repos, by_dir)
+        expected = {ident: by_dir[rd] for ident, rd in repos if rd in by_dir}
+    start = time.monotonic()
+    display = None if quiet else ProgressDisplay(op_name, len(repos), expected=expected)
+    executor = ThreadPoolExecutor(max_workers=effective_jobs)
+    futures: Dict[Future, str] = {}
+    try:
+        with display or nullcontext():
+            for ident, rd in repos:
+                on_start = partial(display.start, ident) if display else None
+                futures[executor.submit(_timed, op, rd, resource, on_start)] = ident
             for future in as_completed(futures):
                 ident = futures[future]
-                ok, msg = future.result()
-                if ok:
-                    print(f"[OK]   {ident}")
-                else:
-                    print(f"[FAIL] {ident}")
-                    for line in msg.splitlines():
-                        print(f"       {line}")
-                    failed.append((ident, msg))
-
-    if failed:
-        if effective_jobs > 1:
-            print(
-                f"\n[SUMMARY] {len(failed)} of {len(repos)} {op_name}(s) failed:"
-            )
-            for ident, _msg in failed:
-                print(f"  - {ident}")
+                if future.cancelled():
+                    if display is not None:
+                        display.skip(ident)
+                    continue
+                ok, msg, duration, timed_out = future.result()
+                outcomes.append(
+                    RepoOutcome(ident, ok, msg, duration, timed_out=timed_out)
+                )
+                if display is not None:
+                    display.finish(
+                        ident, ok, duration, msg=msg, timed_out=timed_out
+                    )
+                if not ok and fail_fast:
+                    for pending in futures:
+                        pending.cancel()
+    except KeyboardInterrupt:
+        # Children were terminated by the interrupt handler; do not start
+        # the repositories that are still queued.
+        for pending in futures:
+            pending.cancel()
+        raise
+    finally:
+        executor.shutdown(wait=True)
+
+    done = {o.ident for o in outcomes}
+    outcomes.extend(
+        RepoOutcome(ident, ok=False, skipped=True)
+        for ident, _rd in repos
+        if ident not in done
+    )
+
+    if not quiet:
+        print_summary(outcomes, op_name, time.monotonic() - start)
+    return outcomes
+
+
+def run_on_repos(
+    repos: List[RepoRef],
+    op: RepoOp,
+    *,
+    jobs: int,
+    op_name: str,
+    fail_fast: bool = False,
+    record: bool = False,
+    resource: Optional[str] = None,
+) -> None:
+    """
+    Run ``op`` for each repo via :func:`execute_on_repos`.
+
+    With ``record`` the outcomes are stored in the run history, which also
+    orders parallel batches longest-expected-first.
+
+    Exits with status 1 if any operation failed.
+    """
+    history = open_run_history() if record else None
+    try:
+        outcomes = execute_on_repos(
+            repos,
+            op,
+            jobs=jobs,
+            op_name=op_name,
+            fail_fast=fail_fast,
+            history=history,
+            resource=resource,
+        )
+    finally:
+        if history is not None:
+            history.close()
+    if any(not o.ok for o in outcomes):
         sys.exit(1)
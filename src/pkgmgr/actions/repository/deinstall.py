@@ -1,5 +1,6 @@
 import os
 
+from pkgmgr.actions.install.ledger import InstallLedger
 from pkgmgr.core.command.run import run_command
 from pkgmgr.core.repository.dir import get_repo_dir
 from pkgmgr.core.repository.identifier import get_repo_identifier
@@ -50,3 +51,10 @@ def deinstall_repos(
                 print(
                     f"[Warning] Failed to run 'make deinstall' for {repo_identifier}: {e}"
                 )
+
+        # Next install must run the installers again.
+        if not preview:
+            try:
+                InstallLedger().forget(repo_dir)
+            except OSError:
+                pass
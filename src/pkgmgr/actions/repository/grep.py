@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fleet-wide code search: run ``git grep`` in every selected repository.
+
+Repositories are searched concurrently with a bounded worker pool; the
+results of each repository are printed as one block as soon as that
+repository finished, every line prefixed with the repository identifier:
+
+  default             <repo>:<path>:<line>:<text>
+  --count             <repo>:<path>:<count>
+  --files-with-matches <repo>:<path>
+
+With ``json_output`` one NDJSON record per match is written instead.
+Exit status follows grep(1): 0 if anything matched, 1 if nothing matched,
+2 if the search failed in at least one repository.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any, Dict, List
+
+from pkgmgr.actions.repository._parallel import execute_on_repos, resolve_repos
+from pkgmgr.core.command.run import OUTPUT_LOCK
+from pkgmgr.core.git.errors import GitBaseError
+from pkgmgr.core.git.queries import GrepMatch, list_grep_matches
+from pkgmgr.core.resources.governor import BUILD
+
+Repository = Dict[str, Any]
+
+
+def _format_line(ident: str, match: GrepMatch) -> str:
+    if match.count is not None:
+        return f"{ident}:{match.path}:{match.count}"
+    if match.line is None:
+        return f"{ident}:{match.path}"
+    return f"{ident}:{match.path}:{match.line}:{match.text}"
+
+
+def _record(ident: str, match: GrepMatch) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"repository": ident, "path": match.path}
+    if match.count is not None:
+        record["count"] = match.count
+    elif match.line is not None:
+        record["line"] = match.line
+        record["text"] = match.text
+    return record
+
+
+def grep_repos(
+    selected_repos: List[Repository],
+    repositories_base_dir: str,
+    all_repos: List[Repository],
+    pattern: str,
+    *,
+    jobs: int = 1,
+    count: bool = False,
+    files_with_matches: bool = False,
+    ignore_case: bool = False,
+    fixed_strings: bool = False,
+    json_output: bool = False,
+    fail_fast: bool = False,
+) -> None:
+    """
+    Search ``pattern`` in the tracked files of all selected repositories.
+
+    Exits with status 1 if nothing matched and 2 if ``git grep`` failed in
+    any repository; returns normally if there was at least one match and no
+    failure.
+    """
+    repos = resolve_repos(selected_repos, repositories_base_dir, all_repos)
+    idents = {rd: ident for ident, rd in repos}
+    matched: List[str] = []
+
+    def _search(repo_dir: str):
+        ident = idents[repo_dir]
+        try:
+            matches = list_grep_matches(
+                pattern,
+                cwd=repo_dir,
+                count=count,
+                files_with_matches=files_with_matches,
+                ignore_case=ignore_case,
+                fixed_strings=fixed_strings,
+            )
+        except GitBaseError as exc:
+            return (False, f"[ERROR] git grep failed in {ident}: {exc}")
+
+        if matches:
+            matched.append(ident)
+            if json_output:
+                lines = [json.dumps(_record(ident, m)) for m in matches]
+            else:
+                lines = [_format_line(ident, m) for m in matches]
+            with OUTPUT_LOCK:
+                print("\n".join(lines), flush=True)
+        return (True, "")
+
+    outcomes = execute_on_repos(
+        repos,
+        _search,
+        jobs=jobs,
+        op_name="grep",
+        fail_fast=fail_fast,
+        quiet=True,
+        resource=BUILD,
+    )
+
+    failed = [o for o in outcomes if not o.ok and not o.skipped]
+    for outcome in failed:
+        print(outcome.msg, file=sys.stderr)
+    if failed:
+        sys.exit(2)
+    if not matched:
+        sys.exit(1)
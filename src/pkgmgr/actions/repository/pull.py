@@ -9,11 +9,12 @@ from pkgmgr.core.git.commands import pull_args, GitPullArgsError
 from pkgmgr.core.repository.identifier import get_repo_identifier
 from pkgmgr.core.repository.dir import get_repo_dir
 from pkgmgr.core.repository.verify import verify_repository
+from pkgmgr.core.resources.governor import BUILD, NETWORK, acquire
 
 Repository = Dict[str, Any]
 
 
-def _pull_one(repo_dir: str, extra_args: List[str], preview: bool) -> Tuple[bool, str]:
+def pull_one(repo_dir: str, extra_args: List[str], preview: bool) -> Tuple[bool, str]:
     try:
         pull_args(extra_args, cwd=repo_dir, preview=preview)
         return (True, "")
@@ -27,9 +28,10 @@ def _verify_one(
     no_verification: bool,
 ) -> Tuple[bool, bool, List[str]]:
     """Returns (has_verified_info, verified_ok, errors)."""
-    verified_ok, errors, _commit, _key = verify_repository(
-        repo, repo_dir, mode="pull", no_verification=no_verification,
-    )
+    with acquire(BUILD):
+        verified_ok, errors, _commit, _key = verify_repository(
+            repo, repo_dir, mode="pull", no_verification=no_verification,
+        )
     return (bool(repo.get("verified")), verified_ok, errors)
 
 
@@ -61,6 +63,38 @@ def _verify_all(
     ]
 
 
+def confirm_pulls(
+    candidates: List[Tuple[Repository, str, str]],
+    no_verification: bool,
+    preview: bool,
+    jobs: int = 1,
+) -> List[Tuple[Repository, str, str, bool]]:
+    """
+    Verify ``(repo, ident, repo_dir)`` candidates and ask about failures.
+
+    Verification runs in parallel when ``jobs > 1``; prompts are asked
+    serially on the calling thread. Returns the approved candidates as
+    ``(repo, ident, repo_dir, overridden)`` where ``overridden`` is True if
+    the user chose to proceed despite a failed verification.
+    """
+    verify_results = _verify_all(candidates, no_verification, jobs)
+
+    approved: List[Tuple[Repository, str, str, bool]] = []
+    for (repo, _ident, _rd), result in zip(candidates, verify_results):
+        ident, rd, has_verified_info, verified_ok, errors = result
+        overridden = False
+        if not preview and not no_verification and has_verified_info and not verified_ok:
+            print(f"Warning: Verification failed for {ident}:")
+            for err in errors:
+                print(f"  - {err}")
+            choice = input("Proceed with 'git pull'? (y/N): ").strip().lower()
+            if choice != "y":
+                continue
+            overridden = True
+        approved.append((repo, ident, rd, overridden))
+    return approved
+
+
 def pull_with_verification(
     selected_repos: List[Repository],
     repositories_base_dir: str,
@@ -69,6 +103,7 @@ def pull_with_verification(
     no_verification: bool,
     preview: bool,
     jobs: int = 1,
+    fail_fast: bool = False,
 ) -> None:
     """
     Execute `git pull` for each repository with verification.
@@ -91,22 +126,19 @@ def pull_with_verification(
     if not candidates:
         return
 
-    verify_results = _verify_all(candidates, no_verification, jobs)
-
-    approved: List[RepoRef] = []
-    for ident, rd, has_verified_info, verified_ok, errors in verify_results:
-        if not preview and not no_verification and has_verified_info and not verified_ok:
-            print(f"Warning: Verification failed for {ident}:")
-            for err in errors:
-                print(f"  - {err}")
-            choice = input("Proceed with 'git pull'? (y/N): ").strip().lower()
-            if choice != "y":
-                continue
-        approved.append((ident, rd))
+    approved: List[RepoRef] = [
+        (ident, rd)
+        for _repo, ident, rd, _overridden in confirm_pulls(
+            candidates, no_verification, preview, jobs
+        )
+    ]
 
     run_on_repos(
         approved,
-        lambda rd: _pull_one(rd, extra_args, preview),
+        lambda rd: pull_one(rd, extra_args, preview),
         jobs=jobs,
         op_name="pull",
+        fail_fast=fail_fast,
+        record=not preview,
+        resource=NETWORK,
     )
@@ -7,6 +7,7 @@ from pkgmgr.actions.repository._parallel import (
     run_on_repos,
 )
 from pkgmgr.core.git.commands import push_args, GitPushArgsError
+from pkgmgr.core.resources.governor import NETWORK
 
 Repository = Dict[str, Any]
 
@@ -26,6 +27,7 @@ def push_in_parallel(
     extra_args: List[str],
     preview: bool,
     jobs: int = 1,
+    fail_fast: bool = False,
 ) -> None:
     """
     Execute `git push` for each repository, optionally in parallel.
@@ -36,4 +38,7 @@ def push_in_parallel(
         lambda rd: _push_one(rd, extra_args, preview),
         jobs=jobs,
         op_name="push",
+        fail_fast=fail_fast,
+        record=not preview,
+        resource=NETWORK,
     )
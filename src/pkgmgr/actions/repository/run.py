@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fan-out runner: execute an arbitrary command in every selected repository.
+
+Builds on run_command() and the shared repository runner:
+
+  - bounded worker pool (``jobs``)
+  - optional per-repository timeout
+  - live ``[repo]``-prefixed output or output grouped per repository
+  - exit-code aggregation (highest exit code wins)
+  - optional NDJSON result records (one JSON object per line on stdout)
+"""
+
+from __future__ import annotations
+
+import json
+import shlex
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from pkgmgr.actions.proxy import print_grouped_output
+from pkgmgr.actions.repository._parallel import execute_on_repos, resolve_repos
+from pkgmgr.core.command.run import OUTPUT_LOCK, run_command
+from pkgmgr.core.resources.governor import BUILD
+
+Repository = Dict[str, Any]
+
+
+def _record(
+    ident: str,
+    repo_dir: str,
+    result,
+    duration: float,
+) -> Dict[str, Any]:
+    return {
+        "repository": ident,
+        "directory": repo_dir,
+        "exit_code": result.returncode,
+        "timed_out": bool(getattr(result, "timed_out", False)),
+        "duration": round(duration, 3),
+        "stdout": result.stdout or "",
+        "stderr": result.stderr or "",
+    }
+
+
+def run_in_repos(
+    selected_repos: List[Repository],
+    repositories_base_dir: str,
+    all_repos: List[Repository],
+    command: List[str],
+    *,
+    preview: bool = False,
+    jobs: int = 1,
+    timeout: Optional[float] = None,
+    output_mode: str = "prefix",
+    fail_fast: bool = False,
+    json_output: bool = False,
+) -> None:
+    """
+    Run ``command`` in each repository.
+
+    ``command`` is an argv list executed without a shell; a single element
+    (e.g. ``"make test && make lint"``) is run through the shell instead.
+
+    With ``json_output`` the command output is captured instead of streamed
+    and one NDJSON record per repository is written to stdout as soon as that
+    repository finished; human-readable progress lines are suppressed.
+
+    Exits with the highest exit code of all failed repositories.
+    """
+    if not command:
+        print("[ERROR] 'run' requires a command after '--'.")
+        sys.exit(2)
+
+    cmd = command[0] if len(command) == 1 else list(command)
+    full_cmd = " ".join(shlex.quote(part) for part in command)
+    repos = resolve_repos(selected_repos, repositories_base_dir, all_repos)
+    idents = {rd: ident for ident, rd in repos}
+    exit_codes: Dict[str, int] = {}
+    grouped = json_output or output_mode == "group"
+
+    def _run_one(repo_dir: str):
+        ident = idents[repo_dir]
+        start = time.monotonic()
+        try:
+            result = run_command(
+                cmd,
+                cwd=repo_dir,
+                preview=preview,
+                allow_failure=True,
+                prefix="" if grouped else f"[{ident}] ",
+                stream=not grouped,
+                timeout=timeout,
+            )
+        except OSError as exc:
+            # A program that cannot be started (argv form); the shell form
+            # reports the same 127.
+            result = subprocess.CompletedProcess(cmd, 127, "", f"{exc}\n")
+            if not grouped:
+                with OUTPUT_LOCK:
+                    print(f"[{ident}] {exc}", file=sys.stderr)
+        duration = time.monotonic() - start
+        exit_codes[ident] = result.returncode
+
+        if json_output:
+            line = json.dumps(_record(ident, repo_dir, result, duration))
+            with OUTPUT_LOCK:
+                print(line, flush=True)
+        elif grouped and not preview:
+            print_grouped_output(ident, full_cmd, result)
+
+        if getattr(result, "timed_out", False):
+            return (False, f"timed out after {timeout}s")
+        if result.returncode != 0:
+            return (False, f"exit code {result.returncode}")
+        return (True, "")
+
+    outcomes = execute_on_repos(
+        repos,
+        _run_one,
+        jobs=jobs,
+        op_name="run",
+        fail_fast=fail_fast,
+        quiet=json_output,
+        resource=BUILD,
+    )
+
+    failed = [o.ident for o in outcomes if not o.ok and not o.skipped]
+    if failed:
+        sys.exit(max(exit_codes.get(ident) or 1 for ident in failed))
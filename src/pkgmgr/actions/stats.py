@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+'pkgmgr stats': durations and failure rates from the run history.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import asdict
+from typing import List, Optional
+
+from pkgmgr.core.state.history import StatRow, open_run_history
+
+STATS_GROUPS = ("repo", "installer")
+
+
+def _print_table(title: str, rows: List[StatRow]) -> None:
+    print(title)
+    if not rows:
+        print("  (no recorded runs)")
+        return
+    width = max(len(r.name) for r in rows)
+    print(
+        f"  {'NAME':<{width}}  {'OPERATION':<9}  {'RUNS':>5}  {'FAIL%':>6}  "
+        f"{'P50':>8}  {'P95':>8}"
+    )
+    for r in rows:
+        print(
+            f"  {r.name:<{width}}  {r.operation:<9}  {r.runs:>5}  "
+            f"{100 * r.failure_rate:>5.1f}%  {r.p50:>7.1f}s  {r.p95:>7.1f}s"
+        )
+
+
+def show_stats(
+    *,
+    by: Optional[str] = None,
+    operation: Optional[str] = None,
+    output_format: str = "text",
+) -> None:
+    """
+    Print p50/p95 durations and failure rates per repository and/or per
+    installer, slowest (p95) first.
+    """
+    history = open_run_history(quiet=False)
+    if history is None:
+        sys.exit(1)
+    try:
+        groups = [by] if by else list(STATS_GROUPS)
+        tables = {g: history.stats(by=g, operation=operation) for g in groups}
+    finally:
+        history.close()
+
+    if output_format == "json":
+        data = {
+            g: [dict(asdict(r), failure_rate=round(r.failure_rate, 4)) for r in rows]
+            for g, rows in tables.items()
+        }
+        print(json.dumps(data, indent=2))
+        return
+
+    titles = {"repo": "Per repository:", "installer": "Per installer:"}
+    for i, (g, rows) in enumerate(tables.items()):
+        if i:
+            print()
+        _print_table(titles[g], rows)
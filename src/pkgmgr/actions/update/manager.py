@@ -5,6 +5,7 @@ from __future__ import annotations
 
 from typing import Any, Iterable, List, Tuple
 
+from pkgmgr.actions.update.pipeline import run_update_pipeline
 from pkgmgr.actions.update.system_updater import SystemUpdater
 
 
@@ -32,71 +33,107 @@ class UpdateManager:
         clone_mode: str,
         silent: bool = False,
         force_update: bool = True,
+        force: bool = False,
+        jobs: int = 1,
     ) -> None:
+        """
+        Pull and install each repository, then optionally update the system.
+
+        With jobs > 1 pulls of later repositories overlap with installs of
+        earlier ones (see pkgmgr.actions.update.pipeline); verification
+        prompts are then asked up front.
+        """
         from pkgmgr.actions.install import install_repos
+        from pkgmgr.actions.install.installers.os_packages.metadata import (
+            package_metadata,
+        )
         from pkgmgr.actions.repository.pull import pull_with_verification
+        from pkgmgr.core.command.index import executable_index
         from pkgmgr.core.repository.identifier import get_repo_identifier
 
         failures: List[Tuple[str, str]] = []
+        repos = list(selected_repos)
 
-        for repo in list(selected_repos):
-            identifier = get_repo_identifier(repo, all_repos)
-
-            try:
-                pull_with_verification(
-                    [repo],
-                    repositories_base_dir,
-                    all_repos,
-                    [],
-                    no_verification,
-                    preview,
-                )
-            except SystemExit as exc:
-                code = exc.code if isinstance(exc.code, int) else str(exc.code)
-                failures.append((identifier, f"pull failed (exit={code})"))
-                if not quiet:
-                    print(
-                        f"[Warning] update: pull failed for {identifier} (exit={code}). Continuing..."
-                    )
-                continue
-            except Exception as exc:
-                failures.append((identifier, f"pull failed: {exc}"))
-                if not quiet:
-                    print(
-                        f"[Warning] update: pull failed for {identifier}: {exc}. Continuing..."
-                    )
-                continue
-
-            try:
-                install_repos(
-                    [repo],
+        # All repositories (and pipeline workers) share one executable index
+        # and one package metadata refresh.
+        with executable_index(), package_metadata():
+            if jobs > 1 and len(repos) > 1:
+                failures = run_update_pipeline(
+                    repos,
                     repositories_base_dir,
                     bin_dir,
                     all_repos,
                     no_verification,
                     preview,
                     quiet,
-                    clone_mode,
                     update_dependencies,
-                    force_update=force_update,
+                    clone_mode,
+                    jobs=jobs,
                     silent=silent,
-                    emit_summary=False,
+                    force_update=force_update,
+                    force=force,
                 )
-            except SystemExit as exc:
-                code = exc.code if isinstance(exc.code, int) else str(exc.code)
-                failures.append((identifier, f"install failed (exit={code})"))
-                if not quiet:
-                    print(
-                        f"[Warning] update: install failed for {identifier} (exit={code}). Continuing..."
+                repos = []
+
+            for repo in repos:
+                identifier = get_repo_identifier(repo, all_repos)
+
+                try:
+                    pull_with_verification(
+                        [repo],
+                        repositories_base_dir,
+                        all_repos,
+                        [],
+                        no_verification,
+                        preview,
                     )
-                continue
-            except Exception as exc:
-                failures.append((identifier, f"install failed: {exc}"))
-                if not quiet:
-                    print(
-                        f"[Warning] update: install failed for {identifier}: {exc}. Continuing..."
+                except SystemExit as exc:
+                    code = exc.code if isinstance(exc.code, int) else str(exc.code)
+                    failures.append((identifier, f"pull failed (exit={code})"))
+                    if not quiet:
+                        print(
+                            f"[Warning] update: pull failed for {identifier} (exit={code}). Continuing..."
+                        )
+                    continue
+                except Exception as exc:
+                    failures.append((identifier, f"pull failed: {exc}"))
+                    if not quiet:
+                        print(
+                            f"[Warning] update: pull failed for {identifier}: {exc}. Continuing..."
+                        )
+                    continue
+
+                try:
+                    install_repos(
+                        [repo],
+                        repositories_base_dir,
+                        bin_dir,
+                        all_repos,
+                        no_verification,
+                        preview,
+                        quiet,
+                        clone_mode,
+                        update_dependencies,
+                        force_update=force_update,
+                        silent=silent,
+                        emit_summary=False,
+                        force=force,
                     )
-                continue
+                except SystemExit as exc:
+                    code = exc.code if isinstance(exc.code, int) else str(exc.code)
+                    failures.append((identifier, f"install failed (exit={code})"))
+                    if not quiet:
+                        print(
+                            f"[Warning] update: install failed for {identifier} (exit={code}). Continuing..."
+                        )
+                    continue
+                except Exception as exc:
+                    failures.append((identifier, f"install failed: {exc}"))
+                    if not quiet:
+                        print(
+                            f"[Warning] update: install failed for {identifier}: {exc}. Continuing..."
+                        )
+                    continue
 
         if failures and not quiet:
             print("\n[pkgmgr] Update finished with warnings:")
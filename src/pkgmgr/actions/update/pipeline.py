@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pipelined update: pull later repositories while earlier ones install.
+
+  - verification of all repositories runs first and every interactive
+    prompt is asked up front, on the main thread
+  - a pool of pull workers pulls the approved repositories
+  - install jobs run on the dependency-aware scheduler
+    (pkgmgr.actions.install.scheduler); each one starts as soon as its own
+    pull and the installs of its dependencies finished
+
+Network (pull) and CPU (build/install) work overlap, so the total time
+approaches max(pull, install) instead of their sum. Repositories that are
+not cloned yet skip the pull stage; the installer clones them. With
+``update_dependencies`` the dependencies are added to the run once, as jobs
+of their own, instead of by every install that needs them.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+from pkgmgr.actions.install.scheduler import (
+    SKIPPED,
+    InstallJob,
+    build_install_jobs,
+    run_install_jobs,
+)
+from pkgmgr.actions.repository._parallel import (
+    RepoOutcome,
+    longest_first,
+    print_summary,
+)
+from pkgmgr.core.command.process import cancelled, watch_timeouts
+from pkgmgr.core.command.run import OUTPUT_LOCK, output_prefix
+from pkgmgr.core.progress.display import ProgressDisplay
+from pkgmgr.core.repository.dir import get_repo_dir
+from pkgmgr.core.resources.governor import NETWORK, acquire
+from pkgmgr.core.state.history import open_run_history
+
+Repository = Dict[str, Any]
+
+
+def run_update_pipeline(
+    selected_repos: List[Repository],
+    repositories_base_dir: str,
+    bin_dir: str,
+    all_repos: List[Repository],
+    no_verification: bool,
+    preview: bool,
+    quiet: bool,
+    update_dependencies: bool,
+    clone_mode: str,
+    *,
+    jobs: int,
+    silent: bool = False,
+    force_update: bool = True,
+    force: bool = False,
+) -> List[Tuple[str, str]]:
+    """
+    Pull and install ``selected_repos`` with up to ``jobs`` pull workers and
+    ``jobs`` install workers.
+
+    Returns ``(identifier, message)`` for every failed repository.
+    """
+    from pkgmgr.actions.install import install_repos
+    from pkgmgr.actions.repository.pull import confirm_pulls, pull_one
+    from pkgmgr.core.repository.identifier import get_repo_identifier
+
+    workers = max(1, jobs)
+    failures: List[Tuple[str, str]] = []
+    outcomes: List[RepoOutcome] = []
+    lock = threading.Lock()
+    display: Optional[ProgressDisplay] = None
+
+    def _stage(ident: str, stage: str) -> None:
+        if display is not None:
+            display.start(ident, stage)
+
+    def _fail(ident: str, msg: str, duration: float, timed_out: bool) -> None:
+        with lock:
+            failures.append((ident, msg))
+            outcomes.append(
+                RepoOutcome(ident, False, msg, duration, timed_out=timed_out)
+            )
+        if display is not None:
+            display.finish(ident, False, duration, msg=msg, timed_out=timed_out)
+        if not quiet:
+            with OUTPUT_LOCK:
+                print(f"[Warning] update: {msg} for {ident}. Continuing...")
+
+    to_pull: List[Tuple[Repository, str, str]] = []
+    for repo in selected_repos:
+        ident = get_repo_identifier(repo, all_repos)
+        repo_dir = get_repo_dir(repositories_base_dir, repo)
+        if os.path.exists(repo_dir):
+            to_pull.append((repo, ident, repo_dir))
+
+    # Every prompt is answered before any worker starts.
+    approved = confirm_pulls(to_pull, no_verification, preview, workers)
+    declined = {ident for _repo, ident, _rd in to_pull} - {
+        ident for _repo, ident, _rd, _o in approved
+    }
+    outcomes.extend(RepoOutcome(ident, False, skipped=True) for ident in declined)
+
+    # Slow pulls first; their installs then overlap with the quick ones.
+    history = None if preview else open_run_history()
+    if history is not None:
+        expected = history.expected_durations("pull", [a[2] for a in approved])
+        by_dir = {a[2]: a for a in approved}
+        approved = [
+            by_dir[rd]
+            for _ident, rd in longest_first([(a[1], a[2]) for a in approved], expected)
+        ]
+
+    # Install jobs follow the dependency DAG of the selection (see
+    # pkgmgr.actions.install.scheduler); declined repositories stay out.
+    install_jobs = build_install_jobs(
+        [
+            r
+            for r in selected_repos
+            if get_repo_identifier(r, all_repos) not in declined
+        ],
+        all_repos,
+        include_dependencies=update_dependencies,
+    )
+    # identifier -> set once its pull finished (any outcome)
+    pulled: Dict[str, threading.Event] = {a[1]: threading.Event() for a in approved}
+    # identifier -> (verification overridden, pull duration) of successful pulls
+    pull_results: Dict[str, Tuple[bool, float]] = {}
+
+    def _pull(repo: Repository, ident: str, repo_dir: str, overridden: bool) -> None:
+        try:
+            with (
+                acquire(NETWORK),
+                output_prefix(f"[{ident}] "),
+                watch_timeouts() as watch,
+            ):
+                _stage(ident, "pull")
+                start = time.monotonic()
+                try:
+                    ok, msg = pull_one(repo_dir, [], preview)
+                except SystemExit as exc:
+                    ok, msg = False, f"exit={exc.code}"
+                except Exception as exc:
+                    ok, msg = False, str(exc)
+            duration = time.monotonic() - start
+            if history is not None:
+                history.record(repo_dir, "pull", duration, ok, label=ident)
+            if not ok:
+                _fail(ident, f"pull failed ({msg})", duration, watch.timed_out)
+                return
+            pull_results[ident] = (overridden, duration)
+            _stage(ident, "queued")
+        finally:
+            # Unblocks the install job even if this pull raised.
+            pulled[ident].set()
+
+    def _install(job: InstallJob) -> Tuple[bool, str]:
+        ident = job.identifier
+        overridden, pulled_for = False, 0.0
+        if ident in pulled:
+            while not pulled[ident].wait(0.1):
+                if cancelled():
+                    return False, SKIPPED
+            if ident not in pull_results:
+                # Reported by the pull; dependents are skipped.
+                return False, SKIPPED
+            overridden, pulled_for = pull_results[ident]
+        _stage(ident, "install")
+        start = time.monotonic()
+        with output_prefix(f"[{ident}] "), watch_timeouts() as watch:
+            try:
+                install_repos(
+                    [job.repo],
+                    repositories_base_dir,
+                    bin_dir,
+                    all_repos,
+                    # The user already accepted this repository up front.
+                    no_verification or overridden,
+                    preview,
+                    quiet,
+                    clone_mode,
+                    # Dependencies are jobs of this pipeline already.
+                    False,
+                    force_update=force_update,
+                    silent=silent,
+                    emit_summary=False,
+                    force=force,
+                    interactive=False,
+                    # One SQLite connection for the whole pipeline.
+                    history=history,
+                )
+            except SystemExit as exc:
+                code = exc.code if isinstance(exc.code, int) else str(exc.code)
+                msg = f"install failed (exit={code})"
+            except Exception as exc:
+                msg = f"install failed: {exc}"
+            else:
+                msg = ""
+        duration = pulled_for + time.monotonic() - start
+        if msg:
+            _fail(ident, msg, duration, watch.timed_out)
+            return False, msg
+        with lock:
+            outcomes.append(RepoOutcome(ident, True, duration=duration))
+        if display is not None:
+            display.finish(ident, True, duration)
+        return True, ""
+
+    if not quiet:
+        print(
+            f"[UPDATE] Updating {len(install_jobs)} repositories with "
+            f"{workers} pull and {workers} install workers..."
+        )
+    if not quiet:
+        display = ProgressDisplay("update", len(install_jobs), outcome_lines=False)
+    start = time.monotonic()
+    with display or nullcontext():
+        for job in install_jobs:
+            if job.identifier not in pulled:
+                _stage(job.identifier, "queued")
+        pullers = ThreadPoolExecutor(max_workers=workers)
+        futures: Dict[Future, str] = {}
+        try:
+            for repo, ident, repo_dir, overridden in approved:
+                future = pullers.submit(_pull, repo, ident, repo_dir, overridden)
+                futures[future] = ident
+            job_outcomes = run_install_jobs(install_jobs, _install, max_workers=workers)
+        except KeyboardInterrupt:
+            # Running children were terminated by the interrupt handler;
+            # queued pulls must not start anymore.
+            pullers.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            pullers.shutdown(wait=True)
+            if history is not None:
+                history.close()
+
+        # A pull worker that raised reported nothing itself.
+        for future, ident in futures.items():
+            exc = future.exception()
+            if exc is not None:
+                _fail(ident, f"pull failed: {exc}", 0.0, False)
+        # Jobs skipped because a dependency failed.
+        for outcome in job_outcomes:
+            if outcome.skipped and outcome.msg != SKIPPED:
+                with lock:
+                    failures.append((outcome.ident, outcome.msg))
+                    outcomes.append(outcome)
+                if display is not None:
+                    display.skip(outcome.ident)
+
+    if not quiet:
+        print_summary(outcomes, "update", time.monotonic() - start)
+    return failures
@@ -6,7 +6,7 @@ from __future__ import annotations
 import platform
 import shutil
 
-from pkgmgr.actions.update.os_release import OSReleaseInfo
+from pkgmgr.core.system.os_release import OSReleaseInfo
 
 
 class SystemUpdater:
@@ -16,6 +16,7 @@ class SystemUpdater:
 
     def run(self, *, preview: bool) -> None:
         from pkgmgr.core.command.run import run_command
+        from pkgmgr.core.nix.profile import invalidate_profile
 
         # Distro-agnostic: Nix profile upgrades (if Nix is present).
         if shutil.which("nix") is not None:
@@ -23,6 +24,8 @@ class SystemUpdater:
                 run_command("nix profile upgrade '.*'", preview=preview)
             except SystemExit as e:
                 print(f"[Warning] 'nix profile upgrade' failed: {e}")
+            finally:
+                invalidate_profile()
 
         osr = OSReleaseInfo.load()
 
@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import os
+import sys
 
+from pkgmgr.core.command.process import install_interrupt_handler
 from pkgmgr.core.config.load import load_config
 
 from .context import CLIContext
-from .parser import create_parser
+from .parser import create_parser, split_run_argv
 from .dispatch import dispatch_command
 
 __all__ = ["CLIContext", "create_parser", "dispatch_command", "main"]
@@ -60,13 +62,22 @@ def main() -> None:
     )
 
     parser = create_parser(DESCRIPTION_TEXT)
-    args = parser.parse_args()
+    argv, run_command = split_run_argv(sys.argv[1:])
+    args = parser.parse_args(argv)
+    if run_command is not None:
+        args.run_command = run_command
 
     if not getattr(args, "command", None):
         parser.print_help()
         return
 
-    dispatch_command(args, ctx)
+    # Ctrl-C also terminates children running in their own process group.
+    install_interrupt_handler()
+    try:
+        dispatch_command(args, ctx)
+    except KeyboardInterrupt:
+        print("\n[pkgmgr] Interrupted; running commands were terminated.")
+        sys.exit(130)
 
 
 if __name__ == "__main__":
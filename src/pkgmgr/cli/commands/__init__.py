@@ -5,6 +5,9 @@ from .release import handle_release
 from .publish import handle_publish
 from .version import handle_version
 from .make import handle_make
+from .run import handle_run
+from .grep import handle_grep
+from .stats import handle_stats
 from .changelog import handle_changelog
 from .branch import handle_branch
 from .mirror import handle_mirror_command
@@ -17,6 +20,9 @@ __all__ = [
     "handle_publish",
     "handle_version",
     "handle_make",
+    "handle_run",
+    "handle_grep",
+    "handle_stats",
     "handle_changelog",
     "handle_branch",
     "handle_mirror_command",
@@ -110,7 +110,7 @@ def handle_config(args, ctx: CLIContext) -> None:
         return
 
     if args.subcommand == "edit":
-        run_command(f"nano {user_config_path}")
+        run_command(f"nano {user_config_path}", interactive=True)
         return
 
     if args.subcommand == "init":
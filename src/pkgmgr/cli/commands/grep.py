@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from pkgmgr.cli.context import CLIContext
+from pkgmgr.actions.repository.grep import grep_repos
+
+
+Repository = Dict[str, Any]
+
+
+def handle_grep(
+    args,
+    ctx: CLIContext,
+    selected: List[Repository],
+) -> None:
+    """
+    Handle 'pkgmgr grep <pattern>' across all selected repositories.
+    """
+    grep_repos(
+        selected,
+        ctx.repositories_base_dir,
+        ctx.all_repositories,
+        args.pattern,
+        jobs=args.jobs,
+        count=args.count,
+        files_with_matches=args.files_with_matches,
+        ignore_case=args.ignore_case,
+        fixed_strings=args.fixed_strings,
+        json_output=args.json,
+        fail_fast=args.fail_fast,
+    )
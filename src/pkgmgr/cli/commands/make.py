@@ -29,5 +29,8 @@ def handle_make(
         args.subcommand,
         getattr(args, "extra_args", []),
         getattr(args, "preview", False),
+        jobs=getattr(args, "jobs", 1),
+        output_mode=getattr(args, "output_mode", "prefix"),
+        fail_fast=getattr(args, "fail_fast", False),
     )
     sys.exit(0)
@@ -8,6 +8,7 @@ from typing import Any, Dict, List
 
 from pkgmgr.cli.context import CLIContext
 from pkgmgr.actions.install import install_repos
+from pkgmgr.actions.install.plan import plan_installs
 from pkgmgr.actions.repository.deinstall import deinstall_repos
 from pkgmgr.actions.repository.delete import delete_repos
 from pkgmgr.actions.repository.status import status_repos
@@ -56,6 +57,21 @@ def handle_repos_command(
     # install
     # ------------------------------------------------------------
     if args.command == "install":
+        if getattr(args, "plan", False):
+            plan_installs(
+                selected,
+                ctx.repositories_base_dir,
+                ctx.binaries_dir,
+                ctx.all_repositories,
+                clone_mode=args.clone_mode,
+                update_dependencies=args.dependencies,
+                force_update=getattr(args, "update", False),
+                force=getattr(args, "force", False),
+                output_format=getattr(args, "format", "text"),
+                jobs=getattr(args, "jobs", 1),
+            )
+            return
+
         install_repos(
             selected,
             ctx.repositories_base_dir,
@@ -68,6 +84,8 @@ def handle_repos_command(
             args.dependencies,
             force_update=getattr(args, "update", False),
             silent=getattr(args, "silent", False),
+            jobs=getattr(args, "jobs", 1),
+            force=getattr(args, "force", False),
         )
         return
 
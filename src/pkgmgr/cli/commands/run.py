@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from pkgmgr.cli.context import CLIContext
+from pkgmgr.actions.repository.run import run_in_repos
+
+
+Repository = Dict[str, Any]
+
+
+def handle_run(
+    args,
+    ctx: CLIContext,
+    selected: List[Repository],
+) -> None:
+    """
+    Handle 'pkgmgr run -- <cmd ...>' by fanning the command out to all
+    selected repositories.
+    """
+    run_in_repos(
+        selected,
+        ctx.repositories_base_dir,
+        ctx.all_repositories,
+        list(getattr(args, "run_command", []) or []),
+        preview=getattr(args, "preview", False),
+        jobs=args.jobs,
+        timeout=args.timeout,
+        output_mode=args.output_mode,
+        fail_fast=args.fail_fast,
+        json_output=args.json,
+    )
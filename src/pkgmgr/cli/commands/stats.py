@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from pkgmgr.actions.stats import show_stats
+from pkgmgr.cli.context import CLIContext
+
+
+def handle_stats(args, ctx: CLIContext) -> None:
+    """
+    Handle 'pkgmgr stats'.
+    """
+    show_stats(by=args.by, operation=args.operation, output_format=args.format)
@@ -8,6 +8,14 @@ from pkgmgr.cli.context import CLIContext
 from pkgmgr.cli.proxy import maybe_handle_proxy
 from pkgmgr.core.repository.selected import get_selected_repos
 from pkgmgr.core.repository.dir import get_repo_dir
+from pkgmgr.core.repository.state import filter_repos_by_state
+from pkgmgr.actions.install.installers.os_packages.metadata import (
+    configure_package_metadata,
+)
+from pkgmgr.core.command.process import configure_timeouts
+from pkgmgr.core.nix.build import configure_nix_build
+from pkgmgr.core.nix.cache import configure_binary_cache
+from pkgmgr.core.resources.governor import configure_governor
 
 from pkgmgr.cli.commands import (
     handle_repos_command,
@@ -17,6 +25,9 @@ from pkgmgr.cli.commands import (
     handle_version,
     handle_config,
     handle_make,
+    handle_run,
+    handle_grep,
+    handle_stats,
     handle_changelog,
     handle_branch,
     handle_mirror_command,
@@ -30,6 +41,7 @@ def _has_explicit_selection(args) -> bool:
         or getattr(args, "category", [])
         or getattr(args, "tag", [])
         or getattr(args, "string", "")
+        or getattr(args, "state", [])
     )
 
 
@@ -57,6 +69,17 @@ def _select_repo_for_current_directory(ctx: CLIContext) -> List[Dict[str, Any]]:
 
 
 def dispatch_command(args, ctx: CLIContext) -> None:
+    performance = (ctx.config_merged or {}).get("performance")
+    configure_governor(
+        performance,
+        network=getattr(args, "network_slots", None),
+        build=getattr(args, "build_slots", None),
+    )
+    configure_timeouts(performance)
+    configure_nix_build(performance)
+    configure_binary_cache(performance)
+    configure_package_metadata(performance)
+
     if maybe_handle_proxy(args, ctx):
         return
 
@@ -71,6 +94,8 @@ def dispatch_command(args, ctx: CLIContext) -> None:
         "create",
         "list",
         "make",
+        "run",
+        "grep",
         "release",
         "publish",
         "version",
@@ -87,6 +112,14 @@ def dispatch_command(args, ctx: CLIContext) -> None:
             if _has_explicit_selection(args)
             else _select_repo_for_current_directory(ctx)
         )
+        states = getattr(args, "state", []) or []
+        if states:
+            selected = filter_repos_by_state(
+                selected,
+                ctx.repositories_base_dir,
+                states,
+                jobs=getattr(args, "jobs", None),
+            )
     else:
         selected = []
 
@@ -119,6 +152,8 @@ def dispatch_command(args, ctx: CLIContext) -> None:
             clone_mode=args.clone_mode,
             silent=getattr(args, "silent", False),
             force_update=True,
+            force=getattr(args, "force", False),
+            jobs=getattr(args, "jobs", 1),
         )
         return
 
@@ -150,6 +185,18 @@ def dispatch_command(args, ctx: CLIContext) -> None:
         handle_make(args, ctx, selected)
         return
 
+    if args.command == "run":
+        handle_run(args, ctx, selected)
+        return
+
+    if args.command == "grep":
+        handle_grep(args, ctx, selected)
+        return
+
+    if args.command == "stats":
+        handle_stats(args, ctx)
+        return
+
     if args.command == "branch":
         handle_branch(args, ctx)
         return
@@ -8,6 +8,7 @@ from .branch_cmd import add_branch_subparsers
 from .changelog_cmd import add_changelog_subparser
 from .common import SortedSubParsersAction
 from .config_cmd import add_config_subparsers
+from .grep_cmd import add_grep_subparser
 from .install_update import add_install_update_subparsers
 from .list_cmd import add_list_subparser
 from .make_cmd import add_make_subparsers
@@ -15,6 +16,8 @@ from .mirror_cmd import add_mirror_subparsers
 from .navigation_cmd import add_navigation_subparsers
 from .publish_cmd import add_publish_subparser
 from .release_cmd import add_release_subparser
+from .run_cmd import add_run_subparser, split_run_argv
+from .stats_cmd import add_stats_subparser
 from .version_cmd import add_version_subparser
 
 
@@ -64,10 +67,13 @@ def create_parser(description_text: str) -> argparse.ArgumentParser:
     add_list_subparser(subparsers)
 
     add_make_subparsers(subparsers)
+    add_run_subparser(subparsers)
+    add_grep_subparser(subparsers)
+    add_stats_subparser(subparsers)
     add_mirror_subparsers(subparsers)
 
     register_proxy_commands(subparsers)
     return parser
 
 
-__all__ = ["create_parser", "SortedSubParsersAction"]
+__all__ = ["create_parser", "split_run_argv", "SortedSubParsersAction"]
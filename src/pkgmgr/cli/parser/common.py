@@ -4,6 +4,8 @@ from __future__ import annotations
 import argparse
 from typing import Optional, Tuple
 
+from pkgmgr.core.repository.state import REPO_STATES
+
 
 class SortedSubParsersAction(argparse._SubParsersAction):
     """
@@ -107,6 +109,19 @@ def add_identifier_arguments(subparser: argparse.ArgumentParser) -> None:
         help="Filter repositories by tag (supports /regex/).",
     )
 
+    _add_option_if_missing(
+        subparser,
+        "--state",
+        nargs="+",
+        choices=REPO_STATES,
+        default=[],
+        help=(
+            "Filter repositories by live git state (matches any of the given "
+            "states; ahead/behind refer to the last fetch and include "
+            "diverged repositories)."
+        ),
+    )
+
     _add_option_if_missing(
         subparser,
         "--preview",
@@ -132,6 +147,85 @@ def add_identifier_arguments(subparser: argparse.ArgumentParser) -> None:
     )
 
 
+def add_resource_arguments(subparser: argparse.ArgumentParser) -> None:
+    """
+    Overrides for the global resource governor (config ``performance:``).
+    """
+    _add_option_if_missing(
+        subparser,
+        "--network-slots",
+        type=int,
+        default=None,
+        help=(
+            "Maximum concurrent network operations across all parallel work "
+            "(default: config performance.network or 8)."
+        ),
+    )
+    _add_option_if_missing(
+        subparser,
+        "--build-slots",
+        type=int,
+        default=None,
+        help=(
+            "Maximum concurrent CPU-heavy operations (installers, builds) "
+            "(default: config performance.build or the CPU count)."
+        ),
+    )
+
+
+def add_parallel_arguments(
+    subparser: argparse.ArgumentParser,
+    *,
+    default_jobs: int = 1,
+    with_output_mode: bool = True,
+) -> None:
+    """
+    Common arguments for commands that can run across repositories in parallel.
+    """
+    _add_option_if_missing(
+        subparser,
+        "-j",
+        "--jobs",
+        type=int,
+        default=default_jobs,
+        help=(
+            f"Number of repositories processed in parallel "
+            f"(default: {default_jobs}). Use 1 for sequential."
+        ),
+    )
+    add_resource_arguments(subparser)
+
+    if with_output_mode:
+        _add_option_if_missing(
+            subparser,
+            "--output-mode",
+            choices=["prefix", "group"],
+            default="prefix",
+            help=(
+                "Parallel output: 'prefix' multiplexes lines with a [repo] "
+                "prefix, 'group' prints each repository's output once it "
+                "finished (default: prefix)."
+            ),
+        )
+
+    if _has_action(subparser, options=("--fail-fast",)):
+        return
+    group = subparser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--fail-fast",
+        dest="fail_fast",
+        action="store_true",
+        default=False,
+        help="Do not start further repositories after the first failure.",
+    )
+    group.add_argument(
+        "--keep-going",
+        dest="fail_fast",
+        action="store_false",
+        help="Process all repositories even if some fail (default).",
+    )
+
+
 def add_install_update_arguments(subparser: argparse.ArgumentParser) -> None:
     """
     Common arguments for install/update commands.
@@ -175,3 +269,14 @@ def add_install_update_arguments(subparser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="Continue with other repositories if one fails; downgrade errors to warnings.",
     )
+
+    _add_option_if_missing(
+        subparser,
+        "--force",
+        action="store_true",
+        help=(
+            "Reinstall even if commit and build files are unchanged since the "
+            "last successful installation (ignore the install ledger)."
+        ),
+    )
+    add_resource_arguments(subparser)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from .common import add_identifier_arguments, add_parallel_arguments
+
+
+def add_grep_subparser(
+    subparsers: argparse._SubParsersAction,
+) -> None:
+    """
+    Register the grep command (parallel 'git grep' across repositories).
+    """
+    grep_parser = subparsers.add_parser(
+        "grep",
+        help="Search tracked files of the selected repositories with git grep",
+        description=(
+            "Runs 'git grep' concurrently in each selected repository and "
+            "prints the matches prefixed with the repository identifier. "
+            "Example:\n"
+            "  pkgmgr grep --all -F 'TODO(' --files-with-matches"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    grep_parser.add_argument("pattern", help="Pattern passed to 'git grep -e'.")
+    add_identifier_arguments(grep_parser)
+    add_parallel_arguments(
+        grep_parser,
+        default_jobs=min(os.cpu_count() or 4, 8),
+        with_output_mode=False,
+    )
+    mode = grep_parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "-c",
+        "--count",
+        action="store_true",
+        help="Print the number of matching lines per file.",
+    )
+    mode.add_argument(
+        "-l",
+        "--files-with-matches",
+        action="store_true",
+        help="Print only the names of files that contain matches.",
+    )
+    grep_parser.add_argument(
+        "-i",
+        "--ignore-case",
+        action="store_true",
+        help="Match case-insensitively.",
+    )
+    grep_parser.add_argument(
+        "-F",
+        "--fixed-strings",
+        action="store_true",
+        help="Interpret the pattern as a fixed string, not a regex.",
+    )
+    grep_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print one NDJSON record per match instead of text lines.",
+    )
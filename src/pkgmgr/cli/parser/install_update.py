@@ -26,6 +26,31 @@ def add_install_update_subparsers(
         action="store_true",
         help="Force re-run installers (upgrade/refresh) even if the CLI layer is already loaded",
     )
+    install_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of repositories installed in parallel (default: 1). "
+            "Dependencies are installed first; package manager and nix "
+            "profile changes are serialized."
+        ),
+    )
+    install_parser.add_argument(
+        "--plan",
+        action="store_true",
+        help=(
+            "Show which installers would run per repository (and why others "
+            "are skipped) with estimated durations; install nothing."
+        ),
+    )
+    install_parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format for --plan (default: text).",
+    )
 
     update_parser = subparsers.add_parser(
         "update",
@@ -38,6 +63,17 @@ def add_install_update_subparsers(
         action="store_true",
         help="Include system update commands",
     )
+    update_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of parallel pull and install workers (default: 1). "
+            "Pulls of later repositories overlap with installs of earlier "
+            "ones; verification prompts are asked up front."
+        ),
+    )
     # No --update here: update implies force_update=True
 
     deinstall_parser = subparsers.add_parser(
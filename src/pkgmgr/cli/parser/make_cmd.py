@@ -5,7 +5,7 @@ from __future__ import annotations
 
 import argparse
 
-from .common import add_identifier_arguments
+from .common import add_identifier_arguments, add_parallel_arguments
 
 
 def add_make_subparsers(
@@ -19,6 +19,7 @@ def add_make_subparsers(
         help="Executes make commands",
     )
     add_identifier_arguments(make_parser)
+    add_parallel_arguments(make_parser)
     make_subparsers = make_parser.add_subparsers(
         dest="subcommand",
         help="Make subcommands",
@@ -30,9 +31,11 @@ def add_make_subparsers(
         help="Executes the make install command",
     )
     add_identifier_arguments(make_install)
+    add_parallel_arguments(make_install)
 
     make_deinstall = make_subparsers.add_parser(
         "deinstall",
         help="Executes the make deinstall command",
     )
     add_identifier_arguments(make_deinstall)
+    add_parallel_arguments(make_deinstall)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+import os
+from typing import List, Optional, Tuple
+
+from .common import add_identifier_arguments, add_parallel_arguments
+
+
+def split_run_argv(argv: List[str]) -> Tuple[List[str], Optional[List[str]]]:
+    """
+    Split ``pkgmgr run [selection] -- <cmd ...>`` at the first ``--``.
+
+    argparse would otherwise feed the command words into the positional
+    repository identifiers. Returns the argv to parse and the command
+    (None if argv is not a run invocation with ``--``).
+    """
+    if not argv or argv[0] != "run" or "--" not in argv:
+        return argv, None
+    idx = argv.index("--")
+    return argv[:idx], argv[idx + 1 :]
+
+
+def add_run_subparser(
+    subparsers: argparse._SubParsersAction,
+) -> None:
+    """
+    Register the run command (fan-out of an arbitrary command).
+
+    Note: 'exec' is already taken by the 'docker compose exec' proxy.
+    """
+    run_parser = subparsers.add_parser(
+        "run",
+        help="Run an arbitrary command in every selected repository",
+        description=(
+            "Runs '<cmd ...>' (given after '--') in each selected repository "
+            "directory using a bounded worker pool. Example:\n"
+            "  pkgmgr run --all -j 8 -- git log -1 --oneline"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    add_identifier_arguments(run_parser)
+    add_parallel_arguments(run_parser, default_jobs=min(os.cpu_count() or 4, 8))
+    run_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Per-repository timeout in seconds (the command is killed).",
+    )
+    run_parser.add_argument(
+        "--json",
+        action="store_true",
+        help=(
+            "Print one NDJSON result record per repository (exit code, "
+            "duration, captured output) instead of live output."
+        ),
+    )
+    run_parser.set_defaults(run_command=[])
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import argparse
+
+
+def add_stats_subparser(
+    subparsers: argparse._SubParsersAction,
+) -> None:
+    """
+    Register the stats command (run history report).
+    """
+    stats_parser = subparsers.add_parser(
+        "stats",
+        help="Show p50/p95 durations and failure rates from the run history",
+    )
+    stats_parser.add_argument(
+        "--by",
+        choices=["repo", "installer"],
+        default=None,
+        help="Only show the report per repository or per installer.",
+    )
+    stats_parser.add_argument(
+        "--operation",
+        default=None,
+        help="Only include one operation (e.g. install, pull, push).",
+    )
+    stats_parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text).",
+    )
@@ -9,12 +9,14 @@ import sys
 from typing import Dict, List, Any
 
 from pkgmgr.cli.context import CLIContext
+from pkgmgr.cli.parser.common import add_parallel_arguments
 from pkgmgr.actions.repository.clone import clone_repos
 from pkgmgr.actions.proxy import exec_proxy_command
 from pkgmgr.actions.repository.pull import pull_with_verification
 from pkgmgr.actions.repository.push import push_in_parallel
 from pkgmgr.core.repository.selected import get_selected_repos
 from pkgmgr.core.repository.dir import get_repo_dir
+from pkgmgr.core.repository.state import REPO_STATES, filter_repos_by_state
 
 
 PROXY_COMMANDS: Dict[str, List[str]] = {
@@ -85,6 +87,17 @@ def _add_proxy_identifier_arguments(parser: argparse.ArgumentParser) -> None:
             "substring (case-insensitive). Use /regex/ for regular expressions."
         ),
     )
+    parser.add_argument(
+        "--state",
+        nargs="+",
+        choices=REPO_STATES,
+        default=[],
+        help=(
+            "Filter repositories by live git state (matches any of the given "
+            "states; ahead/behind refer to the last fetch and include "
+            "diverged repositories)."
+        ),
+    )
     parser.add_argument(
         "--preview",
         action="store_true",
@@ -114,9 +127,10 @@ def _proxy_has_explicit_selection(args: argparse.Namespace) -> bool:
     use_all = getattr(args, "all", False)
     categories = getattr(args, "category", []) or []
     string_filter = getattr(args, "string", "") or ""
+    states = getattr(args, "state", []) or []
 
     # Proxy commands currently do not support --tag, so it is not checked here.
-    return bool(use_all or identifiers or categories or string_filter)
+    return bool(use_all or identifiers or categories or string_filter or states)
 
 
 def _select_repo_for_current_directory(
@@ -189,6 +203,11 @@ def register_proxy_commands(
                         "(default: min(cpu_count, 8)). Use 1 for sequential."
                     ),
                 )
+                add_parallel_arguments(parser, with_output_mode=False)
+            elif subcommand != "clone":
+                # Default stays sequential: commands like commit/add -p may
+                # be interactive.
+                add_parallel_arguments(parser)
             if subcommand == "clone":
                 parser.add_argument(
                     "--clone-mode",
@@ -225,6 +244,15 @@ def maybe_handle_proxy(args: argparse.Namespace, ctx: CLIContext) -> bool:
             )
             sys.exit(1)
 
+    states = getattr(args, "state", []) or []
+    if states:
+        selected = filter_repos_by_state(
+            selected,
+            ctx.repositories_base_dir,
+            states,
+            jobs=getattr(args, "jobs", None),
+        )
+
     for command, subcommands in PROXY_COMMANDS.items():
         if args.command not in subcommands:
             continue
@@ -247,6 +275,7 @@ def maybe_handle_proxy(args: argparse.Namespace, ctx: CLIContext) -> bool:
                 args.no_verification,
                 args.preview,
                 jobs=args.jobs,
+                fail_fast=args.fail_fast,
             )
         elif args.command == "push":
             push_in_parallel(
@@ -256,6 +285,7 @@ def maybe_handle_proxy(args: argparse.Namespace, ctx: CLIContext) -> bool:
                 args.extra_args,
                 args.preview,
                 jobs=args.jobs,
+                fail_fast=args.fail_fast,
             )
         else:
             exec_proxy_command(
@@ -266,6 +296,9 @@ def maybe_handle_proxy(args: argparse.Namespace, ctx: CLIContext) -> bool:
                 args.command,
                 args.extra_args,
                 args.preview,
+                jobs=args.jobs,
+                output_mode=args.output_mode,
+                fail_fast=args.fail_fast,
             )
 
         sys.exit(0)
@@ -101,4 +101,4 @@ def open_vscode_workspace(ctx: CLIContext, selected: List[Repository]) -> None:
     else:
         print(f"Using existing workspace file: {workspace_file}")
 
-    run_command(f'code "{workspace_file}"')
+    run_command(f'code "{workspace_file}"', interactive=True)
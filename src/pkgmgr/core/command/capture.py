@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import deque
+from typing import Deque, Optional
+
+# Default bounds for output kept in memory per stream (stdout / stderr).
+DEFAULT_MAX_LINES = 2000
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+# If set, every run_command() invocation appends its full output to
+# <PKGMGR_LOG_DIR>/<cwd-slug>.log, i.e. one log file per repository.
+LOG_DIR_ENV = "PKGMGR_LOG_DIR"
+
+
+class TailBuffer:
+    """
+    Ring buffer keeping only the last lines of a stream.
+
+    Bounded by both a line count and a total size in bytes (the most recent
+    line is always kept, even if it alone exceeds the byte budget).
+    """
+
+    def __init__(
+        self,
+        max_lines: int = DEFAULT_MAX_LINES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self._lines: Deque[str] = deque()
+        self._max_lines = max(1, max_lines)
+        self._max_bytes = max(1, max_bytes)
+        self._bytes = 0
+        self.dropped = 0
+
+    def append(self, line: str) -> None:
+        self._lines.append(line)
+        self._bytes += len(line.encode("utf-8", errors="replace"))
+        while len(self._lines) > 1 and (
+            len(self._lines) > self._max_lines or self._bytes > self._max_bytes
+        ):
+            old = self._lines.popleft()
+            self._bytes -= len(old.encode("utf-8", errors="replace"))
+            self.dropped += 1
+
+    def __bool__(self) -> bool:
+        return bool(self._lines)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def text(self) -> str:
+        return "".join(self._lines)
+
+
+def _slug(path: str) -> str:
+    cleaned = os.path.abspath(path).strip(os.sep) or "root"
+    return re.sub(r"[^A-Za-z0-9._-]+", "__", cleaned)
+
+
+def command_log_path(cwd: Optional[str]) -> Optional[str]:
+    """
+    Return the spill-to-file log path for commands run in ``cwd``, or None if
+    PKGMGR_LOG_DIR is not set.
+    """
+    log_dir = os.environ.get(LOG_DIR_ENV, "").strip()
+    if not log_dir:
+        return None
+    log_dir = os.path.expanduser(log_dir)
+    os.makedirs(log_dir, exist_ok=True)
+    return os.path.join(log_dir, f"{_slug(cwd or os.getcwd())}.log")
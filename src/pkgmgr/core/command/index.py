@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def _is_executable(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _list_dir(directory: str) -> List[str]:
+    try:
+        return os.listdir(directory)
+    except OSError:
+        return []
+
+
+class ExecutableIndex:
+    """
+    Name → directories index of $PATH and ~/.nix-profile/bin.
+
+    Built lazily on first lookup (one listdir per directory) and rebuilt
+    after invalidate(), e.g. once an installer may have added binaries.
+    Lookups are dictionary accesses plus an executable check of the hit,
+    matching shutil.which() semantics (first executable match in PATH
+    order).
+    """
+
+    def __init__(
+        self,
+        path_dirs: Optional[List[str]] = None,
+        nix_bin_dir: Optional[str] = None,
+    ) -> None:
+        self._path_dirs = path_dirs
+        self._nix_bin_dir = nix_bin_dir
+        self._lock = threading.Lock()
+        self._path_index: Optional[Dict[str, List[str]]] = None
+        self._nix_names: Optional[set] = None
+        self.builds = 0
+
+    def _build(self) -> None:
+        path_dirs = self._path_dirs
+        if path_dirs is None:
+            path_dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+        nix_bin_dir = self._nix_bin_dir or os.path.join(
+            os.path.expanduser("~"), ".nix-profile", "bin"
+        )
+
+        index: Dict[str, List[str]] = {}
+        seen_dirs = set()
+        for directory in path_dirs:
+            if directory in seen_dirs:
+                continue
+            seen_dirs.add(directory)
+            for name in _list_dir(directory):
+                index.setdefault(name, []).append(directory)
+
+        self._path_index = index
+        self._nix_names = set(_list_dir(nix_bin_dir))
+        self._nix_bin_dir = nix_bin_dir
+        self.builds += 1
+
+    def _ensure(self) -> Tuple[Dict[str, List[str]], set, str]:
+        """A consistent snapshot; invalidate() may run concurrently."""
+        with self._lock:
+            if self._path_index is None:
+                self._build()
+            return (
+                self._path_index or {},
+                self._nix_names or set(),
+                self._nix_bin_dir or "",
+            )
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._path_index = None
+            self._nix_names = None
+
+    def which(self, name: str) -> Optional[str]:
+        """First executable ``name`` in PATH order, or None."""
+        if not name or os.sep in name:
+            return None
+        path_index, _nix_names, _nix_bin_dir = self._ensure()
+        for directory in path_index.get(name, []):
+            path = os.path.join(directory, name)
+            if _is_executable(path):
+                return path
+        return None
+
+    def nix(self, name: str) -> Optional[str]:
+        """Executable ``name`` in ~/.nix-profile/bin, or None."""
+        if not name:
+            return None
+        _path_index, nix_names, nix_bin_dir = self._ensure()
+        if name not in nix_names:
+            return None
+        path = os.path.join(nix_bin_dir, name)
+        return path if _is_executable(path) else None
+
+
+_ACTIVE: Optional[ExecutableIndex] = None
+_USERS = 0
+_SCOPE_LOCK = threading.Lock()
+
+
+def active_executable_index() -> Optional[ExecutableIndex]:
+    """The index of the current run, or None (callers use shutil.which)."""
+    return _ACTIVE
+
+
+@contextmanager
+def executable_index() -> Iterator[ExecutableIndex]:
+    """
+    Activate one shared ExecutableIndex for the duration of a run (e.g. an
+    install of many repositories). Nested and concurrent use (worker
+    threads) shares the index; it is dropped when the last user leaves.
+    """
+    global _ACTIVE, _USERS
+    with _SCOPE_LOCK:
+        if _ACTIVE is None:
+            _ACTIVE = ExecutableIndex()
+        _USERS += 1
+        index = _ACTIVE
+    try:
+        yield index
+    finally:
+        with _SCOPE_LOCK:
+            _USERS -= 1
+            if _USERS == 0:
+                _ACTIVE = None
+
+
+def invalidate_executable_index() -> None:
+    """Mark the active index stale (no-op without an active index)."""
+    index = _ACTIVE
+    if index is not None:
+        index.invalidate()
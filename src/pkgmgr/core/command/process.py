@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Supervision of child processes: timeouts, process-tree termination and
+Ctrl-C cancellation.
+
+All commands pkgmgr runs (git, run_command(), the nix installer) are
+started through spawn(), which keeps a registry of live children:
+
+  - A command with a timeout runs in its own process group (within
+    pkgmgr's session). When the deadline passes the whole group receives
+    SIGTERM and, after TERMINATE_GRACE seconds, SIGKILL, so grandchildren
+    (ssh under git, builders under nix) do not survive.
+  - A command without a timeout stays in pkgmgr's process group and keeps
+    the terminal (password prompts, Ctrl-C) as before. So do privileged
+    (sudo) and interactive commands (editors), also with a timeout: in a
+    background process group they would be stopped on their first read
+    from the terminal. On timeout only the command itself is signalled.
+
+install_interrupt_handler() makes Ctrl-C terminate every live child, also
+those in their own process group, and refuse to start new ones for the
+rest of the run, so parallel runs stop promptly instead of working through
+their queue or leaving orphans behind.
+
+Per-operation timeouts (seconds) come from the ``performance:`` config::
+
+    performance:
+      timeouts:
+        git: 600      # every git invocation (default: none)
+        command: 3600 # commands of installers and proxies (default: none)
+        nix: 3600     # nix commands of the nix installer (default: none)
+"""
+
+from __future__ import annotations
+
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set
+
+# Exit code reported for commands killed because they exceeded their timeout
+# (same convention as coreutils `timeout`).
+TIMEOUT_EXIT_CODE = 124
+# Seconds between SIGTERM and SIGKILL.
+TERMINATE_GRACE = 5.0
+
+OPERATIONS = ("git", "command", "nix")
+
+_TIMEOUTS: Dict[str, Optional[float]] = {op: None for op in OPERATIONS}
+_LIVE: Set[subprocess.Popen] = set()
+_LIVE_LOCK = threading.Lock()
+_CANCELLED = threading.Event()
+_THREAD_STATE = threading.local()
+
+
+class CommandCancelled(RuntimeError):
+    """Raised when a command is started after the run was interrupted."""
+
+
+@dataclass
+class TimeoutWatch:
+    """Commands that timed out within a watch_timeouts() block."""
+
+    commands: List[str] = field(default_factory=list)
+
+    @property
+    def timed_out(self) -> bool:
+        return bool(self.commands)
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+
+def configure_timeouts(performance: Optional[Mapping[str, Any]] = None) -> None:
+    """
+    Apply ``performance.timeouts`` of the config.
+
+    Missing, zero or negative values mean "no timeout"; invalid values are
+    reported and ignored.
+    """
+    section = performance.get("timeouts") if isinstance(performance, Mapping) else None
+    if section is not None and not isinstance(section, Mapping):
+        print(f"[Warning] Ignoring invalid performance.timeouts: {section!r}")
+        section = None
+    for op in OPERATIONS:
+        value = (section or {}).get(op)
+        if value is None:
+            _TIMEOUTS[op] = None
+            continue
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            print(f"[Warning] Ignoring invalid performance.timeouts.{op}: {value!r}")
+            continue
+        _TIMEOUTS[op] = seconds if seconds > 0 else None
+
+
+def operation_timeout(op: str) -> Optional[float]:
+    """Configured timeout in seconds for ``op`` (None: no timeout)."""
+    if op not in _TIMEOUTS:
+        raise ValueError(f"unknown operation: {op!r}")
+    return _TIMEOUTS[op]
+
+
+# ---------------------------------------------------------------------------
+# Spawning and termination
+# ---------------------------------------------------------------------------
+
+
+def is_privileged(cmd: Any) -> bool:
+    """True if ``cmd`` runs through sudo (and may prompt for a password)."""
+    if isinstance(cmd, str):
+        try:
+            argv = shlex.split(cmd)
+        except ValueError:
+            argv = cmd.split()
+    else:
+        argv = [str(arg) for arg in cmd]
+    return bool(argv) and os.path.basename(argv[0]) == "sudo"
+
+
+def _own_process_group() -> Dict[str, Any]:
+    # Not a new session: the command keeps the controlling terminal.
+    if sys.version_info >= (3, 11):
+        return {"process_group": 0}
+    return {"preexec_fn": lambda: os.setpgid(0, 0)}  # pragma: no cover
+
+
+def spawn(cmd: Any, *, isolate: bool = False, **kwargs: Any) -> subprocess.Popen:
+    """
+    subprocess.Popen() registered as a live child.
+
+    With ``isolate`` the child gets its own process group so
+    terminate_tree() can reach all of its descendants; privileged commands
+    always stay in the foreground group. Call release() once it has exited.
+    """
+    if _CANCELLED.is_set():
+        raise CommandCancelled("run interrupted; not starting new commands")
+    isolate = isolate and not is_privileged(cmd)
+    group = _own_process_group() if isolate else {}
+    process = subprocess.Popen(cmd, **group, **kwargs)
+    process.isolated = isolate  # type: ignore[attr-defined]
+    with _LIVE_LOCK:
+        _LIVE.add(process)
+    return process
+
+
+def release(process: subprocess.Popen) -> None:
+    with _LIVE_LOCK:
+        _LIVE.discard(process)
+
+
+def _signal_tree(process: subprocess.Popen, sig: int) -> None:
+    try:
+        if getattr(process, "isolated", False):
+            os.killpg(process.pid, sig)
+        else:
+            process.send_signal(sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def terminate_tree(process: subprocess.Popen, grace: float = TERMINATE_GRACE) -> None:
+    """SIGTERM the process (group), then SIGKILL it if it outlives ``grace``."""
+    _signal_tree(process, signal.SIGTERM)
+    try:
+        process.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        pass
+    # Descendants may outlive the group leader; the group id stays valid
+    # as long as any member is alive.
+    _signal_tree(process, signal.SIGKILL)
+
+
+def cancel_all(grace: float = TERMINATE_GRACE) -> None:
+    """
+    Terminate every live child and refuse to start new ones.
+
+    Returns immediately; SIGKILL follows from a timer thread.
+    """
+    _CANCELLED.set()
+    with _LIVE_LOCK:
+        live = list(_LIVE)
+    for process in live:
+        _signal_tree(process, signal.SIGTERM)
+
+    def _kill_survivors() -> None:
+        for process in live:
+            if process.poll() is None or getattr(process, "isolated", False):
+                _signal_tree(process, signal.SIGKILL)
+
+    if live:
+        timer = threading.Timer(grace, _kill_survivors)
+        timer.daemon = True
+        timer.start()
+
+
+def cancelled() -> bool:
+    return _CANCELLED.is_set()
+
+
+def sleep_unless_cancelled(seconds: float) -> None:
+    """
+    time.sleep() that ends early when the run is interrupted
+    (cancel_all()); raises CommandCancelled in that case.
+    """
+    if _CANCELLED.wait(max(0.0, seconds)):
+        raise CommandCancelled("run interrupted while waiting")
+
+
+def reset_cancellation() -> None:
+    """Allow starting commands again (tests, long-lived embedders)."""
+    _CANCELLED.clear()
+
+
+def _on_interrupt(signum: int, frame: Any) -> None:
+    cancel_all()
+    raise KeyboardInterrupt
+
+
+def install_interrupt_handler() -> None:
+    """Cancel all children on Ctrl-C (main thread only)."""
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGINT, _on_interrupt)
+
+
+# ---------------------------------------------------------------------------
+# Timeout bookkeeping
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def watch_timeouts() -> Iterator[TimeoutWatch]:
+    """Collect the commands of the current thread that time out in the block."""
+    watch = TimeoutWatch()
+    previous = getattr(_THREAD_STATE, "watch", None)
+    _THREAD_STATE.watch = watch
+    try:
+        yield watch
+    finally:
+        _THREAD_STATE.watch = previous
+        if previous is not None:
+            previous.commands.extend(watch.commands)
+
+
+def note_timeout(display: str) -> None:
+    """Report a timed-out command to the enclosing watch_timeouts() blocks."""
+    watch = getattr(_THREAD_STATE, "watch", None)
+    if watch is not None:
+        watch.commands.append(display)
+
+
+def run_process(
+    cmd: Any,
+    *,
+    timeout: Optional[float] = None,
+    check: bool = False,
+    **kwargs: Any,
+) -> subprocess.CompletedProcess:
+    """
+    subprocess.run() replacement supervised by this module.
+
+    On timeout the process tree is terminated and subprocess.TimeoutExpired
+    is raised (with the output collected so far); with ``check`` a non-zero
+    exit raises subprocess.CalledProcessError.
+    """
+    process = spawn(cmd, isolate=timeout is not None, **kwargs)
+    try:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired as exc:
+            terminate_tree(process)
+            stdout, stderr = process.communicate()
+            note_timeout(cmd if isinstance(cmd, str) else " ".join(cmd))
+            raise subprocess.TimeoutExpired(
+                cmd, exc.timeout, output=stdout, stderr=stderr
+            ) from None
+        except BaseException:
+            terminate_tree(process, grace=0)
+            process.wait()
+            raise
+    finally:
+        release(process)
+
+    completed = subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+    if check:
+        completed.check_returncode()
+    return completed
@@ -1,6 +1,8 @@
 import os
 import shutil
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+
+from pkgmgr.core.command.index import active_executable_index
 
 
 Repository = Dict[str, Any]
@@ -10,6 +12,12 @@ def _is_executable(path: str) -> bool:
     return os.path.exists(path) and os.access(path, os.X_OK)
 
 
+# src/<pkg>/__main__.py is depth 1; allow one namespace level more.
+MAX_SRC_DEPTH = 2
+_SKIP_DIRS = {"__pycache__", "node_modules"}
+_PACKAGE_ROOT_CACHE: Dict[Tuple[str, int], Optional[str]] = {}
+
+
 def _find_python_package_root(repo_dir: str) -> Optional[str]:
     """
     Detect a Python src-layout package:
@@ -18,16 +26,47 @@ def _find_python_package_root(repo_dir: str) -> Optional[str]:
 
     Returns the directory containing __main__.py (e.g. ".../src/arc")
     or None if no such structure exists.
+
+    The search is breadth-first, bounded to MAX_SRC_DEPTH levels below
+    src/, and cached per src/ directory and its mtime.
     """
     src_dir = os.path.join(repo_dir, "src")
+    try:
+        mtime = os.stat(src_dir).st_mtime_ns
+    except OSError:
+        return None
     if not os.path.isdir(src_dir):
         return None
 
-    for root, _dirs, files in os.walk(src_dir):
-        if "__main__.py" in files:
-            return root
+    key = (os.path.abspath(src_dir), mtime)
+    if key in _PACKAGE_ROOT_CACHE:
+        return _PACKAGE_ROOT_CACHE[key]
+
+    found: Optional[str] = None
+    level = [src_dir]
+    for _depth in range(MAX_SRC_DEPTH + 1):
+        next_level: List[str] = []
+        for directory in level:
+            try:
+                entries = sorted(os.scandir(directory), key=lambda e: e.name)
+            except OSError:
+                continue
+            if any(e.name == "__main__.py" and e.is_file() for e in entries):
+                found = directory
+                break
+            next_level.extend(
+                e.path
+                for e in entries
+                if e.is_dir()
+                and not e.name.startswith(".")
+                and e.name not in _SKIP_DIRS
+            )
+        if found or not next_level:
+            break
+        level = next_level
 
-    return None
+    _PACKAGE_ROOT_CACHE[key] = found
+    return found
 
 
 def _nix_binary_candidates(home: str, names: List[str]) -> List[str]:
@@ -39,14 +78,18 @@ def _nix_binary_candidates(home: str, names: List[str]) -> List[str]:
 
 def _path_binary_candidates(names: List[str]) -> List[str]:
     """
-    Resolve candidate names via PATH using shutil.which.
+    Resolve candidate names via PATH using shutil.which (or the run's
+    executable index, if one is active).
     Returns only existing, executable paths.
     """
+    index = active_executable_index()
+    which = index.which if index is not None else shutil.which
+
     binaries: List[str] = []
     for name in names:
         if not name:
             continue
-        candidate = shutil.which(name)
+        candidate = which(name)
         if candidate and _is_executable(candidate):
             binaries.append(candidate)
     return binaries
@@ -143,11 +186,17 @@ def resolve_command_for_repo(
             break  # prefer the first non-system binary
 
     # c) Nix profile binaries
-    nix_binaries = [
-        path
-        for path in _nix_binary_candidates(home, candidate_names)
-        if _is_executable(path)
-    ]
+    index = active_executable_index()
+    if index is not None:
+        nix_binaries = [
+            path for path in (index.nix(n) for n in candidate_names) if path
+        ]
+    else:
+        nix_binaries = [
+            path
+            for path in _nix_binary_candidates(home, candidate_names)
+            if _is_executable(path)
+        ]
     nix_binary = nix_binaries[0] if nix_binaries else None
 
     # Decide priority:
@@ -3,43 +3,141 @@ from __future__ import annotations
 import selectors
 import subprocess
 import sys
-from typing import List, Optional, Union
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, TextIO, Union
+
+from pkgmgr.core.command.capture import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_LINES,
+    TailBuffer,
+    command_log_path,
+)
+from pkgmgr.core.command.process import (
+    TIMEOUT_EXIT_CODE,
+    note_timeout,
+    operation_timeout,
+    release,
+    spawn,
+    terminate_tree,
+)
 
 CommandType = Union[str, List[str]]
 
+# Serializes line output of commands running concurrently in worker threads,
+# so prefixed lines of different repositories never interleave mid-line.
+OUTPUT_LOCK = threading.Lock()
+
+_THREAD_STATE = threading.local()
+
+
+@contextmanager
+def output_prefix(prefix: str) -> Iterator[None]:
+    """
+    Set the default output ``prefix`` for run_command() calls made by the
+    current thread (e.g. ``"[repo] "`` inside a parallel install worker).
+    """
+    previous = getattr(_THREAD_STATE, "prefix", "")
+    _THREAD_STATE.prefix = prefix
+    try:
+        yield
+    finally:
+        _THREAD_STATE.prefix = previous
+
+
+def _emit(text: str, prefix: str, file: Optional[TextIO] = None) -> None:
+    """Print text line by line with an optional prefix, holding OUTPUT_LOCK."""
+    out = file or sys.stdout
+    with OUTPUT_LOCK:
+        if prefix:
+            for line in text.splitlines(keepends=True):
+                print(f"{prefix}{line}", end="", file=out)
+        else:
+            print(text, end="", file=out)
+
+
+def _tail_note(tail: TailBuffer) -> str:
+    if not tail.dropped:
+        return ""
+    return f" (last {len(tail)} lines, {tail.dropped} earlier lines dropped)"
+
 
 def run_command(
     cmd: CommandType,
     cwd: Optional[str] = None,
     preview: bool = False,
     allow_failure: bool = False,
+    *,
+    prefix: str = "",
+    stream: bool = True,
+    timeout: Optional[float] = None,
+    interactive: bool = False,
+    log_path: Optional[str] = None,
+    max_capture_lines: int = DEFAULT_MAX_LINES,
+    max_capture_bytes: int = DEFAULT_MAX_BYTES,
 ) -> subprocess.CompletedProcess:
     """
     Run a command with live output while capturing stdout/stderr.
 
-    - Output is streamed live to the terminal.
-    - Output is captured in memory.
-    - On failure, captured stdout/stderr are printed again so errors are never lost.
+    - Output is streamed live to the terminal (each line prefixed with
+      ``prefix`` if given, e.g. ``"[repo] "`` for parallel runs; defaults
+      to the prefix set via output_prefix() for the current thread).
+    - With ``stream=False`` nothing is printed live; callers can print the
+      captured output themselves (grouped output).
+    - Output is captured in a bounded in-memory ring buffer (last
+      ``max_capture_lines`` lines / ``max_capture_bytes`` bytes per stream).
+    - The full output is optionally spilled to ``log_path`` (default:
+      one log per working directory under $PKGMGR_LOG_DIR, if set).
+    - With ``timeout`` (seconds, default: config
+      ``performance.timeouts.command``) the process and its children are
+      terminated (SIGTERM, then SIGKILL) once the deadline passes; it then
+      counts as failed with TIMEOUT_EXIT_CODE and the returned object has
+      ``timed_out=True``. Unless the command is privileged (sudo), it runs
+      in its own process group for that.
+    - ``interactive`` commands (editors) stay in the foreground process
+      group and get no default timeout.
+    - On failure, the captured tail of stdout/stderr is printed again (plus
+      the log path) so errors are never lost.
     - Command is executed exactly once.
     """
     display = cmd if isinstance(cmd, str) else " ".join(cmd)
     where = cwd or "."
+    prefix = prefix or getattr(_THREAD_STATE, "prefix", "")
 
     if preview:
-        print(f"[Preview] In '{where}': {display}")
+        _emit(f"[Preview] In '{where}': {display}\n", prefix)
         return subprocess.CompletedProcess(cmd, 0)  # type: ignore[arg-type]
 
-    print(f"Running in '{where}': {display}")
+    if stream:
+        _emit(f"Running in '{where}': {display}\n", prefix)
 
-    process = subprocess.Popen(
-        cmd,
-        cwd=cwd,
-        shell=isinstance(cmd, str),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        bufsize=1,
-    )
+    if timeout is None and not interactive:
+        timeout = operation_timeout("command")
+
+    # Opened before the process starts, so an unwritable log directory
+    # cannot leave a running child behind.
+    if log_path is None:
+        log_path = command_log_path(cwd)
+    log_file = open(log_path, "a", encoding="utf-8") if log_path else None
+
+    try:
+        if log_file:
+            log_file.write(f"===== Running in '{where}': {display}\n")
+        process = spawn(
+            cmd,
+            isolate=timeout is not None and not interactive,
+            cwd=cwd,
+            shell=isinstance(cmd, str),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+    except BaseException:
+        if log_file:
+            log_file.close()
+        raise
 
     assert process.stdout is not None
     assert process.stderr is not None
@@ -48,30 +146,52 @@ def run_command(
     sel.register(process.stdout, selectors.EVENT_READ, data="stdout")
     sel.register(process.stderr, selectors.EVENT_READ, data="stderr")
 
-    stdout_lines: List[str] = []
-    stderr_lines: List[str] = []
+    stdout_tail = TailBuffer(max_capture_lines, max_capture_bytes)
+    stderr_tail = TailBuffer(max_capture_lines, max_capture_bytes)
+
+    deadline = time.monotonic() + timeout if timeout else None
+    timed_out = False
 
     try:
         while sel.get_map():
-            for key, _ in sel.select():
-                stream = key.fileobj
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    terminate_tree(process)
+                    break
+
+            for key, _ in sel.select(timeout=remaining):
+                fileobj = key.fileobj
                 which = key.data
 
-                line = stream.readline()
+                line = fileobj.readline()
                 if line == "":
                     # EOF: stop watching this stream
                     try:
-                        sel.unregister(stream)
+                        sel.unregister(fileobj)
                     except Exception:
                         pass
                     continue
 
+                if log_file:
+                    log_file.write(line)
+
                 if which == "stdout":
-                    stdout_lines.append(line)
-                    print(line, end="")
+                    stdout_tail.append(line)
+                    if stream:
+                        _emit(line, prefix)
                 else:
-                    stderr_lines.append(line)
-                    print(line, end="", file=sys.stderr)
+                    stderr_tail.append(line)
+                    if stream:
+                        _emit(line, prefix, file=sys.stderr)
+    except BaseException:
+        # Ctrl-C or an output error: do not leave the command running.
+        terminate_tree(process, grace=0)
+        process.wait()
+        release(process)
+        raise
     finally:
         # Ensure we don't leak FDs
         try:
@@ -85,27 +205,47 @@ def run_command(
                 process.stderr.close()
             except Exception:
                 pass
+            if log_file:
+                log_file.close()
 
     returncode = process.wait()
+    release(process)
+
+    if timed_out:
+        returncode = TIMEOUT_EXIT_CODE
+        note_timeout(display)
+        _emit(
+            f"[pkgmgr] Command timed out after {timeout}s and was killed: {display}\n",
+            prefix,
+            file=sys.stderr,
+        )
 
     if returncode != 0 and not allow_failure:
         print("\n[pkgmgr] Command failed, captured diagnostics:", file=sys.stderr)
         print(f"[pkgmgr] Failed command: {display}", file=sys.stderr)
 
-        if stdout_lines:
-            print("----- stdout -----")
-            print("".join(stdout_lines), end="")
+        if stdout_tail:
+            print(f"----- stdout{_tail_note(stdout_tail)} -----")
+            print(stdout_tail.text(), end="")
+
+        if stderr_tail:
+            print(f"----- stderr{_tail_note(stderr_tail)} -----", file=sys.stderr)
+            print(stderr_tail.text(), end="", file=sys.stderr)
 
-        if stderr_lines:
-            print("----- stderr -----", file=sys.stderr)
-            print("".join(stderr_lines), end="", file=sys.stderr)
+        if log_path:
+            print(f"[pkgmgr] Full output log: {log_path}", file=sys.stderr)
 
         print(f"Command failed with exit code {returncode}. Exiting.")
         sys.exit(returncode)
 
-    return subprocess.CompletedProcess(
+    completed = subprocess.CompletedProcess(
         cmd,
         returncode,
-        stdout="".join(stdout_lines),
-        stderr="".join(stderr_lines),
+        stdout=stdout_tail.text(),
+        stderr=stderr_tail.text(),
     )
+    # Attach details for callers that need to tell timeouts from failures
+    # or want to point at the full log.
+    completed.timed_out = timed_out  # type: ignore[attr-defined]
+    completed.log_path = log_path  # type: ignore[attr-defined]
+    return completed
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import urllib.error
 import urllib.request
 import json
 
+from pkgmgr.core.resources.ratelimit import github_rate_limit
+
 
 def validate_token(provider_kind: str, host: str, token: str) -> bool:
     """
@@ -25,13 +28,19 @@ def validate_token(provider_kind: str, host: str, token: str) -> bool:
             },
             method="GET",
         )
+        limits = github_rate_limit()
+        limits.wait()
         try:
             with urllib.request.urlopen(req, timeout=10) as resp:
+                limits.update_from_headers(resp.headers, int(resp.status))
                 if resp.status != 200:
                     return False
                 # Optional: parse to ensure body is JSON
                 _ = json.loads(resp.read().decode("utf-8"))
                 return True
+        except urllib.error.HTTPError as exc:
+            limits.update_from_headers(exc.headers or {}, int(exc.code))
+            return False
         except Exception:
             return False
 
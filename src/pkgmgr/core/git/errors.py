@@ -13,6 +13,12 @@ class GitNotRepositoryError(GitBaseError):
     """Raised when the current working directory is not a git repository."""
 
 
+class GitTimeoutError(GitRunError):
+    """Raised when a git command exceeded its timeout and was terminated."""
+
+    timed_out = True
+
+
 class GitQueryError(GitRunError):
     """Base class for read-only git query failures."""
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from .get_ahead_behind import get_ahead_behind
 from .get_changelog import GitChangelogQueryError, get_changelog
 from .get_config_value import get_config_value
 from .get_current_branch import get_current_branch
@@ -18,6 +19,8 @@ from .get_repo_root import get_repo_root
 from .get_tags import get_tags
 from .get_tags_at_ref import GitTagsAtRefQueryError, get_tags_at_ref
 from .get_upstream_ref import get_upstream_ref
+from .get_worktree_changes import get_worktree_changes
+from .list_grep_matches import GitGrepQueryError, GrepMatch, list_grep_matches
 from .list_remotes import list_remotes
 from .list_tags import list_tags
 from .probe_remote_reachable import (
@@ -38,6 +41,9 @@ __all__ = [
     "resolve_base_branch",
     "GitBaseBranchNotFoundError",
     "list_remotes",
+    "list_grep_matches",
+    "GrepMatch",
+    "GitGrepQueryError",
     "get_remote_push_urls",
     "probe_remote_reachable",
     "probe_remote_reachable_detail",
@@ -47,6 +53,8 @@ __all__ = [
     "GitTagsAtRefQueryError",
     "get_config_value",
     "get_upstream_ref",
+    "get_ahead_behind",
+    "get_worktree_changes",
     "list_tags",
     "get_repo_root",
 ]
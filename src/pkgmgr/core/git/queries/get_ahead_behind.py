@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+from ..errors import GitRunError
+from ..run import run
+
+
+def get_ahead_behind(*, cwd: str = ".") -> Optional[Tuple[int, int]]:
+    """
+    Return ``(ahead, behind)`` commit counts of HEAD relative to its upstream.
+
+    Returns None if the current branch has no upstream (or HEAD is detached).
+    The counts are based on the local remote-tracking refs, i.e. the state
+    of the last fetch.
+
+    Equivalent to:
+      git rev-list --left-right --count HEAD...@{u}
+    """
+    try:
+        out = run(["rev-list", "--left-right", "--count", "HEAD...@{u}"], cwd=cwd)
+    except GitRunError:
+        return None
+
+    parts = out.split()
+    if len(parts) != 2:
+        return None
+
+    try:
+        return int(parts[0]), int(parts[1])
+    except ValueError:
+        return None
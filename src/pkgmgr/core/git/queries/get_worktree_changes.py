@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import List
+
+from ..run import run
+
+
+def get_worktree_changes(*, cwd: str = ".", untracked: bool = True) -> List[str]:
+    """
+    Return the porcelain status lines of the working tree (including untracked
+    files unless ``untracked`` is False). An empty list means the working tree
+    is clean.
+
+    Equivalent to:
+      git status --porcelain [--untracked-files=no]
+
+    Raises GitBaseError if the command fails.
+    """
+    args = ["status", "--porcelain"]
+    if not untracked:
+        args.append("--untracked-files=no")
+    output = run(args, cwd=cwd)
+    if not output:
+        return []
+    return [line for line in output.splitlines() if line.strip()]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..errors import GitRunError
+from ..run import run
+
+
+class GitGrepQueryError(GitRunError):
+    """Raised when `git grep` fails for reasons other than "no match"."""
+
+
+@dataclass(frozen=True)
+class GrepMatch:
+    """
+    One `git grep` result.
+
+    - default mode: path + line number + line text
+    - count mode: path + count
+    - files-with-matches mode: path only
+    """
+
+    path: str
+    line: Optional[int] = None
+    text: Optional[str] = None
+    count: Optional[int] = None
+
+
+def list_grep_matches(
+    pattern: str,
+    *,
+    cwd: str = ".",
+    count: bool = False,
+    files_with_matches: bool = False,
+    ignore_case: bool = False,
+    fixed_strings: bool = False,
+) -> List[GrepMatch]:
+    """
+    Search tracked files of the repository with `git grep`.
+
+    Returns an empty list if nothing matches (git grep exits with 1).
+    Output is requested NUL-separated (-z) so paths containing ':' parse
+    unambiguously.
+
+    Raises GitGrepQueryError on real failures (e.g. invalid pattern).
+    """
+    args = ["grep", "-z", "-I"]
+    if ignore_case:
+        args.append("-i")
+    if fixed_strings:
+        args.append("-F")
+    if files_with_matches:
+        args.append("-l")
+    elif count:
+        args.append("-c")
+    else:
+        args.append("-n")
+    args += ["-e", pattern]
+
+    try:
+        # Unstripped: trailing whitespace of the last match is significant.
+        out = run(args, cwd=cwd, strip=False)
+    except GitRunError as exc:
+        if getattr(exc, "returncode", None) == 1 and not getattr(exc, "stderr", ""):
+            return []
+        raise GitGrepQueryError(
+            f"Failed to run `git grep` in {cwd!r}: {exc}"
+        ) from exc
+
+    if not out:
+        return []
+
+    if files_with_matches:
+        return [GrepMatch(path=p) for p in out.split("\0") if p]
+
+    matches: List[GrepMatch] = []
+    # Records end with "\n" only; splitlines() would also split the matched
+    # text on "\r", "\f", "\x1c" and similar.
+    for raw in out.split("\n"):
+        if not raw:
+            continue
+        parts = raw.split("\0")
+        if count and len(parts) >= 2:
+            try:
+                matches.append(GrepMatch(path=parts[0], count=int(parts[1])))
+            except ValueError:
+                continue
+        elif len(parts) >= 3:
+            try:
+                line_no = int(parts[1])
+            except ValueError:
+                continue
+            matches.append(
+                GrepMatch(path=parts[0], line=line_no, text="\0".join(parts[2:]))
+            )
+    return matches
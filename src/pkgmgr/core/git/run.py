@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import subprocess
-from typing import List
+from typing import List, Optional
 
-from .errors import GitRunError, GitNotRepositoryError
+from pkgmgr.core.command.process import (
+    TIMEOUT_EXIT_CODE,
+    operation_timeout,
+    run_process,
+)
+
+from .errors import GitNotRepositoryError, GitRunError, GitTimeoutError
 
 
 def _is_not_repo_error(stderr: str) -> bool:
@@ -16,13 +22,21 @@ def run(
     *,
     cwd: str = ".",
     preview: bool = False,
+    timeout: Optional[float] = None,
+    strip: bool = True,
 ) -> str:
     """
-    Run a Git command and return its stdout as a stripped string.
+    Run a Git command and return its stdout as a stripped string
+    (``strip=False`` returns it unmodified).
 
     If preview=True, the command is printed but NOT executed.
 
-    Raises GitRunError (or a subclass) if execution fails.
+    ``timeout`` defaults to the configured git timeout (config
+    ``performance.timeouts.git``); a command exceeding it is terminated
+    together with its children (ssh, credential helpers).
+
+    Raises GitRunError (or a subclass, GitTimeoutError on timeout) if
+    execution fails.
     """
     cmd = ["git"] + args
     cmd_str = " ".join(cmd)
@@ -31,15 +45,34 @@ def run(
         print(f"[PREVIEW] Would run in {cwd!r}: {cmd_str}")
         return ""
 
+    if timeout is None:
+        timeout = operation_timeout("git")
+
     try:
-        result = subprocess.run(
+        result = run_process(
             cmd,
             cwd=cwd,
             check=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
+            timeout=timeout,
         )
+    except subprocess.TimeoutExpired as exc:
+        stdout = exc.stdout or ""
+        stderr = exc.stderr or ""
+        err = GitTimeoutError(
+            f"Git command timed out after {timeout}s in {cwd!r}: {cmd_str}\n"
+            f"STDOUT:\n{stdout}\n"
+            f"STDERR:\n{stderr}"
+        )
+        err.cwd = cwd
+        err.cmd = cmd
+        err.cmd_str = cmd_str
+        err.returncode = TIMEOUT_EXIT_CODE
+        err.stdout = stdout
+        err.stderr = stderr
+        raise err from None
     except subprocess.CalledProcessError as exc:
         stderr = exc.stderr or ""
         stdout = exc.stdout or ""
@@ -72,4 +105,4 @@ def run(
         err.stderr = stderr
         raise err from exc
 
-    return result.stdout.strip()
+    return result.stdout.strip() if strip else result.stdout
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tuning of concurrent `nix build` invocations.
+
+Flake outputs can be built (realised) in parallel ahead of the serial
+`nix profile install`. Several nix processes building at once must not
+each assume the whole machine, so by default the CPU count is split
+between them: every process gets ``--max-jobs cpu_count // processes``.
+``--cores`` is only passed when configured; otherwise nix's own setting
+(nix.conf) applies.
+
+Config (all optional)::
+
+    performance:
+      nix:
+        prefetch_jobs: 4  # concurrent `nix build` processes (default: build slots)
+        max_jobs: 2       # --max-jobs per process
+        cores: 4          # --cores per process (0: all cores)
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Mapping, Optional
+
+SETTINGS = ("prefetch_jobs", "max_jobs", "cores")
+
+_SETTINGS: Dict[str, Optional[int]] = {name: None for name in SETTINGS}
+
+
+def configure_nix_build(performance: Optional[Mapping[str, Any]] = None) -> None:
+    """Apply ``performance.nix``; invalid values are reported and ignored."""
+    section = performance.get("nix") if isinstance(performance, Mapping) else None
+    if section is not None and not isinstance(section, Mapping):
+        print(f"[Warning] Ignoring invalid performance.nix: {section!r}")
+        section = None
+    for name in SETTINGS:
+        value = (section or {}).get(name)
+        _SETTINGS[name] = None
+        if value is None:
+            continue
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            print(f"[Warning] Ignoring invalid performance.nix.{name}: {value!r}")
+            continue
+        # cores: 0 is nix's "all cores"; the others need at least 1.
+        if number > 0 or (name == "cores" and number == 0):
+            _SETTINGS[name] = number
+
+
+def prefetch_jobs(default: int) -> int:
+    """Number of concurrent `nix build` processes (``default`` if unset)."""
+    return max(1, _SETTINGS["prefetch_jobs"] or default)
+
+
+def build_options(processes: int) -> List[str]:
+    """`nix build` options for one of ``processes`` concurrent builds."""
+    share = max(1, (os.cpu_count() or 1) // max(1, processes))
+    max_jobs = _SETTINGS["max_jobs"] or share
+    cores = _SETTINGS["cores"]
+    options = ["--max-jobs", str(max_jobs)]
+    if cores is not None:
+        options += ["--cores", str(cores)]
+    return options
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Optional pkgmgr-managed local nix binary cache.
+
+When enabled, flake outputs built by the nix installer are copied into a
+file binary cache (``nix copy --to file://...``) and the cache is offered to
+every nix command of the installer as an extra substituter. Machines or
+containers sharing the cache directory then substitute those outputs
+instead of building them again.
+
+Store paths are signed with a key pair kept in the cache directory
+(generated on first use); its public key is trusted for this cache only,
+so signature checking stays enabled. Whoever can write the directory can
+therefore provide binaries: only share it between machines that trust each
+other.
+
+Config::
+
+    performance:
+      nix:
+        binary_cache: true                  # /var/cache/pkgmgr/nix
+        # binary_cache: /srv/pkgmgr-nix     # or an explicit directory
+
+``PKGMGR_NIX_BINARY_CACHE`` (a directory, or ``0`` to disable) overrides
+the config.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import threading
+from typing import Any, Dict, Mapping, Optional
+
+from pkgmgr.core.command.process import run_process
+
+DEFAULT_CACHE_DIR = "/var/cache/pkgmgr/nix"
+CACHE_ENV = "PKGMGR_NIX_BINARY_CACHE"
+SECRET_KEY_FILE = "pkgmgr-cache.sec"
+PUBLIC_KEY_FILE = "pkgmgr-cache.pub"
+
+_LOCK = threading.Lock()
+_CONFIGURED: Optional[str] = None
+
+
+def _cache_dir(value: Any) -> Optional[str]:
+    if value is None or value is False:
+        return None
+    if value is True:
+        return DEFAULT_CACHE_DIR
+    if isinstance(value, str) and value.strip():
+        text = value.strip()
+        if text.startswith("file://"):
+            text = text[len("file://") :]
+        return os.path.abspath(os.path.expanduser(text))
+    print(f"[Warning] Ignoring invalid performance.nix.binary_cache: {value!r}")
+    return None
+
+
+def configure_binary_cache(performance: Optional[Mapping[str, Any]] = None) -> None:
+    """Apply ``performance.nix.binary_cache``."""
+    global _CONFIGURED
+    section = performance.get("nix") if isinstance(performance, Mapping) else None
+    value = section.get("binary_cache") if isinstance(section, Mapping) else None
+    _CONFIGURED = _cache_dir(value)
+
+
+def binary_cache_dir() -> Optional[str]:
+    """The cache directory, or None if the local binary cache is disabled."""
+    env = os.environ.get(CACHE_ENV, "").strip()
+    if env:
+        return None if env == "0" else _cache_dir(env)
+    return _CONFIGURED
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _nix_output(*args: str, stdin: Optional[str] = None) -> Optional[str]:
+    try:
+        p = run_process(
+            ["nix", *args],
+            input=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except OSError:
+        return None
+    if p.returncode != 0:
+        return None
+    return (p.stdout or "").strip() or None
+
+
+def ensure_signing_key(directory: str) -> Optional[str]:
+    """
+    Create the cache directory and its key pair if needed; return the path
+    of the secret key (None if the cache cannot be written).
+    """
+    secret = os.path.join(directory, SECRET_KEY_FILE)
+    public = os.path.join(directory, PUBLIC_KEY_FILE)
+    with _LOCK:
+        if os.path.isfile(secret) and os.path.isfile(public):
+            return secret
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as exc:
+            print(f"[Warning] nix binary cache {directory} unavailable ({exc}).")
+            return None
+
+        name = f"pkgmgr-{socket.gethostname() or 'local'}-1"
+        secret_key = _nix_output("key", "generate-secret", "--key-name", name)
+        public_key = (
+            _nix_output("key", "convert-secret-to-public", stdin=secret_key)
+            if secret_key
+            else None
+        )
+        if not (secret_key and public_key):
+            print(f"[Warning] Could not create a signing key for {directory}.")
+            return None
+        try:
+            fd = os.open(secret, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(secret_key + "\n")
+            with open(public, "w", encoding="utf-8") as f:
+                f.write(public_key + "\n")
+        except OSError as exc:
+            print(f"[Warning] nix binary cache {directory} unavailable ({exc}).")
+            return None
+        return secret
+
+
+def substituter_env(
+    base: Optional[Mapping[str, str]] = None,
+) -> Optional[Dict[str, str]]:
+    """
+    Environment for nix commands with the local cache added as a trusted
+    extra substituter via NIX_CONFIG (None: nothing to add).
+    """
+    directory = binary_cache_dir()
+    if directory is None:
+        return None
+    public_key = _read(os.path.join(directory, PUBLIC_KEY_FILE))
+    if public_key is None:
+        # Nothing was published yet.
+        return None
+
+    env = dict(os.environ if base is None else base)
+    extra = (
+        f"extra-substituters = file://{directory}\n"
+        f"extra-trusted-public-keys = {public_key}"
+    )
+    current = env.get("NIX_CONFIG", "")
+    env["NIX_CONFIG"] = f"{current}\n{extra}" if current else extra
+    return env
+
+
+def copy_to_cache_command(installables: str) -> Optional[str]:
+    """
+    The `nix copy` command publishing ``installables`` (space separated)
+    into the local cache, or None if the cache is disabled or unusable.
+    """
+    directory = binary_cache_dir()
+    if directory is None:
+        return None
+    secret = ensure_signing_key(directory)
+    if secret is None:
+        return None
+    return f"nix copy --to 'file://{directory}?secret-key={secret}' {installables}"
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Run-wide bookkeeping of the user's nix profile.
+
+`nix profile list --json` is slow on large profiles, so its result is
+cached for the whole pkgmgr run. Every command that changes the profile
+(`nix profile install/remove/upgrade/...`) bumps the profile generation;
+caches keyed on profile_generation() are thereby invalidated exactly when
+the profile may have changed.
+
+The nix installer reports its commands via note_nix_command() (see its
+CommandRunner) and keeps an indexed model of the profile per generation;
+other code mutating the profile calls invalidate_profile().
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import subprocess
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pkgmgr.core.command.process import run_process
+
+_MUTATION = re.compile(
+    r"\bnix\s+profile\s+(install|add|remove|upgrade|rollback|wipe-history)\b"
+)
+
+_LOCK = threading.Lock()
+_GENERATION = 0
+# kind ("json" / "text") -> (generation, listing)
+_CACHE: Dict[str, Tuple[int, Any]] = {}
+
+
+def profile_generation() -> int:
+    """Counter bumped on every (possible) change of the nix profile."""
+    return _GENERATION
+
+
+def invalidate_profile() -> None:
+    global _GENERATION
+    with _LOCK:
+        _GENERATION += 1
+
+
+def is_profile_mutation(cmd: str) -> bool:
+    return bool(_MUTATION.search(cmd or ""))
+
+
+def note_nix_command(cmd: str) -> None:
+    """Invalidate cached profile data if ``cmd`` may have changed the profile."""
+    if is_profile_mutation(cmd):
+        invalidate_profile()
+
+
+def _list_profile(*extra: str) -> Optional[str]:
+    if shutil.which("nix") is None:
+        return None
+    try:
+        p = run_process(
+            ["nix", "profile", "list", *extra],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except OSError:
+        return None
+    if p.returncode != 0:
+        return None
+    return p.stdout or ""
+
+
+def _parse_json(raw: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not (raw or "").strip():
+        return None
+    try:
+        data = json.loads(raw or "")
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _cached(kind: str, load: Callable[[], Any]) -> Any:
+    with _LOCK:
+        hit = _CACHE.get(kind)
+        if hit is not None and hit[0] == _GENERATION:
+            return hit[1]
+        generation = _GENERATION
+    value = load()
+    with _LOCK:
+        if value is not None and generation == _GENERATION:
+            _CACHE[kind] = (generation, value)
+    return value
+
+
+def profile_json() -> Optional[Dict[str, Any]]:
+    """
+    `nix profile list --json` of the current profile generation (None if nix
+    is unavailable or the listing failed; failures are not cached).
+    """
+    return _cached("json", lambda: _parse_json(_list_profile("--json")))
+
+
+def profile_text() -> Optional[str]:
+    """Plain `nix profile list` of the current profile generation."""
+    return _cached("text", _list_profile)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Progress display for parallel repository operations.
+
+On a terminal a live block is kept at the bottom of the output::
+
+    [PULL] 12/40 done, 1 failed | 4 running | 0.9/s | ETA 31s
+       23.4s  acme/huge-monorepo  (slow)
+        4.1s  acme/tool
+        ...
+
+showing the jobs in flight (longest running first), completed and failed
+counters, throughput and an ETA. Jobs running much longer than expected
+(their run history, else the median of the finished jobs) are flagged as
+slow. Everything else written to stdout/stderr while the display is active
+(command output, outcome lines) scrolls above the block.
+
+Without a terminal (pipes, CI logs, ``TERM=dumb`` or ``PKGMGR_PROGRESS=plain``)
+only the plain ``[OK]`` / ``[FAIL]`` / ``[TIME]`` lines are printed.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, TextIO
+
+from pkgmgr.core.command.run import OUTPUT_LOCK
+
+# A running job is flagged as slow beyond this multiple of its expectation.
+SLOW_FACTOR = 2.0
+# Finished jobs needed before their median serves as the expectation.
+MIN_SAMPLES = 3
+REFRESH_SECONDS = 0.5
+# Redraws triggered by other output are throttled to this interval.
+MIN_REDRAW_SECONDS = 0.1
+
+
+def live_supported(stream: TextIO) -> bool:
+    """Whether a live block can be drawn on ``stream``."""
+    if os.environ.get("PKGMGR_PROGRESS", "").lower() == "plain":
+        return False
+    if os.environ.get("TERM", "") == "dumb":
+        return False
+    isatty = getattr(stream, "isatty", None)
+    return bool(isatty and isatty())
+
+
+def format_outcome(
+    ident: str, ok: bool, msg: str, duration: float, timed_out: bool = False
+) -> str:
+    """The plain outcome line(s) of one job."""
+    if ok:
+        return f"[OK]   {ident} ({duration:.1f}s)"
+    status = "[TIME]" if timed_out else "[FAIL]"
+    lines = [f"{status} {ident} ({duration:.1f}s)"]
+    lines.extend(f"       {line}" for line in msg.splitlines())
+    return "\n".join(lines)
+
+
+def _format_eta(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+@dataclass
+class _Active:
+    ident: str
+    stage: str
+    started: float
+
+
+class _Passthrough:
+    """Stream proxy that keeps the live block below everything written."""
+
+    def __init__(self, display: "ProgressDisplay", real: TextIO) -> None:
+        self._display = display
+        self._real = real
+
+    def write(self, text: str) -> int:
+        return self._display._write_through(self._real, text)
+
+    def flush(self) -> None:
+        self._real.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._real, name)
+
+
+class ProgressDisplay:
+    """
+    Tracks the jobs of one batch and renders them live or as plain lines.
+
+    Use as a context manager; call start() when a job begins running and
+    finish() when it ends. Thread-safe.
+
+    - ``expected``: expected duration per identifier (run history), used
+      for slow-job detection.
+    - ``outcome_lines``: print an outcome line per finished job in plain
+      mode (live mode always prints them above the block).
+    - ``live``: force (True) or disable (False) the live block; default is
+      auto-detection on ``stream``.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        total: int,
+        *,
+        expected: Optional[Dict[str, float]] = None,
+        outcome_lines: bool = True,
+        stream: Optional[TextIO] = None,
+        live: Optional[bool] = None,
+        refresh: float = REFRESH_SECONDS,
+    ) -> None:
+        self.title = title
+        self.total = total
+        self.expected = dict(expected or {})
+        self.outcome_lines = outcome_lines
+        self._stream = stream or sys.stdout
+        self.live = live_supported(self._stream) if live is None else live
+        self._refresh = refresh
+
+        self._lock = threading.RLock()
+        self._active: Dict[str, _Active] = {}
+        self._durations: List[float] = []
+        self._done = 0
+        self._failed = 0
+        self._started_at = time.monotonic()
+
+        self._drawn = 0
+        self._last_draw = 0.0
+        self._at_line_start = True
+        self._saved: Optional[tuple] = None
+        self._stop = threading.Event()
+        self._ticker: Optional[threading.Thread] = None
+
+    # -- lifecycle --------------------------------------------------------
+
+    def __enter__(self) -> "ProgressDisplay":
+        self._started_at = time.monotonic()
+        if self.live:
+            self._saved = (sys.stdout, sys.stderr)
+            sys.stdout = _Passthrough(self, self._stream)  # type: ignore[assignment]
+            if live_supported(sys.stderr):
+                sys.stderr = _Passthrough(self, sys.stderr)  # type: ignore[assignment]
+            self._ticker = threading.Thread(
+                target=self._tick, name="pkgmgr-progress", daemon=True
+            )
+            self._ticker.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if not self.live:
+            return
+        self._stop.set()
+        if self._ticker is not None:
+            self._ticker.join()
+        with self._lock:
+            self._clear()
+            if self._saved is not None:
+                sys.stdout, sys.stderr = self._saved
+                self._saved = None
+            self._stream.flush()
+
+    # -- events -------------------------------------------------------------
+
+    def start(self, ident: str, stage: str = "") -> None:
+        with self._lock:
+            self._active[ident] = _Active(ident, stage, time.monotonic())
+            self._redraw()
+
+    def finish(
+        self,
+        ident: str,
+        ok: bool,
+        duration: float,
+        *,
+        msg: str = "",
+        timed_out: bool = False,
+    ) -> None:
+        with self._lock:
+            self._active.pop(ident, None)
+            self._done += 1
+            if ok:
+                self._durations.append(duration)
+            else:
+                self._failed += 1
+            self._redraw()
+        if self.live or self.outcome_lines:
+            # Through sys.stdout, so a live block stays below; OUTPUT_LOCK is
+            # taken before the display lock, like run_command() output does.
+            with OUTPUT_LOCK:
+                print(format_outcome(ident, ok, msg, duration, timed_out))
+
+    def skip(self, ident: str) -> None:
+        """Count a job that will not run (fail-fast, declined, blocked)."""
+        with self._lock:
+            self._active.pop(ident, None)
+            self._done += 1
+            self._redraw()
+
+    # -- rendering ----------------------------------------------------------
+
+    def is_slow(self, ident: str, elapsed: float) -> bool:
+        baseline = self.expected.get(ident)
+        if baseline is None and len(self._durations) >= MIN_SAMPLES:
+            baseline = statistics.median(self._durations)
+        return baseline is not None and elapsed > SLOW_FACTOR * max(baseline, 1.0)
+
+    def render(self, now: Optional[float] = None) -> List[str]:
+        """Lines of the live block (without trailing newlines)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            elapsed = max(now - self._started_at, 1e-6)
+            parts = [f"{self._done}/{self.total} done"]
+            if self._failed:
+                parts[0] += f", {self._failed} failed"
+            parts.append(f"{len(self._active)} running")
+            if self._done and elapsed >= 1.0:
+                rate = self._done / elapsed
+                parts.append(f"{rate:.1f}/s")
+                parts.append(f"ETA {_format_eta((self.total - self._done) / rate)}")
+            lines = [f"[{self.title.upper()}] " + " | ".join(parts)]
+
+            active = sorted(self._active.values(), key=lambda a: a.started)
+            height = shutil.get_terminal_size((80, 24)).lines
+            room = max(1, height // 2)
+            for job in active[:room]:
+                running = now - job.started
+                stage = f" [{job.stage}]" if job.stage else ""
+                slow = "  (slow)" if self.is_slow(job.ident, running) else ""
+                lines.append(f"  {running:7.1f}s  {job.ident}{stage}{slow}")
+            if len(active) > room:
+                lines.append(f"  ... (+{len(active) - room} more)")
+        return lines
+
+    def _clear(self) -> None:
+        if self._drawn:
+            # Cursor to the start of the block, erase to end of screen.
+            self._stream.write(f"\x1b[{self._drawn}F\x1b[J")
+            self._stream.flush()
+            self._drawn = 0
+
+    def _draw(self) -> None:
+        width = max(20, shutil.get_terminal_size((80, 24)).columns - 1)
+        lines = [line[:width] for line in self.render()]
+        self._stream.write("".join(line + "\n" for line in lines))
+        self._stream.flush()
+        self._drawn = len(lines)
+        self._last_draw = time.monotonic()
+
+    def _redraw(self) -> None:
+        if self.live and self._at_line_start:
+            self._clear()
+            self._draw()
+
+    def _write_through(self, real: TextIO, text: str) -> int:
+        with self._lock:
+            self._clear()
+            written = real.write(text)
+            if text:
+                self._at_line_start = text.endswith("\n")
+            if self._at_line_start:
+                real.flush()
+                if time.monotonic() - self._last_draw >= MIN_REDRAW_SECONDS:
+                    self._draw()
+            return written
+
+    def _tick(self) -> None:
+        while not self._stop.wait(self._refresh):
+            with self._lock:
+                self._redraw()
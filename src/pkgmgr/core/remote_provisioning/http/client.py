@@ -8,6 +8,12 @@ import urllib.request
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
+from pkgmgr.core.resources.ratelimit import (
+    github_rate_limit,
+    is_github_api,
+    is_rate_limit_error,
+)
+
 from .errors import HttpError
 
 
@@ -19,7 +25,12 @@ class HttpResponse:
 
 
 class HttpClient:
-    """Tiny HTTP client (stdlib) with JSON support."""
+    """
+    Tiny HTTP client (stdlib) with JSON support.
+
+    Requests to the GitHub API wait for and report to the shared GitHub
+    rate-limit coordinator (pkgmgr.core.resources.ratelimit).
+    """
 
     def __init__(self, timeout_s: int = 15) -> None:
         self._timeout_s = int(timeout_s)
@@ -42,12 +53,18 @@ class HttpClient:
         for k, v in final_headers.items():
             req.add_header(k, v)
 
+        limits = github_rate_limit() if is_github_api(url) else None
+        if limits is not None:
+            limits.wait()
+
         try:
             with urllib.request.urlopen(
                 req,
                 timeout=self._timeout_s,
                 context=ssl.create_default_context(),
             ) as resp:
+                if limits is not None:
+                    limits.update_from_headers(resp.headers, int(resp.status))
                 raw = resp.read().decode("utf-8", errors="replace")
 
                 parsed: Optional[Dict[str, Any]] = None
@@ -64,6 +81,10 @@ class HttpClient:
                 body = exc.read().decode("utf-8", errors="replace")
             except Exception:
                 body = ""
+            if limits is not None:
+                limits.update_from_headers(exc.headers or {}, int(exc.code))
+                if int(exc.code) in (403, 429) and is_rate_limit_error(body):
+                    limits.note_rate_limited(body)
             raise HttpError(status=int(exc.code), message=str(exc), body=body) from exc
         except urllib.error.URLError as exc:
             raise HttpError(status=0, message=str(exc), body="") from exc
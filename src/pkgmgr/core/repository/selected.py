@@ -149,7 +149,7 @@ def get_selected_repos(args, all_repositories: List[Repository]) -> List[Reposit
       - If identifiers are given: select via resolve_repos() from all_repositories.
         Ignored repositories are *not* filtered here, so explicit identifiers
         always win.
-      - Else if any of --category/--string/--tag is used: start from
+      - Else if any of --category/--string/--tag/--state is used: start from
         all_repositories, apply filters and then drop ignored repos.
       - Else if --all is set: select all_repositories and then drop ignored repos.
       - Else: try to select the repository of the current working directory
@@ -157,14 +157,21 @@ def get_selected_repos(args, all_repositories: List[Repository]) -> List[Reposit
 
     The ignore filter can be bypassed by setting args.include_ignored = True
     (e.g. via a CLI flag --include-ignored).
+
+    Live --state selectors are not evaluated here because they need the
+    repositories base directory; callers apply them afterwards via
+    pkgmgr.core.repository.state.filter_repos_by_state().
     """
     identifiers: List[str] = getattr(args, "identifiers", []) or []
     use_all: bool = bool(getattr(args, "all", False))
     category_patterns: List[str] = getattr(args, "category", []) or []
     string_pattern: str = getattr(args, "string", "") or ""
     tag_patterns: List[str] = getattr(args, "tag", []) or []
+    state_filters: List[str] = getattr(args, "state", []) or []
 
-    has_filters = bool(category_patterns or string_pattern or tag_patterns)
+    has_filters = bool(
+        category_patterns or string_pattern or tag_patterns or state_filters
+    )
 
     # 1) Explicit identifiers win and bypass ignore filtering
     if identifiers:
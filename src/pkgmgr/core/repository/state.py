@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Live repository state detection and state-based selection.
+
+Unlike the static filters in ``selected.py`` (identifier string, category,
+tag), these selectors look at the git state of each repository on disk:
+
+  - missing  : the repository directory does not exist
+  - dirty    : the working tree has uncommitted or untracked changes
+  - clean    : the working tree has no changes
+  - ahead    : HEAD has commits that are not in the upstream
+  - behind   : the upstream has commits that are not in HEAD
+  - diverged : both ahead and behind (such a repository is also ahead and
+               behind, so e.g. ``--state behind`` selects it too)
+
+Ahead/behind are computed against the local remote-tracking refs (state of
+the last fetch). The git queries are I/O bound, so repositories are
+evaluated concurrently.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Sequence, Set
+
+from pkgmgr.core.git.errors import GitBaseError
+from pkgmgr.core.git.queries import get_ahead_behind, get_worktree_changes
+from pkgmgr.core.repository.dir import get_repo_dir
+from pkgmgr.core.resources.governor import BUILD, acquire
+
+Repository = Dict[str, Any]
+
+REPO_STATES: List[str] = [
+    "dirty",
+    "clean",
+    "ahead",
+    "behind",
+    "diverged",
+    "missing",
+]
+
+
+def _default_jobs() -> int:
+    return min(os.cpu_count() or 4, 8)
+
+
+def detect_repo_states(repo_dir: str) -> Set[str]:
+    """
+    Return the set of live states that apply to the repository at repo_dir.
+
+    A directory that exists but is not a usable git repository yields an
+    empty set (it matches no state selector).
+    """
+    if not os.path.isdir(repo_dir):
+        return {"missing"}
+
+    states: Set[str] = set()
+
+    try:
+        changes = get_worktree_changes(cwd=repo_dir)
+    except GitBaseError:
+        return states
+
+    states.add("dirty" if changes else "clean")
+
+    counts = get_ahead_behind(cwd=repo_dir)
+    if counts is not None:
+        ahead, behind = counts
+        if ahead:
+            states.add("ahead")
+        if behind:
+            states.add("behind")
+        if ahead and behind:
+            states.add("diverged")
+
+    return states
+
+
+def _detect_governed(repo_dir: str) -> Set[str]:
+    with acquire(BUILD):
+        return detect_repo_states(repo_dir)
+
+
+def filter_repos_by_state(
+    repos: List[Repository],
+    repositories_base_dir: str,
+    states: Sequence[str],
+    jobs: int | None = None,
+) -> List[Repository]:
+    """
+    Keep only repositories that are in at least one of the requested states.
+
+    States are evaluated concurrently (``jobs`` workers, default
+    ``min(cpu_count, 8)``). The input order is preserved.
+    """
+    wanted = {s for s in states if s}
+    if not wanted or not repos:
+        return list(repos)
+
+    repo_dirs = [get_repo_dir(repositories_base_dir, repo) for repo in repos]
+
+    workers = max(1, min(jobs or _default_jobs(), len(repo_dirs)))
+    if workers == 1:
+        detected = [detect_repo_states(rd) for rd in repo_dirs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            detected = list(executor.map(_detect_governed, repo_dirs))
+
+    return [repo for repo, found in zip(repos, detected) if found & wanted]
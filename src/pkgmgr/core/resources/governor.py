@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Process-wide resource governor shared by all parallel code paths.
+
+Worker pools (``--jobs``) decide how many repositories are *in flight*;
+the governor decides how many of them may use a resource at the same time,
+no matter which executor they run in:
+
+  - NETWORK          git pull/push/fetch/clone, remote probes
+  - BUILD            CPU-heavy work: installers, builds, local git scans
+  - PACKAGE_MANAGER  transactions on the system package database
+                     (apt/dpkg, dnf/rpm, pacman)
+  - NIX_PROFILE      the user's nix profile (install/upgrade/remove)
+  - PYTHON_ENV       a shared Python environment (pip into the active
+                     virtualenv or $PKGMGR_PIP)
+
+Limits come from the ``performance:`` section of the config and can be
+overridden per invocation with ``--network-slots`` / ``--build-slots``::
+
+    performance:
+      network: 8          # default: 8
+      build: 4            # default: cpu_count
+      package_manager: 1  # default: 1
+
+NIX_PROFILE and PYTHON_ENV always have a single slot.
+
+Tokens are re-entrant per thread: a thread that already holds a token of a
+pool does not take a second one, so nested helpers cannot deadlock on their
+own caller. acquire() with several pools takes them in POOL_ORDER.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+NETWORK = "network"
+BUILD = "build"
+PACKAGE_MANAGER = "package_manager"
+NIX_PROFILE = "nix_profile"
+PYTHON_ENV = "python_env"
+
+POOL_ORDER = (NETWORK, BUILD, PACKAGE_MANAGER, NIX_PROFILE, PYTHON_ENV)
+CONFIGURABLE_POOLS = (NETWORK, BUILD, PACKAGE_MANAGER)
+
+
+def default_limits() -> Dict[str, int]:
+    return {
+        NETWORK: 8,
+        BUILD: os.cpu_count() or 4,
+        PACKAGE_MANAGER: 1,
+        NIX_PROFILE: 1,
+        PYTHON_ENV: 1,
+    }
+
+
+class TokenPool:
+    """Counting semaphore with per-thread re-entrancy and a resizable limit."""
+
+    def __init__(self, name: str, size: int) -> None:
+        self.name = name
+        self._size = max(1, size)
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._held = threading.local()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def resize(self, size: int) -> None:
+        with self._cond:
+            self._size = max(1, size)
+            self._cond.notify_all()
+
+    def acquire(self) -> None:
+        depth = getattr(self._held, "depth", 0)
+        if depth:
+            self._held.depth = depth + 1
+            return
+        with self._cond:
+            while self._in_use >= self._size:
+                self._cond.wait()
+            self._in_use += 1
+        self._held.depth = 1
+
+    def release(self) -> None:
+        depth = getattr(self._held, "depth", 0)
+        if depth <= 0:
+            raise RuntimeError(f"release of unheld {self.name} token")
+        self._held.depth = depth - 1
+        if depth > 1:
+            return
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+
+
+class ResourceGovernor:
+    """The set of token pools of one pkgmgr process."""
+
+    def __init__(self, limits: Optional[Mapping[str, int]] = None) -> None:
+        merged = default_limits()
+        merged.update(limits or {})
+        self._pools = {name: TokenPool(name, merged[name]) for name in POOL_ORDER}
+
+    def pool(self, name: str) -> TokenPool:
+        try:
+            return self._pools[name]
+        except KeyError:
+            raise ValueError(f"unknown resource pool: {name!r}") from None
+
+    def limits(self) -> Dict[str, int]:
+        return {name: pool.size for name, pool in self._pools.items()}
+
+    def configure(self, **limits: Optional[int]) -> None:
+        """Resize the configurable pools; None / non-positive values are ignored."""
+        for name, size in limits.items():
+            if name not in CONFIGURABLE_POOLS:
+                raise ValueError(f"pool {name!r} is not configurable")
+            if size is not None and int(size) > 0:
+                self._pools[name].resize(int(size))
+
+    @contextmanager
+    def acquire(self, *names: Optional[str]) -> Iterator[None]:
+        """Hold one token of each named pool (None entries are ignored)."""
+        wanted = {n for n in names if n}
+        pools = [self.pool(n) for n in POOL_ORDER if n in wanted]
+        unknown = wanted - set(POOL_ORDER)
+        if unknown:
+            raise ValueError(f"unknown resource pool(s): {sorted(unknown)}")
+
+        taken = []
+        try:
+            for pool in pools:
+                pool.acquire()
+                taken.append(pool)
+            yield
+        finally:
+            for pool in reversed(taken):
+                pool.release()
+
+
+_GOVERNOR = ResourceGovernor()
+
+
+def get_governor() -> ResourceGovernor:
+    return _GOVERNOR
+
+
+def acquire(*names: Optional[str]):
+    """Shortcut for ``get_governor().acquire(*names)``."""
+    return _GOVERNOR.acquire(*names)
+
+
+def configure_governor(
+    performance: Optional[Mapping[str, Any]] = None,
+    *,
+    network: Optional[int] = None,
+    build: Optional[int] = None,
+) -> None:
+    """
+    Apply the config ``performance:`` section, then CLI overrides.
+
+    Invalid config values are reported and ignored.
+    """
+    if performance is not None and not isinstance(performance, Mapping):
+        print(f"[Warning] Ignoring invalid performance section: {performance!r}")
+        performance = None
+    for name in CONFIGURABLE_POOLS:
+        value = (performance or {}).get(name)
+        if value is None:
+            continue
+        try:
+            _GOVERNOR.configure(**{name: int(value)})
+        except (TypeError, ValueError):
+            print(f"[Warning] Ignoring invalid performance.{name}: {value!r}")
+    _GOVERNOR.configure(network=network, build=build)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Process-wide GitHub rate-limit coordinator.
+
+All operations that talk to GitHub (pkgmgr's own API calls, nix fetching
+``github:`` flake inputs) share one view of the rate limit:
+
+  - API responses feed their ``X-RateLimit-Remaining`` /
+    ``X-RateLimit-Reset`` and ``Retry-After`` headers into it; an exhausted
+    quota blocks until its reset time.
+  - Commands that fail with a rate-limit error (e.g. nix's
+    "HTTP error 403 ... API rate limit exceeded") report it; without a known
+    reset time the coordinator blocks for a backoff that grows while the
+    errors persist.
+
+Before every GitHub-touching attempt workers call wait(). While a block is
+active they all sleep until the same deadline, announced once, instead of
+each discovering the limit with failing requests and backing off on its own
+schedule. The wait ends early with CommandCancelled when the run is
+interrupted (see pkgmgr.core.command.process.cancel_all).
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Callable, Mapping, Optional
+from urllib.parse import urlparse
+
+from pkgmgr.core.command.process import sleep_unless_cancelled
+
+# Backoff (seconds) after a rate-limit error without reset information; it
+# doubles for consecutive errors up to MAX_BACKOFF.
+DEFAULT_BACKOFF = 60.0
+MAX_BACKOFF = 3600.0
+# Waits until an announced reset get this margin for clock skew.
+RESET_MARGIN = 1.0
+
+_RETRY_AFTER = re.compile(r"retry[- ]after:?\s*(\d+)", re.IGNORECASE)
+
+
+def is_rate_limit_error(text: str) -> bool:
+    """Whether command output / an error body looks like a GitHub rate limit."""
+    t = (text or "").lower()
+    return (
+        "http error 403" in t
+        or "http error 429" in t
+        or "rate limit exceeded" in t
+        or "github api rate limit" in t
+        or "api rate limit exceeded" in t
+    )
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    return None if value is None else str(value).strip()
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimitCoordinator:
+    """Shared deadline before which no GitHub request should be made."""
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = sleep_unless_cancelled,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._announced = 0.0
+        self._strikes = 0
+        self.remaining: Optional[int] = None
+
+    @property
+    def blocked_until(self) -> float:
+        return self._blocked_until
+
+    def block_until(self, deadline: float) -> None:
+        """Block GitHub requests until ``deadline`` (epoch seconds)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, deadline)
+
+    def update_from_headers(
+        self, headers: Mapping[str, str], status: int = 200
+    ) -> None:
+        """Record the quota reported by a GitHub API response."""
+        remaining = _number(_header(headers, "X-RateLimit-Remaining"))
+        reset = _number(_header(headers, "X-RateLimit-Reset"))
+        retry_after = _number(_header(headers, "Retry-After"))
+
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if retry_after is not None and status in (403, 429):
+            self.block_until(self._clock() + retry_after)
+        elif remaining is not None and remaining <= 0 and reset is not None:
+            self.block_until(reset + RESET_MARGIN)
+        elif status < 400:
+            with self._lock:
+                self._strikes = 0
+
+    def note_rate_limited(
+        self, text: str = "", backoff: Optional[float] = None
+    ) -> float:
+        """
+        Record a rate-limit error (command output or error body) and return
+        the deadline until which requests are blocked.
+
+        A ``Retry-After`` hint in ``text`` wins; otherwise the caller's
+        ``backoff`` or the growing default backoff is used. A deadline that
+        is already further away (e.g. a known quota reset) is kept.
+        """
+        now = self._clock()
+        match = _RETRY_AFTER.search(text or "")
+        with self._lock:
+            self._strikes += 1
+            if match:
+                delay = float(match.group(1))
+            elif backoff is not None:
+                delay = backoff
+            else:
+                delay = min(DEFAULT_BACKOFF * 2 ** (self._strikes - 1), MAX_BACKOFF)
+            self._blocked_until = max(self._blocked_until, now + delay)
+            return self._blocked_until
+
+    def note_success(self) -> None:
+        with self._lock:
+            self._strikes = 0
+
+    def wait(self, quiet: bool = False) -> float:
+        """
+        Sleep until the current block (if any) is over; return the seconds
+        slept. The wait is announced once per deadline, not per worker.
+
+        Raises CommandCancelled if the run is interrupted meanwhile.
+        """
+        slept = 0.0
+        while True:
+            with self._lock:
+                deadline = self._blocked_until
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return slept
+                announce = not quiet and self._announced != deadline
+                if announce:
+                    self._announced = deadline
+            if announce:
+                print(
+                    "[pkgmgr] GitHub rate limit reached; all workers pause "
+                    f"for {remaining:.0f}s."
+                )
+            self._sleep(remaining)
+            slept += remaining
+
+
+_GITHUB = RateLimitCoordinator()
+
+
+def github_rate_limit() -> RateLimitCoordinator:
+    """The coordinator shared by all GitHub-touching operations."""
+    return _GITHUB
+
+
+def is_github_api(url: str) -> bool:
+    """Whether ``url`` points at the public GitHub API."""
+    return (urlparse(url or "").hostname or "").lower() == "api.github.com"
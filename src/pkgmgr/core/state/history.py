@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Run history: durations and outcomes of repository operations.
+
+Every pull, push and install of a repository (and every installer run
+within an install) is appended to a SQLite database in the pkgmgr state
+directory. The history is used to
+
+  - schedule parallel work longest-expected-first (shorter makespan)
+  - estimate install plans (``pkgmgr install --plan``)
+  - report p50/p95 durations and failure rates (``pkgmgr stats``)
+
+Rows are keyed by the absolute repository directory; ``installer`` is
+empty for whole-repository operations. Only the most recent KEEP_PER_KEY
+rows per (repository, operation, installer) are kept.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import statistics
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from pkgmgr.core.state.paths import state_dir, state_file
+
+HISTORY_FILE = "history.sqlite3"
+KEEP_PER_KEY = 50
+# Expected durations use the median of the most recent successful runs.
+ESTIMATE_SAMPLES = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo TEXT NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    operation TEXT NOT NULL,
+    installer TEXT NOT NULL DEFAULT '',
+    duration REAL NOT NULL,
+    ok INTEGER NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (operation, installer, repo);
+"""
+
+
+@dataclass(frozen=True)
+class StatRow:
+    """Aggregated history of one repository or installer and operation."""
+
+    name: str
+    operation: str
+    runs: int
+    failures: int
+    p50: float
+    p95: float
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.runs if self.runs else 0.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class RunHistory:
+    """
+    Thread-safe SQLite-backed run history.
+
+    With read_only=True neither the state directory nor the database is
+    created (a missing database raises sqlite3.OperationalError) and
+    record() is not available.
+    """
+
+    def __init__(self, path: Optional[str] = None, *, read_only: bool = False) -> None:
+        if path is None:
+            path = (
+                os.path.join(state_dir(create=False), HISTORY_FILE)
+                if read_only
+                else state_file(HISTORY_FILE)
+            )
+        self.path = path
+        self._lock = threading.Lock()
+        self._warned = False
+        if read_only:
+            self._conn = sqlite3.connect(
+                f"file:{urllib.parse.quote(path)}?mode=ro",
+                uri=True,
+                timeout=10,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            return
+        self._conn = sqlite3.connect(
+            path, timeout=10, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def key(repo_dir: str) -> str:
+        return os.path.abspath(repo_dir)
+
+    def record(
+        self,
+        repo_dir: str,
+        operation: str,
+        duration: float,
+        ok: bool,
+        *,
+        label: str = "",
+        installer: str = "",
+    ) -> None:
+        """
+        Append one run. A failing write (locked or read-only database, full
+        disk) is reported once and otherwise ignored: the history must never
+        fail the operation it records.
+        """
+        repo = self.key(repo_dir)
+        with self._lock:
+            try:
+                self._write(repo, operation, installer, duration, ok, label)
+            except sqlite3.Error as exc:
+                if not self._warned:
+                    self._warned = True
+                    print(f"[Warning] run history not updated ({exc}).")
+
+    def _write(
+        self,
+        repo: str,
+        operation: str,
+        installer: str,
+        duration: float,
+        ok: bool,
+        label: str,
+    ) -> None:
+        self._conn.execute(
+            "INSERT INTO runs (repo, label, operation, installer, duration, "
+            "ok, finished_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                repo,
+                label,
+                operation,
+                installer,
+                round(duration, 3),
+                int(ok),
+                time.time(),
+            ),
+        )
+        self._conn.execute(
+            "DELETE FROM runs WHERE id IN (SELECT id FROM runs WHERE repo = ? "
+            "AND operation = ? AND installer = ? ORDER BY id DESC "
+            "LIMIT -1 OFFSET ?)",
+            (repo, operation, installer, KEEP_PER_KEY),
+        )
+
+    def _recent_ok(self, operation: str, installer: str) -> Dict[str, List[float]]:
+        rows = self._conn.execute(
+            "SELECT repo, duration FROM runs WHERE operation = ? AND installer = ? "
+            "AND ok = 1 ORDER BY id DESC",
+            (operation, installer),
+        ).fetchall()
+        samples: Dict[str, List[float]] = {}
+        for repo, duration in rows:
+            per_repo = samples.setdefault(repo, [])
+            if len(per_repo) < ESTIMATE_SAMPLES:
+                per_repo.append(duration)
+        return samples
+
+    def expected_durations(
+        self,
+        operation: str,
+        repo_dirs: Iterable[str],
+        *,
+        installer: str = "",
+    ) -> Dict[str, float]:
+        """
+        Expected duration per repository directory (median of its recent
+        successful runs); repositories without history are left out.
+        """
+        with self._lock:
+            samples = self._recent_ok(operation, installer)
+        expected: Dict[str, float] = {}
+        for repo_dir in repo_dirs:
+            own = samples.get(self.key(repo_dir))
+            if own:
+                expected[repo_dir] = statistics.median(own)
+        return expected
+
+    def estimate(
+        self, repo_dir: str, operation: str, installer: str = ""
+    ) -> Optional[float]:
+        """
+        Expected duration for this repository, falling back to the median of
+        the same operation/installer across all repositories.
+        """
+        with self._lock:
+            samples = self._recent_ok(operation, installer)
+        own = samples.get(self.key(repo_dir))
+        if own:
+            return statistics.median(own)
+        pooled = [s for per_repo in samples.values() for s in per_repo]
+        return statistics.median(pooled) if pooled else None
+
+    def stats(
+        self,
+        *,
+        by: str = "repo",
+        operation: Optional[str] = None,
+    ) -> List[StatRow]:
+        """
+        Aggregate the history per repository (``by="repo"``, whole-repository
+        operations) or per installer (``by="installer"``).
+        """
+        if by not in ("repo", "installer"):
+            raise ValueError(f"unknown grouping: {by!r}")
+
+        query = (
+            "SELECT repo, label, installer, operation, duration, ok FROM runs "
+            "WHERE installer " + ("= ''" if by == "repo" else "!= ''")
+        )
+        params: List[str] = []
+        if operation:
+            query += " AND operation = ?"
+            params.append(operation)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+
+        groups: Dict[tuple, List[tuple]] = {}
+        labels: Dict[str, str] = {}
+        for repo, label, installer, op, duration, ok in rows:
+            name = repo if by == "repo" else installer
+            if by == "repo" and label:
+                labels[repo] = label
+            groups.setdefault((name, op), []).append((duration, ok))
+
+        result: List[StatRow] = []
+        for (name, op), runs in groups.items():
+            durations = [d for d, _ok in runs]
+            result.append(
+                StatRow(
+                    name=labels.get(name, name),
+                    operation=op,
+                    runs=len(runs),
+                    failures=sum(1 for _d, ok in runs if not ok),
+                    p50=percentile(durations, 50),
+                    p95=percentile(durations, 95),
+                )
+            )
+        result.sort(key=lambda r: (-r.p95, r.name, r.operation))
+        return result
+
+
+def open_run_history(
+    quiet: bool = True, *, read_only: bool = False
+) -> Optional[RunHistory]:
+    """
+    Open the default run history; None (optionally warning) if unavailable.
+    Read-only, a history that was never written is unavailable, too.
+    """
+    try:
+        return RunHistory(read_only=read_only)
+    except (OSError, sqlite3.Error) as exc:
+        if not quiet:
+            print(f"[Warning] run history unavailable ({exc}).")
+        return None
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+
+# Overrides the directory pkgmgr keeps its persistent state in (install
+# ledger, caches, run history). Default: $XDG_STATE_HOME/pkgmgr, i.e.
+# ~/.local/state/pkgmgr.
+STATE_DIR_ENV = "PKGMGR_STATE_DIR"
+
+
+def state_dir(create: bool = True) -> str:
+    """
+    Return pkgmgr's state directory, creating it unless create=False.
+    """
+    explicit = os.environ.get(STATE_DIR_ENV, "").strip()
+    if explicit:
+        path = os.path.expanduser(explicit)
+    else:
+        base = os.environ.get("XDG_STATE_HOME", "").strip() or "~/.local/state"
+        path = os.path.join(os.path.expanduser(base), "pkgmgr")
+
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def state_file(name: str) -> str:
+    """Return the path of a file inside the state directory."""
+    return os.path.join(state_dir(), name)
+
+
+# Overrides the directory pkgmgr keeps rebuildable caches in (wheelhouse,
+# venv templates, build artifacts). Default: $XDG_CACHE_HOME/pkgmgr, i.e.
+# ~/.cache/pkgmgr.
+CACHE_DIR_ENV = "PKGMGR_CACHE_DIR"
+
+
+def cache_dir(create: bool = True) -> str:
+    """
+    Return pkgmgr's cache directory, creating it unless create=False.
+    """
+    explicit = os.environ.get(CACHE_DIR_ENV, "").strip()
+    if explicit:
+        path = os.path.expanduser(explicit)
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", "").strip() or "~/.cache"
+        path = os.path.join(os.path.expanduser(base), "pkgmgr")
+
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
 import re
 import shutil
-import subprocess
 from dataclasses import dataclass
-from typing import Iterable, Optional, Tuple
+from typing import Iterable, Optional
+
+from pkgmgr.core.nix.profile import profile_json, profile_text
 
 
 @dataclass(frozen=True)
@@ -85,17 +85,6 @@ def get_installed_python_version(*candidates: str) -> Optional[InstalledVersion]
     return None
 
 
-def _run_nix(args: list[str]) -> Tuple[int, str, str]:
-    p = subprocess.run(
-        args,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        check=False,
-    )
-    return p.returncode, p.stdout or "", p.stderr or ""
-
-
 def _extract_version_from_store_path(path: str) -> Optional[str]:
     if not path:
         return None
@@ -113,7 +102,8 @@ def get_installed_nix_profile_version(*candidates: str) -> Optional[InstalledVer
     Detect installed version from the current Nix profile.
 
     Strategy:
-      1) JSON output (exact normalized match)
+      1) JSON output (exact normalized match; listed once per profile
+         generation, see pkgmgr.core.nix.profile)
       2) Text fallback (substring)
     """
     if shutil.which("nix") is None:
@@ -126,10 +116,9 @@ def get_installed_nix_profile_version(*candidates: str) -> Optional[InstalledVer
     norm_candidates = {_normalize(c) for c in candidates}
 
     # Preferred: JSON output
-    rc, out, _ = _run_nix(["nix", "profile", "list", "--json"])
-    if rc == 0 and out.strip():
+    data = profile_json()
+    if data is not None:
         try:
-            data = json.loads(out)
             elements = data.get("elements") or data.get("items") or {}
             if isinstance(elements, dict):
                 for elem in elements.values():
@@ -150,8 +139,8 @@ def get_installed_nix_profile_version(*candidates: str) -> Optional[InstalledVer
             pass
 
     # Fallback: text mode
-    rc, out, _ = _run_nix(["nix", "profile", "list"])
-    if rc != 0:
+    out = profile_text()
+    if out is None:
         return None
 
     for line in out.splitlines():
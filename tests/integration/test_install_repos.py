@@ -27,6 +27,14 @@ class DummyInstaller(BaseInstaller):
 
 
 class TestInstallReposIntegration(unittest.TestCase):
+    def setUp(self) -> None:
+        # The run history must not touch the real state directory.
+        state = tempfile.TemporaryDirectory()
+        self.addCleanup(state.cleanup)
+        env = patch.dict(os.environ, {"PKGMGR_STATE_DIR": state.name})
+        env.start()
+        self.addCleanup(env.stop)
+
     @patch("pkgmgr.actions.install.verify_repository")
     @patch("pkgmgr.actions.install.clone_repos")
     @patch("pkgmgr.actions.install.get_repo_dir")
@@ -21,6 +21,7 @@ from typing import List, Sequence, Tuple
 from unittest.mock import patch
 
 import pkgmgr.actions.install as install_mod
+import pkgmgr.actions.install.capabilities as capabilities
 from pkgmgr.actions.install import install_repos
 from pkgmgr.actions.install.installers.makefile import MakefileInstaller
 from pkgmgr.actions.install.installers.nix import NixFlakeInstaller
@@ -39,6 +40,15 @@ class TestRecursiveCapabilitiesIntegration(unittest.TestCase):
         self.bin_dir = os.path.join(self.tmp_root, "bin")
         os.makedirs(self.bin_dir, exist_ok=True)
 
+        # Keep the capability cache out of the user's state directory.
+        state = os.path.join(self.tmp_root, "state")
+        for patcher in (
+            patch.dict(os.environ, {"PKGMGR_STATE_DIR": state}),
+            patch.object(capabilities, "_CACHE", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     def tearDown(self) -> None:
         shutil.rmtree(self.tmp_root)
 
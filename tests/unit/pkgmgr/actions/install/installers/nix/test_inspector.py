@@ -3,7 +3,11 @@ from __future__ import annotations
 import json
 import unittest
 
-from pkgmgr.actions.install.installers.nix.profile import NixProfileInspector
+from pkgmgr.actions.install.installers.nix.profile import (
+    NixProfileInspector,
+    NixProfileModel,
+)
+from pkgmgr.core.nix.profile import note_nix_command
 from ._fakes import FakeRunResult, FakeRunner
 
 
@@ -80,3 +84,65 @@ class TestNixProfileInspector(unittest.TestCase):
             prefixes=["/nix/store/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa-pkgmgr"],
         )
         self.assertIn("pkgmgr-1", tokens)
+
+    def test_profile_is_listed_once_until_it_changes(self) -> None:
+        payload = {
+            "elements": {
+                "pkgmgr-1": {
+                    "name": "pkgmgr-1",
+                    "attrPath": "packages.x86_64-linux.pkgmgr",
+                    "storePaths": [
+                        "/nix/store/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa-pkgmgr"
+                    ],
+                },
+            }
+        }
+        runner = FakeRunner(default=FakeRunResult(0, stdout=json.dumps(payload)))
+        insp = NixProfileInspector()
+
+        insp.find_remove_tokens_for_output(ctx=None, runner=runner, output="pkgmgr")
+        insp.find_installed_indices_for_output(ctx=None, runner=runner, output="pkgmgr")
+        insp.find_remove_tokens_for_store_prefixes(
+            ctx=None,
+            runner=runner,
+            prefixes=["/nix/store/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa-pkgmgr"],
+        )
+        self.assertEqual(len(runner.calls), 1)
+
+        note_nix_command("nix profile remove pkgmgr-1")
+        insp.find_remove_tokens_for_output(ctx=None, runner=runner, output="pkgmgr")
+        self.assertEqual(len(runner.calls), 2)
+
+        insp.invalidate()
+        insp.find_remove_tokens_for_output(ctx=None, runner=runner, output="pkgmgr")
+        self.assertEqual(len(runner.calls), 3)
+
+
+class TestNixProfileModel(unittest.TestCase):
+    def test_indexed_lookups(self) -> None:
+        sp = "/nix/store/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa-pkgmgr"
+        model = NixProfileModel.from_json(
+            {
+                "elements": {
+                    "pkgmgr-1": {
+                        "name": "pkgmgr-1",
+                        "attrPath": "packages.x86_64-linux.pkgmgr",
+                        "storePaths": [sp, sp],
+                    },
+                    "default": {
+                        "name": "default",
+                        "attrPath": "packages.x86_64-linux.default",
+                    },
+                }
+            }
+        )
+
+        self.assertEqual([e.key for e in model.by_name("pkgmgr-1")], ["pkgmgr-1"])
+        self.assertEqual(
+            [e.key for e in model.by_attr_path("packages.x86_64-linux.default")],
+            ["default"],
+        )
+        self.assertEqual([e.key for e in model.by_store_path(sp)], ["pkgmgr-1"])
+        self.assertTrue(model.has_store_path(sp))
+        self.assertEqual([e.key for e in model.for_output("pkgmgr")], ["pkgmgr-1"])
+        self.assertEqual(model.for_output("missing"), [])
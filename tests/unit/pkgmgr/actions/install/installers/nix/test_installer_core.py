@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from pkgmgr.actions.install.installers.nix.installer import NixFlakeInstaller
 from ._fakes import FakeRunResult
@@ -92,3 +92,130 @@ class TestNixFlakeInstallerCore(unittest.TestCase):
 
         ctx = DummyCtx(identifier="pkgmgr", repo_dir="/repo", quiet=True)
         ins.run(ctx)  # must not raise
+
+
+    def test_force_update_is_a_noop_when_out_path_is_installed(self) -> None:
+        ins = NixFlakeInstaller()
+        ins.supports = MagicMock(return_value=True)
+        ins._retry = MagicMock()
+        ins._runner = MagicMock()
+        ins._outpaths = MagicMock()
+        ins._outpaths.out_path.return_value = "/nix/store/abc-lib"
+        ins._profile = MagicMock()
+        ins._profile.model.return_value.has_store_path.return_value = True
+
+        ctx = DummyCtx(identifier="lib", repo_dir="/repo", force_update=True)
+        ins.run(ctx)
+
+        ins._outpaths.out_path.assert_called_once_with(
+            ctx, ins._runner, "/repo#default"
+        )
+        ins._profile.model.return_value.has_store_path.assert_called_once_with(
+            "/nix/store/abc-lib"
+        )
+        ins._retry.run_with_retry.assert_not_called()
+        ins._runner.run.assert_not_called()
+        ins._profile.find_installed_indices_for_output.assert_not_called()
+
+class TestNixFlakeInstallerBatch(unittest.TestCase):
+    def _installer(self, *results: FakeRunResult) -> NixFlakeInstaller:
+        ins = NixFlakeInstaller()
+        ins.supports = MagicMock(return_value=True)
+        ins._retry = MagicMock()
+        ins._retry.run_with_retry.side_effect = list(results)
+        ins._conflicts = MagicMock()
+        ins._conflicts.resolve.return_value = False
+        ins._profile = MagicMock()
+        ins._profile.find_installed_indices_for_output.return_value = []
+        ins._runner = MagicMock()
+        return ins
+
+    def test_batch_installs_required_outputs_in_one_command(self) -> None:
+        ins = self._installer(*[FakeRunResult(0, "", "")] * 3)
+        a = DummyCtx(identifier="a", repo_dir="/a")
+        pkgmgr = DummyCtx(identifier="pkgmgr", repo_dir="/pm")
+
+        installed = ins.install_batch([a, pkgmgr])
+
+        self.assertEqual(installed, {"/a#default", "/pm#pkgmgr"})
+        ins._retry.run_with_retry.assert_called_once()
+        self.assertEqual(
+            ins._retry.run_with_retry.call_args.args[2],
+            "nix profile install /a#default /pm#pkgmgr",
+        )
+
+        # Batched outputs are skipped once; the optional output still runs.
+        ins.run(a)
+        ins.run(pkgmgr)
+        cmds = [c.args[2] for c in ins._retry.run_with_retry.call_args_list[1:]]
+        self.assertEqual(cmds, ["nix profile install /pm#default"])
+
+        ins.run(a)
+        self.assertEqual(
+            ins._retry.run_with_retry.call_args.args[2], "nix profile install /a#default"
+        )
+
+    def test_failed_batch_falls_back_to_per_output_install(self) -> None:
+        ins = self._installer(
+            FakeRunResult(1, "", "conflict"),
+            FakeRunResult(0, "", ""),
+        )
+        a = DummyCtx(identifier="a", repo_dir="/a")
+        b = DummyCtx(identifier="b", repo_dir="/b")
+
+        self.assertEqual(ins.install_batch([a, b]), set())
+        ins.run(a)
+        self.assertEqual(
+            ins._retry.run_with_retry.call_args.args[2], "nix profile install /a#default"
+        )
+
+    def test_single_installable_is_not_batched(self) -> None:
+        ins = self._installer()
+        self.assertEqual(ins.install_batch([DummyCtx(identifier="a")]), set())
+        ins._retry.run_with_retry.assert_not_called()
+
+    def test_prefetch_builds_concurrently_and_reports_failures(self) -> None:
+        ins = self._installer()
+
+        def run_with_retry(ctx, runner, cmd):
+            return FakeRunResult(1 if cmd.endswith("/b#default") else 0, "", "")
+
+        ins._retry.run_with_retry.side_effect = run_with_retry
+        a = DummyCtx(identifier="a", repo_dir="/a")
+        b = DummyCtx(identifier="b", repo_dir="/b")
+        c = DummyCtx(identifier="c", repo_dir="/c")
+
+        with patch(
+            "pkgmgr.actions.install.installers.nix.installer.build_options",
+            return_value=["--max-jobs", "2", "--cores", "1"],
+        ):
+            built = ins.prefetch([a, b, c])
+
+        self.assertEqual(built, {"/a#default", "/c#default"})
+        cmds = sorted(c.args[2] for c in ins._retry.run_with_retry.call_args_list)
+        self.assertEqual(
+            cmds[0], "nix build --no-link --max-jobs 2 --cores 1 /a#default"
+        )
+        self.assertEqual(len(cmds), 3)
+
+        ins.install_batch([a, b, c], prefetched=built)
+        self.assertEqual(
+            ins._retry.run_with_retry.call_args.args[2],
+            "nix profile install /a#default /c#default",
+        )
+
+    def test_built_outputs_are_published_to_the_binary_cache(self) -> None:
+        ins = self._installer(FakeRunResult(0, "", ""), FakeRunResult(0, "", ""))
+        ins._runner.run.return_value = FakeRunResult(0, "", "")
+        a = DummyCtx(identifier="a", repo_dir="/a")
+
+        with patch(
+            "pkgmgr.actions.install.installers.nix.installer.copy_to_cache_command",
+            side_effect=lambda installable: f"nix copy --to file:///c {installable}",
+        ):
+            ins.prefetch([a])
+            ins.run(DummyCtx(identifier="b", repo_dir="/b"))
+
+        cmds = [call.args[1] for call in ins._runner.run.call_args_list]
+        self.assertIn("nix copy --to file:///c /a#default", cmds)
+        self.assertIn("nix copy --to file:///c /b#default", cmds)
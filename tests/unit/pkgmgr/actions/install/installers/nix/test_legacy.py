@@ -94,7 +94,7 @@ class TestNixFlakeInstaller(unittest.TestCase):
 
         install_results = [self._cp(0)]  # first install succeeds
 
-        def fake_subprocess_run(cmd, *args, **kwargs):
+        def fake_run_process(cmd, *args, **kwargs):
             # cmd is a string because CommandRunner uses shell=True
             if isinstance(cmd, str) and cmd.startswith("nix profile list --json"):
                 return self._cp(0, stdout='{"elements": []}', stderr="")
@@ -112,8 +112,8 @@ class TestNixFlakeInstaller(unittest.TestCase):
                 return_value=True,
             ),
             patch(
-                "pkgmgr.actions.install.installers.nix.runner.subprocess.run",
-                side_effect=fake_subprocess_run,
+                "pkgmgr.actions.install.installers.nix.runner.run_process",
+                side_effect=fake_run_process,
             ) as subproc_mock,
             redirect_stdout(buf),
         ):
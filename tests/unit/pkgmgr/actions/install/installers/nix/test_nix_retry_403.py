@@ -8,6 +8,7 @@ from pkgmgr.actions.install.installers.nix.retry import (
     RetryPolicy,
 )
 from pkgmgr.actions.install.installers.nix.types import RunResult
+from pkgmgr.core.resources.ratelimit import RateLimitCoordinator
 
 
 class DummyCtx:
@@ -39,6 +40,19 @@ class FakeRunner:
         return RunResult(returncode=0, stdout="ok", stderr="")
 
 
+class FakeClock:
+    """Clock whose sleep() only advances the fake time."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
 class TestGitHub403Retry(unittest.TestCase):
     def test_retries_on_403_without_realtime_waiting(self) -> None:
         """
@@ -55,20 +69,23 @@ class TestGitHub403Retry(unittest.TestCase):
             jitter_seconds_max=60,
         )
 
-        retry = GitHubRateLimitRetry(policy=policy)
+        clock = FakeClock()
+        sleeps = []
+
+        def sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            clock.sleep(seconds)
+
+        coordinator = RateLimitCoordinator(clock=clock.time, sleep=sleep)
+        retry = GitHubRateLimitRetry(policy=policy, coordinator=coordinator)
         ctx = DummyCtx(quiet=True)
         runner = FakeRunner(fail_count=2)  # fail twice (403), then succeed
 
-        # Make jitter deterministic and prevent real sleeping.
-        with (
-            patch(
-                "pkgmgr.actions.install.installers.nix.retry.random.randint",
-                return_value=5,
-            ) as jitter_mock,
-            patch(
-                "pkgmgr.actions.install.installers.nix.retry.time.sleep"
-            ) as sleep_mock,
-        ):
+        # Make jitter deterministic; waiting happens on the fake clock.
+        with patch(
+            "pkgmgr.actions.install.installers.nix.retry.random.randint",
+            return_value=5,
+        ) as jitter_mock:
             res = retry.run_with_retry(ctx, runner, "nix profile install /tmp#default")
 
         # Result should be success on 3rd attempt.
@@ -77,20 +94,20 @@ class TestGitHub403Retry(unittest.TestCase):
 
         # jitter should be used for each retry sleep (attempt 1->2, attempt 2->3) => 2 sleeps
         self.assertEqual(jitter_mock.call_count, 2)
-        self.assertEqual(sleep_mock.call_count, 2)
+        self.assertEqual(len(sleeps), 2)
 
         # Fibonacci delays for attempts=3: [30, 30, 60]
         # sleep occurs after failed attempt 1 and 2, so base delays are 30 and 30
         # wait_time = base_delay + jitter(5) => 35, 35
-        sleep_args = [c.args[0] for c in sleep_mock.call_args_list]
-        self.assertEqual(sleep_args, [35, 35])
+        self.assertEqual(sleeps, [35, 35])
 
     def test_does_not_retry_on_non_403_errors(self) -> None:
         """
         Ensure it does not retry when the error is not recognized as GitHub 403/rate limit.
         """
         policy = RetryPolicy(max_attempts=7, base_delay_seconds=30)
-        retry = GitHubRateLimitRetry(policy=policy)
+        coordinator = RateLimitCoordinator()
+        retry = GitHubRateLimitRetry(policy=policy, coordinator=coordinator)
         ctx = DummyCtx(quiet=True)
 
         class Non403Runner:
@@ -105,14 +122,32 @@ class TestGitHub403Retry(unittest.TestCase):
 
         runner = Non403Runner()
 
-        with patch(
-            "pkgmgr.actions.install.installers.nix.retry.time.sleep"
-        ) as sleep_mock:
-            res = retry.run_with_retry(ctx, runner, "nix profile install /tmp#default")
+        res = retry.run_with_retry(ctx, runner, "nix profile install /tmp#default")
 
         self.assertEqual(res.returncode, 1)
         self.assertEqual(runner.calls, 1)  # no retries
-        self.assertEqual(sleep_mock.call_count, 0)
+        self.assertEqual(coordinator.blocked_until, 0.0)  # no wait scheduled
+
+
+    def test_workers_share_one_deadline(self) -> None:
+        clock = FakeClock()
+        coordinator = RateLimitCoordinator(clock=clock.time, sleep=clock.sleep)
+        retry = GitHubRateLimitRetry(
+            policy=RetryPolicy(max_attempts=2, jitter_seconds_max=0),
+            coordinator=coordinator,
+        )
+        runner = FakeRunner(fail_count=1)
+
+        retry.run_with_retry(DummyCtx(), runner, "nix build /a#default")
+        self.assertEqual(clock.now, 1030.0)
+
+        # Another worker that starts while the limit is active waits for the
+        # same deadline before its first attempt.
+        coordinator.note_rate_limited("API rate limit exceeded", backoff=10)
+        other = FakeRunner(fail_count=0)
+        retry.run_with_retry(DummyCtx(), other, "nix build /b#default")
+        self.assertEqual(clock.now, 1040.0)
+        self.assertEqual(other.calls, 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pkgmgr.actions.install.installers.nix.outpath import (
+    NixOutPathCache,
+    flake_signature,
+)
+
+from ._fakes import FakeRunner, FakeRunResult
+
+OUT = "/nix/store/abc-tool-1.0"
+EVAL = "nix eval --raw /repo#default.outPath"
+
+
+class DummyCtx:
+    repo_dir = "/repo"
+    quiet = True
+
+
+class TestFlakeSignature(unittest.TestCase):
+    def test_dirty_trees_have_no_signature(self) -> None:
+        with tempfile.TemporaryDirectory() as repo, patch(
+            "pkgmgr.actions.install.installers.nix.outpath.get_head_commit",
+            return_value="c0ffee",
+        ), patch(
+            "pkgmgr.actions.install.installers.nix.outpath.get_worktree_changes",
+            side_effect=[[], [" M flake.nix"]],
+        ):
+            with open(os.path.join(repo, "flake.lock"), "w") as f:
+                f.write("{}")
+            signature = flake_signature(repo)
+            self.assertEqual(signature[0], "c0ffee")
+            self.assertEqual(len(signature[1]), 64)
+            self.assertIsNone(flake_signature(repo))
+
+
+class TestNixOutPathCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "outpaths.json")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    @patch(
+        "pkgmgr.actions.install.installers.nix.outpath.flake_signature",
+        return_value=["c1", "lock"],
+    )
+    def test_evaluation_is_reused_until_the_signature_changes(self, sig) -> None:
+        runner = FakeRunner(mapping={EVAL: FakeRunResult(0, OUT + "\n", "")})
+
+        self.assertEqual(
+            NixOutPathCache(self.path).out_path(DummyCtx(), runner, "/repo#default"),
+            OUT,
+        )
+        # A new instance reads the persisted entry.
+        self.assertEqual(
+            NixOutPathCache(self.path).out_path(DummyCtx(), runner, "/repo#default"),
+            OUT,
+        )
+        self.assertEqual(len(runner.calls), 1)
+
+        sig.return_value = ["c2", "lock"]
+        NixOutPathCache(self.path).out_path(DummyCtx(), runner, "/repo#default")
+        self.assertEqual(len(runner.calls), 2)
+
+    @patch(
+        "pkgmgr.actions.install.installers.nix.outpath.flake_signature",
+        return_value=None,
+    )
+    def test_failures_and_dirty_trees_are_not_cached(self, _sig) -> None:
+        runner = FakeRunner(mapping={EVAL: FakeRunResult(1, "", "error")})
+        cache = NixOutPathCache(self.path)
+
+        self.assertIsNone(cache.out_path(DummyCtx(), runner, "/repo#default"))
+        runner.mapping[EVAL] = FakeRunResult(0, OUT, "")
+        self.assertEqual(cache.out_path(DummyCtx(), runner, "/repo#default"), OUT)
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import subprocess
+import unittest
+from unittest.mock import patch
+
+from pkgmgr.actions.install.installers.nix.runner import CommandRunner
+from pkgmgr.core.command.process import TIMEOUT_EXIT_CODE
+from pkgmgr.core.nix.profile import profile_generation
+
+
+class DummyCtx:
+    repo_dir = "/repo"
+    preview = False
+    quiet = True
+
+
+class TestCommandRunner(unittest.TestCase):
+    def _run(self, cmd: str, **kwargs):
+        with patch(
+            "pkgmgr.actions.install.installers.nix.runner.run_process", **kwargs
+        ):
+            return CommandRunner().run(DummyCtx(), cmd, allow_failure=True)
+
+    def test_profile_mutations_bump_the_generation(self) -> None:
+        done = subprocess.CompletedProcess("", 0, "", "")
+
+        before = profile_generation()
+        self._run("nix profile list --json", return_value=done)
+        self.assertEqual(profile_generation(), before)
+
+        self._run("nix profile install /repo#default", return_value=done)
+        self.assertEqual(profile_generation(), before + 1)
+
+    def test_timeout_is_reported_as_failure(self) -> None:
+        exc = subprocess.TimeoutExpired("nix build", 5, output="", stderr="")
+        res = self._run("nix build /repo#default", side_effect=exc)
+        self.assertEqual(res.returncode, TIMEOUT_EXIT_CODE)
+        self.assertIn("timed out", res.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
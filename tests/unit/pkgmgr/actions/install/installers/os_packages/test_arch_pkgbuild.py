@@ -1,13 +1,18 @@
 # tests/unit/pkgmgr/installers/os_packages/test_arch_pkgbuild.py
 
+import io
 import os
+import subprocess
 import unittest
+from contextlib import redirect_stdout
 from unittest.mock import patch
 
 from pkgmgr.actions.install.context import RepoContext
 from pkgmgr.actions.install.installers.os_packages.arch_pkgbuild import (
     ArchPkgbuildInstaller,
 )
+from pkgmgr.actions.install.installers.os_packages.artifacts import ArtifactKey
+from pkgmgr.core.resources.governor import PACKAGE_MANAGER, get_governor
 
 
 class TestArchPkgbuildInstaller(unittest.TestCase):
@@ -75,6 +80,7 @@ class TestArchPkgbuildInstaller(unittest.TestCase):
         mock_which.return_value = "/usr/bin/pacman"
         self.assertFalse(self.installer.supports(self.ctx))
 
+    @patch("os.path.isfile", return_value=True)
     @patch("pkgmgr.actions.install.installers.os_packages.arch_pkgbuild.run_command")
     @patch(
         "pkgmgr.actions.install.installers.os_packages.arch_pkgbuild.os.geteuid",
@@ -82,28 +88,157 @@ class TestArchPkgbuildInstaller(unittest.TestCase):
     )
     @patch("os.path.exists", return_value=True)
     @patch("shutil.which")
-    def test_run_builds_and_installs_with_makepkg(
-        self, mock_which, mock_exists, mock_geteuid, mock_run_command
+    def test_run_builds_with_makepkg_and_installs_with_pacman(
+        self, mock_which, mock_exists, mock_geteuid, mock_run_command, _isfile
     ):
         def which_side_effect(name):
             if name in ("pacman", "makepkg"):
                 return f"/usr/bin/{name}"
             return None
 
+        def run(cmd, cwd=None, **kwargs):
+            if cmd == "makepkg --printsrcinfo":
+                return subprocess.CompletedProcess(
+                    cmd, 0, "pkgbase = tool\npkgname = tool\n", ""
+                )
+            if cmd == "makepkg --packagelist":
+                return subprocess.CompletedProcess(
+                    cmd,
+                    0,
+                    "/tmp/repo/tool-1.0-1-x86_64.pkg.tar.zst\n"
+                    "/tmp/repo/tool-debug-1.0-1-x86_64.pkg.tar.zst\n",
+                    "",
+                )
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
         mock_which.side_effect = which_side_effect
+        mock_run_command.side_effect = run
 
         self.installer.run(self.ctx)
 
-        cmd = mock_run_command.call_args[0][0]
+        cmds = [c.args[0] for c in mock_run_command.call_args_list]
+        # Nothing is missing (pacman -T), so makepkg needs no --syncdeps.
+        self.assertIn("makepkg --cleanbuild --noconfirm", cmds)
+        self.assertEqual(cmds.count("makepkg --printsrcinfo"), 1)
         self.assertEqual(
-            cmd,
-            "makepkg --syncdeps --cleanbuild --install --noconfirm",
+            cmds[-1],
+            "sudo pacman -U --noconfirm /tmp/repo/tool-1.0-1-x86_64.pkg.tar.zst",
         )
         self.assertEqual(
             mock_run_command.call_args[1].get("cwd"),
             self.ctx.repo_dir,
         )
 
+SRCINFO = {
+    "/tmp/a": (
+        "pkgbase = a\n\tmakedepends = git\n\tdepends = python>=3.10\n"
+        "\tdepends_x86_64 = zlib\npkgname = a\n"
+    ),
+    "/tmp/b": "pkgbase = b\n\tdepends = a\n\tdepends = git\npkgname = b\n",
+}
+
+
+@patch(
+    "pkgmgr.actions.install.installers.os_packages.arch_pkgbuild.os.geteuid",
+    return_value=1000,
+)
+@patch("os.path.exists", return_value=True)
+@patch("shutil.which", side_effect=lambda name: f"/usr/bin/{name}")
+@patch("pkgmgr.actions.install.installers.os_packages.arch_pkgbuild.run_command")
+class TestArchDependencyBatch(unittest.TestCase):
+    def _ctx(self, repo_dir):
+        repo = {"name": repo_dir}
+        return RepoContext(
+            repo=repo,
+            identifier=repo_dir,
+            repo_dir=repo_dir,
+            repositories_base_dir="/tmp",
+            bin_dir="/bin",
+            all_repos=[repo],
+            no_verification=False,
+            preview=False,
+            quiet=False,
+            clone_mode="ssh",
+            update_dependencies=False,
+        )
+
+    def _fake(self, missing):
+        def run(cmd, cwd=None, **kwargs):
+            if cmd == "makepkg --printsrcinfo":
+                return subprocess.CompletedProcess(cmd, 0, SRCINFO[cwd], "")
+            if cmd.startswith("pacman -T"):
+                return subprocess.CompletedProcess(cmd, 127, missing, "")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        return run
+
+    def test_missing_deps_are_installed_in_one_transaction(
+        self, run, _which, _exists, _euid
+    ):
+        run.side_effect = self._fake("git\nzlib\n")
+        installer = ArchPkgbuildInstaller()
+        ok = installer.install_build_dependencies_batch(
+            [self._ctx("/tmp/a"), self._ctx("/tmp/b")]
+        )
+
+        self.assertTrue(ok)
+        cmds = [c.args[0] for c in run.call_args_list]
+        # "a" is built by the batch itself and left to makepkg.
+        self.assertEqual(cmds[2], "pacman -T git 'python>=3.10' zlib")
+        self.assertEqual(cmds[3], "sudo pacman -S --asdeps --noconfirm git zlib")
+
+    def test_nothing_missing(self, run, _which, _exists, _euid):
+        run.side_effect = self._fake("")
+        installer = ArchPkgbuildInstaller()
+        self.assertTrue(
+            installer.install_build_dependencies_batch(
+                [self._ctx("/tmp/a"), self._ctx("/tmp/b")]
+            )
+        )
+        cmds = [c.args[0] for c in run.call_args_list]
+        self.assertFalse(any(c.startswith("sudo pacman -S") for c in cmds))
+
+    def test_makepkg_syncdeps_holds_the_package_manager_on_failure(
+        self, run, _which, _exists, _euid
+    ):
+        fake = self._fake("git\n")
+        held = {}
+
+        def failing_pacman(cmd, cwd=None, **kwargs):
+            if cmd.startswith("sudo pacman -S"):
+                return subprocess.CompletedProcess(cmd, 1, "", "")
+            if cmd.startswith("makepkg --syncdeps") or cmd.startswith(
+                "makepkg --cleanbuild"
+            ):
+                held[cmd] = get_governor().pool(PACKAGE_MANAGER).in_use
+            return fake(cmd, cwd, **kwargs)
+
+        run.side_effect = failing_pacman
+        with redirect_stdout(io.StringIO()):
+            ArchPkgbuildInstaller().run(self._ctx("/tmp/b"))
+
+        self.assertEqual(held, {"makepkg --syncdeps --cleanbuild --noconfirm": 1})
+
+    def test_cached_packages_are_installed_with_pacman(
+        self, run, _which, _exists, _euid
+    ):
+        key = ArtifactKey("a", "abc123", "0" * 64, "arch-rolling-x86_64")
+        cached = [
+            "/cache/a-1.0-1-any.pkg.tar.zst",
+            "/cache/a-1.0-1-any.pkg.tar.zst.sig",
+        ]
+        with patch(
+            "pkgmgr.actions.install.installers.os_packages.arch_pkgbuild."
+            "cached_artifacts",
+            return_value=(key, cached),
+        ):
+            ArchPkgbuildInstaller().run(self._ctx("/tmp/a"))
+
+        cmds = [c.args[0] for c in run.call_args_list]
+        self.assertEqual(
+            cmds, ["sudo pacman -U --noconfirm /cache/a-1.0-1-any.pkg.tar.zst"]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from pkgmgr.actions.install.context import RepoContext
+from pkgmgr.actions.install.installers.os_packages import artifacts
+from pkgmgr.actions.install.installers.os_packages.artifacts import (
+    ArtifactCache,
+    ArtifactKey,
+    artifact_cache_dir,
+    cached_artifacts,
+    distro_id,
+    store_artifacts,
+)
+from pkgmgr.actions.install.ledger import LedgerEntry
+
+
+def _ctx(repo_dir):
+    repo = {"name": "repo"}
+    return RepoContext(
+        repo=repo,
+        identifier="acct/repo",
+        repo_dir=repo_dir,
+        repositories_base_dir="/tmp",
+        bin_dir="/bin",
+        all_repos=[repo],
+        no_verification=False,
+        preview=False,
+        quiet=False,
+        clone_mode="ssh",
+        update_dependencies=False,
+    )
+
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "artifacts")
+        self.cache = ArtifactCache(self.root)
+        self.built = os.path.join(self.tmp.name, "pkg_1.0_all.deb")
+        with open(self.built, "w") as f:
+            f.write("deb")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _key(self, commit="abc"):
+        return ArtifactKey("acct/repo", commit, "f" * 64, "debian-12-x86_64")
+
+    def test_store_and_lookup(self):
+        key = self._key()
+        self.assertEqual(self.cache.lookup(key), [])
+        stored = self.cache.store(key, [self.built])
+
+        self.assertEqual(self.cache.lookup(key), stored)
+        self.assertEqual(os.path.basename(stored[0]), "pkg_1.0_all.deb")
+        # The repository identifier is flattened into one path component.
+        self.assertIn(os.path.join("debian-12-x86_64", "acct_repo"), stored[0])
+        self.assertEqual(self.cache.lookup(self._key("def")), [])
+
+    def test_old_builds_are_pruned(self):
+        for i in range(artifacts.KEEP + 2):
+            key = self._key(f"c{i}")
+            self.cache.store(key, [self.built])
+            past = time.time() - 100 + i
+            os.utime(self.cache.entry_dir(key), (past, past))
+
+        repo_dir = os.path.dirname(self.cache.entry_dir(self._key()))
+        self.assertEqual(len(os.listdir(repo_dir)), artifacts.KEEP)
+        self.assertTrue(self.cache.lookup(self._key(f"c{artifacts.KEEP + 1}")))
+        self.assertEqual(self.cache.lookup(self._key("c0")), [])
+
+
+class TestCachedArtifacts(unittest.TestCase):
+    def test_disabled(self):
+        with patch.dict(os.environ, {"PKGMGR_ARTIFACT_CACHE": "0"}):
+            self.assertIsNone(artifact_cache_dir())
+            self.assertEqual(cached_artifacts(_ctx("/tmp/repo")), (None, []))
+            store_artifacts(None, ["/tmp/x.deb"])
+
+    def test_dirty_checkout_is_not_cached(self):
+        with tempfile.TemporaryDirectory() as root, patch.dict(
+            os.environ, {"PKGMGR_ARTIFACT_CACHE": root}
+        ), patch.object(artifacts, "repo_fingerprint", return_value=None):
+            self.assertEqual(cached_artifacts(_ctx("/tmp/repo")), (None, []))
+
+    def test_roundtrip_for_clean_checkout(self):
+        fingerprint = LedgerEntry(commit="abc123", build_hash="0" * 64)
+        with tempfile.TemporaryDirectory() as root, patch.dict(
+            os.environ, {"PKGMGR_ARTIFACT_CACHE": root}
+        ), patch.object(
+            artifacts, "repo_fingerprint", return_value=fingerprint
+        ), patch.object(
+            artifacts, "distro_id", return_value="fedora-40-x86_64"
+        ):
+            key, cached = cached_artifacts(_ctx("/tmp/repo"))
+            self.assertEqual(cached, [])
+            self.assertEqual(key.commit, "abc123")
+
+            built = os.path.join(root, "x.rpm")
+            open(built, "w").close()
+            store_artifacts(key, [built])
+
+            _key, cached = cached_artifacts(_ctx("/tmp/repo"))
+            self.assertEqual([os.path.basename(p) for p in cached], ["x.rpm"])
+
+    def test_distro_id(self):
+        with patch.object(
+            artifacts,
+            "read_os_release",
+            return_value={"ID": "arch", "BUILD_ID": ""},
+        ), patch.object(artifacts.platform, "machine", return_value="x86_64"):
+            self.assertEqual(distro_id(), "arch-rolling-x86_64")
+
+
+if __name__ == "__main__":
+    unittest.main()
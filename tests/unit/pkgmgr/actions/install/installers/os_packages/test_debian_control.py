@@ -1,3 +1,6 @@
+import os
+import subprocess
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -5,6 +8,9 @@ from pkgmgr.actions.install.context import RepoContext
 from pkgmgr.actions.install.installers.os_packages.debian_control import (
     DebianControlInstaller,
 )
+from pkgmgr.actions.install.installers.os_packages.artifacts import ArtifactKey
+from pkgmgr.actions.install.installers.os_packages.metadata import package_metadata
+from pkgmgr.core.resources.governor import PACKAGE_MANAGER, get_governor
 
 
 class TestDebianControlInstaller(unittest.TestCase):
@@ -44,14 +50,18 @@ class TestDebianControlInstaller(unittest.TestCase):
         self.assertFalse(self.installer.supports(self.ctx))
 
     @patch("pkgmgr.actions.install.installers.os_packages.debian_control.run_command")
-    @patch("glob.glob", return_value=["/tmp/package-manager_0.1.1_all.deb"])
+    @patch.object(
+        DebianControlInstaller,
+        "_find_built_debs",
+        return_value=["/tmp/package-manager_0.1.1_all.deb"],
+    )
     @patch("os.path.exists", return_value=True)
     @patch("shutil.which")
     def test_run_builds_and_installs_debs(
         self,
         mock_which,
         mock_exists,
-        mock_glob,
+        mock_find_debs,
         mock_run_command,
     ):
         """
@@ -59,7 +69,7 @@ class TestDebianControlInstaller(unittest.TestCase):
 
         1. Install build dependencies (apt-get build-dep).
         2. Build the package using dpkg-buildpackage -b -us -uc.
-        3. Discover built .deb files via glob.
+        3. Discover the built .deb files.
         4. Install the resulting .deb packages using a suitable tool:
            - dpkg -i
            - sudo dpkg -i
@@ -112,5 +122,188 @@ class TestDebianControlInstaller(unittest.TestCase):
         )
 
 
+class TestDebianPackageManagerResource(unittest.TestCase):
+    @patch("os.path.exists", return_value=True)
+    @patch("shutil.which", side_effect=lambda name: f"/usr/bin/{name}")
+    @patch.object(
+        DebianControlInstaller, "_find_built_debs", return_value=["/tmp/a_1_all.deb"]
+    )
+    @patch("pkgmgr.actions.install.installers.os_packages.debian_control.run_command")
+    def test_only_package_transactions_hold_the_package_manager(
+        self, run, _debs, _which, _exists
+    ):
+        pool = get_governor().pool(PACKAGE_MANAGER)
+        held = {}
+
+        def record(cmd, **kwargs):
+            held[cmd.replace("sudo ", "").split()[0]] = pool.in_use
+            return subprocess.CompletedProcess(cmd, 0)
+
+        run.side_effect = record
+        self.assertNotIn(PACKAGE_MANAGER, DebianControlInstaller.resources)
+        DebianControlInstaller().run(_ctx("/tmp/a"))
+
+        self.assertEqual(held, {"apt-get": 1, "dpkg-buildpackage": 0, "dpkg": 1})
+
+
+class TestFindBuiltDebs(unittest.TestCase):
+    def test_only_debs_listed_in_this_builds_changes_file(self):
+        with tempfile.TemporaryDirectory() as parent:
+            repo_dir = os.path.join(parent, "tool")
+            os.makedirs(os.path.join(repo_dir, "debian"))
+            with open(
+                os.path.join(repo_dir, "debian", "changelog"), "w", encoding="utf-8"
+            ) as f:
+                f.write("tool (1:2.0-1) unstable; urgency=medium\n")
+            with open(
+                os.path.join(parent, "tool_2.0-1_amd64.changes"), "w", encoding="utf-8"
+            ) as f:
+                f.write(
+                    "Source: tool\n"
+                    "Checksums-Sha1:\n"
+                    " aaa 10 tool_2.0-1_amd64.deb\n"
+                    "Files:\n"
+                    " bbb 10 utils optional tool_2.0-1_amd64.deb\n"
+                    " ccc 20 utils optional tool-doc_2.0-1_all.deb\n"
+                    " ddd 30 utils optional tool_2.0-1_amd64.buildinfo\n"
+                )
+            # Built by another repository in the same parent directory.
+            for name in ("other_1.0_all.deb", "tool_2.0-1_amd64.deb"):
+                open(os.path.join(parent, name), "w").close()
+
+            debs = DebianControlInstaller()._find_built_debs(repo_dir)
+
+        self.assertEqual(
+            debs,
+            [
+                os.path.join(parent, "tool-doc_2.0-1_all.deb"),
+                os.path.join(parent, "tool_2.0-1_amd64.deb"),
+            ],
+        )
+
+    def test_no_changes_file(self):
+        with tempfile.TemporaryDirectory() as repo_dir:
+            self.assertEqual(DebianControlInstaller()._find_built_debs(repo_dir), [])
+
+
+def _ctx(repo_dir):
+    repo = {"name": os.path.basename(repo_dir)}
+    return RepoContext(
+        repo=repo,
+        identifier=repo["name"],
+        repo_dir=repo_dir,
+        repositories_base_dir="/tmp",
+        bin_dir="/bin",
+        all_repos=[repo],
+        no_verification=False,
+        preview=False,
+        quiet=False,
+        clone_mode="ssh",
+        update_dependencies=False,
+    )
+
+
+@patch("os.path.exists", return_value=True)
+@patch("shutil.which", side_effect=lambda name: f"/usr/bin/{name}")
+@patch("pkgmgr.actions.install.installers.os_packages.debian_control.run_command")
+class TestDebianBuildDependencyBatch(unittest.TestCase):
+    def setUp(self):
+        self.installer = DebianControlInstaller()
+        self.ctxs = [_ctx("/tmp/a"), _ctx("/tmp/b")]
+
+    def test_batch_installs_all_build_deps_at_once(self, run, _which, _exists):
+        run.return_value = subprocess.CompletedProcess("", 0)
+        with package_metadata():
+            self.assertTrue(self.installer.install_build_dependencies_batch(self.ctxs))
+            cmds = [c.args[0] for c in run.call_args_list]
+            self.assertEqual(
+                cmds,
+                [
+                    "sudo apt-get update",
+                    "sudo apt-get build-dep -y /tmp/a /tmp/b",
+                ],
+            )
+
+            run.reset_mock()
+            self.installer._install_build_dependencies(self.ctxs[0])
+            run.assert_not_called()
+
+            # Not part of the batch: no second `apt-get update` in this run.
+            self.installer._install_build_dependencies(_ctx("/tmp/c"))
+            cmds = [c.args[0] for c in run.call_args_list]
+            self.assertEqual(cmds, ["sudo apt-get build-dep -y ./"])
+
+    def test_failed_batch_leaves_build_deps_to_each_repo(self, run, _which, _exists):
+        def fail_builddep(cmd, **kwargs):
+            if "build-dep" in cmd:
+                raise SystemExit(100)
+            return subprocess.CompletedProcess(cmd, 0)
+
+        run.side_effect = fail_builddep
+        with package_metadata():
+            self.assertFalse(
+                self.installer.install_build_dependencies_batch(self.ctxs)
+            )
+        run.side_effect = None
+        run.reset_mock()
+        self.installer._install_build_dependencies(self.ctxs[0])
+        self.assertIn("sudo apt-get build-dep -y ./", run.call_args.args[0])
+
+    def test_stale_lists_are_refreshed_after_failure(self, run, _which, _exists):
+        results = iter([1, 0, 0])
+        run.side_effect = lambda cmd, **kw: subprocess.CompletedProcess(
+            cmd, 0 if "update" in cmd else next(results)
+        )
+        with patch(
+            "pkgmgr.actions.install.installers.os_packages.metadata._stamp_fresh",
+            return_value=True,
+        ), package_metadata():
+            self.installer._install_build_dependencies(self.ctxs[0])
+        cmds = [c.args[0] for c in run.call_args_list]
+        self.assertEqual(
+            cmds,
+            [
+                "sudo apt-get build-dep -y ./",
+                "sudo apt-get update",
+                "sudo apt-get build-dep -y ./",
+            ],
+        )
+
+
+@patch("os.path.exists", return_value=True)
+@patch("shutil.which", side_effect=lambda name: f"/usr/bin/{name}")
+@patch("pkgmgr.actions.install.installers.os_packages.debian_control.run_command")
+class TestDebianArtifactCache(unittest.TestCase):
+    MODULE = "pkgmgr.actions.install.installers.os_packages.debian_control"
+
+    def test_cached_debs_are_installed_without_building(self, run, _which, _exists):
+        key = ArtifactKey("id", "abc123", "0" * 64, "debian-12-x86_64")
+        with patch(
+            f"{self.MODULE}.cached_artifacts",
+            return_value=(key, ["/cache/pkg_1.0_all.deb"]),
+        ):
+            DebianControlInstaller().run(_ctx("/tmp/repo"))
+
+        cmds = [c.args[0] for c in run.call_args_list]
+        self.assertEqual(cmds, ["sudo dpkg -i /cache/pkg_1.0_all.deb"])
+
+    def test_built_debs_are_stored(self, run, _which, _exists):
+        key = ArtifactKey("id", "abc123", "0" * 64, "debian-12-x86_64")
+        with patch(
+            f"{self.MODULE}.cached_artifacts", return_value=(key, [])
+        ), patch.object(
+            DebianControlInstaller,
+            "_find_built_debs",
+            return_value=["/tmp/pkg_1.0_all.deb"],
+        ), patch(
+            f"{self.MODULE}.store_artifacts"
+        ) as store:
+            DebianControlInstaller().run(_ctx("/tmp/repo"))
+
+        cmds = [c.args[0] for c in run.call_args_list]
+        self.assertIn("dpkg-buildpackage -b -us -uc", cmds)
+        store.assert_called_once_with(key, ["/tmp/pkg_1.0_all.deb"])
+
+
 if __name__ == "__main__":
     unittest.main()
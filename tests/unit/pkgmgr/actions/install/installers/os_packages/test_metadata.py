@@ -0,0 +1,133 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pkgmgr.actions.install.installers.os_packages import metadata
+from pkgmgr.actions.install.installers.os_packages.metadata import (
+    configure_package_metadata,
+    package_metadata,
+    refresh_metadata,
+)
+
+
+class TestRefreshMetadata(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = patch.dict(os.environ, {"PKGMGR_STATE_DIR": self.tmp.name})
+        self.env.start()
+        configure_package_metadata(None)
+
+    def tearDown(self):
+        configure_package_metadata(None)
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def test_without_scope_every_call_refreshes(self):
+        refresh = MagicMock()
+        self.assertTrue(refresh_metadata("apt", refresh))
+        self.assertTrue(refresh_metadata("apt", refresh))
+        self.assertEqual(refresh.call_count, 2)
+
+    def test_scope_refreshes_once_per_key(self):
+        apt, dnf = MagicMock(), MagicMock()
+        with package_metadata():
+            for _ in range(3):
+                self.assertTrue(refresh_metadata("apt", apt))
+            self.assertTrue(refresh_metadata("dnf", dnf))
+            with package_metadata():
+                refresh_metadata("apt", apt)
+        self.assertEqual(apt.call_count, 1)
+        self.assertEqual(dnf.call_count, 1)
+
+        # A new run refreshes again.
+        with package_metadata():
+            refresh_metadata("apt", apt)
+        self.assertEqual(apt.call_count, 2)
+
+    def test_scope_outlives_a_concurrent_user_leaving_first(self):
+        apt = MagicMock()
+        entered, leave = threading.Event(), threading.Event()
+
+        def worker():
+            with package_metadata():
+                refresh_metadata("apt", apt)
+                entered.set()
+                leave.wait(5)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.assertTrue(entered.wait(5))
+        with package_metadata():
+            leave.set()
+            thread.join(5)
+            refresh_metadata("apt", apt)
+        self.assertEqual(apt.call_count, 1)
+
+    def test_concurrent_callers_share_one_refresh(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_refresh():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+
+        with package_metadata():
+            first = threading.Thread(
+                target=refresh_metadata, args=("apt", slow_refresh)
+            )
+            first.start()
+            started.wait(5)
+            second = threading.Thread(
+                target=refresh_metadata, args=("apt", slow_refresh)
+            )
+            second.start()
+            release.set()
+            first.join(5)
+            second.join(5)
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_refresh_is_retried(self):
+        refresh = MagicMock(side_effect=[SystemExit(1), None])
+        with package_metadata():
+            with self.assertRaises(SystemExit):
+                refresh_metadata("apt", refresh)
+            self.assertTrue(refresh_metadata("apt", refresh))
+        self.assertEqual(refresh.call_count, 2)
+
+    def test_ttl_stamp_skips_refresh_across_runs(self):
+        configure_package_metadata({"package_metadata_ttl": 3600})
+        refresh = MagicMock()
+        with package_metadata():
+            self.assertTrue(refresh_metadata("apt", refresh))
+        with package_metadata():
+            self.assertFalse(refresh_metadata("apt", refresh))
+            self.assertFalse(refresh_metadata("apt", refresh))
+            # A forced refresh (e.g. after a failed transaction) still runs.
+            self.assertTrue(refresh_metadata("apt", refresh, force=True))
+        self.assertEqual(refresh.call_count, 2)
+
+    def test_expired_stamp_refreshes(self):
+        configure_package_metadata({"package_metadata_ttl": 60})
+        refresh = MagicMock()
+        refresh_metadata("apt", refresh)
+        stamp = metadata._stamp_path("apt")
+        os.utime(stamp, (0, 0))
+        with package_metadata():
+            self.assertTrue(refresh_metadata("apt", refresh))
+        self.assertEqual(refresh.call_count, 2)
+
+    def test_invalid_ttl_is_ignored(self):
+        configure_package_metadata({"package_metadata_ttl": "soon"})
+        refresh = MagicMock()
+        refresh_metadata("apt", refresh)
+        with package_metadata():
+            self.assertTrue(refresh_metadata("apt", refresh))
+        self.assertEqual(refresh.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,12 @@
+import os
+import subprocess
+import tempfile
 import unittest
 from unittest.mock import patch
 
 from pkgmgr.actions.install.context import RepoContext
+from pkgmgr.actions.install.installers.os_packages.artifacts import ArtifactKey
+from pkgmgr.actions.install.installers.os_packages.metadata import package_metadata
 from pkgmgr.actions.install.installers.os_packages.rpm_spec import (
     RpmSpecInstaller,
 )
@@ -57,6 +62,11 @@ class TestRpmSpecInstaller(unittest.TestCase):
         self.assertFalse(self.installer.supports(self.ctx))
 
     @patch.object(RpmSpecInstaller, "_prepare_source_tarball")
+    @patch.object(
+        RpmSpecInstaller,
+        "_find_built_rpms",
+        return_value=["/home/user/rpmbuild/RPMS/x86_64/package-manager-0.1.1.rpm"],
+    )
     @patch("pkgmgr.actions.install.installers.os_packages.rpm_spec.run_command")
     @patch("glob.glob")
     @patch("shutil.which")
@@ -65,6 +75,7 @@ class TestRpmSpecInstaller(unittest.TestCase):
         mock_which,
         mock_glob,
         mock_run_command,
+        mock_find_rpms,
         mock_prepare_source_tarball,
     ):
         """
@@ -74,16 +85,13 @@ class TestRpmSpecInstaller(unittest.TestCase):
         2. Call _prepare_source_tarball() once with ctx and spec path.
         3. Install build dependencies via dnf/yum-builddep/yum.
         4. Call rpmbuild -ba <spec>.
-        5. Find built RPMs via glob.
+        5. Find the built RPMs.
         6. Install built RPMs via dnf/yum/rpm (here: dnf).
         """
 
-        # glob.glob is used twice: once for *.spec, once for built RPMs.
         def glob_side_effect(pattern, recursive=False):
             if pattern.endswith("*.spec"):
                 return ["/tmp/repo/package-manager.spec"]
-            if "rpmbuild/RPMS" in pattern:
-                return ["/home/user/rpmbuild/RPMS/x86_64/package-manager-0.1.1.rpm"]
             return []
 
         mock_glob.side_effect = glob_side_effect
@@ -120,5 +128,135 @@ class TestRpmSpecInstaller(unittest.TestCase):
         self.assertTrue(any(cmd.startswith("sudo dnf install -y ") for cmd in cmds))
 
 
+class TestFindBuiltRpms(unittest.TestCase):
+    @patch("pkgmgr.actions.install.installers.os_packages.rpm_spec.run_command")
+    def test_only_rpms_defined_by_the_spec(self, run):
+        run.return_value = subprocess.CompletedProcess(
+            "", 0, "x86_64/tool-1.0-1.x86_64.rpm\nnoarch/tool-doc-1.0-1.noarch.rpm\n"
+        )
+        with tempfile.TemporaryDirectory() as home:
+            for rel in (
+                "x86_64/tool-1.0-1.x86_64.rpm",
+                "noarch/tool-doc-1.0-1.noarch.rpm",
+                "x86_64/other-2.0-1.x86_64.rpm",
+            ):
+                path = os.path.join(home, "rpmbuild", "RPMS", rel)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                open(path, "w").close()
+
+            installer = RpmSpecInstaller()
+            with patch.object(
+                RpmSpecInstaller,
+                "_rpmbuild_topdir",
+                return_value=os.path.join(home, "rpmbuild"),
+            ):
+                rpms = installer._find_built_rpms(
+                    RepoContext(
+                        repo={},
+                        identifier="tool",
+                        repo_dir="/tmp/tool",
+                        repositories_base_dir="/tmp",
+                        bin_dir="/bin",
+                        all_repos=[],
+                        no_verification=False,
+                        preview=False,
+                        quiet=False,
+                        clone_mode="ssh",
+                        update_dependencies=False,
+                    ),
+                    "/tmp/tool/tool.spec",
+                )
+
+        rpms_dir = os.path.join(home, "rpmbuild", "RPMS")
+        self.assertEqual(
+            rpms,
+            [
+                os.path.join(rpms_dir, "noarch/tool-doc-1.0-1.noarch.rpm"),
+                os.path.join(rpms_dir, "x86_64/tool-1.0-1.x86_64.rpm"),
+            ],
+        )
+        self.assertTrue(run.call_args.args[0].startswith("rpmspec -q --rpms"))
+        self.assertTrue(run.call_args.args[0].endswith(" tool.spec"))
+
+
+@patch("shutil.which", side_effect=lambda name: f"/usr/bin/{name}")
+@patch("pkgmgr.actions.install.installers.os_packages.rpm_spec.run_command")
+class TestRpmBuildDependencyBatch(unittest.TestCase):
+    def _ctx(self, repo_dir):
+        repo = {"name": repo_dir}
+        return RepoContext(
+            repo=repo,
+            identifier=repo_dir,
+            repo_dir=repo_dir,
+            repositories_base_dir="/tmp",
+            bin_dir="/bin",
+            all_repos=[repo],
+            no_verification=False,
+            preview=False,
+            quiet=False,
+            clone_mode="ssh",
+            update_dependencies=False,
+        )
+
+    def test_batch_builddep_and_cached_metadata(self, run, _which):
+        run.return_value = subprocess.CompletedProcess("", 0)
+        installer = RpmSpecInstaller()
+        ctxs = [self._ctx("/tmp/a"), self._ctx("/tmp/b")]
+        specs = {"/tmp/a": "/tmp/a/a.spec", "/tmp/b": "/tmp/b/b.spec"}
+
+        with patch.object(
+            RpmSpecInstaller, "_spec_path", side_effect=lambda c: specs[c.repo_dir]
+        ), package_metadata():
+            self.assertTrue(installer.install_build_dependencies_batch(ctxs))
+            installer._install_build_dependencies(ctxs[0], specs["/tmp/a"])
+            installer._install_built_rpms(ctxs[0], ["/tmp/a.rpm"])
+
+        cmds = [c.args[0] for c in run.call_args_list]
+        self.assertEqual(
+            cmds,
+            [
+                # The first dnf command checks the metadata itself.
+                "sudo dnf builddep -y /tmp/a/a.spec /tmp/b/b.spec",
+                "sudo dnf --setopt=metadata_expire=-1 install -y /tmp/a.rpm",
+            ],
+        )
+
+    def test_failed_batch_leaves_build_deps_to_each_repo(self, run, _which):
+        run.side_effect = lambda cmd, **kw: subprocess.CompletedProcess(
+            cmd, 1 if "builddep" in cmd else 0
+        )
+        installer = RpmSpecInstaller()
+        ctx = self._ctx("/tmp/a")
+        with patch.object(
+            RpmSpecInstaller, "_spec_path", return_value="/tmp/a/a.spec"
+        ), package_metadata():
+            self.assertFalse(
+                installer.install_build_dependencies_batch([ctx, self._ctx("/tmp/b")])
+            )
+            run.side_effect = None
+            run.reset_mock()
+            installer._install_build_dependencies(ctx, "/tmp/a/a.spec")
+        self.assertIn("builddep -y", run.call_args.args[0])
+
+    def test_cached_rpms_are_installed_without_building(self, run, _which):
+        key = ArtifactKey("id", "abc123", "0" * 64, "fedora-40-x86_64")
+        installer = RpmSpecInstaller()
+        with patch.object(
+            RpmSpecInstaller, "_spec_path", return_value="/tmp/a/a.spec"
+        ), patch(
+            "pkgmgr.actions.install.installers.os_packages.rpm_spec."
+            "cached_artifacts",
+            return_value=(key, ["/cache/a-1.0.x86_64.rpm"]),
+        ), patch.object(
+            RpmSpecInstaller, "_prepare_source_tarball"
+        ) as prepare, package_metadata():
+            installer.run(self._ctx("/tmp/a"))
+
+        prepare.assert_not_called()
+        cmds = [c.args[0] for c in run.call_args_list]
+        self.assertFalse(any("rpmbuild" in c or "builddep" in c for c in cmds))
+        self.assertEqual(cmds[-1].split()[-1], "/cache/a-1.0.x86_64.rpm")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,12 @@
 import os
+import subprocess
+import tempfile
 import unittest
 from unittest.mock import patch
 
 from pkgmgr.actions.install.context import RepoContext
 from pkgmgr.actions.install.installers.python import PythonInstaller
+from pkgmgr.actions.install.wheelhouse import ProjectKey, Wheelhouse
 
 
 class TestPythonInstaller(unittest.TestCase):
@@ -41,9 +44,12 @@ class TestPythonInstaller(unittest.TestCase):
         with patch.dict(os.environ, {"IN_NIX_SHELL": ""}, clear=False):
             self.assertFalse(self.installer.supports(self.ctx))
 
+    @patch("pkgmgr.actions.install.installers.python.create_venv", return_value=False)
     @patch("pkgmgr.actions.install.installers.python.run_command")
     @patch("os.path.exists", side_effect=lambda path: path.endswith("pyproject.toml"))
-    def test_run_installs_project_from_pyproject(self, mock_exists, mock_run_command):
+    def test_run_installs_project_from_pyproject(
+        self, mock_exists, mock_run_command, mock_create_venv
+    ):
         """
         run() should invoke pip to install the project from pyproject.toml
         when we are not inside a Nix dev shell.
@@ -66,5 +72,154 @@ class TestPythonInstaller(unittest.TestCase):
         )
 
 
+class TestPythonInstallerWheelhouse(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo_dir = os.path.join(self.tmp.name, "repo")
+        os.makedirs(self.repo_dir)
+        open(os.path.join(self.repo_dir, "pyproject.toml"), "w").close()
+        self.wheelhouse = Wheelhouse(os.path.join(self.tmp.name, "wheelhouse"))
+        self.key = ProjectKey("pkg", "1.0", "abc")
+        self.ctx = RepoContext(
+            repo={"name": "pkg"},
+            identifier="pkg",
+            repo_dir=self.repo_dir,
+            repositories_base_dir=self.tmp.name,
+            bin_dir="/bin",
+            all_repos=[],
+            no_verification=False,
+            preview=False,
+            quiet=False,
+            clone_mode="ssh",
+            update_dependencies=False,
+        )
+        self.env = patch.dict(
+            os.environ,
+            {
+                "PKGMGR_PIP": "pip",
+                "PKGMGR_PYTHON_BACKEND": "pip",
+                "PKGMGR_WHEELHOUSE": self.wheelhouse.root,
+            },
+        )
+        self.env.start()
+        self.key_patch = patch(
+            "pkgmgr.actions.install.installers.python.project_key",
+            return_value=self.key,
+        )
+        self.key_patch.start()
+
+    def tearDown(self):
+        self.key_patch.stop()
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def _cache_wheel(self):
+        staging = self.wheelhouse.staging_dir()
+        built = os.path.join(staging, "pkg-1.0-py3-none-any.whl")
+        open(built, "w").close()
+        return self.wheelhouse.store_project_wheel(self.key, built)
+
+    def _run(self, returncodes):
+        results = iter(returncodes)
+        with patch(
+            "pkgmgr.actions.install.installers.python.run_command",
+            side_effect=lambda cmd, **kw: subprocess.CompletedProcess(
+                cmd, next(results), "", ""
+            ),
+        ) as run:
+            PythonInstaller().run(self.ctx)
+        return [c.args[0] for c in run.call_args_list]
+
+    def test_cached_wheel_is_installed_offline(self):
+        wheel = self._cache_wheel()
+        cmds = self._run([0, 0])
+        self.assertEqual(
+            cmds,
+            [
+                f"pip install --no-index --find-links {self.wheelhouse.deps} {wheel}",
+                f"pip install --no-index --force-reinstall --no-deps {wheel}",
+            ],
+        )
+
+    def test_same_version_of_a_new_commit_is_reinstalled(self):
+        # pip skips the first install of an already installed version; the
+        # project wheel of the new commit still has to replace it.
+        self.key_patch.stop()
+        self.key = ProjectKey("pkg", "1.0", "def")
+        self.key_patch = patch(
+            "pkgmgr.actions.install.installers.python.project_key",
+            return_value=self.key,
+        )
+        self.key_patch.start()
+        wheel = self._cache_wheel()
+        self.assertIn("def", wheel)
+
+        cmds = self._run([0, 0])
+        self.assertEqual(
+            cmds[-1], f"pip install --no-index --force-reinstall --no-deps {wheel}"
+        )
+
+    def test_uv_reinstalls_the_project_package(self):
+        wheel = self._cache_wheel()
+        with patch.dict(
+            os.environ, {"PKGMGR_PIP": "", "PKGMGR_PYTHON_BACKEND": "uv"}
+        ), patch.object(
+            PythonInstaller, "_target_python", return_value="/venv/bin/python"
+        ), patch.object(
+            PythonInstaller, "_pip_cmd", return_value="/venv/bin/pip"
+        ), patch(
+            "pkgmgr.actions.install.installers.python.shutil.which",
+            return_value="/usr/bin/uv",
+        ):
+            cmds = self._run([0])
+        self.assertEqual(
+            cmds,
+            [
+                "/usr/bin/uv pip install --python /venv/bin/python "
+                f"--find-links {self.wheelhouse.deps} --reinstall-package pkg "
+                f"{wheel}"
+            ],
+        )
+
+    def test_missing_dependencies_are_added_to_wheelhouse(self):
+        wheel = self._cache_wheel()
+        cmds = self._run([1, 0, 0, 0])
+        self.assertEqual(len(cmds), 4)
+        self.assertEqual(
+            cmds[1],
+            f"pip wheel --find-links {self.wheelhouse.deps} "
+            f"-w {self.wheelhouse.deps} {wheel}",
+        )
+        self.assertEqual(cmds[2], cmds[0])
+        self.assertIn("--force-reinstall --no-deps", cmds[3])
+
+    def test_project_wheel_is_built_on_cache_miss(self):
+        def build(cmd, **kw):
+            if " wheel --no-deps " in cmd:
+                staging = cmd.split(" -w ")[1].split()[0]
+                open(os.path.join(staging, "pkg-1.0-py3-none-any.whl"), "w").close()
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        with patch(
+            "pkgmgr.actions.install.installers.python.run_command", side_effect=build
+        ) as run:
+            PythonInstaller().run(self.ctx)
+
+        cmds = [c.args[0] for c in run.call_args_list]
+        self.assertTrue(cmds[0].startswith("pip wheel --no-deps -w "))
+        self.assertIsNotNone(self.wheelhouse.project_wheel(self.key))
+        self.assertIn("--no-index", cmds[1])
+
+    def test_falls_back_to_pip_install_when_wheelhouse_fails(self):
+        self._cache_wheel()
+        cmds = self._run([1, 1, 0])
+        self.assertEqual(cmds[-1], "pip install .")
+
+    def test_disabled_wheelhouse_uses_pip_install(self):
+        with patch.dict(os.environ, {"PKGMGR_WHEELHOUSE": "0"}):
+            cmds = self._run([0])
+        self.assertEqual(cmds, ["pip install ."])
+
+
 if __name__ == "__main__":
     unittest.main()
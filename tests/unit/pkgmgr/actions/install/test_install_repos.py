@@ -2,11 +2,15 @@
 # -*- coding: utf-8 -*-
 
 import os
+import tempfile
 import unittest
 from typing import Any, Dict, List
 from unittest.mock import MagicMock, patch
 
 from pkgmgr.actions.install import install_repos
+from pkgmgr.actions.install.installers.nix import NixFlakeInstaller
+from pkgmgr.actions.install.installers.os_packages import DebianControlInstaller
+from pkgmgr.core.resources.governor import NIX_PROFILE, get_governor
 
 
 Repository = Dict[str, Any]
@@ -14,6 +18,13 @@ Repository = Dict[str, Any]
 
 class TestInstallReposOrchestration(unittest.TestCase):
     def setUp(self) -> None:
+        # The run history must not touch the real state directory.
+        state = tempfile.TemporaryDirectory()
+        self.addCleanup(state.cleanup)
+        env = patch.dict(os.environ, {"PKGMGR_STATE_DIR": state.name})
+        env.start()
+        self.addCleanup(env.stop)
+
         self.base_dir = "/fake/base"
         self.bin_dir = "/fake/bin"
 
@@ -125,6 +136,203 @@ class TestInstallReposOrchestration(unittest.TestCase):
         pipeline_instance = mock_pipeline_cls.return_value
         pipeline_instance.run.assert_not_called()
 
+    @patch("pkgmgr.actions.install._install_jobs", side_effect=SystemExit(2))
+    @patch("pkgmgr.actions.install.open_run_history")
+    def test_run_history_is_closed_when_installing_fails(
+        self, mock_open_history: MagicMock, _mock_jobs: MagicMock
+    ) -> None:
+        with self.assertRaises(SystemExit):
+            install_repos(
+                [self.repo1],
+                self.base_dir,
+                self.bin_dir,
+                self.all_repos,
+                True,
+                False,
+                True,
+                "ssh",
+                False,
+            )
+        mock_open_history.return_value.close.assert_called_once()
+
+        # A history passed in by the caller (pipelined update) stays open.
+        mock_open_history.reset_mock()
+        history = MagicMock()
+        with self.assertRaises(SystemExit):
+            install_repos(
+                [self.repo1],
+                self.base_dir,
+                self.bin_dir,
+                self.all_repos,
+                True,
+                False,
+                True,
+                "ssh",
+                False,
+                history=history,
+            )
+        mock_open_history.assert_not_called()
+        history.close.assert_not_called()
+        self.assertIs(_mock_jobs.call_args.args[-1], history)
+
+    @patch("pkgmgr.actions.install.shutil.which", return_value="/usr/bin/nix")
+    @patch("pkgmgr.actions.install.InstallationPipeline")
+    @patch("pkgmgr.actions.install.get_repo_dir")
+    @patch("pkgmgr.actions.install.os.path.isdir", return_value=True)
+    @patch("pkgmgr.actions.install.os.path.exists", return_value=True)
+    @patch(
+        "pkgmgr.actions.install.verify_repository",
+        return_value=(True, [], "hash", "key"),
+    )
+    def test_nix_outputs_are_installed_in_one_batch(
+        self,
+        _mock_verify_repository: MagicMock,
+        _mock_exists: MagicMock,
+        _mock_isdir: MagicMock,
+        mock_get_repo_dir: MagicMock,
+        mock_pipeline_cls: MagicMock,
+        _mock_which: MagicMock,
+    ) -> None:
+        mock_get_repo_dir.side_effect = lambda base, repo: os.path.join(
+            base, repo["repository"]
+        )
+        nix = MagicMock(spec=NixFlakeInstaller)
+        nix.resources = ()
+        pipeline = mock_pipeline_cls.return_value
+        pipeline.installers = [nix]
+        pipeline.first_installer.return_value = nix
+
+        install_repos(
+            selected_repos=[self.repo1, self.repo2],
+            repositories_base_dir=self.base_dir,
+            bin_dir=self.bin_dir,
+            all_repos=self.all_repos,
+            no_verification=False,
+            preview=False,
+            quiet=True,
+            clone_mode="ssh",
+            update_dependencies=False,
+            force=True,
+        )
+
+        nix.prefetch.assert_called_once()
+        nix.install_batch.assert_called_once()
+        ctxs = nix.install_batch.call_args.args[0]
+        self.assertEqual([c.identifier for c in ctxs], ["repo-one", "repo-two"])
+        self.assertIs(
+            nix.install_batch.call_args.kwargs["prefetched"],
+            nix.prefetch.return_value,
+        )
+        # The pipelines still run and consume the batch; leftovers are dropped.
+        self.assertEqual(pipeline.run.call_count, 2)
+        nix.discard_batch.assert_called_once()
+
+    @patch("pkgmgr.actions.install.shutil.which", return_value="/usr/bin/nix")
+    @patch("pkgmgr.actions.install.InstallationPipeline")
+    @patch("pkgmgr.actions.install.get_repo_dir")
+    @patch("pkgmgr.actions.install.os.path.isdir", return_value=True)
+    @patch("pkgmgr.actions.install.os.path.exists", return_value=True)
+    @patch(
+        "pkgmgr.actions.install.verify_repository",
+        return_value=(True, [], "hash", "key"),
+    )
+    def test_update_prefetches_flake_outside_the_profile_lock(
+        self,
+        _mock_verify_repository: MagicMock,
+        _mock_exists: MagicMock,
+        _mock_isdir: MagicMock,
+        mock_get_repo_dir: MagicMock,
+        mock_pipeline_cls: MagicMock,
+        _mock_which: MagicMock,
+    ) -> None:
+        mock_get_repo_dir.side_effect = lambda base, repo: os.path.join(
+            base, repo["repository"]
+        )
+        nix = MagicMock(spec=NixFlakeInstaller)
+        nix.resources = (NIX_PROFILE,)
+        profile_held = []
+        nix.prefetch.side_effect = lambda ctxs: profile_held.append(
+            get_governor().pool(NIX_PROFILE).in_use
+        )
+        pipeline = mock_pipeline_cls.return_value
+        pipeline.installers = [nix]
+        pipeline.first_installer.return_value = nix
+
+        # The (pipelined) update installs a single repository per call.
+        install_repos(
+            selected_repos=[self.repo1],
+            repositories_base_dir=self.base_dir,
+            bin_dir=self.bin_dir,
+            all_repos=self.all_repos,
+            no_verification=False,
+            preview=False,
+            quiet=True,
+            clone_mode="ssh",
+            update_dependencies=False,
+            force_update=True,
+            force=True,
+        )
+
+        nix.prefetch.assert_called_once()
+        ctxs = nix.prefetch.call_args.args[0]
+        self.assertEqual([c.identifier for c in ctxs], ["repo-one"])
+        self.assertEqual(profile_held, [0])
+        # Upgrades replace profile entries per repository, not in a batch.
+        nix.install_batch.assert_not_called()
+        pipeline.run.assert_called_once()
+
+    @patch(
+        "pkgmgr.actions.install.shutil.which",
+        side_effect=lambda name: (
+            "/usr/bin/dpkg-buildpackage" if name == "dpkg-buildpackage" else None
+        ),
+    )
+    @patch("pkgmgr.actions.install.InstallationPipeline")
+    @patch("pkgmgr.actions.install.get_repo_dir")
+    @patch("pkgmgr.actions.install.os.path.isdir", return_value=True)
+    @patch("pkgmgr.actions.install.os.path.exists", return_value=True)
+    @patch(
+        "pkgmgr.actions.install.verify_repository",
+        return_value=(True, [], "hash", "key"),
+    )
+    def test_build_dependencies_are_installed_in_one_batch(
+        self,
+        _mock_verify_repository: MagicMock,
+        _mock_exists: MagicMock,
+        _mock_isdir: MagicMock,
+        mock_get_repo_dir: MagicMock,
+        mock_pipeline_cls: MagicMock,
+        _mock_which: MagicMock,
+    ) -> None:
+        mock_get_repo_dir.side_effect = lambda base, repo: os.path.join(
+            base, repo["repository"]
+        )
+        deb = MagicMock(spec=DebianControlInstaller)
+        pipeline = mock_pipeline_cls.return_value
+        pipeline.installers = [deb]
+        pipeline.first_installer.return_value = deb
+
+        install_repos(
+            selected_repos=[self.repo1, self.repo2],
+            repositories_base_dir=self.base_dir,
+            bin_dir=self.bin_dir,
+            all_repos=self.all_repos,
+            no_verification=False,
+            preview=False,
+            quiet=True,
+            clone_mode="ssh",
+            update_dependencies=False,
+            force_update=True,
+            force=True,
+        )
+
+        deb.install_build_dependencies_batch.assert_called_once()
+        ctxs = deb.install_build_dependencies_batch.call_args.args[0]
+        self.assertEqual([c.identifier for c in ctxs], ["repo-one", "repo-two"])
+        self.assertTrue(all(c.force_update for c in ctxs))
+        self.assertEqual(pipeline.run.call_count, 2)
+        deb.discard_batch.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import tempfile
+import unittest
+
+from pkgmgr.actions.install.ledger import (
+    InstallLedger,
+    build_files_hash,
+    repo_fingerprint,
+)
+
+
+def _git(cwd: str, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+class TestInstallLedger(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.repo_dir = os.path.join(self._tmp.name, "repo")
+        os.makedirs(self.repo_dir)
+        self._write("pyproject.toml", "[project]\nname = 'demo'\n")
+        _git(self.repo_dir, "init", "-q")
+        _git(self.repo_dir, "add", ".")
+        _git(self.repo_dir, "commit", "-q", "-m", "init")
+        self.ledger_path = os.path.join(self._tmp.name, "state", "ledger.json")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self, name: str, text: str) -> None:
+        with open(os.path.join(self.repo_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_build_hash_changes_with_build_files_only(self) -> None:
+        before = build_files_hash(self.repo_dir)
+        self._write("README.md", "docs\n")
+        self.assertEqual(build_files_hash(self.repo_dir), before)
+        self._write("pyproject.toml", "[project]\nname = 'other'\n")
+        self.assertNotEqual(build_files_hash(self.repo_dir), before)
+
+    def test_fingerprint_is_none_for_dirty_tree_or_non_git_dir(self) -> None:
+        self.assertIsNotNone(repo_fingerprint(self.repo_dir))
+        self._write("pyproject.toml", "changed\n")
+        self.assertIsNone(repo_fingerprint(self.repo_dir))
+        self.assertIsNone(repo_fingerprint(self._tmp.name))
+
+    def test_untracked_build_output_still_hits_the_ledger(self) -> None:
+        ledger = InstallLedger(self.ledger_path)
+        fp = repo_fingerprint(self.repo_dir)
+        ledger.record(self.repo_dir, fp, layer="python", command=None)
+
+        # What a build leaves behind without a .gitignore.
+        os.makedirs(os.path.join(self.repo_dir, "dist"))
+        self._write("dist/demo-1.0-py3-none-any.whl", "wheel\n")
+        self._write("result", "nix output link\n")
+        self.assertTrue(
+            ledger.is_unchanged(self.repo_dir, repo_fingerprint(self.repo_dir))
+        )
+
+        # An untracked build file is still noticed through the build hash.
+        self._write("Makefile", "install:\n")
+        self.assertFalse(
+            ledger.is_unchanged(self.repo_dir, repo_fingerprint(self.repo_dir))
+        )
+
+    def test_recorded_fingerprint_is_unchanged_after_reload(self) -> None:
+        fp = repo_fingerprint(self.repo_dir)
+        InstallLedger(self.ledger_path).record(
+            self.repo_dir, fp, layer="python", command=None
+        )
+
+        reloaded = InstallLedger(self.ledger_path)
+        current = repo_fingerprint(self.repo_dir)
+        self.assertTrue(reloaded.is_unchanged(self.repo_dir, current))
+        self.assertEqual(reloaded.get(self.repo_dir).layer, "python")
+
+        self._write("new.txt", "x\n")
+        _git(self.repo_dir, "add", ".")
+        _git(self.repo_dir, "commit", "-q", "-m", "second")
+        current = repo_fingerprint(self.repo_dir)
+        self.assertFalse(reloaded.is_unchanged(self.repo_dir, current))
+
+    def test_missing_command_or_forget_forces_reinstall(self) -> None:
+        fp = repo_fingerprint(self.repo_dir)
+        ledger = InstallLedger(self.ledger_path)
+        ledger.record(
+            self.repo_dir, fp, layer="nix", command="/nonexistent/bin/demo"
+        )
+        self.assertFalse(ledger.is_unchanged(self.repo_dir, fp))
+
+        ledger.record(self.repo_dir, fp, layer=None, command=None)
+        self.assertTrue(ledger.is_unchanged(self.repo_dir, fp))
+        ledger.forget(self.repo_dir)
+        reloaded = InstallLedger(self.ledger_path)
+        self.assertFalse(reloaded.is_unchanged(self.repo_dir, fp))
+
+
+if __name__ == "__main__":
+    unittest.main()
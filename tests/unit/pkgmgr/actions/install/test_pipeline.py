@@ -152,6 +152,25 @@ class TestInstallationPipeline(unittest.TestCase):
             "Second installer with identical capabilities must be skipped.",
         )
 
+    @patch("pkgmgr.actions.install.pipeline.resolve_command_for_repo")
+    def test_first_installer_is_the_first_that_would_run(
+        self,
+        mock_resolve_command_for_repo: MagicMock,
+    ) -> None:
+        mock_resolve_command_for_repo.return_value = None
+
+        ctx = _minimal_context()
+        unsupported = DummyInstaller(
+            "os-installer", layer=CliLayer.OS_PACKAGES.value, supports_result=False
+        )
+        nix = DummyInstaller("nix-installer", layer=CliLayer.NIX.value)
+        python = DummyInstaller("python-installer", layer=CliLayer.PYTHON.value)
+
+        pipeline = InstallationPipeline([unsupported, nix, python])
+        self.assertIs(pipeline.first_installer(ctx), nix)
+        self.assertFalse(nix.ran)
+        self.assertIsNone(InstallationPipeline([unsupported]).first_installer(ctx))
+
 
 if __name__ == "__main__":
     unittest.main()
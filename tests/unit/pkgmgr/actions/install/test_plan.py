@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from pkgmgr.actions.install.plan import plan_installs
+from pkgmgr.core.state.history import RunHistory
+
+
+class TestPlanInstalls(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = os.path.join(self._tmp.name, "repos")
+        self.state = os.path.join(self._tmp.name, "state")
+        self.repo = {"provider": "github.com", "account": "acme", "repository": "app"}
+        self.missing = {"provider": "github.com", "account": "acme", "repository": "new"}
+        self.repo_dir = os.path.join(self.base, "github.com", "acme", "app")
+        os.makedirs(self.repo_dir)
+        for name, text in {
+            "pyproject.toml": "[project]\nname = 'app'\n",
+            "Makefile": "install:\n\ttrue\n",
+        }.items():
+            with open(os.path.join(self.repo_dir, name), "w", encoding="utf-8") as f:
+                f.write(text)
+
+        env = patch.dict(
+            os.environ,
+            {
+                "PKGMGR_STATE_DIR": self.state,
+                "PKGMGR_DISABLE_NIX_FLAKE_INSTALLER": "1",
+            },
+        )
+        env.start()
+        self.addCleanup(env.stop)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _plan(self, output_format: str = "json"):
+        buf = io.StringIO()
+        with redirect_stdout(buf), patch(
+            "pkgmgr.actions.install.pipeline.resolve_command_for_repo",
+            return_value=None,
+        ):
+            plans = plan_installs(
+                [self.repo, self.missing],
+                self.base,
+                os.path.join(self._tmp.name, "bin"),
+                [self.repo, self.missing],
+                output_format=output_format,
+            )
+        return plans, buf.getvalue()
+
+    def test_python_runs_and_shadows_makefile(self) -> None:
+        RunHistory().record(
+            self.repo_dir, "install", 12.0, True, installer="PythonInstaller"
+        )
+
+        plans, out = self._plan()
+        data = {p["repository"]: p for p in json.loads(out)}
+
+        self.assertEqual(data["new"]["status"], "clone")
+        steps = {s["installer"]: s for s in data["app"]["steps"]}
+        self.assertEqual(steps["PythonInstaller"]["action"], "run")
+        self.assertEqual(steps["PythonInstaller"]["estimate"], 12.0)
+        self.assertEqual(steps["MakefileInstaller"]["action"], "skip")
+        self.assertEqual(steps["MakefileInstaller"]["kind"], "layer-shadowed")
+        self.assertEqual(plans[0].estimate, 12.0)
+
+    def test_text_output_hides_unsupported_installers(self) -> None:
+        _plans, out = self._plan("text")
+        self.assertIn("run   PythonInstaller", out)
+        self.assertNotIn("NixFlakeInstaller", out)
+        self.assertIn("not cloned yet", out)
+
+    def test_plans_are_listed_in_scheduling_order(self) -> None:
+        self.repo["dependencies"] = ["github.com/acme/new"]
+
+        plans, out = self._plan()
+
+        self.assertEqual([p.repository for p in plans], ["new", "app"])
+        self.assertEqual(
+            [p["repository"] for p in json.loads(out)], ["new", "app"]
+        )
+        self.assertEqual(plans[1].depends_on, ["new"])
+
+    def test_plan_does_not_create_the_state_directory(self) -> None:
+        plans, _out = self._plan()
+        self.assertEqual(len(plans), 2)
+        self.assertFalse(os.path.exists(self.state))
+
+    def test_unavailable_ledger_does_not_fail_the_plan(self) -> None:
+        with patch(
+            "pkgmgr.actions.install.plan.InstallLedger",
+            side_effect=OSError("read-only"),
+        ):
+            plans, _out = self._plan()
+        self.assertEqual(len(plans), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+import unittest
+from typing import Any, Dict, List
+
+from pkgmgr.actions.install.scheduler import (
+    SKIPPED,
+    build_install_jobs,
+    critical_path_priorities,
+    run_install_jobs,
+)
+from pkgmgr.core.command.process import note_timeout
+
+
+def _repo(name: str, deps: List[str] | None = None) -> Dict[str, Any]:
+    repo: Dict[str, Any] = {
+        "provider": "github.com",
+        "account": "acme",
+        "repository": name,
+    }
+    if deps:
+        repo["dependencies"] = deps
+    return repo
+
+
+class TestBuildInstallJobs(unittest.TestCase):
+    def test_edges_are_restricted_to_selected_repos(self) -> None:
+        lib = _repo("lib")
+        app = _repo("app", ["lib", "github.com/acme/other"])
+        other = _repo("other")
+        jobs = build_install_jobs([app, lib], [lib, app, other])
+
+        by_ident = {j.identifier: j for j in jobs}
+        self.assertEqual(by_ident["app"].depends_on, {"lib"})
+        self.assertEqual(by_ident["lib"].depends_on, set())
+
+    def test_include_dependencies_adds_missing_repos_first(self) -> None:
+        lib = _repo("lib")
+        app = _repo("app", ["lib"])
+        jobs = build_install_jobs([app], [lib, app], include_dependencies=True)
+
+        self.assertEqual([j.identifier for j in jobs], ["lib", "app"])
+        self.assertEqual(jobs[1].depends_on, {"lib"})
+
+
+class TestRunInstallJobs(unittest.TestCase):
+    def test_dependencies_finish_before_dependents_start(self) -> None:
+        lib = _repo("lib")
+        app = _repo("app", ["lib"])
+        tool = _repo("tool")
+        jobs = build_install_jobs([app, lib, tool], [lib, app, tool])
+
+        events: List[str] = []
+        lock = threading.Lock()
+
+        def op(job):
+            with lock:
+                events.append(f"start:{job.identifier}")
+            time.sleep(0.02)
+            with lock:
+                events.append(f"end:{job.identifier}")
+            return True, ""
+
+        outcomes = run_install_jobs(jobs, op, max_workers=3)
+
+        self.assertTrue(all(o.ok for o in outcomes))
+        self.assertLess(events.index("end:lib"), events.index("start:app"))
+
+    def test_failed_dependency_skips_dependents(self) -> None:
+        lib = _repo("lib")
+        app = _repo("app", ["lib"])
+        jobs = build_install_jobs([lib, app], [lib, app])
+
+        def op(job):
+            if job.identifier == "lib":
+                raise SystemExit(3)
+            return True, ""
+
+        outcomes = {o.ident: o for o in run_install_jobs(jobs, op, max_workers=2)}
+
+        self.assertFalse(outcomes["lib"].ok)
+        self.assertFalse(outcomes["lib"].skipped)
+        self.assertTrue(outcomes["app"].skipped)
+        self.assertIn("lib", outcomes["app"].msg)
+
+    def test_timed_out_job_is_marked(self) -> None:
+        jobs = build_install_jobs([_repo("slow")], [_repo("slow")])
+
+        def op(job):
+            note_timeout("nix profile install")
+            raise SystemExit(124)
+
+        outcomes = run_install_jobs(jobs, op)
+
+        self.assertFalse(outcomes[0].ok)
+        self.assertTrue(outcomes[0].timed_out)
+
+    def test_declined_job_is_reported_as_skipped(self) -> None:
+        jobs = build_install_jobs([_repo("one")], [_repo("one")])
+        outcomes = run_install_jobs(jobs, lambda job: (False, SKIPPED))
+        self.assertTrue(outcomes[0].skipped)
+
+    def test_cycle_is_broken(self) -> None:
+        a = _repo("a", ["b"])
+        b = _repo("b", ["a"])
+        jobs = build_install_jobs([a, b], [a, b])
+
+        seen: List[str] = []
+
+        def op(job):
+            seen.append(job.identifier)
+            return True, ""
+
+        outcomes = run_install_jobs(jobs, op)
+
+        self.assertEqual(sorted(seen), ["a", "b"])
+        self.assertTrue(all(o.ok for o in outcomes))
+
+    def test_cycle_members_run_one_after_another_in_selection_order(self) -> None:
+        a = _repo("a", ["c"])
+        b = _repo("b", ["a"])
+        c = _repo("c", ["b"])
+        free = _repo("free")
+        jobs = build_install_jobs([b, a, c, free], [a, b, c, free])
+
+        events: List[str] = []
+        lock = threading.Lock()
+
+        def op(job):
+            with lock:
+                events.append(f"start {job.identifier}")
+            time.sleep(0.05)
+            with lock:
+                events.append(f"end {job.identifier}")
+            return True, ""
+
+        outcomes = run_install_jobs(jobs, op, max_workers=4)
+
+        self.assertTrue(all(o.ok for o in outcomes))
+        cycle_events = [e for e in events if not e.endswith("free")]
+        self.assertEqual(
+            cycle_events,
+            ["start b", "end b", "start a", "end a", "start c", "end c"],
+        )
+
+
+class TestLongestFirst(unittest.TestCase):
+    def test_priority_includes_longest_dependent_chain(self) -> None:
+        lib = _repo("lib")
+        app = _repo("app", ["lib"])
+        tool = _repo("tool")
+        jobs = build_install_jobs([lib, app, tool], [lib, app, tool])
+
+        priorities = critical_path_priorities(jobs, {"lib": 1.0, "app": 9.0})
+
+        self.assertEqual(priorities["lib"], 10.0)
+        self.assertEqual(priorities["app"], 9.0)
+        # No history: median of the known durations.
+        self.assertEqual(priorities["tool"], 9.0)
+
+    def test_slowest_ready_job_starts_first(self) -> None:
+        names = ["quick", "medium", "slow"]
+        repos = [_repo(n) for n in names]
+        jobs = build_install_jobs(repos, repos)
+        started: List[str] = []
+        lock = threading.Lock()
+
+        def op(job):
+            with lock:
+                started.append(job.identifier)
+            return True, ""
+
+        run_install_jobs(
+            jobs,
+            op,
+            max_workers=2,
+            expected={"quick": 1.0, "medium": 5.0, "slow": 50.0},
+        )
+
+        self.assertEqual(started[:2], ["slow", "medium"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pkgmgr.actions.install.capabilities as capabilities
+from pkgmgr.actions.install.capability_cache import CapabilityCache
+from pkgmgr.actions.install.context import RepoContext
+from pkgmgr.actions.install.snapshot import RepoFileSnapshot
+
+
+def _ctx(repo_dir: str) -> RepoContext:
+    return RepoContext(
+        repo={},
+        identifier="demo",
+        repo_dir=repo_dir,
+        repositories_base_dir=os.path.dirname(repo_dir),
+        bin_dir="/tmp/bin",
+        all_repos=[],
+        no_verification=True,
+        preview=False,
+        quiet=True,
+        clone_mode="ssh",
+        update_dependencies=False,
+    )
+
+
+class TestRepoFileSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.repo_dir = self._tmp.name
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self, name: str, text: str) -> None:
+        with open(os.path.join(self.repo_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_reads_each_file_once(self) -> None:
+        self._write("flake.nix", "BuildPythonApplication")
+        snap = RepoFileSnapshot(self.repo_dir)
+
+        self.assertEqual(snap.lower("flake.nix"), "buildpythonapplication")
+        os.remove(os.path.join(self.repo_dir, "flake.nix"))
+        self.assertEqual(snap.text("flake.nix"), "BuildPythonApplication")
+        self.assertFalse(snap.exists("pyproject.toml"))
+
+    def test_size_cap_truncates(self) -> None:
+        self._write("Makefile", "x" * 100)
+        snap = RepoFileSnapshot(self.repo_dir, max_bytes=10)
+        self.assertEqual(snap.text("Makefile"), "x" * 10)
+
+    def test_capability_matrix_is_computed_once_and_cached_by_mtime(self) -> None:
+        self._write("pyproject.toml", "[tool]\nmake install\n")
+        self._write("Makefile", "install:\n\ttrue\n")
+        cache = CapabilityCache(os.path.join(self.repo_dir, ".cache.json"))
+
+        with patch.object(capabilities, "_CACHE", cache):
+            ctx = _ctx(self.repo_dir)
+            with patch.object(
+                capabilities,
+                "detect_capabilities",
+                wraps=capabilities.detect_capabilities,
+            ) as detect:
+                first = capabilities.capability_matrix(ctx)
+                capabilities.capability_matrix(ctx)
+                # New run (fresh context): served from the persistent cache.
+                second = capabilities.capability_matrix(_ctx(self.repo_dir))
+                self.assertEqual(detect.call_count, 1)
+
+                self._write("Makefile", "all:\n\ttrue\n# changed size\n")
+                third = capabilities.capability_matrix(_ctx(self.repo_dir))
+                self.assertEqual(detect.call_count, 2)
+
+        self.assertEqual(first, second)
+        self.assertIn("make-install", first["makefile"])
+        self.assertIn("python-runtime", first["python"])
+        self.assertNotIn("make-install", third["makefile"])
+
+    def test_preview_does_not_persist_the_cache(self) -> None:
+        self._write("Makefile", "install:\n\ttrue\n")
+        state = os.path.join(self.repo_dir, "state")
+        ctx = _ctx(self.repo_dir)
+        ctx.preview = True
+
+        with patch.dict(os.environ, {"PKGMGR_STATE_DIR": state}), patch.object(
+            capabilities, "_CACHE", None
+        ):
+            matrix = capabilities.capability_matrix(ctx)
+
+        self.assertIn("make-install", matrix["makefile"])
+        self.assertFalse(os.path.exists(state))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pkgmgr.actions.install import venv_template
+from pkgmgr.actions.install.venv_template import (
+    MARKER_FILE,
+    TEMPLATE_VERSION,
+    clone_template,
+    create_venv,
+    ensure_template,
+)
+
+
+def _make_template(root: str, origin: str) -> str:
+    """A minimal venv layout as `python -m venv` would leave it."""
+    template = os.path.join(root, "template")
+    os.makedirs(os.path.join(template, "bin"))
+    site = os.path.join(template, "lib", "python3", "site-packages")
+    os.makedirs(os.path.join(site, "__pycache__"))
+    with open(os.path.join(template, "pyvenv.cfg"), "w") as f:
+        f.write(f"home = /usr/bin\ncommand = /usr/bin/python3 -m venv {origin}\n")
+    with open(os.path.join(template, "bin", "activate"), "w") as f:
+        f.write(f'VIRTUAL_ENV="{origin}"\nexport VIRTUAL_ENV\n')
+    with open(os.path.join(template, "bin", "pip"), "w") as f:
+        f.write(f"#!{origin}/bin/python\nimport pip\n")
+    os.chmod(os.path.join(template, "bin", "pip"), 0o755)
+    os.symlink("/usr/bin/python3", os.path.join(template, "bin", "python"))
+    with open(os.path.join(site, "mod.py"), "w") as f:
+        f.write("X = 1\n")
+    open(os.path.join(site, "__pycache__", "mod.cpython.pyc"), "w").close()
+    with open(os.path.join(template, MARKER_FILE), "w") as f:
+        json.dump({"version": TEMPLATE_VERSION, "origin": origin}, f)
+    return template
+
+
+class TestCloneTemplate(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.origin = os.path.join(self.tmp.name, ".build-abc")
+        self.template = _make_template(self.tmp.name, self.origin)
+        self.venv = os.path.join(self.tmp.name, "venvs", "repo")
+        # Force the hardlink path regardless of the test filesystem.
+        self.reflink = patch.object(venv_template, "_reflink_tree", return_value=False)
+        self.reflink.start()
+
+    def tearDown(self):
+        self.reflink.stop()
+        self.tmp.cleanup()
+
+    def _read(self, *parts):
+        with open(os.path.join(self.venv, *parts)) as f:
+            return f.read()
+
+    def test_clone_rewrites_template_location(self):
+        self.assertTrue(clone_template(self.template, self.venv))
+
+        self.assertIn(f'VIRTUAL_ENV="{self.venv}"', self._read("bin", "activate"))
+        self.assertTrue(self._read("bin", "pip").startswith(f"#!{self.venv}/bin/"))
+        self.assertIn(self.venv, self._read("pyvenv.cfg"))
+        self.assertTrue(os.access(os.path.join(self.venv, "bin", "pip"), os.X_OK))
+        self.assertEqual(
+            os.readlink(os.path.join(self.venv, "bin", "python")), "/usr/bin/python3"
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.venv, MARKER_FILE)))
+
+    def test_clone_hardlinks_unchanged_files_and_skips_pycache(self):
+        self.assertTrue(clone_template(self.template, self.venv))
+
+        site = ("lib", "python3", "site-packages")
+        src = os.stat(os.path.join(self.template, *site, "mod.py"))
+        dst = os.stat(os.path.join(self.venv, *site, "mod.py"))
+        self.assertEqual(src.st_ino, dst.st_ino)
+        self.assertFalse(os.path.exists(os.path.join(self.venv, *site, "__pycache__")))
+
+        # Rewritten files are independent of the template.
+        self.assertIn(
+            self.origin,
+            open(os.path.join(self.template, "bin", "activate")).read(),
+        )
+
+    def test_existing_target_is_not_overwritten(self):
+        os.makedirs(self.venv)
+        self.assertFalse(clone_template(self.template, self.venv))
+
+    def test_template_without_marker_is_rejected(self):
+        os.remove(os.path.join(self.template, MARKER_FILE))
+        self.assertFalse(clone_template(self.template, self.venv))
+        self.assertFalse(os.path.exists(self.venv))
+
+
+class TestEnsureTemplate(unittest.TestCase):
+    def test_template_is_built_once(self):
+        def fake_venv(cmd, **kwargs):
+            os.makedirs(os.path.join(cmd[-1], "bin"), exist_ok=True)
+            return subprocess.CompletedProcess(cmd, 0)
+
+        with tempfile.TemporaryDirectory() as cache, patch.dict(
+            os.environ, {"PKGMGR_CACHE_DIR": cache}
+        ), patch.object(
+            venv_template, "run_process", side_effect=fake_venv
+        ) as run:
+            first = ensure_template(venv_template.sys.executable)
+            second = ensure_template(venv_template.sys.executable)
+
+            self.assertEqual(first, second)
+            self.assertEqual(run.call_count, 1)
+            self.assertTrue(first.endswith(f"-v{TEMPLATE_VERSION}"))
+            with open(os.path.join(first, MARKER_FILE)) as f:
+                origin = json.load(f)["origin"]
+            self.assertFalse(os.path.exists(origin))
+
+    def test_failed_build_returns_none(self):
+        with tempfile.TemporaryDirectory() as cache, patch.dict(
+            os.environ, {"PKGMGR_CACHE_DIR": cache}
+        ), patch.object(
+            venv_template,
+            "run_process",
+            return_value=subprocess.CompletedProcess([], 1),
+        ):
+            self.assertIsNone(ensure_template(venv_template.sys.executable))
+
+    def test_disabled_templates(self):
+        with patch.dict(os.environ, {"PKGMGR_VENV_TEMPLATE": "0"}), patch.object(
+            venv_template, "ensure_template"
+        ) as ensure:
+            self.assertFalse(create_venv("/usr/bin/python3", "/tmp/never"))
+        ensure.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
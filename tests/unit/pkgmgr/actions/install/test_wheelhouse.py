@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pkgmgr.actions.install.wheelhouse import (
+    ProjectKey,
+    Wheelhouse,
+    project_key,
+    wheelhouse_dir,
+)
+
+
+class TestWheelhouseDir(unittest.TestCase):
+    def test_disabled_with_zero(self):
+        with patch.dict(os.environ, {"PKGMGR_WHEELHOUSE": "0"}):
+            self.assertIsNone(wheelhouse_dir())
+
+    def test_explicit_directory(self):
+        with patch.dict(os.environ, {"PKGMGR_WHEELHOUSE": "/srv/wheels"}):
+            self.assertEqual(wheelhouse_dir(), "/srv/wheels")
+
+    def test_default_lives_in_cache_dir(self):
+        with patch.dict(
+            os.environ,
+            {"PKGMGR_WHEELHOUSE": "", "PKGMGR_CACHE_DIR": "/tmp/pkgmgr-cache"},
+        ):
+            self.assertEqual(wheelhouse_dir(), "/tmp/pkgmgr-cache/wheelhouse")
+
+
+class TestProjectKey(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = self.tmp.name
+        with open(os.path.join(self.repo, "pyproject.toml"), "w") as f:
+            f.write('[project]\nname = "My_Pkg"\nversion = "1.2.0"\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_clean_checkout(self):
+        with patch(
+            "pkgmgr.actions.install.wheelhouse.get_head_commit", return_value="abc"
+        ), patch(
+            "pkgmgr.actions.install.wheelhouse.get_worktree_changes", return_value=[]
+        ):
+            key = project_key(self.repo)
+        self.assertEqual(key, ProjectKey("my-pkg", "1.2.0", "abc"))
+
+    def test_dirty_checkout_is_not_cached(self):
+        with patch(
+            "pkgmgr.actions.install.wheelhouse.get_head_commit", return_value="abc"
+        ), patch(
+            "pkgmgr.actions.install.wheelhouse.get_worktree_changes",
+            return_value=[" M src/x.py"],
+        ):
+            self.assertIsNone(project_key(self.repo))
+
+    def test_missing_pyproject(self):
+        os.remove(os.path.join(self.repo, "pyproject.toml"))
+        self.assertIsNone(project_key(self.repo))
+
+
+class TestWheelhouse(unittest.TestCase):
+    def test_store_and_lookup_project_wheel(self):
+        with tempfile.TemporaryDirectory() as root:
+            wheelhouse = Wheelhouse(root)
+            key = ProjectKey("pkg", "1.0", "abc")
+            self.assertIsNone(wheelhouse.project_wheel(key))
+
+            staging = wheelhouse.staging_dir()
+            built = os.path.join(staging, "pkg-1.0-py3-none-any.whl")
+            open(built, "w").close()
+            stored = wheelhouse.store_project_wheel(key, built)
+
+            self.assertEqual(wheelhouse.project_wheel(key), stored)
+            self.assertFalse(os.path.exists(built))
+            self.assertIsNone(
+                wheelhouse.project_wheel(ProjectKey("pkg", "1.0", "def"))
+            )
+
+    def test_locked_creates_deps_dir(self):
+        with tempfile.TemporaryDirectory() as root:
+            wheelhouse = Wheelhouse(root)
+            with wheelhouse.locked(shared=True):
+                self.assertTrue(os.path.isdir(wheelhouse.deps))
+            with wheelhouse.locked(shared=False):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
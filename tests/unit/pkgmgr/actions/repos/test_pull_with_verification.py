@@ -1,4 +1,6 @@
 import io
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -17,6 +19,14 @@ class TestPullWithVerification(unittest.TestCase):
       - Handling of extra git pull arguments
     """
 
+    def setUp(self) -> None:
+        # The run history must not touch the real state directory.
+        state = tempfile.TemporaryDirectory()
+        self.addCleanup(state.cleanup)
+        env = patch.dict(os.environ, {"PKGMGR_STATE_DIR": state.name})
+        env.start()
+        self.addCleanup(env.stop)
+
     def _setup_mocks(
         self,
         mock_exists,
@@ -0,0 +1,72 @@
+import io
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from pkgmgr.actions.repository.grep import grep_repos
+
+
+def _git(cwd: str, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+class TestGrepRepos(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = self._tmp.name
+        self.repos = []
+        contents = {
+            "alpha": {"main.py": "import os\n# TODO: fix\n", "a:b.txt": "TODO\n"},
+            "beta": {"README.md": "nothing to see\n"},
+        }
+        for name, files in contents.items():
+            repo_dir = os.path.join(self.base, "github.com", "user", name)
+            os.makedirs(repo_dir)
+            _git(repo_dir, "init", "-q")
+            for fname, text in files.items():
+                with open(os.path.join(repo_dir, fname), "w", encoding="utf-8") as f:
+                    f.write(text)
+            _git(repo_dir, "add", ".")
+            self.repos.append(
+                {"provider": "github.com", "account": "user", "repository": name}
+            )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _grep(self, pattern: str, **kwargs) -> str:
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            grep_repos(self.repos, self.base, self.repos, pattern, jobs=2, **kwargs)
+        return buf.getvalue()
+
+    def test_prefixes_matches_with_repository(self) -> None:
+        lines = sorted(self._grep("TODO").splitlines())
+        self.assertEqual(lines, ["alpha:a:b.txt:1:TODO", "alpha:main.py:2:# TODO: fix"])
+
+    def test_count_and_files_with_matches(self) -> None:
+        self.assertIn("alpha:main.py:1", self._grep("TODO", count=True).splitlines())
+        self.assertEqual(
+            sorted(self._grep("TODO", files_with_matches=True).splitlines()),
+            ["alpha:a:b.txt", "alpha:main.py"],
+        )
+
+    def test_json_records(self) -> None:
+        out = self._grep("todo", ignore_case=True, json_output=True)
+        records = [json.loads(line) for line in out.splitlines()]
+        by_path = {r["path"]: r for r in records}
+        self.assertEqual(by_path["main.py"]["line"], 2)
+        self.assertEqual(by_path["a:b.txt"]["repository"], "alpha")
+
+    def test_no_match_exits_one(self) -> None:
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as ctx:
+                grep_repos(self.repos, self.base, self.repos, "does-not-occur", jobs=2)
+        self.assertEqual(ctx.exception.code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
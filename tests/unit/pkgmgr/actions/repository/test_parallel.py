@@ -0,0 +1,147 @@
+import io
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+
+from pkgmgr.actions.repository._parallel import (
+    execute_on_repos,
+    longest_first,
+    run_on_repos,
+)
+from pkgmgr.core.command.process import note_timeout
+from pkgmgr.core.state.history import RunHistory
+
+
+class TestExecuteOnRepos(unittest.TestCase):
+    def test_parallel_collects_outcomes_and_prints_summary(self) -> None:
+        repos = [("a", "/r/a"), ("b", "/r/b"), ("c", "/r/c")]
+
+        def op(rd: str):
+            return (rd != "/r/b", f"failed in {rd}")
+
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            outcomes = execute_on_repos(repos, op, jobs=3, op_name="diff")
+
+        by_ident = {o.ident: o for o in outcomes}
+        self.assertTrue(by_ident["a"].ok)
+        self.assertFalse(by_ident["b"].ok)
+        self.assertEqual(by_ident["b"].msg, "failed in /r/b")
+        out = buf.getvalue()
+        self.assertIn("[FAIL] b", out)
+        self.assertIn("[SUMMARY] diff: 2 ok, 1 failed, 0 skipped", out)
+
+    def test_serial_fail_fast_skips_remaining(self) -> None:
+        calls = []
+
+        def op(rd: str):
+            calls.append(rd)
+            return (False, "boom")
+
+        with redirect_stdout(io.StringIO()):
+            outcomes = execute_on_repos(
+                [("a", "/r/a"), ("b", "/r/b")],
+                op,
+                jobs=1,
+                op_name="pull",
+                fail_fast=True,
+            )
+
+        self.assertEqual(calls, ["/r/a"])
+        self.assertTrue(outcomes[1].skipped)
+
+    def test_system_exit_in_op_is_reported_as_failure(self) -> None:
+        def op(_rd: str):
+            raise SystemExit(4)
+
+        with redirect_stdout(io.StringIO()):
+            outcomes = execute_on_repos(
+                [("a", "/r/a"), ("b", "/r/b")], op, jobs=2, op_name="make"
+            )
+
+        self.assertTrue(all(not o.ok for o in outcomes))
+        self.assertIn("4", outcomes[0].msg)
+
+    def test_exception_in_op_does_not_lose_other_results(self) -> None:
+        def op(rd: str):
+            if rd == "/r/a":
+                raise FileNotFoundError("no such program")
+            return (True, "")
+
+        with redirect_stdout(io.StringIO()):
+            outcomes = execute_on_repos(
+                [("a", "/r/a"), ("b", "/r/b")], op, jobs=2, op_name="run"
+            )
+
+        by_ident = {o.ident: o for o in outcomes}
+        self.assertFalse(by_ident["a"].ok)
+        self.assertIn("no such program", by_ident["a"].msg)
+        self.assertTrue(by_ident["b"].ok)
+
+    def test_timed_out_operation_is_reported_in_summary(self) -> None:
+        def op(rd: str):
+            if rd == "/r/b":
+                note_timeout("git pull")
+                return (False, "pull failed")
+            return (True, "")
+
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            outcomes = execute_on_repos(
+                [("a", "/r/a"), ("b", "/r/b")], op, jobs=2, op_name="pull"
+            )
+
+        by_ident = {o.ident: o for o in outcomes}
+        self.assertFalse(by_ident["a"].timed_out)
+        self.assertTrue(by_ident["b"].timed_out)
+        out = buf.getvalue()
+        self.assertIn("[TIME] b", out)
+        self.assertIn("1 ok, 1 failed (1 timed out), 0 skipped", out)
+
+    def test_run_on_repos_exits_on_failure(self) -> None:
+        with redirect_stdout(io.StringIO()):
+            with self.assertRaises(SystemExit) as ctx:
+                run_on_repos(
+                    [("a", "/r/a")], lambda _rd: (False, "x"), jobs=1, op_name="push"
+                )
+        self.assertEqual(ctx.exception.code, 1)
+
+
+class TestHistoryOrdering(unittest.TestCase):
+    def test_longest_first_uses_median_for_unknown_repos(self) -> None:
+        repos = [("a", "/r/a"), ("b", "/r/b"), ("c", "/r/c"), ("d", "/r/d")]
+        expected = {"/r/a": 1.0, "/r/b": 30.0, "/r/c": 5.0}
+        ordered = longest_first(repos, expected)
+        self.assertEqual([i for i, _rd in ordered], ["b", "c", "d", "a"])
+
+    def test_execute_records_and_starts_slowest_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            history = RunHistory(os.path.join(tmp, "history.sqlite3"))
+            history.record("/r/slow", "pull", 40.0, True)
+            history.record("/r/fast", "pull", 1.0, True)
+            history.record("/r/other", "pull", 5.0, True)
+            repos = [("fast", "/r/fast"), ("other", "/r/other"), ("slow", "/r/slow")]
+            started = []
+            lock = threading.Lock()
+
+            def op(rd: str):
+                with lock:
+                    started.append(rd)
+                return (rd != "/r/other", "boom")
+
+            with redirect_stdout(io.StringIO()):
+                execute_on_repos(
+                    repos, op, jobs=2, op_name="pull", history=history
+                )
+
+            self.assertEqual(started[0], "/r/slow")
+            rows = {r.name: r for r in history.stats(by="repo", operation="pull")}
+            self.assertEqual(rows["other"].failures, 1)
+            self.assertEqual(rows["slow"].runs, 2)
+            history.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from pkgmgr.actions.repository.run import run_in_repos
+from pkgmgr.cli.parser.run_cmd import split_run_argv
+
+
+class TestSplitRunArgv(unittest.TestCase):
+    def test_splits_at_double_dash(self) -> None:
+        argv, cmd = split_run_argv(["run", "--all", "--", "git", "status", "-s"])
+        self.assertEqual(argv, ["run", "--all"])
+        self.assertEqual(cmd, ["git", "status", "-s"])
+
+    def test_leaves_other_commands_untouched(self) -> None:
+        argv = ["pull", "--all", "--", "x"]
+        self.assertEqual(split_run_argv(argv), (argv, None))
+
+
+class TestRunInRepos(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = self._tmp.name
+        self.repos = []
+        for name in ("alpha", "beta"):
+            os.makedirs(os.path.join(self.base, "github.com", "user", name))
+            self.repos.append(
+                {"provider": "github.com", "account": "user", "repository": name}
+            )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_json_records_per_repository(self) -> None:
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            run_in_repos(
+                self.repos,
+                self.base,
+                self.repos,
+                ["sh", "-c", "basename $(pwd)"],
+                jobs=2,
+                json_output=True,
+            )
+
+        records = [json.loads(line) for line in buf.getvalue().splitlines()]
+        by_repo = {r["repository"]: r for r in records}
+        self.assertEqual(set(by_repo), {"alpha", "beta"})
+        self.assertEqual(by_repo["alpha"]["exit_code"], 0)
+        self.assertEqual(by_repo["alpha"]["stdout"].strip(), "alpha")
+        self.assertFalse(by_repo["beta"]["timed_out"])
+
+    def test_timeout_marks_record_and_exits_non_zero(self) -> None:
+        buf = io.StringIO()
+        with redirect_stdout(buf), redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as ctx:
+                run_in_repos(
+                    self.repos[:1],
+                    self.base,
+                    self.repos,
+                    ["sleep", "5"],
+                    timeout=0.2,
+                    json_output=True,
+                )
+
+        self.assertEqual(ctx.exception.code, 124)
+        record = json.loads(buf.getvalue().splitlines()[0])
+        self.assertTrue(record["timed_out"])
+
+    def test_exit_code_aggregation_uses_highest_code(self) -> None:
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as ctx:
+                run_in_repos(
+                    self.repos,
+                    self.base,
+                    self.repos,
+                    ['[ "$(basename $(pwd))" = alpha ] && exit 2 || exit 7'],
+                    jobs=2,
+                    output_mode="group",
+                )
+        self.assertEqual(ctx.exception.code, 7)
+
+    def test_missing_executable_is_reported_as_127(self) -> None:
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                buf = io.StringIO()
+                with redirect_stdout(buf), redirect_stderr(io.StringIO()):
+                    with self.assertRaises(SystemExit) as ctx:
+                        run_in_repos(
+                            self.repos,
+                            self.base,
+                            self.repos,
+                            ["pkgmgr-nonexistent-cmd", "x"],
+                            jobs=jobs,
+                            json_output=True,
+                        )
+
+                self.assertEqual(ctx.exception.code, 127)
+                records = [json.loads(line) for line in buf.getvalue().splitlines()]
+                self.assertEqual(
+                    {r["repository"]: r["exit_code"] for r in records},
+                    {"alpha": 127, "beta": 127},
+                )
+
+    def test_missing_command_exits(self) -> None:
+        with redirect_stdout(io.StringIO()):
+            with self.assertRaises(SystemExit) as ctx:
+                run_in_repos(self.repos, self.base, self.repos, [])
+        self.assertEqual(ctx.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from pkgmgr.actions.proxy import exec_proxy_command
+
+
+class TestExecProxyCommandParallel(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = self._tmp.name
+        self.repos = []
+        for name in ("alpha", "beta"):
+            os.makedirs(os.path.join(self.base, "github.com", "user", name))
+            self.repos.append(
+                {"provider": "github.com", "account": "user", "repository": name}
+            )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_prefix_mode_prefixes_each_line(self) -> None:
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            exec_proxy_command(
+                "echo", self.repos, self.base, self.repos, "hello", [], False, jobs=2
+            )
+        out = buf.getvalue()
+        self.assertIn("[alpha] hello", out)
+        self.assertIn("[beta] hello", out)
+        self.assertIn("[SUMMARY]", out)
+
+    def test_group_mode_prints_block_per_repo(self) -> None:
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            exec_proxy_command(
+                "echo",
+                self.repos,
+                self.base,
+                self.repos,
+                "hello",
+                [],
+                False,
+                jobs=2,
+                output_mode="group",
+            )
+        out = buf.getvalue()
+        self.assertIn("===== alpha: echo hello", out)
+        self.assertNotIn("[alpha] hello", out)
+
+    def test_parallel_failure_exits_with_max_exit_code(self) -> None:
+        with redirect_stdout(io.StringIO()):
+            with self.assertRaises(SystemExit) as ctx:
+                exec_proxy_command(
+                    "sh -c", self.repos, self.base, self.repos, "'exit 5'", [], False,
+                    jobs=2,
+                )
+        self.assertEqual(ctx.exception.code, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from pkgmgr.actions.update.pipeline import run_update_pipeline
+
+
+def _repo(name: str) -> dict:
+    return {"provider": "github", "account": "example", "repository": name}
+
+
+class TestUpdatePipeline(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base = self._tmp.name
+        self.repos = [_repo(n) for n in ("repo-a", "repo-b", "repo-c")]
+        for name in ("repo-a", "repo-b"):
+            os.makedirs(os.path.join(self.base, "github", "example", name))
+        self.confirm = patch(
+            "pkgmgr.actions.repository.pull.confirm_pulls",
+            side_effect=lambda candidates, *_a: [
+                (repo, ident, rd, False) for repo, ident, rd in candidates
+            ],
+        )
+        self.confirm.start()
+        self.addCleanup(self.confirm.stop)
+        env = patch.dict(os.environ, {"PKGMGR_STATE_DIR": self.base + "-state"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _run(self, **kwargs):
+        return run_update_pipeline(
+            self.repos,
+            self.base,
+            "/tmp/bin",
+            self.repos,
+            no_verification=True,
+            preview=False,
+            quiet=True,
+            update_dependencies=False,
+            clone_mode="ssh",
+            jobs=2,
+            **kwargs,
+        )
+
+    def test_pulls_overlap_with_installs_and_missing_repos_skip_pull(self) -> None:
+        events = []
+        lock = threading.Lock()
+        install_started = threading.Event()
+
+        def fake_pull(repo_dir, _extra, _preview):
+            name = os.path.basename(repo_dir)
+            if name == "repo-b":
+                # Still pulling while repo-a / repo-c install.
+                install_started.wait(timeout=5)
+            with lock:
+                events.append(("pull", name))
+            return True, ""
+
+        def fake_install(selected, *_args, **kwargs):
+            name = selected[0]["repository"]
+            install_started.set()
+            with lock:
+                events.append(("install", name))
+            self.assertFalse(kwargs["interactive"])
+            self.assertFalse(kwargs["emit_summary"])
+            # The pipeline's run history is shared with every install.
+            self.assertIsNotNone(kwargs["history"])
+
+        with (
+            patch(
+                "pkgmgr.actions.repository.pull.pull_one", side_effect=fake_pull
+            ),
+            patch("pkgmgr.actions.install.install_repos", side_effect=fake_install),
+        ):
+            failures = self._run()
+
+        self.assertEqual(failures, [])
+        self.assertNotIn(("pull", "repo-c"), events)
+        self.assertEqual(
+            sorted(n for kind, n in events if kind == "install"),
+            ["repo-a", "repo-b", "repo-c"],
+        )
+        # An install finished before the last pull did.
+        first_install = events.index(next(e for e in events if e[0] == "install"))
+        self.assertLess(first_install, events.index(("pull", "repo-b")))
+
+    def test_failures_are_collected_per_stage(self) -> None:
+        def fake_pull(repo_dir, _extra, _preview):
+            if repo_dir.endswith("repo-a"):
+                return False, "merge conflict"
+            return True, ""
+
+        def fake_install(selected, *_args, **_kwargs):
+            if selected[0]["repository"] == "repo-b":
+                raise SystemExit(3)
+
+        with (
+            patch(
+                "pkgmgr.actions.repository.pull.pull_one", side_effect=fake_pull
+            ),
+            patch("pkgmgr.actions.install.install_repos", side_effect=fake_install),
+        ):
+            failures = dict(self._run())
+
+        self.assertEqual(
+            failures,
+            {
+                "repo-a": "pull failed (merge conflict)",
+                "repo-b": "install failed (exit=3)",
+            },
+        )
+
+    def test_prompts_are_asked_before_any_pull(self) -> None:
+        order = []
+
+        def fake_confirm(candidates, *_args):
+            order.append("confirm")
+            # Decline repo-b, accept repo-a despite a failed verification.
+            return [
+                (repo, ident, rd, True)
+                for repo, ident, rd in candidates
+                if ident == "repo-a"
+            ]
+
+        def fake_pull(repo_dir, _extra, _preview):
+            order.append(("pull", os.path.basename(repo_dir)))
+            return True, ""
+
+        installs = {}
+
+        def fake_install(selected, _base, _bin, _all, no_verification, *_a, **_k):
+            installs[selected[0]["repository"]] = no_verification
+
+        with (
+            patch(
+                "pkgmgr.actions.repository.pull.confirm_pulls",
+                side_effect=fake_confirm,
+            ),
+            patch(
+                "pkgmgr.actions.repository.pull.pull_one", side_effect=fake_pull
+            ),
+            patch("pkgmgr.actions.install.install_repos", side_effect=fake_install),
+        ):
+            run_update_pipeline(
+                self.repos,
+                self.base,
+                "/tmp/bin",
+                self.repos,
+                no_verification=False,
+                preview=False,
+                quiet=True,
+                update_dependencies=False,
+                clone_mode="ssh",
+                jobs=2,
+            )
+
+        self.assertEqual(order, ["confirm", ("pull", "repo-a")])
+        # The accepted override skips the second verification on install.
+        self.assertEqual(installs, {"repo-a": True, "repo-c": False})
+
+    def test_shared_dependencies_install_once_before_their_dependents(self) -> None:
+        shared = _repo("shared")
+        self.repos[0]["dependencies"] = ["shared"]
+        self.repos[1]["dependencies"] = ["shared"]
+        all_repos = self.repos + [shared]
+        installs = []
+        lock = threading.Lock()
+
+        def fake_install(selected, *args, **_kwargs):
+            # update_dependencies: the pipeline adds dependencies itself.
+            self.assertFalse(args[7])
+            with lock:
+                installs.append(selected[0]["repository"])
+
+        with (
+            patch(
+                "pkgmgr.actions.repository.pull.pull_one",
+                return_value=(True, ""),
+            ),
+            patch("pkgmgr.actions.install.install_repos", side_effect=fake_install),
+        ):
+            failures = run_update_pipeline(
+                self.repos,
+                self.base,
+                "/tmp/bin",
+                all_repos,
+                no_verification=True,
+                preview=False,
+                quiet=True,
+                update_dependencies=True,
+                clone_mode="ssh",
+                jobs=3,
+            )
+
+        self.assertEqual(failures, [])
+        self.assertEqual(installs.count("shared"), 1)
+        self.assertEqual(installs.index("shared"), 0)
+        self.assertEqual(sorted(installs), ["repo-a", "repo-b", "repo-c", "shared"])
+
+    def test_failed_pull_skips_dependents(self) -> None:
+        self.repos[1]["dependencies"] = ["repo-a"]
+        installs = []
+
+        def fake_pull(repo_dir, _extra, _preview):
+            return (False, "merge conflict") if repo_dir.endswith("repo-a") else (
+                True,
+                "",
+            )
+
+        with (
+            patch(
+                "pkgmgr.actions.repository.pull.pull_one", side_effect=fake_pull
+            ),
+            patch(
+                "pkgmgr.actions.install.install_repos",
+                side_effect=lambda selected, *_a, **_k: installs.append(
+                    selected[0]["repository"]
+                ),
+            ),
+        ):
+            failures = dict(self._run())
+
+        self.assertEqual(installs, ["repo-c"])
+        self.assertEqual(failures["repo-a"], "pull failed (merge conflict)")
+        self.assertEqual(failures["repo-b"], "dependency failed: repo-a")
+
+    def test_pull_worker_exceptions_are_reported(self) -> None:
+        with (
+            patch(
+                "pkgmgr.actions.repository.pull.pull_one", return_value=(True, "")
+            ),
+            patch(
+                "pkgmgr.actions.update.pipeline.acquire",
+                side_effect=RuntimeError("boom"),
+            ),
+            patch("pkgmgr.actions.install.install_repos"),
+        ):
+            failures = dict(self._run())
+
+        self.assertEqual(
+            failures, {"repo-a": "pull failed: boom", "repo-b": "pull failed: boom"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
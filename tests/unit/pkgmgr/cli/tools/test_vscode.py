@@ -107,7 +107,9 @@ class TestOpenVSCodeWorkspace(unittest.TestCase):
             self.assertEqual(data["folders"], [{"path": repo_path}])
             self.assertEqual(data["settings"], {})
 
-            run_cmd.assert_called_once_with(f'code "{workspace_file}"')
+            run_cmd.assert_called_once_with(
+                f'code "{workspace_file}"', interactive=True
+            )
 
     def test_uses_existing_workspace_file_without_overwriting(self) -> None:
         from pkgmgr.cli.tools.vscode import open_vscode_workspace
@@ -153,4 +155,6 @@ class TestOpenVSCodeWorkspace(unittest.TestCase):
                 data = json.load(f)
 
             self.assertEqual(data, original)
-            run_cmd.assert_called_once_with(f'code "{workspace_file}"')
+            run_cmd.assert_called_once_with(
+                f'code "{workspace_file}"', interactive=True
+            )
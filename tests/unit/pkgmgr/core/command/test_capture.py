@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pkgmgr.core.command.run as run_mod
+from pkgmgr.core.command.capture import LOG_DIR_ENV, TailBuffer, command_log_path
+
+
+class TestTailBuffer(unittest.TestCase):
+    def test_keeps_only_last_lines(self) -> None:
+        buf = TailBuffer(max_lines=3, max_bytes=1000)
+        for i in range(10):
+            buf.append(f"line {i}\n")
+        self.assertEqual(buf.text(), "line 7\nline 8\nline 9\n")
+        self.assertEqual(buf.dropped, 7)
+
+    def test_respects_byte_budget_but_keeps_latest_line(self) -> None:
+        buf = TailBuffer(max_lines=100, max_bytes=10)
+        buf.append("aaaa\n")
+        buf.append("bbbb\n")
+        buf.append("c" * 50 + "\n")
+        self.assertEqual(buf.text(), "c" * 50 + "\n")
+        self.assertEqual(buf.dropped, 2)
+
+
+class TestCommandLogPath(unittest.TestCase):
+    def test_none_without_env(self) -> None:
+        with patch.dict(os.environ, {LOG_DIR_ENV: ""}):
+            self.assertIsNone(command_log_path("/repos/a"))
+
+    def test_one_log_per_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.dict(os.environ, {LOG_DIR_ENV: tmp}):
+                a = command_log_path("/repos/github.com/u/a")
+                b = command_log_path("/repos/github.com/v/a")
+        self.assertNotEqual(a, b)
+        self.assertTrue(a.startswith(tmp))
+
+
+class TestRunCommandBoundedCapture(unittest.TestCase):
+    def test_capture_is_bounded_and_log_has_everything(self) -> None:
+        cmd = ["python3", "-c", "for i in range(500): print(i)"]
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, "out.log")
+            with patch("builtins.print"):
+                result = run_mod.run_command(
+                    cmd, stream=False, log_path=log, max_capture_lines=10
+                )
+            with open(log, encoding="utf-8") as f:
+                logged = f.read()
+
+        self.assertEqual(result.stdout.splitlines(), [str(i) for i in range(490, 500)])
+        self.assertIn("\n0\n", logged)
+        self.assertIn("\n499\n", logged)
+        self.assertEqual(result.log_path, log)
+
+    def test_failure_diagnostics_mention_log_path(self) -> None:
+        cmd = ["python3", "-c", "import sys; print('x'); sys.exit(2)"]
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, "fail.log")
+            with patch("builtins.print") as print_mock:
+                with self.assertRaises(SystemExit):
+                    run_mod.run_command(cmd, stream=False, log_path=log)
+
+        printed = " ".join(str(c.args[0]) for c in print_mock.call_args_list if c.args)
+        self.assertIn(log, printed)
+
+
+if __name__ == "__main__":
+    unittest.main()
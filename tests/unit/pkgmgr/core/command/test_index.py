@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import threading
+import unittest
+
+from pkgmgr.core.command.index import (
+    ExecutableIndex,
+    active_executable_index,
+    executable_index,
+    invalidate_executable_index,
+)
+from pkgmgr.core.command.resolve import (
+    MAX_SRC_DEPTH,
+    _find_python_package_root,
+    _path_binary_candidates,
+)
+
+
+def _touch(path: str, executable: bool = True) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(path, 0o755 if executable else 0o644)
+    return path
+
+
+class TestExecutableIndex(unittest.TestCase):
+    def test_which_follows_path_order_and_skips_non_executables(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            first = os.path.join(tmp, "a")
+            second = os.path.join(tmp, "b")
+            _touch(os.path.join(first, "tool"), executable=False)
+            expected = _touch(os.path.join(second, "tool"))
+
+            index = ExecutableIndex(path_dirs=[first, second], nix_bin_dir=tmp)
+
+            self.assertEqual(index.which("tool"), expected)
+            self.assertIsNone(index.which("missing"))
+            self.assertEqual(index.builds, 1)
+
+    def test_nix_lookup(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            nix_bin = os.path.join(tmp, "nix")
+            expected = _touch(os.path.join(nix_bin, "pkgmgr"))
+
+            index = ExecutableIndex(path_dirs=[], nix_bin_dir=nix_bin)
+
+            self.assertEqual(index.nix("pkgmgr"), expected)
+            self.assertIsNone(index.nix("other"))
+
+    def test_invalidate_rebuilds_on_next_lookup(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = ExecutableIndex(path_dirs=[tmp], nix_bin_dir=tmp)
+            self.assertIsNone(index.which("late"))
+
+            late = _touch(os.path.join(tmp, "late"))
+            self.assertIsNone(index.which("late"))
+
+            index.invalidate()
+            self.assertEqual(index.which("late"), late)
+            self.assertEqual(index.builds, 2)
+
+    def test_context_manager_is_reentrant_and_scoped(self) -> None:
+        self.assertIsNone(active_executable_index())
+        with executable_index() as outer:
+            with executable_index() as inner:
+                self.assertIs(inner, outer)
+            self.assertIs(active_executable_index(), outer)
+        self.assertIsNone(active_executable_index())
+        invalidate_executable_index()  # no-op without an active index
+
+    def test_scope_outlives_a_concurrent_user_leaving_first(self) -> None:
+        entered, leave = threading.Event(), threading.Event()
+
+        def worker() -> None:
+            with executable_index():
+                entered.set()
+                leave.wait(5)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.assertTrue(entered.wait(5))
+        with executable_index() as index:
+            leave.set()
+            thread.join(5)
+            # The worker left first; this run still uses the same index.
+            self.assertIs(active_executable_index(), index)
+        self.assertIsNone(active_executable_index())
+
+    def test_path_candidates_use_active_index(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            expected = _touch(os.path.join(tmp, "indexed-tool"))
+            old_path = os.environ.get("PATH", "")
+            os.environ["PATH"] = tmp
+            try:
+                with executable_index() as index:
+                    self.assertEqual(
+                        _path_binary_candidates(["indexed-tool"]), [expected]
+                    )
+                    self.assertEqual(index.builds, 1)
+            finally:
+                os.environ["PATH"] = old_path
+
+
+class TestFindPythonPackageRoot(unittest.TestCase):
+    def test_finds_main_within_depth(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            main = _touch(os.path.join(tmp, "src", "ns", "arc", "__main__.py"))
+            self.assertEqual(_find_python_package_root(tmp), os.path.dirname(main))
+
+    def test_ignores_main_beyond_depth(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            parts = [f"d{i}" for i in range(MAX_SRC_DEPTH + 1)]
+            _touch(os.path.join(tmp, "src", *parts, "__main__.py"))
+            self.assertIsNone(_find_python_package_root(tmp))
+
+    def test_result_is_cached_per_src_mtime(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pkg = os.path.join(tmp, "src", "arc")
+            _touch(os.path.join(pkg, "__main__.py"))
+            self.assertEqual(_find_python_package_root(tmp), pkg)
+
+            # Same src/ mtime: the cached answer is returned without a walk.
+            os.remove(os.path.join(pkg, "__main__.py"))
+            self.assertEqual(_find_python_package_root(tmp), pkg)
+
+            # Adding an entry to src/ changes its mtime and forces a rescan.
+            os.makedirs(os.path.join(tmp, "src", "other"))
+            st = os.stat(os.path.join(tmp, "src"))
+            os.utime(
+                os.path.join(tmp, "src"),
+                ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000),
+            )
+            self.assertIsNone(_find_python_package_root(tmp))
+
+
+if __name__ == "__main__":
+    unittest.main()
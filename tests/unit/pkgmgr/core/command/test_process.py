@@ -0,0 +1,153 @@
+import os
+import subprocess
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+import pkgmgr.core.command.process as process_mod
+from pkgmgr.core.command.process import (
+    CommandCancelled,
+    cancel_all,
+    configure_timeouts,
+    is_privileged,
+    note_timeout,
+    operation_timeout,
+    reset_cancellation,
+    run_process,
+    spawn,
+    watch_timeouts,
+)
+
+
+def _gone(pid: int) -> bool:
+    """True once ``pid`` no longer runs (exited or left as a zombie)."""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as fh:
+            return fh.read().rsplit(")", 1)[1].split()[0] == "Z"
+    except FileNotFoundError:
+        return True
+
+
+def _wait_gone(pid: int, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _gone(pid):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class TestConfigureTimeouts(unittest.TestCase):
+    def tearDown(self) -> None:
+        configure_timeouts(None)
+
+    def test_reads_performance_timeouts(self) -> None:
+        configure_timeouts({"timeouts": {"git": 30, "nix": "120", "command": 0}})
+        self.assertEqual(operation_timeout("git"), 30.0)
+        self.assertEqual(operation_timeout("nix"), 120.0)
+        self.assertIsNone(operation_timeout("command"))
+
+    def test_invalid_values_are_ignored(self) -> None:
+        buf = StringIO()
+        with redirect_stdout(buf):
+            configure_timeouts({"timeouts": {"git": "soon"}})
+            configure_timeouts({"timeouts": ["git"]})
+        self.assertIsNone(operation_timeout("git"))
+        self.assertIn("performance.timeouts.git", buf.getvalue())
+
+    def test_unknown_operation_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            operation_timeout("bogus")
+
+
+class TestRunProcess(unittest.TestCase):
+    def test_timeout_terminates_the_whole_process_group(self) -> None:
+        cmd = "sleep 30 & echo $!; wait"
+        with watch_timeouts() as watch:
+            with self.assertRaises(subprocess.TimeoutExpired) as ctx:
+                run_process(
+                    cmd, shell=True, stdout=subprocess.PIPE, text=True, timeout=0.5
+                )
+
+        grandchild = int(ctx.exception.stdout.split()[0])
+        self.assertTrue(_wait_gone(grandchild))
+        self.assertEqual(watch.commands, [cmd])
+        self.assertFalse(process_mod._LIVE)
+
+    def test_check_raises_called_process_error(self) -> None:
+        with self.assertRaises(subprocess.CalledProcessError) as ctx:
+            run_process(
+                ["sh", "-c", "echo out; exit 3"],
+                check=True,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+        self.assertEqual(ctx.exception.returncode, 3)
+        self.assertEqual(ctx.exception.stdout, "out\n")
+
+
+class TestWatchTimeouts(unittest.TestCase):
+    def test_nested_watches_propagate_outwards(self) -> None:
+        with watch_timeouts() as outer:
+            with watch_timeouts() as inner:
+                note_timeout("git pull")
+            self.assertTrue(inner.timed_out)
+        self.assertEqual(outer.commands, ["git pull"])
+
+    def test_note_without_watch_is_ignored(self) -> None:
+        note_timeout("git pull")
+
+
+class TestSpawn(unittest.TestCase):
+    def test_isolated_child_keeps_the_session(self) -> None:
+        child = spawn(["sleep", "30"], isolate=True)
+        try:
+            self.assertEqual(os.getpgid(child.pid), child.pid)
+            self.assertEqual(os.getsid(child.pid), os.getsid(0))
+        finally:
+            child.kill()
+            child.wait()
+            process_mod.release(child)
+
+    def test_privileged_commands_stay_in_the_foreground_group(self) -> None:
+        with patch.object(process_mod.subprocess, "Popen") as popen:
+            process_mod.release(spawn("sudo apt-get update", isolate=True))
+            process_mod.release(spawn(["make", "install"], isolate=True))
+
+        self.assertEqual(popen.call_args_list[0].kwargs, {})
+        # Own process group (process_group / preexec_fn, by Python version).
+        self.assertTrue(popen.call_args_list[1].kwargs)
+
+    def test_is_privileged(self) -> None:
+        self.assertTrue(is_privileged("sudo dpkg -i a.deb"))
+        self.assertTrue(is_privileged(["/usr/bin/sudo", "pacman", "-U"]))
+        self.assertFalse(is_privileged("dpkg-buildpackage -b"))
+        self.assertFalse(is_privileged([]))
+
+
+class TestCancelAll(unittest.TestCase):
+    def tearDown(self) -> None:
+        reset_cancellation()
+
+    def test_terminates_children_and_refuses_new_ones(self) -> None:
+        child = spawn(["sleep", "30"], isolate=True)
+        try:
+            cancel_all(grace=0.1)
+            self.assertIsNotNone(child.wait(timeout=5))
+        finally:
+            process_mod.release(child)
+
+        with self.assertRaises(CommandCancelled):
+            spawn(["true"])
+
+    def test_interrupt_handler_cancels_and_raises(self) -> None:
+        with patch.object(process_mod, "cancel_all") as cancel_mock:
+            with self.assertRaises(KeyboardInterrupt):
+                process_mod._on_interrupt(2, None)
+        cancel_mock.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -54,6 +56,48 @@ class TestRunCommand(unittest.TestCase):
         self.assertIn("oops", result.stderr)
         exit_mock.assert_not_called()
 
+    def test_timeout_kills_command(self) -> None:
+        cmd = ["python3", "-c", "import time; time.sleep(5)"]
+
+        with patch.object(run_mod.sys, "exit") as exit_mock:
+            result = run_mod.run_command(cmd, allow_failure=True, timeout=0.2)
+
+        self.assertEqual(result.returncode, run_mod.TIMEOUT_EXIT_CODE)
+        self.assertTrue(result.timed_out)
+        exit_mock.assert_not_called()
+
+    def test_interactive_command_gets_no_default_timeout(self) -> None:
+        cmd = ["python3", "-c", "import time; time.sleep(0.5)"]
+
+        with patch.object(run_mod, "operation_timeout", return_value=0.1), patch.object(
+            run_mod, "spawn", wraps=run_mod.spawn
+        ) as spawn_mock:
+            result = run_mod.run_command(cmd, interactive=True)
+
+        self.assertEqual(result.returncode, 0)
+        self.assertFalse(spawn_mock.call_args.kwargs["isolate"])
+
+    def test_stream_false_does_not_print_output(self) -> None:
+        cmd = ["python3", "-c", "print('quiet-line')"]
+
+        with patch("builtins.print") as print_mock:
+            result = run_mod.run_command(cmd, stream=False)
+
+        self.assertIn("quiet-line", result.stdout)
+        print_mock.assert_not_called()
+
+    def test_unwritable_log_fails_before_the_command_starts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            # The log "directory" is a file, so makedirs() fails.
+            blocker = os.path.join(tmp, "logs")
+            open(blocker, "w").close()
+            with patch.dict(os.environ, {"PKGMGR_LOG_DIR": blocker}), patch.object(
+                run_mod, "spawn"
+            ) as spawn_mock:
+                with self.assertRaises(OSError):
+                    run_mod.run_command(["true"])
+        spawn_mock.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
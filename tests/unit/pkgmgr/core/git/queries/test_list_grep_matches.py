@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from pkgmgr.core.git.queries.list_grep_matches import list_grep_matches
+
+
+class TestListGrepMatches(unittest.TestCase):
+    @patch("pkgmgr.core.git.queries.list_grep_matches.run")
+    def test_splits_records_on_newline_only(self, mock_run):
+        mock_run.return_value = "a.txt\x001\x00x\rfoo\nb.txt\x002\x00y\x1cbar  \n"
+
+        matches = list_grep_matches("foo", cwd="/repo")
+
+        self.assertEqual(mock_run.call_args.kwargs["strip"], False)
+        self.assertEqual(
+            [(m.path, m.line, m.text) for m in matches],
+            [("a.txt", 1, "x\rfoo"), ("b.txt", 2, "y\x1cbar  ")],
+        )
+
+    @patch("pkgmgr.core.git.queries.list_grep_matches.run")
+    def test_count_mode(self, mock_run):
+        mock_run.return_value = "a.txt\x003\n"
+
+        matches = list_grep_matches("foo", count=True)
+
+        self.assertEqual([(m.path, m.count) for m in matches], [("a.txt", 3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
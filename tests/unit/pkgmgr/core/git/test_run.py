@@ -1,14 +1,14 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
-from pkgmgr.core.git.errors import GitRunError
+from pkgmgr.core.git.errors import GitRunError, GitTimeoutError
 from pkgmgr.core.git.run import run
 
 
 class TestGitRun(unittest.TestCase):
     def test_preview_mode_prints_and_does_not_execute(self) -> None:
         with (
-            patch("pkgmgr.core.git.run.subprocess.run") as mock_run,
+            patch("pkgmgr.core.git.run.run_process") as mock_run,
             patch("builtins.print") as mock_print,
         ):
             out = run(["status"], cwd="/tmp/repo", preview=True)
@@ -26,7 +26,7 @@ class TestGitRun(unittest.TestCase):
         completed.returncode = 0
 
         with patch(
-            "pkgmgr.core.git.run.subprocess.run", return_value=completed
+            "pkgmgr.core.git.run.run_process", return_value=completed
         ) as mock_run:
             out = run(["rev-parse", "HEAD"], cwd="/repo", preview=False)
 
@@ -57,7 +57,7 @@ class TestGitRun(unittest.TestCase):
         exc.stdout = "OUT!"
         exc.stderr = "ERR!"
 
-        with patch("pkgmgr.core.git.run.subprocess.run", side_effect=exc):
+        with patch("pkgmgr.core.git.run.run_process", side_effect=exc):
             with self.assertRaises(GitRunError) as ctx:
                 run(["status"], cwd="/bad/repo", preview=False)
 
@@ -67,6 +67,19 @@ class TestGitRun(unittest.TestCase):
         self.assertIn("STDOUT:\nOUT!", msg)
         self.assertIn("STDERR:\nERR!", msg)
 
+    def test_timeout_raises_git_timeout_error(self) -> None:
+        import subprocess as sp
+
+        exc = sp.TimeoutExpired(["git", "pull"], 5, output="", stderr="Host key?")
+        with patch("pkgmgr.core.git.run.run_process", side_effect=exc) as mock_run:
+            with self.assertRaises(GitTimeoutError) as ctx:
+                run(["pull"], cwd="/repo", timeout=5)
+
+        self.assertEqual(mock_run.call_args.kwargs["timeout"], 5)
+        self.assertEqual(ctx.exception.returncode, 124)
+        self.assertIn("timed out after 5s", str(ctx.exception))
+        self.assertIn("Host key?", str(ctx.exception))
+
 
 if __name__ == "__main__":
     unittest.main()
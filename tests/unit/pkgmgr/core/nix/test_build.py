@@ -0,0 +1,36 @@
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+from pkgmgr.core.nix.build import build_options, configure_nix_build, prefetch_jobs
+
+
+class TestNixBuildSettings(unittest.TestCase):
+    def tearDown(self) -> None:
+        configure_nix_build(None)
+
+    @patch("pkgmgr.core.nix.build.os.cpu_count", return_value=8)
+    def test_defaults_split_the_cpus_between_processes(self, _cpu) -> None:
+        # --cores is left to nix.conf unless configured.
+        self.assertEqual(build_options(4), ["--max-jobs", "2"])
+        self.assertEqual(build_options(16), ["--max-jobs", "1"])
+        self.assertEqual(prefetch_jobs(3), 3)
+
+    def test_config_overrides(self) -> None:
+        configure_nix_build({"nix": {"prefetch_jobs": 2, "max_jobs": "3", "cores": 0}})
+        self.assertEqual(prefetch_jobs(8), 2)
+        self.assertEqual(build_options(2), ["--max-jobs", "3", "--cores", "0"])
+
+    def test_invalid_values_are_ignored(self) -> None:
+        buf = StringIO()
+        with redirect_stdout(buf):
+            configure_nix_build({"nix": {"max_jobs": "many", "prefetch_jobs": -1}})
+            configure_nix_build({"nix": ["max_jobs"]})
+        self.assertEqual(prefetch_jobs(5), 5)
+        self.assertIn("performance.nix.max_jobs", buf.getvalue())
+        self.assertIn("performance.nix:", buf.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
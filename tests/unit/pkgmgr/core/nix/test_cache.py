@@ -0,0 +1,88 @@
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pkgmgr.core.nix.cache import (
+    CACHE_ENV,
+    DEFAULT_CACHE_DIR,
+    PUBLIC_KEY_FILE,
+    binary_cache_dir,
+    configure_binary_cache,
+    copy_to_cache_command,
+    substituter_env,
+)
+
+
+class TestBinaryCacheConfig(unittest.TestCase):
+    def tearDown(self) -> None:
+        configure_binary_cache(None)
+
+    @patch.dict(os.environ, {CACHE_ENV: ""})
+    def test_disabled_by_default_and_configurable(self) -> None:
+        configure_binary_cache(None)
+        self.assertIsNone(binary_cache_dir())
+
+        configure_binary_cache({"nix": {"binary_cache": True}})
+        self.assertEqual(binary_cache_dir(), DEFAULT_CACHE_DIR)
+
+        configure_binary_cache({"nix": {"binary_cache": "file:///srv/nix-cache"}})
+        self.assertEqual(binary_cache_dir(), "/srv/nix-cache")
+
+    def test_environment_overrides_config(self) -> None:
+        configure_binary_cache({"nix": {"binary_cache": True}})
+        with patch.dict(os.environ, {CACHE_ENV: "0"}):
+            self.assertIsNone(binary_cache_dir())
+        with patch.dict(os.environ, {CACHE_ENV: "/tmp/cache"}):
+            self.assertEqual(binary_cache_dir(), "/tmp/cache")
+
+
+class TestBinaryCacheUse(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self._tmp.name, "cache")
+        patcher = patch.dict(os.environ, {CACHE_ENV: self.dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_substituter_is_added_once_a_key_exists(self) -> None:
+        self.assertIsNone(substituter_env({}))
+
+        os.makedirs(self.dir)
+        with open(os.path.join(self.dir, PUBLIC_KEY_FILE), "w") as f:
+            f.write("pkgmgr-host-1:PUBKEY\n")
+
+        env = substituter_env({"NIX_CONFIG": "max-jobs = 2"})
+        self.assertEqual(
+            env["NIX_CONFIG"],
+            f"max-jobs = 2\nextra-substituters = file://{self.dir}\n"
+            "extra-trusted-public-keys = pkgmgr-host-1:PUBKEY",
+        )
+
+    def test_copy_command_generates_the_signing_key(self) -> None:
+        outputs = {
+            "generate-secret": "pkgmgr-host-1:SECRET",
+            "convert-secret-to-public": "pkgmgr-host-1:PUBKEY",
+        }
+        with patch(
+            "pkgmgr.core.nix.cache._nix_output",
+            side_effect=lambda *args, stdin=None: outputs[args[1]],
+        ) as nix:
+            cmd = copy_to_cache_command("/repo#default")
+            self.assertEqual(copy_to_cache_command("/repo#default"), cmd)
+
+        secret = os.path.join(self.dir, "pkgmgr-cache.sec")
+        self.assertEqual(
+            cmd, f"nix copy --to 'file://{self.dir}?secret-key={secret}' /repo#default"
+        )
+        # The key pair is generated once and the secret is private.
+        self.assertEqual(nix.call_count, 2)
+        self.assertEqual(stat.S_IMODE(os.stat(secret).st_mode), 0o600)
+
+
+if __name__ == "__main__":
+    unittest.main()
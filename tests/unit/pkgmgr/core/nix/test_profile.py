@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+
+import pkgmgr.core.nix.profile as profile_mod
+from pkgmgr.core.nix.profile import (
+    invalidate_profile,
+    is_profile_mutation,
+    note_nix_command,
+    profile_generation,
+    profile_json,
+    profile_text,
+)
+
+
+class TestProfileMutation(unittest.TestCase):
+    def test_detects_mutating_subcommands(self) -> None:
+        for cmd in (
+            "nix profile install /repo#default",
+            "nix profile remove pkgmgr-1",
+            "nix profile upgrade --refresh 3",
+            "sudo nix  profile rollback",
+        ):
+            self.assertTrue(is_profile_mutation(cmd), cmd)
+        for cmd in ("nix profile list --json", "nix build /repo#default", ""):
+            self.assertFalse(is_profile_mutation(cmd), cmd)
+
+    def test_note_bumps_generation_only_for_mutations(self) -> None:
+        before = profile_generation()
+        note_nix_command("nix profile list")
+        self.assertEqual(profile_generation(), before)
+        note_nix_command("nix profile install /repo#default")
+        self.assertEqual(profile_generation(), before + 1)
+
+
+class TestProfileCache(unittest.TestCase):
+    def setUp(self) -> None:
+        invalidate_profile()
+
+    def test_listing_is_reused_until_the_profile_changes(self) -> None:
+        calls = []
+
+        def fake_list(*extra):
+            calls.append(extra)
+            return '{"elements": {}}' if extra else "0 flake:x"
+
+        with patch.object(profile_mod, "_list_profile", side_effect=fake_list):
+            self.assertEqual(profile_json(), {"elements": {}})
+            self.assertEqual(profile_json(), {"elements": {}})
+            self.assertEqual(profile_text(), "0 flake:x")
+            self.assertEqual(profile_text(), "0 flake:x")
+            self.assertEqual(calls, [("--json",), ()])
+
+            note_nix_command("nix profile remove x")
+            profile_json()
+            self.assertEqual(calls, [("--json",), (), ("--json",)])
+
+    def test_failures_are_not_cached(self) -> None:
+        with patch.object(
+            profile_mod, "_list_profile", side_effect=[None, "not json", "{}"]
+        ) as list_mock:
+            self.assertIsNone(profile_json())
+            self.assertIsNone(profile_json())
+            self.assertEqual(profile_json(), {})
+            self.assertEqual(list_mock.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from pkgmgr.core.progress.display import (
+    ProgressDisplay,
+    format_outcome,
+    live_supported,
+)
+
+
+class _FakeTty(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+class TestFormatOutcome(unittest.TestCase):
+    def test_failure_lines_include_message(self) -> None:
+        text = format_outcome("acme/tool", False, "boom\nbang", 2.0)
+        self.assertEqual(
+            text, "[FAIL] acme/tool (2.0s)\n       boom\n       bang"
+        )
+
+    def test_timed_out_status(self) -> None:
+        self.assertTrue(format_outcome("a", False, "", 1.0, True).startswith("[TIME]"))
+
+
+class TestLiveSupported(unittest.TestCase):
+    def test_requires_a_tty_and_honors_overrides(self) -> None:
+        with patch.dict(os.environ, {"TERM": "xterm", "PKGMGR_PROGRESS": ""}):
+            self.assertTrue(live_supported(_FakeTty()))
+            self.assertFalse(live_supported(io.StringIO()))
+        with patch.dict(os.environ, {"PKGMGR_PROGRESS": "plain"}):
+            self.assertFalse(live_supported(_FakeTty()))
+        with patch.dict(os.environ, {"TERM": "dumb", "PKGMGR_PROGRESS": ""}):
+            self.assertFalse(live_supported(_FakeTty()))
+
+
+class TestPlainMode(unittest.TestCase):
+    def test_prints_outcome_lines_only(self) -> None:
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            with ProgressDisplay("pull", 2, stream=buf) as display:
+                display.start("a")
+                display.finish("a", True, 1.0)
+                display.start("b")
+                display.finish("b", False, 2.0, msg="boom", timed_out=True)
+
+        self.assertFalse(display.live)
+        self.assertEqual(
+            buf.getvalue(), "[OK]   a (1.0s)\n[TIME] b (2.0s)\n       boom\n"
+        )
+
+    def test_outcome_lines_can_be_disabled(self) -> None:
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            with ProgressDisplay("install", 1, outcome_lines=False, live=False) as d:
+                d.start("a")
+                d.finish("a", True, 1.0)
+        self.assertEqual(buf.getvalue(), "")
+
+
+class TestRender(unittest.TestCase):
+    def test_header_counts_throughput_and_eta(self) -> None:
+        display = ProgressDisplay("pull", 4, live=False)
+        display._started_at = 0.0
+        display.finish("a", True, 1.0)
+        display.finish("b", False, 1.0)
+        display._active.clear()
+
+        with patch("sys.stdout", io.StringIO()):
+            display.start("c")
+        display._active["c"].started = 6.0
+
+        lines = display.render(now=10.0)
+        self.assertEqual(
+            lines[0], "[PULL] 2/4 done, 1 failed | 1 running | 0.2/s | ETA 10s"
+        )
+        self.assertEqual(lines[1], "      4.0s  c")
+
+    def test_slow_jobs_are_flagged(self) -> None:
+        display = ProgressDisplay("pull", 5, expected={"big": 2.0}, live=False)
+        display._started_at = 0.0
+        display.start("big")
+        display.start("new")
+        display._active["big"].started = 0.0
+        display._active["new"].started = 0.0
+
+        lines = display.render(now=5.0)
+        self.assertIn("big  (slow)", lines[1])
+        # No expectation and too few finished jobs for a median.
+        self.assertNotIn("(slow)", lines[2])
+
+        for ident in ("x", "y", "z"):
+            with patch("sys.stdout", io.StringIO()):
+                display.finish(ident, True, 1.0)
+        self.assertIn("new  (slow)", display.render(now=5.0)[2])
+
+
+class TestLiveMode(unittest.TestCase):
+    def test_block_is_redrawn_below_output_and_removed_on_exit(self) -> None:
+        tty = _FakeTty()
+        original = sys.stdout
+        with ProgressDisplay("pull", 2, stream=tty, live=True, refresh=60) as d:
+            self.assertIsNot(sys.stdout, original)
+            d.start("a")
+            print("some command output")
+            d.finish("a", True, 1.0)
+
+        self.assertIs(sys.stdout, original)
+        out = tty.getvalue()
+        self.assertIn("[PULL] 0/2 done", out)
+        self.assertIn("some command output\n", out)
+        self.assertIn("[OK]   a (1.0s)\n", out)
+        # The block drawn before the output was erased first ...
+        self.assertIn("\x1b[2F\x1b[J" + "some command output", out)
+        # ... and no block is left behind after the display closed.
+        tail = out.rsplit("[OK]   a (1.0s)\n", 1)[1]
+        self.assertTrue(tail == "" or tail.endswith("\x1b[J"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pkgmgr.core.git.errors import GitNotRepositoryError
+from pkgmgr.core.repository.state import detect_repo_states, filter_repos_by_state
+
+
+def _repo(name: str):
+    return {"provider": "github.com", "account": "user", "repository": name}
+
+
+class TestDetectRepoStates(unittest.TestCase):
+    def test_missing_directory(self) -> None:
+        self.assertEqual(detect_repo_states("/nonexistent/pkgmgr/repo"), {"missing"})
+
+    def test_clean_and_behind(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch(
+                "pkgmgr.core.repository.state.get_worktree_changes", return_value=[]
+            ), patch(
+                "pkgmgr.core.repository.state.get_ahead_behind", return_value=(0, 3)
+            ):
+                self.assertEqual(detect_repo_states(tmp), {"clean", "behind"})
+
+    def test_dirty_and_diverged(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch(
+                "pkgmgr.core.repository.state.get_worktree_changes",
+                return_value=[" M file.txt"],
+            ), patch(
+                "pkgmgr.core.repository.state.get_ahead_behind", return_value=(1, 2)
+            ):
+                self.assertEqual(
+                    detect_repo_states(tmp), {"dirty", "ahead", "behind", "diverged"}
+                )
+
+    def test_no_upstream_has_no_tracking_state(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch(
+                "pkgmgr.core.repository.state.get_worktree_changes", return_value=[]
+            ), patch(
+                "pkgmgr.core.repository.state.get_ahead_behind", return_value=None
+            ):
+                self.assertEqual(detect_repo_states(tmp), {"clean"})
+
+    def test_not_a_repository_matches_nothing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch(
+                "pkgmgr.core.repository.state.get_worktree_changes",
+                side_effect=GitNotRepositoryError("no repo"),
+            ):
+                self.assertEqual(detect_repo_states(tmp), set())
+
+
+class TestFilterReposByState(unittest.TestCase):
+    def test_keeps_order_and_matches_any_state(self) -> None:
+        repos = [_repo("a"), _repo("b"), _repo("c")]
+        states = {
+            os.path.join("/base", "github.com", "user", "a"): {"clean", "ahead"},
+            os.path.join("/base", "github.com", "user", "b"): {"dirty"},
+            os.path.join("/base", "github.com", "user", "c"): {"clean", "behind"},
+        }
+
+        with patch(
+            "pkgmgr.core.repository.state.detect_repo_states",
+            side_effect=lambda rd: states[rd],
+        ):
+            selected = filter_repos_by_state(repos, "/base", ["behind", "ahead"], jobs=4)
+
+        self.assertEqual([r["repository"] for r in selected], ["a", "c"])
+
+    def test_diverged_repository_matches_behind(self) -> None:
+        with tempfile.TemporaryDirectory() as base:
+            os.makedirs(os.path.join(base, "github.com", "user", "a"))
+            with patch(
+                "pkgmgr.core.repository.state.get_worktree_changes", return_value=[]
+            ), patch(
+                "pkgmgr.core.repository.state.get_ahead_behind", return_value=(2, 5)
+            ):
+                selected = filter_repos_by_state([_repo("a")], base, ["behind"])
+        self.assertEqual([r["repository"] for r in selected], ["a"])
+
+    def test_no_states_returns_input(self) -> None:
+        repos = [_repo("a")]
+        with patch("pkgmgr.core.repository.state.detect_repo_states") as mock_detect:
+            self.assertEqual(filter_repos_by_state(repos, "/base", []), repos)
+        mock_detect.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
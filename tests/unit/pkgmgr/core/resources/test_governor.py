@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from pkgmgr.core.resources import governor as governor_mod
+from pkgmgr.core.resources.governor import (
+    BUILD,
+    NETWORK,
+    PACKAGE_MANAGER,
+    ResourceGovernor,
+    TokenPool,
+    configure_governor,
+)
+
+
+class TestTokenPool(unittest.TestCase):
+    def test_limits_concurrent_holders(self) -> None:
+        pool = TokenPool("build", 2)
+        peak = 0
+        active = 0
+        lock = threading.Lock()
+
+        def worker() -> None:
+            nonlocal peak, active
+            pool.acquire()
+            try:
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+            finally:
+                pool.release()
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(pool.in_use, 0)
+
+    def test_nested_acquire_by_same_thread_takes_one_token(self) -> None:
+        pool = TokenPool("pm", 1)
+        pool.acquire()
+        pool.acquire()  # would block forever without re-entrancy
+        self.assertEqual(pool.in_use, 1)
+        pool.release()
+        self.assertEqual(pool.in_use, 1)
+        pool.release()
+        self.assertEqual(pool.in_use, 0)
+        with self.assertRaises(RuntimeError):
+            pool.release()
+
+
+class TestResourceGovernor(unittest.TestCase):
+    def test_acquire_several_pools_and_ignore_none(self) -> None:
+        gov = ResourceGovernor({NETWORK: 3, BUILD: 2})
+        with gov.acquire(BUILD, None, PACKAGE_MANAGER):
+            self.assertEqual(gov.pool(BUILD).in_use, 1)
+            self.assertEqual(gov.pool(PACKAGE_MANAGER).in_use, 1)
+            self.assertEqual(gov.pool(NETWORK).in_use, 0)
+        self.assertEqual(gov.pool(BUILD).in_use, 0)
+
+        with self.assertRaises(ValueError):
+            with gov.acquire("gpu"):
+                pass
+
+    def test_configure_only_configurable_pools(self) -> None:
+        gov = ResourceGovernor()
+        gov.configure(network=2, build=None)
+        self.assertEqual(gov.limits()[NETWORK], 2)
+        with self.assertRaises(ValueError):
+            gov.configure(nix_profile=4)
+
+    def test_configure_from_config_then_cli(self) -> None:
+        gov = ResourceGovernor()
+        with patch.object(governor_mod, "_GOVERNOR", gov):
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                configure_governor(
+                    {"network": 4, "build": "lots", "package_manager": 1},
+                    build=3,
+                )
+        self.assertEqual(gov.limits()[NETWORK], 4)
+        self.assertEqual(gov.limits()[BUILD], 3)
+        self.assertIn("performance.build", buf.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import io
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from pkgmgr.core.command.process import (
+    CommandCancelled,
+    cancel_all,
+    reset_cancellation,
+)
+from pkgmgr.core.resources.ratelimit import (
+    DEFAULT_BACKOFF,
+    RESET_MARGIN,
+    RateLimitCoordinator,
+    is_github_api,
+    is_rate_limit_error,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimitCoordinator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.limits = RateLimitCoordinator(
+            clock=self.clock.time, sleep=self.clock.sleep
+        )
+
+    def test_exhausted_quota_blocks_until_reset(self) -> None:
+        self.limits.update_from_headers(
+            {"X-RateLimit-Remaining": "12", "X-RateLimit-Reset": "1500"}
+        )
+        self.assertEqual(self.limits.remaining, 12)
+        self.assertEqual(self.limits.wait(quiet=True), 0.0)
+
+        self.limits.update_from_headers(
+            {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "1500"}
+        )
+        self.assertEqual(self.limits.wait(quiet=True), 500 + RESET_MARGIN)
+        self.assertEqual(self.clock.now, 1500 + RESET_MARGIN)
+
+    def test_retry_after_of_a_secondary_limit(self) -> None:
+        self.limits.update_from_headers({"Retry-After": "42"}, status=403)
+        self.assertEqual(self.limits.blocked_until, 1042.0)
+
+    def test_error_text_backoff_grows_until_success(self) -> None:
+        self.assertEqual(self.limits.note_rate_limited("403"), 1000 + DEFAULT_BACKOFF)
+        self.assertEqual(
+            self.limits.note_rate_limited("403"), 1000 + 2 * DEFAULT_BACKOFF
+        )
+        self.limits.wait(quiet=True)
+
+        self.limits.note_success()
+        now = self.clock.now
+        self.assertEqual(self.limits.note_rate_limited("403"), now + DEFAULT_BACKOFF)
+        self.assertEqual(
+            self.limits.note_rate_limited("error: Retry-After: 7", backoff=99),
+            now + DEFAULT_BACKOFF,  # an earlier hint never shortens the block
+        )
+
+    def test_the_wait_is_announced_once(self) -> None:
+        asleep = threading.Semaphore(0)
+        release = threading.Event()
+
+        def sleep(seconds: float) -> None:
+            asleep.release()
+            release.wait(5)
+
+        limits = RateLimitCoordinator(clock=self.clock.time, sleep=sleep)
+        limits.note_rate_limited(backoff=30)
+
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            workers = [threading.Thread(target=limits.wait) for _ in range(4)]
+            for w in workers:
+                w.start()
+            for _ in workers:
+                self.assertTrue(asleep.acquire(timeout=5))
+            self.clock.now += 30
+            release.set()
+            for w in workers:
+                w.join(5)
+
+        self.assertEqual(buf.getvalue().count("GitHub rate limit reached"), 1)
+
+    def test_cancellation_ends_the_wait(self) -> None:
+        self.addCleanup(reset_cancellation)
+        limits = RateLimitCoordinator(clock=self.clock.time)
+        limits.note_rate_limited(backoff=3600)
+        threading.Timer(0.1, cancel_all).start()
+
+        start = time.monotonic()
+        with self.assertRaises(CommandCancelled), redirect_stdout(io.StringIO()):
+            limits.wait()
+        self.assertLess(time.monotonic() - start, 5)
+
+
+class TestHelpers(unittest.TestCase):
+    def test_rate_limit_text(self) -> None:
+        self.assertTrue(
+            is_rate_limit_error("error: HTTP error 403: API rate limit exceeded")
+        )
+        self.assertFalse(is_rate_limit_error("error: HTTP error 404"))
+
+    def test_github_api_urls(self) -> None:
+        self.assertTrue(is_github_api("https://api.github.com/user/repos"))
+        self.assertFalse(is_github_api("https://git.example.org/api/v1/repos"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from pkgmgr.core.state.history import KEEP_PER_KEY, RunHistory, percentile
+
+
+class TestRunHistory(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.history = RunHistory(os.path.join(self._tmp.name, "history.sqlite3"))
+
+    def tearDown(self) -> None:
+        self.history.close()
+        self._tmp.cleanup()
+
+    def test_expected_durations_use_recent_successes_only(self) -> None:
+        for seconds in (10.0, 20.0, 30.0):
+            self.history.record("/r/a", "pull", seconds, True)
+        self.history.record("/r/a", "pull", 999.0, False)
+        self.history.record("/r/b", "push", 5.0, True)
+
+        expected = self.history.expected_durations("pull", ["/r/a", "/r/b"])
+        self.assertEqual(expected, {"/r/a": 20.0})
+
+    def test_failed_write_warns_once_and_continues(self) -> None:
+        class LockedConnection:
+            def execute(self, *_args):
+                raise sqlite3.OperationalError("database is locked")
+
+            def close(self):
+                pass
+
+        self.history._conn.close()
+        self.history._conn = LockedConnection()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.history.record("/r/a", "pull", 1.0, True)
+            self.history.record("/r/a", "pull", 2.0, True)
+
+        self.assertEqual(
+            out.getvalue(),
+            "[Warning] run history not updated (database is locked).\n",
+        )
+
+    def test_estimate_falls_back_to_pooled_installer_median(self) -> None:
+        self.history.record("/r/a", "install", 4.0, True, installer="NixFlakeInstaller")
+        self.history.record("/r/b", "install", 8.0, True, installer="NixFlakeInstaller")
+
+        self.assertEqual(
+            self.history.estimate("/r/a", "install", "NixFlakeInstaller"), 4.0
+        )
+        self.assertEqual(
+            self.history.estimate("/r/new", "install", "NixFlakeInstaller"), 6.0
+        )
+        self.assertIsNone(self.history.estimate("/r/a", "install", "Other"))
+
+    def test_stats_per_repo_and_installer(self) -> None:
+        for seconds, ok in ((1.0, True), (2.0, True), (3.0, False), (10.0, True)):
+            self.history.record("/r/a", "install", seconds, ok, label="a")
+        self.history.record("/r/a", "install", 7.0, True, installer="PythonInstaller")
+
+        repo_rows = self.history.stats(by="repo")
+        self.assertEqual(len(repo_rows), 1)
+        row = repo_rows[0]
+        self.assertEqual((row.name, row.operation, row.runs), ("a", "install", 4))
+        self.assertEqual(row.failures, 1)
+        self.assertAlmostEqual(row.failure_rate, 0.25)
+        self.assertEqual((row.p50, row.p95), (2.0, 10.0))
+
+        installer_rows = self.history.stats(by="installer")
+        self.assertEqual([r.name for r in installer_rows], ["PythonInstaller"])
+
+    def test_rows_are_pruned_per_key(self) -> None:
+        for i in range(KEEP_PER_KEY + 5):
+            self.history.record("/r/a", "pull", float(i), True)
+        (row,) = self.history.stats(by="repo")
+        self.assertEqual(row.runs, KEEP_PER_KEY)
+
+    def test_read_only_history_reads_but_never_creates(self) -> None:
+        self.history.record("/r/a", "install", 7.0, True)
+        reader = RunHistory(self.history.path, read_only=True)
+        try:
+            self.assertEqual(
+                reader.expected_durations("install", ["/r/a"]), {"/r/a": 7.0}
+            )
+        finally:
+            reader.close()
+
+        missing = os.path.join(self._tmp.name, "absent", "history.sqlite3")
+        with self.assertRaises(sqlite3.OperationalError):
+            RunHistory(missing, read_only=True)
+        self.assertFalse(os.path.exists(os.path.dirname(missing)))
+
+    def test_percentile_nearest_rank(self) -> None:
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(percentile([3.0, 1.0, 2.0], 50), 2.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 95), 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
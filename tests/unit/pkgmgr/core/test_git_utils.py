@@ -10,7 +10,7 @@ from pkgmgr.core.git.queries import get_tags, get_head_commit, get_current_branc
 
 
 class TestGitRun(unittest.TestCase):
-    @patch("pkgmgr.core.git.run.subprocess.run")
+    @patch("pkgmgr.core.git.run.run_process")
     def test_run_success(self, mock_run):
         mock_run.return_value.stdout = "ok\n"
         mock_run.return_value.stderr = ""
@@ -24,7 +24,7 @@ class TestGitRun(unittest.TestCase):
         self.assertEqual(args[0][0], "git")
         self.assertEqual(kwargs.get("cwd"), "/tmp/repo")
 
-    @patch("pkgmgr.core.git.run.subprocess.run")
+    @patch("pkgmgr.core.git.run.run_process")
     def test_run_failure_raises_giterror(self, mock_run):
         import subprocess
 